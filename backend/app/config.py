@@ -36,6 +36,53 @@ class Settings(BaseSettings):
         default="",
         validation_alias=AliasChoices("GOOGLE_PLACES_API_KEY", "PLACES_API_KEY"),
     )
+    # Merchant lookup cache: in-process tier size/TTL, how long a no-match
+    # is trusted, and how often a match is re-checked against the API
+    places_lookup_memory_size: int = 10_000
+    places_lookup_memory_ttl_seconds: int = 3600
+    places_negative_cache_ttl_seconds: int = 7 * 24 * 3600
+    places_positive_cache_refresh_days: int = 90
+    # Place details: in-process cache, and how often venues' volatile fields
+    # (rating, review count, hours) are re-pulled; interval 0 = cron only
+    places_details_cache_size: int = 2000
+    places_details_cache_ttl_seconds: int = 24 * 3600
+    venue_details_stale_days: int = 14
+    venue_details_refresh_interval_minutes: int = 0
+    venue_details_refresh_batch_size: int = 100
+    # Places API request budget; set a state path (SQLite file) to share
+    # the bucket between worker processes on one host
+    places_rate_limit_per_minute: int = 500
+    places_rate_limit_state_path: str = ""
+    # Pooled Places HTTP client
+    places_http_max_connections: int = 20
+    places_http_max_keepalive: int = 10
+    places_http_max_retries: int = 3
+    # Local merchant -> venue matching before falling back to Google
+    venue_match_confidence_threshold: float = 0.85
+    venue_index_refresh_seconds: int = 900
+    # Concurrent Claude calls per venue tagging batch
+    venue_tagging_concurrency: int = 8
+
+    # Anthropic (LLM gateway shared by every Claude call): default
+    # per-use-case concurrency and deadline, retries on transient errors
+    llm_max_concurrency: int = 8
+    llm_timeout_seconds: float = 30.0
+    llm_max_retries: int = 2
+    llm_max_connections: int = 20
+    # Reuse of insight/DNA/title generations for unchanged inputs: how
+    # long stored outputs live, and the in-process tier's size
+    llm_generation_cache_ttl_days: int = 7
+    llm_generation_cache_memory_size: int = 5000
+    # Nightly precompute of daily insights, DNA and profile titles: UTC
+    # hour to run in-process (-1 = cron only), worker pool size, users per
+    # batch, and how recently (profiles.last_active_at) a user must have
+    # used the app. Content is for the server's UTC date, not local days
+    taste_precompute_hour_utc: int = -1
+    taste_precompute_workers: int = 4
+    taste_precompute_batch_size: int = 200
+    taste_precompute_active_days: int = 14
+    # Today's insights, DNA and profile titles kept in-process per user
+    daily_content_cache_size: int = 10_000
 
     # OpenAI
     openai_api_key: str = ""
@@ -8,9 +8,12 @@ from __future__ import annotations
 
 from typing import Any
 
-import anthropic
 from pydantic import BaseModel
 
+from app.intelligence.generation_cache import GenerationCache, prompt_version
+from app.intelligence.llm_gateway import LLMGateway, get_llm_gateway
+from app.intelligence.prompt_builder import PromptBuilder
+
 
 class DNATrait(BaseModel):
     """A single DNA trait describing the user's taste personality."""
@@ -76,19 +79,39 @@ Output:
 
 Return exactly 4 traits that paint a unique picture of this person's taste identity."""
 
+MODEL = "claude-haiku-4-5"
+
 MAX_TRAITS = 4
 
+# Token budget for the user data message
+PROMPT_BUDGET_TOKENS = 300
+
+# Cached generations are invalidated when any of these change
+PROMPT_VERSION = prompt_version(MODEL, SYSTEM_PROMPT, PROMPT_BUDGET_TOKENS)
+
 
 class DNAGenerator:
     """Generates personalized DNA traits using Claude API."""
 
-    def __init__(self) -> None:
-        """Initialize with Anthropic client."""
-        self._client = anthropic.Anthropic()
+    def __init__(
+        self,
+        gateway: LLMGateway | None = None,
+        cache: GenerationCache | None = None,
+    ) -> None:
+        """Initialize generator.
+
+        Args:
+            gateway: LLM gateway (defaults to the shared one)
+            cache: Generation cache for unchanged inputs (None disables reuse)
+        """
+        self._gateway = gateway or get_llm_gateway()
+        self._cache = cache
 
     def generate(self, user_data: dict[str, Any]) -> list[DNATrait]:
         """Generate DNA traits from user data.
 
+        Reuses a cached generation when the same input was seen before.
+
         Args:
             user_data: Combined quiz + transaction data including:
                 - categories: spending breakdown
@@ -102,10 +125,24 @@ class DNAGenerator:
         Returns:
             List of exactly 4 DNATrait objects.
         """
+        if self._cache is None:
+            return self._generate(user_data)
+
+        stored = self._cache.get_or_generate(
+            "dna",
+            PROMPT_VERSION,
+            user_data,
+            lambda: [t.model_dump() for t in self._generate(user_data)],
+        )
+        return [DNATrait.model_validate(t) for t in stored]
+
+    def _generate(self, user_data: dict[str, Any]) -> list[DNATrait]:
+        """Generate DNA traits with Claude (no cache)."""
         user_message = self._build_user_message(user_data)
 
-        response = self._client.beta.messages.parse(
-            model="claude-haiku-4-5",
+        response = self._gateway.parse(
+            "dna",
+            model=MODEL,
             max_tokens=600,
             betas=["structured-outputs-2025-11-13"],
             system=[
@@ -136,60 +173,71 @@ class DNAGenerator:
         Returns:
             Formatted message for Claude.
         """
-        parts = ["## User Data"]
+        builder = PromptBuilder(PROMPT_BUDGET_TOKENS)
+        builder.add_required("## User Data")
+
+        # Quiz data (declared taste) is small and always included
+        builder.add_required("\n### From Quiz")
+
+        exploration = user_data.get("exploration_style")
+        if exploration:
+            builder.add_required(f"- Exploration: {exploration}")
+
+        vibes = user_data.get("vibe_preferences", [])
+        if vibes:
+            builder.add_required(f"- Vibes: {', '.join(vibes)}")
+
+        social = user_data.get("social_preference")
+        if social:
+            builder.add_required(f"- Social: {social}")
 
-        # Transaction data
+        price = user_data.get("price_tier")
+        if price:
+            builder.add_required(f"- Price: {price}")
+
+        # Transaction data, largest categories first
         categories = user_data.get("categories", {})
         if categories:
-            parts.append("\n### Spending Breakdown")
             total = sum(
                 cat.get("count", 0) if isinstance(cat, dict) else 0
                 for cat in categories.values()
             )
-            for cat_name, cat_data in categories.items():
-                if isinstance(cat_data, dict):
-                    count = cat_data.get("count", 0)
-                    pct = (count / total * 100) if total > 0 else 0
-                    merchants = cat_data.get("merchants", [])[:2]
-                    merchant_str = f" (at: {', '.join(merchants)})" if merchants else ""
-                    parts.append(f"- {cat_name}: {pct:.0f}%{merchant_str}")
+            lines = []
+            ranked = sorted(
+                (item for item in categories.items() if isinstance(item[1], dict)),
+                key=lambda item: item[1].get("count", 0),
+                reverse=True,
+            )
+            for cat_name, cat_data in ranked:
+                count = cat_data.get("count", 0)
+                pct = (count / total * 100) if total > 0 else 0
+                merchants = cat_data.get("merchants", [])[:2]
+                merchant_str = f" (at: {', '.join(merchants)})" if merchants else ""
+                lines.append(f"- {cat_name}: {pct:.0f}%{merchant_str}")
+            builder.add_section("\n### Spending Breakdown", lines)
 
         # Top merchants
         top_merchants = user_data.get("top_merchants", [])
         if top_merchants:
-            parts.append("\n### Top Spots")
-            for m in top_merchants[:3]:
-                name = m.get("merchant_name", "Unknown")
-                count = m.get("count", 0)
-                parts.append(f"- {name}: {count} visits")
+            builder.add_section(
+                "\n### Top Spots",
+                (
+                    f"- {m.get('merchant_name', 'Unknown')}: {m.get('count', 0)} visits"
+                    for m in top_merchants[:3]
+                ),
+            )
 
         # Time patterns
         time_buckets = user_data.get("time_buckets", {})
         if time_buckets:
             total_time = sum(time_buckets.values())
             if total_time > 0:
-                parts.append("\n### Time Patterns")
-                for bucket, count in time_buckets.items():
-                    pct = (count / total_time) * 100
-                    parts.append(f"- {bucket}: {pct:.0f}%")
-
-        # Quiz data (declared taste)
-        parts.append("\n### From Quiz")
-
-        exploration = user_data.get("exploration_style")
-        if exploration:
-            parts.append(f"- Exploration: {exploration}")
-
-        vibes = user_data.get("vibe_preferences", [])
-        if vibes:
-            parts.append(f"- Vibes: {', '.join(vibes)}")
-
-        social = user_data.get("social_preference")
-        if social:
-            parts.append(f"- Social: {social}")
-
-        price = user_data.get("price_tier")
-        if price:
-            parts.append(f"- Price: {price}")
-
-        return "\n".join(parts)
+                builder.add_section(
+                    "\n### Time Patterns",
+                    (
+                        f"- {bucket}: {count / total_time * 100:.0f}%"
+                        for bucket, count in time_buckets.items()
+                    ),
+                )
+
+        return builder.build()
@@ -0,0 +1,213 @@
+"""GenerationCache - Reuse LLM generations for unchanged inputs.
+
+Insights, DNA traits and profile titles are regenerated daily, but a
+user's data often hasn't changed since yesterday, and users with
+identical sparse profiles (e.g. quiz only) send identical inputs. Results
+are stored under (generator, prompt version, input fingerprint), so an
+unchanged input reuses prior outputs instead of a new model call.
+
+A key can hold several variants: a generator asking for N variants gets
+a fresh generation until N are stored, then the stored ones rotate by
+day. Entries live in an in-process TTL cache in front of the
+llm_generation_cache table and expire LLM_GENERATION_CACHE_TTL_DAYS after
+the last new variant.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Callable
+
+from supabase import Client
+
+from app.config import get_settings
+from app.services.ttl_cache import TTLCache
+
+
+def input_fingerprint(data: Any) -> str:
+    """Hash a generator input canonically (key order and spacing don't matter).
+
+    Args:
+        data: JSON-like generator input
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    canonical = json.dumps(data, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def prompt_version(*parts: Any) -> str:
+    """Derive a prompt version from everything that shapes the output.
+
+    Pass the model, system prompt and prompt budget, so editing any of
+    them invalidates cached generations.
+    """
+    return hashlib.sha256("\n".join(str(p) for p in parts).encode()).hexdigest()[:12]
+
+
+_settings = get_settings()
+_memory = TTLCache(
+    maxsize=_settings.llm_generation_cache_memory_size,
+    ttl=_settings.llm_generation_cache_ttl_days * 24 * 3600,
+)
+_stats = {"hits": 0, "misses": 0}
+_stats_lock = threading.Lock()
+
+
+def get_generation_cache_stats() -> dict[str, Any]:
+    """Get reuse counters and the hit ratio of the in-process tier."""
+    with _stats_lock:
+        hits, misses = _stats["hits"], _stats["misses"]
+    total = hits + misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_ratio": hits / total if total else 0.0,
+        "memory": _memory.stats(),
+    }
+
+
+def clear_generation_cache() -> None:
+    """Clear the in-process tier and counters (for tests)."""
+    _memory.clear()
+    with _stats_lock:
+        _stats["hits"] = 0
+        _stats["misses"] = 0
+
+
+class GenerationCache:
+    """Stores generator outputs keyed by generator, prompt version and input."""
+
+    def __init__(self, supabase: Client | None = None) -> None:
+        """Initialize cache.
+
+        Args:
+            supabase: Supabase client for the shared tier (None keeps it in-process)
+        """
+        self._supabase = supabase
+
+    def get_or_generate(
+        self,
+        generator: str,
+        version: str,
+        input_data: Any,
+        generate: Callable[[], Any],
+        variants: int = 1,
+    ) -> Any:
+        """Get a stored output for this input, or generate and store one.
+
+        Args:
+            generator: Generator name ("insights", "dna", "profile_title")
+            version: Prompt version (see prompt_version())
+            input_data: The generator's input dict
+            generate: Makes a new, JSON-serializable output
+            variants: Outputs to collect before reusing (rotated by day)
+
+        Returns:
+            The stored or newly generated output
+        """
+        output = self.get(generator, version, input_data, variants)
+        if output is not None:
+            return output
+
+        output = generate()
+        self.add(generator, version, input_data, output, variants)
+        return output
+
+    def get(
+        self,
+        generator: str,
+        version: str,
+        input_data: Any,
+        variants: int = 1,
+    ) -> Any | None:
+        """Get a stored output once a key has collected enough variants.
+
+        For generators that can't hand get_or_generate() a synchronous
+        callable (e.g. streaming); pair with add().
+
+        Returns:
+            Today's stored output, or None if a new one should be generated
+        """
+        outputs = self._load(self._key(generator, version, input_data))
+        if len(outputs) >= variants:
+            self._count("hits")
+            return outputs[date.today().toordinal() % len(outputs)]
+        self._count("misses")
+        return None
+
+    def add(
+        self,
+        generator: str,
+        version: str,
+        input_data: Any,
+        output: Any,
+        variants: int = 1,
+    ) -> None:
+        """Store a newly generated output, keeping the latest variants."""
+        key = self._key(generator, version, input_data)
+        outputs = self._load(key)
+        self._store(key, generator, [*outputs, output][-variants:])
+
+    @staticmethod
+    def _key(generator: str, version: str, input_data: Any) -> str:
+        return f"{generator}:{version}:{input_fingerprint(input_data)}"
+
+    def _load(self, key: str) -> list[Any]:
+        """Load a key's outputs from memory, then the table."""
+        outputs = _memory.get(key)
+        if outputs is not None:
+            return outputs
+        if self._supabase is None:
+            return []
+
+        try:
+            result = (
+                self._supabase.table("llm_generation_cache")
+                .select("outputs, expires_at")
+                .eq("cache_key", key)
+                .gt("expires_at", datetime.now(timezone.utc).isoformat())
+                .execute()
+            )
+        except Exception as e:
+            print(f"[GenerationCache] Lookup failed: {e}")
+            return []
+
+        if not result.data:
+            return []
+        row = result.data[0]
+        outputs = row["outputs"] or []
+        expires_at = datetime.fromisoformat(row["expires_at"].replace("Z", "+00:00"))
+        _memory.set(key, outputs, expires_at=expires_at.timestamp())
+        return outputs
+
+    def _store(self, key: str, generator: str, outputs: list[Any]) -> None:
+        """Write a key's outputs to memory and the table."""
+        expires_at = datetime.now(timezone.utc) + timedelta(
+            days=get_settings().llm_generation_cache_ttl_days
+        )
+        _memory.set(key, outputs, expires_at=expires_at.timestamp())
+        if self._supabase is None:
+            return
+
+        try:
+            self._supabase.table("llm_generation_cache").upsert(
+                {
+                    "cache_key": key,
+                    "generator": generator,
+                    "outputs": outputs,
+                    "expires_at": expires_at.isoformat(),
+                },
+                on_conflict="cache_key",
+            ).execute()
+        except Exception as e:
+            print(f"[GenerationCache] Write failed: {e}")
+
+    @staticmethod
+    def _count(stat: str) -> None:
+        with _stats_lock:
+            _stats[stat] += 1
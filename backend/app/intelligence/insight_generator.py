@@ -1,16 +1,22 @@
 """InsightGenerator - AI-powered personalized insight generation.
 
 Uses Claude Haiku with structured outputs to generate 2-3 personalized
-insights based on user transaction data.
+insights based on user transaction data. astream() yields each insight
+as soon as it is complete in the model's output stream.
 """
 
 from __future__ import annotations
 
+import json
+from collections.abc import AsyncIterator
 from typing import Literal, Any
 
-import anthropic
 from pydantic import BaseModel
 
+from app.intelligence.generation_cache import GenerationCache, prompt_version
+from app.intelligence.llm_gateway import LLMGateway, get_llm_gateway
+from app.intelligence.prompt_builder import PromptBuilder
+
 
 class Insight(BaseModel):
     """A single insight about the user's habits."""
@@ -27,6 +33,57 @@ class InsightsResponse(BaseModel):
     insights: list[Insight]
 
 
+class InsightStreamParser:
+    """Extracts insights from a partial {"insights": [...]} JSON stream.
+
+    Tracks nesting outside of strings and yields each insight object as
+    soon as its closing brace arrives.
+    """
+
+    def __init__(self) -> None:
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._object: list[str] | None = None
+
+    def feed(self, text: str) -> list[Insight]:
+        """Consume a text delta.
+
+        Args:
+            text: Next chunk of the model's JSON output
+
+        Returns:
+            Insights completed by this chunk (may be empty)
+        """
+        completed = []
+        for char in text:
+            if self._object is not None:
+                self._object.append(char)
+
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                continue
+
+            if char == '"':
+                self._in_string = True
+            elif char in "{[":
+                # Root object is depth 1, the insights array depth 2
+                if char == "{" and self._depth == 2:
+                    self._object = [char]
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if char == "}" and self._depth == 2 and self._object is not None:
+                    completed.append(Insight.model_validate(json.loads("".join(self._object))))
+                    self._object = None
+        return completed
+
+
 # System prompt for insight generation (cached for efficiency)
 SYSTEM_PROMPT = """You generate 2-3 personalized dining and lifestyle insights based on user transaction data.
 
@@ -36,6 +93,8 @@ SYSTEM_PROMPT = """You generate 2-3 personalized dining and lifestyle insights b
 - Tone: friendly, playful, celebrating their habits
 - Focus on: streaks, discoveries, patterns, milestones
 - Only use data that exists - never fabricate
+- Highlights are facts already computed from the data, most notable first: build on them, \
+but don't just restate them
 
 ## Insight Types
 - streak: Consecutive day patterns
@@ -63,19 +122,42 @@ Output:
 
 Return exactly 2-3 insights based on what's most interesting in the data."""
 
+MODEL = "claude-haiku-4-5"
+
 MAX_INSIGHTS = 3
 
+# Token budget for the user data message
+PROMPT_BUDGET_TOKENS = 350
+
+# Cached generations are invalidated when any of these change
+PROMPT_VERSION = prompt_version(MODEL, SYSTEM_PROMPT, PROMPT_BUDGET_TOKENS)
+
+# Insight sets collected for an unchanged input before they rotate daily
+CACHE_VARIANTS = 3
+
 
 class InsightGenerator:
     """Generates personalized insights using Claude API."""
 
-    def __init__(self) -> None:
-        """Initialize with Anthropic client."""
-        self._client = anthropic.Anthropic()
+    def __init__(
+        self,
+        gateway: LLMGateway | None = None,
+        cache: GenerationCache | None = None,
+    ) -> None:
+        """Initialize generator.
+
+        Args:
+            gateway: LLM gateway (defaults to the shared one)
+            cache: Generation cache for unchanged inputs (None disables reuse)
+        """
+        self._gateway = gateway or get_llm_gateway()
+        self._cache = cache
 
     def generate(self, user_data: dict[str, Any]) -> list[Insight]:
         """Generate insights from user data.
 
+        Reuses a cached generation when the same input was seen before.
+
         Args:
             user_data: User analysis data including categories, streaks,
                       exploration, time_buckets, top_merchants, etc.
@@ -83,33 +165,84 @@ class InsightGenerator:
         Returns:
             List of 2-3 Insight objects.
         """
-        # Build the user message with data
-        user_message = self._build_user_message(user_data)
+        if self._cache is None:
+            return self._generate(user_data)
+
+        stored = self._cache.get_or_generate(
+            "insights",
+            PROMPT_VERSION,
+            user_data,
+            lambda: [i.model_dump() for i in self._generate(user_data)],
+            variants=CACHE_VARIANTS,
+        )
+        return [Insight.model_validate(i) for i in stored]
+
+    async def astream(self, user_data: dict[str, Any]) -> AsyncIterator[Insight]:
+        """Generate insights, yielding each as soon as it is parsed.
+
+        A cached generation is yielded at once; a new one is added to the
+        cache when the stream completes.
 
+        Args:
+            user_data: Same as generate()
+
+        Yields:
+            Up to MAX_INSIGHTS Insight objects
+        """
+        if self._cache is not None:
+            stored = self._cache.get("insights", PROMPT_VERSION, user_data, CACHE_VARIANTS)
+            if stored is not None:
+                for item in stored:
+                    yield Insight.model_validate(item)
+                return
+
+        parser = InsightStreamParser()
+        insights: list[Insight] = []
+        async for text in self._gateway.astream("insights", **self._request(user_data)):
+            for insight in parser.feed(text):
+                if len(insights) < MAX_INSIGHTS:
+                    insights.append(insight)
+                    yield insight
+
+        if self._cache is not None:
+            self._cache.add(
+                "insights",
+                PROMPT_VERSION,
+                user_data,
+                [i.model_dump() for i in insights],
+                CACHE_VARIANTS,
+            )
+
+    def _generate(self, user_data: dict[str, Any]) -> list[Insight]:
+        """Generate insights with Claude (no cache)."""
         # Call Claude with structured outputs
-        response = self._client.beta.messages.parse(
-            model="claude-haiku-4-5",
-            max_tokens=500,
-            betas=["structured-outputs-2025-11-13"],
-            system=[
+        response = self._gateway.parse("insights", **self._request(user_data))
+
+        # Extract and limit insights
+        insights = response.parsed_output.insights
+        return insights[:MAX_INSIGHTS]
+
+    def _request(self, user_data: dict[str, Any]) -> dict[str, Any]:
+        """Build the request arguments shared by generate() and astream()."""
+        return {
+            "model": MODEL,
+            "max_tokens": 500,
+            "betas": ["structured-outputs-2025-11-13"],
+            "system": [
                 {
                     "type": "text",
                     "text": SYSTEM_PROMPT,
                     "cache_control": {"type": "ephemeral"},
                 }
             ],
-            messages=[
+            "messages": [
                 {
                     "role": "user",
-                    "content": user_message,
+                    "content": self._build_user_message(user_data),
                 }
             ],
-            output_format=InsightsResponse,
-        )
-
-        # Extract and limit insights
-        insights = response.parsed_output.insights
-        return insights[:MAX_INSIGHTS]
+            "output_format": InsightsResponse,
+        }
 
     def _build_user_message(self, user_data: dict[str, Any]) -> str:
         """Build the user message containing the data to analyze.
@@ -128,58 +261,78 @@ class InsightGenerator:
         time_buckets = user_data.get("time_buckets", {})
         top_merchants = user_data.get("top_merchants", [])
 
-        # Build a concise summary
-        parts = [
-            f"## User Data Summary",
-            f"Total transactions: {total_tx}",
-        ]
+        # Build a concise summary, highest-signal sections first
+        builder = PromptBuilder(PROMPT_BUDGET_TOKENS)
+        builder.add_required("## User Data Summary")
+        builder.add_required(f"Total transactions: {total_tx}")
+
+        # Rule-based highlights (see RuleInsightEngine), most notable first
+        builder.add_section(
+            "\n### Highlights",
+            (f"- {fact}" for fact in user_data.get("highlights") or []),
+        )
 
-        # Categories
+        # Categories, busiest first
         if categories:
-            parts.append("\n### Categories")
-            for cat, data in categories.items():
-                if isinstance(data, dict):
-                    count = data.get("count", 0)
-                    spend = data.get("total_spend", 0)
-                    merchants = data.get("merchants", [])
-                    merchant_str = ", ".join(merchants[:3]) if merchants else "none"
-                    parts.append(f"- {cat}: {count} visits, ${spend:.0f} spent (at: {merchant_str})")
+            lines = []
+            ranked = sorted(
+                (item for item in categories.items() if isinstance(item[1], dict)),
+                key=lambda item: item[1].get("count", 0),
+                reverse=True,
+            )
+            for cat, data in ranked:
+                count = data.get("count", 0)
+                spend = data.get("total_spend", 0)
+                merchants = data.get("merchants", [])
+                merchant_str = ", ".join(merchants[:3]) if merchants else "none"
+                lines.append(f"- {cat}: {count} visits, ${spend:.0f} spent (at: {merchant_str})")
+            builder.add_section("\n### Categories", lines)
 
         # Streaks
         if streaks:
-            parts.append("\n### Current Streaks")
+            lines = []
             for cat, data in streaks.items():
                 if isinstance(data, dict) and data.get("current", 0) > 0:
                     current = data.get("current", 0)
                     longest = data.get("longest", 0)
-                    parts.append(f"- {cat}: {current} day streak (longest: {longest})")
+                    lines.append(f"- {cat}: {current} day streak (longest: {longest})")
+            builder.add_section("\n### Current Streaks", lines)
 
         # Exploration
         if exploration:
-            parts.append("\n### Exploration (unique vs total)")
+            lines = []
             for cat, data in exploration.items():
                 if isinstance(data, dict):
                     unique = data.get("unique", 0)
                     total = data.get("total", 0)
                     if total > 0:
                         ratio = unique / total
-                        parts.append(f"- {cat}: {unique} unique out of {total} visits ({ratio:.0%} exploration)")
+                        lines.append(
+                            f"- {cat}: {unique} unique out of {total} visits "
+                            f"({ratio:.0%} exploration)"
+                        )
+            builder.add_section("\n### Exploration (unique vs total)", lines)
+
+        # Top merchants
+        if top_merchants:
+            builder.add_section(
+                "\n### Top Spots",
+                (
+                    f"- {m.get('merchant_name', 'Unknown')}: {m.get('count', 0)} visits"
+                    for m in top_merchants[:5]
+                ),
+            )
 
         # Time patterns
         if time_buckets:
             total_time = sum(time_buckets.values())
             if total_time > 0:
-                parts.append("\n### Time Patterns")
-                for bucket, count in time_buckets.items():
-                    pct = (count / total_time) * 100
-                    parts.append(f"- {bucket}: {count} ({pct:.0f}%)")
-
-        # Top merchants
-        if top_merchants:
-            parts.append("\n### Top Spots")
-            for merchant in top_merchants[:5]:
-                name = merchant.get("merchant_name", "Unknown")
-                count = merchant.get("count", 0)
-                parts.append(f"- {name}: {count} visits")
-
-        return "\n".join(parts)
+                builder.add_section(
+                    "\n### Time Patterns",
+                    (
+                        f"- {bucket}: {count} ({count / total_time * 100:.0f}%)"
+                        for bucket, count in time_buckets.items()
+                    ),
+                )
+
+        return builder.build()
@@ -0,0 +1,724 @@
+"""LLMGateway - Shared, instrumented access point for every Claude call.
+
+Generators (VenueTagger, InsightGenerator, DNAGenerator,
+AIProfileTitleGenerator) call through one process-wide gateway (see
+get_llm_gateway) instead of constructing their own Anthropic clients.
+The gateway:
+
+- holds pooled sync and async clients, created on first use
+- caps concurrent calls per use case across all threads and event
+  loops, and applies a deadline per use case
+- retries transient errors (connection, 429, 5xx, overloaded) with
+  jittered backoff inside the deadline
+- streams structured output as text deltas (astream)
+- records per-use-case latency, tokens and cost for metrics()
+
+FakeLLMBackend replaces the Anthropic backend in tests.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import threading
+import time
+import weakref
+from collections import deque
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+from types import SimpleNamespace
+from typing import Any, Callable
+
+import anthropic
+import httpx
+
+from app.config import get_settings
+from app.metrics import LatencyHistogram
+
+# Latency histogram bucket upper bounds for LLM calls, in milliseconds
+LLM_LATENCY_BUCKETS_MS = [250, 500, 1000, 2500, 5000, 10000, 30000]
+
+# Price per million tokens (input, output) by model
+MODEL_PRICING = {
+    "claude-haiku-4-5": (1.0, 5.0),
+}
+DEFAULT_PRICING = (1.0, 5.0)
+
+# Interactive use cases get shorter deadlines than batch tagging
+USE_CASE_TIMEOUTS = {
+    "insights": 20.0,
+    "dna": 20.0,
+    "profile_title": 10.0,
+    "taste_content": 25.0,
+}
+
+# HTTP status codes worth retrying (529 = overloaded)
+RETRY_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504, 529}
+
+
+class LLMTimeoutError(TimeoutError):
+    """A call did not finish within its use case's deadline."""
+
+
+@dataclass(frozen=True)
+class UseCasePolicy:
+    """Concurrency, deadline and retry limits for one use case."""
+
+    concurrency: int
+    timeout_seconds: float
+    max_retries: int
+
+
+def llm_usage(response: Any, model: str) -> dict[str, Any]:
+    """Calculate token usage and cost for a response.
+
+    Args:
+        response: Anthropic message (or parsed message) with usage
+        model: Model the call was made with
+
+    Returns:
+        Dict with input/output tokens and costs in dollars
+    """
+    input_price, output_price = MODEL_PRICING.get(model, DEFAULT_PRICING)
+    input_tokens = response.usage.input_tokens
+    output_tokens = response.usage.output_tokens
+    input_cost = input_tokens * input_price / 1_000_000
+    output_cost = output_tokens * output_price / 1_000_000
+
+    return {
+        "input_tokens": input_tokens,
+        "output_tokens": output_tokens,
+        "input_cost": input_cost,
+        "output_cost": output_cost,
+        "total_cost": input_cost + output_cost,
+    }
+
+
+class AnthropicBackend:
+    """Pooled Anthropic clients; retries are left to the gateway."""
+
+    def __init__(self, max_connections: int | None = None) -> None:
+        """Initialize backend (clients are created on first call).
+
+        Args:
+            max_connections: Connection pool size per client
+        """
+        self._limits = httpx.Limits(
+            max_connections=max_connections or get_settings().llm_max_connections,
+        )
+        self._client: anthropic.Anthropic | None = None
+        self._async_clients: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop,
+            tuple[anthropic.AsyncAnthropic, AsyncIterator[None]],
+        ] = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def call(self, method: str, timeout: float, **kwargs: Any) -> Any:
+        """Make one request ("parse" or "create")."""
+        client = self._get_client()
+        if method == "parse":
+            return client.beta.messages.parse(timeout=timeout, **kwargs)
+        return client.messages.create(timeout=timeout, **kwargs)
+
+    async def acall(self, method: str, timeout: float, **kwargs: Any) -> Any:
+        """Async variant of call()."""
+        client = await self._get_async_client()
+        if method == "parse":
+            return await client.beta.messages.parse(timeout=timeout, **kwargs)
+        return await client.messages.create(timeout=timeout, **kwargs)
+
+    async def astream(self, timeout: float, **kwargs: Any) -> AsyncIterator[Any]:
+        """Stream a structured-output request (beta.messages.stream).
+
+        Yields text deltas as they arrive, then the final message.
+        """
+        client = await self._get_async_client()
+        async with client.beta.messages.stream(timeout=timeout, **kwargs) as stream:
+            async for text in stream.text_stream:
+                yield text
+            yield await stream.get_final_message()
+
+    @staticmethod
+    def is_transient(error: Exception) -> bool:
+        """Check whether an error is worth retrying."""
+        if isinstance(error, anthropic.APIConnectionError):
+            return True
+        if isinstance(error, anthropic.APIStatusError):
+            return error.status_code in RETRY_STATUS_CODES
+        return False
+
+    def _get_client(self) -> anthropic.Anthropic:
+        with self._lock:
+            if self._client is None:
+                self._client = anthropic.Anthropic(
+                    max_retries=0,
+                    http_client=anthropic.DefaultHttpxClient(limits=self._limits),
+                )
+            return self._client
+
+    async def _get_async_client(self) -> anthropic.AsyncAnthropic:
+        """Get the async client bound to the running event loop.
+
+        A new client is closed when its loop shuts down (see
+        _client_lifetime). Clients of loops closed without shutting down
+        their async generators are dropped here.
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            for closed in [other for other in self._async_clients if other.is_closed()]:
+                del self._async_clients[closed]
+            entry = self._async_clients.get(loop)
+        if entry is not None:
+            return entry[0]
+
+        client = anthropic.AsyncAnthropic(
+            max_retries=0,
+            http_client=anthropic.DefaultAsyncHttpxClient(limits=self._limits),
+        )
+        lifetime = self._client_lifetime(client)
+        await lifetime.__anext__()
+        with self._lock:
+            self._async_clients[loop] = (client, lifetime)
+        return client
+
+    async def _client_lifetime(self, client: anthropic.AsyncAnthropic) -> AsyncIterator[None]:
+        """Close a loop's client when the loop shuts down.
+
+        Once started, the loop tracks this generator, and
+        loop.shutdown_asyncgens() (run by asyncio.run() before it closes
+        the loop) closes it on that loop, while the client can still be
+        awaited. Doesn't reference the loop, so the clients table can
+        still drop the loop once it is garbage collected.
+        """
+        try:
+            yield
+        finally:
+            loop = asyncio.get_running_loop()
+            with self._lock:
+                entry = self._async_clients.get(loop)
+                if entry is not None and entry[0] is client:
+                    del self._async_clients[loop]
+            await client.close()
+
+
+def fake_response(
+    parsed_output: Any = None,
+    text: str = "",
+    input_tokens: int = 0,
+    output_tokens: int = 0,
+) -> SimpleNamespace:
+    """Build a response shaped like an Anthropic message, for FakeLLMBackend."""
+    return SimpleNamespace(
+        parsed_output=parsed_output,
+        content=[SimpleNamespace(type="text", text=text)],
+        usage=SimpleNamespace(input_tokens=input_tokens, output_tokens=output_tokens),
+    )
+
+
+class FakeLLMBackend:
+    """In-memory backend for tests.
+
+    Responses come from a handler (called with the request kwargs) or a
+    queue; queued exceptions are raised. Every request is recorded in
+    calls. ConnectionError counts as transient. astream() yields the
+    response text in chunks of stream_chunk_size characters.
+    """
+
+    def __init__(
+        self,
+        responses: list[Any] | None = None,
+        handler: Callable[[dict[str, Any]], Any] | None = None,
+        delay: float = 0.0,
+        stream_chunk_size: int = 16,
+    ) -> None:
+        """Initialize fake backend.
+
+        Args:
+            responses: Responses (or exceptions) returned in order
+            handler: Builds a response from the request kwargs
+            delay: Seconds each call takes (before the first chunk when streaming)
+            stream_chunk_size: Characters per streamed text delta
+        """
+        self.responses = list(responses or [])
+        self.handler = handler
+        self.delay = delay
+        self.stream_chunk_size = stream_chunk_size
+        self.calls: list[dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def call(self, method: str, timeout: float, **kwargs: Any) -> Any:
+        """Record the request and return the next response."""
+        if self.delay:
+            time.sleep(self.delay)
+        return self._respond(method, timeout, kwargs)
+
+    async def acall(self, method: str, timeout: float, **kwargs: Any) -> Any:
+        """Async variant of call()."""
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        return self._respond(method, timeout, kwargs)
+
+    async def astream(self, timeout: float, **kwargs: Any) -> AsyncIterator[Any]:
+        """Stream the next response's text in chunks, then the response."""
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        response = self._respond("stream", timeout, kwargs)
+        text = response.content[0].text
+        for i in range(0, len(text), self.stream_chunk_size):
+            await asyncio.sleep(0)
+            yield text[i : i + self.stream_chunk_size]
+        yield response
+
+    @staticmethod
+    def is_transient(error: Exception) -> bool:
+        """Connection errors are retried."""
+        return isinstance(error, ConnectionError)
+
+    def _respond(self, method: str, timeout: float, kwargs: dict[str, Any]) -> Any:
+        with self._lock:
+            self.calls.append({"method": method, "timeout": timeout, **kwargs})
+            if self.handler is None:
+                response = self.responses.pop(0)
+        if self.handler is not None:
+            response = self.handler(kwargs)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+class _Waiter:
+    """A thread or coroutine queued for a limiter permit."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop | None = None) -> None:
+        self.granted = False
+        self.event = threading.Event() if loop is None else None
+        self.loop = loop
+        self.future: asyncio.Future[None] | None = loop.create_future() if loop else None
+
+    def grant(self) -> bool:
+        """Hand this waiter a permit; False if it can no longer take one."""
+        if self.event is not None:
+            self.granted = True
+            self.event.set()
+            return True
+        try:
+            self.loop.call_soon_threadsafe(self._wake)
+        except RuntimeError:
+            # Its event loop is closed
+            return False
+        self.granted = True
+        return True
+
+    def _wake(self) -> None:
+        if not self.future.done():
+            self.future.set_result(None)
+
+
+class _ConcurrencyLimiter:
+    """Process-wide cap on concurrent calls, shared by threads and event loops.
+
+    A threading.BoundedSemaphore can't be awaited, and an asyncio.Semaphore
+    only counts callers on its own loop, so neither caps a use case
+    called from request handlers, worker threads and asyncio.run()
+    batches at once. Permits are handed to waiters in FIFO order.
+    """
+
+    def __init__(self, limit: int) -> None:
+        """Initialize limiter.
+
+        Args:
+            limit: Maximum permits held at once
+        """
+        self._available = limit
+        self._waiters: deque[_Waiter] = deque()
+        self._lock = threading.Lock()
+
+    def acquire(self, timeout: float) -> bool:
+        """Take a permit, blocking the calling thread.
+
+        Args:
+            timeout: Seconds to wait for a permit
+
+        Returns:
+            True if a permit was taken; False if the timeout passed
+        """
+        with self._lock:
+            if self._available and not self._waiters:
+                self._available -= 1
+                return True
+            waiter = _Waiter()
+            self._waiters.append(waiter)
+
+        waiter.event.wait(timeout)
+        with self._lock:
+            if waiter.granted:
+                return True
+            self._waiters.remove(waiter)
+            return False
+
+    async def aacquire(self, timeout: float) -> bool:
+        """Take a permit without blocking the event loop; see acquire()."""
+        with self._lock:
+            if self._available and not self._waiters:
+                self._available -= 1
+                return True
+            waiter = _Waiter(asyncio.get_running_loop())
+            self._waiters.append(waiter)
+
+        try:
+            await asyncio.wait_for(waiter.future, timeout=timeout)
+            return True
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            with self._lock:
+                granted = waiter.granted
+                if not granted:
+                    self._waiters.remove(waiter)
+            if granted:
+                # Granted as the wait ended - pass the permit on
+                self.release()
+            if isinstance(e, asyncio.CancelledError):
+                raise
+            return False
+
+    def release(self) -> None:
+        """Return a permit, handing it to the longest waiter if any."""
+        with self._lock:
+            while self._waiters:
+                if self._waiters.popleft().grant():
+                    return
+            self._available += 1
+
+
+class _UseCaseMetrics:
+    """Counters and latency for one use case."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.failures = 0
+        self.retries = 0
+        self.timeouts = 0
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self.total_cost = 0.0
+        self.latency = LatencyHistogram(LLM_LATENCY_BUCKETS_MS)
+        self.first_token_latency = LatencyHistogram(LLM_LATENCY_BUCKETS_MS)
+        self._lock = threading.Lock()
+
+    def record(self, **counts: float) -> None:
+        with self._lock:
+            for name, amount in counts.items():
+                setattr(self, name, getattr(self, name) + amount)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            counters = {
+                "calls": self.calls,
+                "failures": self.failures,
+                "retries": self.retries,
+                "timeouts": self.timeouts,
+                "input_tokens": self.input_tokens,
+                "output_tokens": self.output_tokens,
+                "total_cost": self.total_cost,
+            }
+        return {
+            **counters,
+            "latency": self.latency.stats(),
+            "first_token_latency": self.first_token_latency.stats(),
+        }
+
+
+class LLMGateway:
+    """Concurrency-limited, deadline-bound, retrying Claude client."""
+
+    def __init__(
+        self,
+        backend: AnthropicBackend | FakeLLMBackend | None = None,
+        policies: dict[str, UseCasePolicy] | None = None,
+        backoff_base: float = 0.5,
+        backoff_max: float = 4.0,
+    ) -> None:
+        """Initialize gateway.
+
+        Args:
+            backend: Backend making the requests (defaults to Anthropic)
+            policies: Policy overrides by use case
+            backoff_base: First backoff ceiling in seconds
+            backoff_max: Maximum backoff ceiling in seconds
+        """
+        settings = get_settings()
+        self._backend = backend or AnthropicBackend()
+        self._default_policy = UseCasePolicy(
+            concurrency=settings.llm_max_concurrency,
+            timeout_seconds=settings.llm_timeout_seconds,
+            max_retries=settings.llm_max_retries,
+        )
+        self._policies = {
+            use_case: UseCasePolicy(
+                concurrency=self._default_policy.concurrency,
+                timeout_seconds=timeout,
+                max_retries=self._default_policy.max_retries,
+            )
+            for use_case, timeout in USE_CASE_TIMEOUTS.items()
+        }
+        self._policies["venue_tagging"] = UseCasePolicy(
+            concurrency=settings.venue_tagging_concurrency,
+            timeout_seconds=self._default_policy.timeout_seconds,
+            max_retries=self._default_policy.max_retries,
+        )
+        self._policies.update(policies or {})
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+        self._lock = threading.Lock()
+        self._metrics: dict[str, _UseCaseMetrics] = {}
+        self._limiters: dict[str, _ConcurrencyLimiter] = {}
+
+    def policy(self, use_case: str) -> UseCasePolicy:
+        """Get the policy for a use case (the default if none is set)."""
+        return self._policies.get(use_case, self._default_policy)
+
+    def parse(self, use_case: str, **kwargs: Any) -> Any:
+        """Structured-output request (beta.messages.parse).
+
+        Args:
+            use_case: Use case label for limits and metrics
+            **kwargs: Arguments for beta.messages.parse
+
+        Returns:
+            Parsed message
+
+        Raises:
+            LLMTimeoutError: If the deadline passed
+            Exception: The backend's error if not transient or out of retries
+        """
+        return self._call(use_case, "parse", kwargs)
+
+    def create(self, use_case: str, **kwargs: Any) -> Any:
+        """Plain request (messages.create); see parse()."""
+        return self._call(use_case, "create", kwargs)
+
+    async def aparse(self, use_case: str, **kwargs: Any) -> Any:
+        """Async variant of parse()."""
+        return await self._acall(use_case, "parse", kwargs)
+
+    async def acreate(self, use_case: str, **kwargs: Any) -> Any:
+        """Async variant of create()."""
+        return await self._acall(use_case, "create", kwargs)
+
+    async def astream(self, use_case: str, **kwargs: Any) -> AsyncIterator[str]:
+        """Streaming structured-output request (beta.messages.stream).
+
+        Transient errors are retried until the first delta arrives; after
+        that they propagate, since the caller has consumed partial output.
+        The use case's deadline bounds the whole stream.
+
+        Args:
+            use_case: Use case label for limits and metrics
+            **kwargs: Arguments for beta.messages.stream
+
+        Yields:
+            Text deltas of the response
+
+        Raises:
+            LLMTimeoutError: If the deadline passed
+            Exception: The backend's error if not transient or out of retries
+        """
+        policy = self.policy(use_case)
+        metrics = self._get_metrics(use_case)
+        deadline = time.monotonic() + policy.timeout_seconds
+        limiter = self._get_limiter(use_case, policy)
+
+        if not await limiter.aacquire(timeout=policy.timeout_seconds):
+            metrics.record(calls=1, failures=1, timeouts=1)
+            raise LLMTimeoutError(f"{use_case}: no capacity within deadline")
+        try:
+            for attempt in range(policy.max_retries + 1):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    metrics.record(calls=1, failures=1, timeouts=1)
+                    raise LLMTimeoutError(f"{use_case}: deadline exceeded")
+                start = time.monotonic()
+                stream = self._backend.astream(remaining, **kwargs)
+                started = False
+                try:
+                    while True:
+                        try:
+                            item = await asyncio.wait_for(
+                                stream.__anext__(), timeout=deadline - time.monotonic()
+                            )
+                        except StopAsyncIteration:
+                            raise RuntimeError(
+                                f"{use_case}: stream ended without a final message"
+                            ) from None
+                        if not isinstance(item, str):
+                            break
+                        if not started:
+                            started = True
+                            metrics.first_token_latency.record((time.monotonic() - start) * 1000)
+                        yield item
+                except asyncio.TimeoutError:
+                    metrics.record(calls=1, failures=1, timeouts=1)
+                    raise LLMTimeoutError(f"{use_case}: deadline exceeded") from None
+                except Exception as e:
+                    delay = None if started else self._retry_delay(e, attempt, policy, deadline)
+                    if delay is None:
+                        metrics.record(calls=1, failures=1)
+                        raise
+                    metrics.record(retries=1)
+                    await asyncio.sleep(delay)
+                    continue
+                finally:
+                    await stream.aclose()
+                    metrics.latency.record((time.monotonic() - start) * 1000)
+
+                self._record_usage(metrics, item, kwargs.get("model", ""))
+                return
+        finally:
+            limiter.release()
+
+    def metrics(self) -> dict[str, dict[str, Any]]:
+        """Get call counts, tokens, cost and latency keyed by use case."""
+        with self._lock:
+            metrics = dict(self._metrics)
+        return {use_case: m.stats() for use_case, m in metrics.items()}
+
+    def _call(self, use_case: str, method: str, kwargs: dict[str, Any]) -> Any:
+        policy = self.policy(use_case)
+        metrics = self._get_metrics(use_case)
+        deadline = time.monotonic() + policy.timeout_seconds
+        limiter = self._get_limiter(use_case, policy)
+
+        if not limiter.acquire(timeout=policy.timeout_seconds):
+            metrics.record(calls=1, failures=1, timeouts=1)
+            raise LLMTimeoutError(f"{use_case}: no capacity within deadline")
+        try:
+            for attempt in range(policy.max_retries + 1):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    metrics.record(calls=1, failures=1, timeouts=1)
+                    raise LLMTimeoutError(f"{use_case}: deadline exceeded")
+                start = time.monotonic()
+                try:
+                    response = self._backend.call(method, remaining, **kwargs)
+                except Exception as e:
+                    delay = self._retry_delay(e, attempt, policy, deadline)
+                    if delay is None:
+                        metrics.record(calls=1, failures=1)
+                        raise
+                    metrics.record(retries=1)
+                    time.sleep(delay)
+                    continue
+                finally:
+                    metrics.latency.record((time.monotonic() - start) * 1000)
+
+                self._record_usage(metrics, response, kwargs.get("model", ""))
+                return response
+        finally:
+            limiter.release()
+
+        raise AssertionError("unreachable")
+
+    async def _acall(self, use_case: str, method: str, kwargs: dict[str, Any]) -> Any:
+        policy = self.policy(use_case)
+        metrics = self._get_metrics(use_case)
+        deadline = time.monotonic() + policy.timeout_seconds
+        limiter = self._get_limiter(use_case, policy)
+
+        if not await limiter.aacquire(timeout=policy.timeout_seconds):
+            metrics.record(calls=1, failures=1, timeouts=1)
+            raise LLMTimeoutError(f"{use_case}: no capacity within deadline")
+        try:
+            for attempt in range(policy.max_retries + 1):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    metrics.record(calls=1, failures=1, timeouts=1)
+                    raise LLMTimeoutError(f"{use_case}: deadline exceeded")
+                start = time.monotonic()
+                try:
+                    response = await asyncio.wait_for(
+                        self._backend.acall(method, remaining, **kwargs), timeout=remaining
+                    )
+                except asyncio.TimeoutError:
+                    metrics.record(calls=1, failures=1, timeouts=1)
+                    raise LLMTimeoutError(f"{use_case}: deadline exceeded") from None
+                except Exception as e:
+                    delay = self._retry_delay(e, attempt, policy, deadline)
+                    if delay is None:
+                        metrics.record(calls=1, failures=1)
+                        raise
+                    metrics.record(retries=1)
+                    await asyncio.sleep(delay)
+                    continue
+                finally:
+                    metrics.latency.record((time.monotonic() - start) * 1000)
+
+                self._record_usage(metrics, response, kwargs.get("model", ""))
+                return response
+        finally:
+            limiter.release()
+
+        raise AssertionError("unreachable")
+
+    def _retry_delay(
+        self,
+        error: Exception,
+        attempt: int,
+        policy: UseCasePolicy,
+        deadline: float,
+    ) -> float | None:
+        """Get the backoff before retrying, or None if the error is final.
+
+        Uses full-jitter exponential backoff, and gives up when the
+        backoff would run past the deadline.
+        """
+        if attempt >= policy.max_retries or not self._backend.is_transient(error):
+            return None
+        ceiling = min(self.backoff_max, self.backoff_base * (2**attempt))
+        delay = random.uniform(0, ceiling)
+        if time.monotonic() + delay >= deadline:
+            return None
+        return delay
+
+    @staticmethod
+    def _record_usage(metrics: _UseCaseMetrics, response: Any, model: str) -> None:
+        """Record a successful call's tokens and cost."""
+        usage = llm_usage(response, model)
+        metrics.record(
+            calls=1,
+            input_tokens=usage["input_tokens"],
+            output_tokens=usage["output_tokens"],
+            total_cost=usage["total_cost"],
+        )
+
+    def _get_metrics(self, use_case: str) -> _UseCaseMetrics:
+        with self._lock:
+            if use_case not in self._metrics:
+                self._metrics[use_case] = _UseCaseMetrics()
+            return self._metrics[use_case]
+
+    def _get_limiter(self, use_case: str, policy: UseCasePolicy) -> _ConcurrencyLimiter:
+        """Get the use case's limiter, shared by sync and async calls."""
+        with self._lock:
+            if use_case not in self._limiters:
+                self._limiters[use_case] = _ConcurrencyLimiter(policy.concurrency)
+            return self._limiters[use_case]
+
+
+_gateway: LLMGateway | None = None
+_gateway_lock = threading.Lock()
+
+
+def get_llm_gateway() -> LLMGateway:
+    """Get the process-wide LLM gateway."""
+    global _gateway
+    with _gateway_lock:
+        if _gateway is None:
+            _gateway = LLMGateway()
+        return _gateway
+
+
+def set_llm_gateway(gateway: LLMGateway | None) -> None:
+    """Replace the process-wide gateway (None resets it), e.g. for tests."""
+    global _gateway
+    with _gateway_lock:
+        _gateway = gateway
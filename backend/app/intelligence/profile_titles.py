@@ -9,9 +9,11 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Any
 
-import anthropic
 from pydantic import BaseModel
 
+from app.intelligence.generation_cache import GenerationCache, prompt_version
+from app.intelligence.llm_gateway import LLMGateway, get_llm_gateway
+from app.intelligence.prompt_builder import PromptBuilder
 from app.intelligence.quiz_processor import DeclaredTaste
 from app.mappings.profile_title_mappings import (
     get_dominant_vibe,
@@ -26,6 +28,9 @@ class ProfileTitleResponse(BaseModel):
     tagline: str  # 3-6 words (e.g., "Discovering hidden gems everywhere")
 
 
+# Token budget for the title prompt (a one-line summary)
+TITLE_PROMPT_BUDGET_TOKENS = 60
+
 # System prompt for AI profile title generation
 PROFILE_TITLE_PROMPT = """You generate a personalized profile title and tagline for a user based on their dining habits.
 
@@ -51,6 +56,11 @@ Output: title="Night Sophisticate", tagline="Where evenings come alive"
 
 Return a title and tagline that captures this person's unique dining personality."""
 
+TITLE_MODEL = "claude-haiku-4-20250514"
+
+# Cached titles are invalidated when any of these change
+TITLE_PROMPT_VERSION = prompt_version(TITLE_MODEL, PROFILE_TITLE_PROMPT, TITLE_PROMPT_BUDGET_TOKENS)
+
 
 @dataclass
 class TasteTrait:
@@ -207,14 +217,27 @@ class ProfileTitleMapper:
 class AIProfileTitleGenerator:
     """Generates AI-powered profile titles using Claude Haiku with caching."""
 
-    def __init__(self) -> None:
-        """Initialize with Anthropic client."""
-        self._client = anthropic.Anthropic()
+    def __init__(
+        self,
+        gateway: LLMGateway | None = None,
+        cache: GenerationCache | None = None,
+    ) -> None:
+        """Initialize generator.
+
+        Args:
+            gateway: LLM gateway (defaults to the shared one)
+            cache: Generation cache for unchanged inputs (None disables reuse)
+        """
+        self._gateway = gateway or get_llm_gateway()
+        self._cache = cache
         self._rule_mapper = ProfileTitleMapper()
 
     def generate(self, user_data: dict[str, Any]) -> tuple[str, str]:
         """Generate profile title and tagline from user data.
 
+        Reuses a cached title when the same input was seen before. Falls
+        back to the rule-based title on any error (fallbacks are not cached).
+
         Args:
             user_data: Combined quiz + transaction data including:
                 - categories: spending breakdown (from observed taste)
@@ -227,53 +250,67 @@ class AIProfileTitleGenerator:
             Tuple of (title, tagline)
         """
         try:
-            user_prompt = self._build_prompt(user_data)
-
-            response = self._client.messages.create(
-                model="claude-haiku-4-20250514",
-                max_tokens=100,
-                system=PROFILE_TITLE_PROMPT,
-                messages=[{"role": "user", "content": user_prompt}],
+            if self._cache is None:
+                return self._generate(user_data)
+            title, tagline = self._cache.get_or_generate(
+                "profile_title",
+                TITLE_PROMPT_VERSION,
+                user_data,
+                lambda: list(self._generate(user_data)),
             )
+            return title, tagline
 
-            # Parse structured response
-            result = self._client.messages.create(
-                model="claude-haiku-4-20250514",
-                max_tokens=100,
-                system=PROFILE_TITLE_PROMPT,
-                messages=[
-                    {"role": "user", "content": user_prompt},
-                    {"role": "assistant", "content": response.content[0].text},
-                    {
-                        "role": "user",
-                        "content": "Now return this as JSON with 'title' and 'tagline' keys only.",
-                    },
-                ],
-            )
+        except Exception:
+            # Fallback to rule-based on any error
+            return self._fallback_title(user_data)
 
-            # Try to parse JSON from response
-            import json
+    def _generate(self, user_data: dict[str, Any]) -> tuple[str, str]:
+        """Generate a title with Claude (no cache; raises on error)."""
+        user_prompt = self._build_prompt(user_data)
 
-            text = result.content[0].text.strip()
-            # Handle markdown code blocks
-            if "```" in text:
-                text = text.split("```")[1]
-                if text.startswith("json"):
-                    text = text[4:]
-                text = text.strip()
+        response = self._gateway.create(
+            "profile_title",
+            model=TITLE_MODEL,
+            max_tokens=100,
+            system=PROFILE_TITLE_PROMPT,
+            messages=[{"role": "user", "content": user_prompt}],
+        )
 
-            data = json.loads(text)
-            return data.get("title", "Taste Explorer"), data.get(
-                "tagline", "Discovering your perfect spots"
-            )
+        # Parse structured response
+        result = self._gateway.create(
+            "profile_title",
+            model=TITLE_MODEL,
+            max_tokens=100,
+            system=PROFILE_TITLE_PROMPT,
+            messages=[
+                {"role": "user", "content": user_prompt},
+                {"role": "assistant", "content": response.content[0].text},
+                {
+                    "role": "user",
+                    "content": "Now return this as JSON with 'title' and 'tagline' keys only.",
+                },
+            ],
+        )
 
-        except Exception:
-            # Fallback to rule-based on any error
-            return self._fallback_title(user_data)
+        # Try to parse JSON from response
+        import json
+
+        text = result.content[0].text.strip()
+        # Handle markdown code blocks
+        if "```" in text:
+            text = text.split("```")[1]
+            if text.startswith("json"):
+                text = text[4:]
+            text = text.strip()
+
+        data = json.loads(text)
+        return data.get("title", "Taste Explorer"), data.get(
+            "tagline", "Discovering your perfect spots"
+        )
 
     def _build_prompt(self, user_data: dict[str, Any]) -> str:
         """Build user prompt from user data."""
-        parts = []
+        builder = PromptBuilder(TITLE_PROMPT_BUDGET_TOKENS, separator=". ")
 
         # Category breakdown
         categories = user_data.get("categories", {})
@@ -290,26 +327,26 @@ class AIProfileTitleGenerator:
                     if pct > 0:
                         breakdown.append(f"{name} {pct}%")
                 if breakdown:
-                    parts.append(", ".join(breakdown))
+                    builder.add(", ".join(breakdown))
 
         # Quiz data
         exploration = user_data.get("exploration_style")
         if exploration:
-            parts.append(f"{exploration.replace('_', ' ')} explorer")
+            builder.add(f"{exploration.replace('_', ' ')} explorer")
 
         vibes = user_data.get("vibe_preferences", [])
         if vibes:
-            parts.append(f"{', '.join(vibes[:3])} vibes")
+            builder.add(f"{', '.join(vibes[:3])} vibes")
 
         social = user_data.get("social_preference")
         if social:
-            parts.append(f"{social.replace('_', ' ')} dining")
+            builder.add(f"{social.replace('_', ' ')} dining")
 
         price = user_data.get("price_tier")
         if price:
-            parts.append(f"{price} prices")
+            builder.add(f"{price} prices")
 
-        return ". ".join(parts) if parts else "General food lover"
+        return builder.build() or "General food lover"
 
     def _fallback_title(self, user_data: dict[str, Any]) -> tuple[str, str]:
         """Fallback to rule-based title generation."""
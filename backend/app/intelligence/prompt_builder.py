@@ -0,0 +1,278 @@
+"""PromptBuilder - Token-budgeted prompt assembly for Claude calls.
+
+Latency and cost scale with prompt length, so every generator builds its
+user message against a fixed token budget. Sections are added in priority
+order and lines are dropped (never cut mid-line) once the budget is spent,
+so the same input always produces the same prompt.
+
+Token counts are estimated from character length; the estimate is
+deliberately conservative for English text.
+"""
+
+from __future__ import annotations
+
+import math
+import re
+from collections.abc import Iterable
+from typing import Any
+
+# Rough chars-per-token ratio for English prose with Claude's tokenizer
+CHARS_PER_TOKEN = 3.5
+
+# Review text beyond this length rarely adds signal for tagging
+REVIEW_MAX_CHARS = 300
+
+# Reviews sharing this fraction of content words are near-duplicates
+REVIEW_SIMILARITY_THRESHOLD = 0.6
+
+# Common words ignored when scoring and comparing reviews
+STOPWORDS = frozenset(
+    {
+        "a",
+        "about",
+        "all",
+        "also",
+        "am",
+        "an",
+        "and",
+        "are",
+        "as",
+        "at",
+        "be",
+        "been",
+        "but",
+        "by",
+        "can",
+        "did",
+        "do",
+        "for",
+        "from",
+        "get",
+        "got",
+        "had",
+        "has",
+        "have",
+        "here",
+        "i",
+        "if",
+        "in",
+        "is",
+        "it",
+        "its",
+        "just",
+        "me",
+        "my",
+        "not",
+        "of",
+        "on",
+        "one",
+        "or",
+        "our",
+        "out",
+        "place",
+        "so",
+        "that",
+        "the",
+        "their",
+        "there",
+        "they",
+        "this",
+        "to",
+        "us",
+        "very",
+        "was",
+        "we",
+        "were",
+        "what",
+        "when",
+        "will",
+        "with",
+        "would",
+        "you",
+    }
+)
+
+# Words that speak directly to the profile fields being extracted
+SIGNAL_WORDS = frozenset(
+    {
+        "date",
+        "romantic",
+        "group",
+        "groups",
+        "friends",
+        "family",
+        "kids",
+        "birthday",
+        "work",
+        "laptop",
+        "study",
+        "wifi",
+        "quiet",
+        "cozy",
+        "loud",
+        "lively",
+        "busy",
+        "chill",
+        "late",
+        "night",
+        "quick",
+        "lunch",
+        "brunch",
+        "upscale",
+        "fancy",
+        "casual",
+        "hidden",
+        "gem",
+        "local",
+        "vibe",
+        "atmosphere",
+        "music",
+        "patio",
+        "view",
+    }
+)
+
+WORD_PATTERN = re.compile(r"[a-z']+")
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the token count of text."""
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+class PromptBuilder:
+    """Accumulates prompt lines until a token budget is spent."""
+
+    def __init__(self, budget_tokens: int, separator: str = "\n") -> None:
+        """Initialize builder.
+
+        Args:
+            budget_tokens: Maximum estimated tokens for the built prompt
+            separator: String joining lines (counted against the budget)
+        """
+        self.budget_tokens = budget_tokens
+        self._separator = separator
+        self._lines: list[str] = []
+        self._used = 0
+
+    @property
+    def used_tokens(self) -> int:
+        """Estimated tokens used so far."""
+        return self._used
+
+    @property
+    def remaining_tokens(self) -> int:
+        """Estimated tokens left in the budget."""
+        return self.budget_tokens - self._used
+
+    def add_required(self, line: str) -> None:
+        """Add a line regardless of budget (identity, schema-critical data)."""
+        self._append(line)
+
+    def add(self, line: str) -> bool:
+        """Add a line if it fits in the remaining budget.
+
+        Returns:
+            True if the line was added
+        """
+        if self._cost(line) > self.remaining_tokens:
+            return False
+        self._append(line)
+        return True
+
+    def add_section(self, header: str, lines: Iterable[str]) -> int:
+        """Add a header and as many lines as fit, in order.
+
+        Lines should be passed highest priority first. Stops at the first
+        line that doesn't fit, and omits the header if no line fits.
+
+        Args:
+            header: Section header line
+            lines: Section lines, highest priority first
+
+        Returns:
+            Number of lines added (excluding the header)
+        """
+        header_cost = self._cost(header)
+        fitting: list[str] = []
+        cost = header_cost
+        for line in lines:
+            line_cost = self._cost(line)
+            if cost + line_cost > self.remaining_tokens:
+                break
+            fitting.append(line)
+            cost += line_cost
+
+        if fitting:
+            self._append(header)
+            for line in fitting:
+                self._append(line)
+        return len(fitting)
+
+    def build(self) -> str:
+        """Join the accumulated lines into the prompt."""
+        return self._separator.join(self._lines)
+
+    def _cost(self, line: str) -> int:
+        """Estimated tokens for a line plus its separator."""
+        separator = self._separator if self._lines else ""
+        return estimate_tokens(separator + line)
+
+    def _append(self, line: str) -> None:
+        self._used += self._cost(line)
+        self._lines.append(line)
+
+
+def _content_words(text: str) -> set[str]:
+    """Lowercased words of a text, minus stopwords and very short words."""
+    return {w for w in WORD_PATTERN.findall(text.lower()) if len(w) > 2 and w not in STOPWORDS}
+
+
+def review_informativeness(text: str) -> float:
+    """Score how much a review can tell the tagger.
+
+    Counts distinct content words (capped, so long rambling reviews don't
+    dominate) plus a bonus for words that map to profile fields.
+    """
+    words = _content_words(text)
+    return min(len(words), 40) + 3 * len(words & SIGNAL_WORDS)
+
+
+def rank_reviews(
+    reviews: list[dict[str, Any]],
+    max_chars: int = REVIEW_MAX_CHARS,
+    similarity_threshold: float = REVIEW_SIMILARITY_THRESHOLD,
+) -> list[dict[str, Any]]:
+    """Order reviews by informativeness and drop near-duplicates.
+
+    Ties keep their original order, so ranking is deterministic.
+
+    Args:
+        reviews: Review dicts with text and stars
+        max_chars: Truncate review text to this length
+        similarity_threshold: Jaccard similarity of content words at
+            which a review duplicates a higher-ranked one
+
+    Returns:
+        Review dicts (text truncated), most informative first
+    """
+    candidates = []
+    for index, review in enumerate(reviews):
+        text = (review.get("text") or "").strip()[:max_chars]
+        if not text:
+            continue
+        candidates.append((-review_informativeness(text), index, text, review))
+    candidates.sort(key=lambda c: (c[0], c[1]))
+
+    ranked: list[dict[str, Any]] = []
+    kept_words: list[set[str]] = []
+    for _, _, text, review in candidates:
+        words = _content_words(text)
+        if any(
+            words and len(words & other) / len(words | other) >= similarity_threshold
+            for other in kept_words
+        ):
+            continue
+        kept_words.append(words)
+        ranked.append({**review, "text": text})
+    return ranked
@@ -55,6 +55,22 @@ class RingBuilder:
         # Fetch declared_taste for profile title
         declared = self._get_declared_taste(user_id)
 
+        return self.build_ring_from_rows(analysis, declared)
+
+    def build_ring_from_rows(
+        self,
+        analysis: Optional[dict[str, Any]],
+        declared: Optional[dict[str, Any]],
+    ) -> dict[str, Any]:
+        """Build ring data from already-loaded rows.
+
+        Args:
+            analysis: user_analysis row (needs categories, total_transactions)
+            declared: declared_taste row (needs exploration_style, vibe_preferences)
+
+        Returns:
+            Ring data with segments, profile_title, tagline
+        """
         # Build segments from categories
         segments = self._build_segments(analysis)
 
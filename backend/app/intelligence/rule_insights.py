@@ -0,0 +1,274 @@
+"""RuleInsightEngine - Instant, deterministic insights from aggregates.
+
+Many insights InsightGenerator asks Claude for - streaks, a go-to spot,
+weekend vs weekday habits, exploration, time of day, milestones - follow
+directly from user_analysis fields AggregationEngine already maintains.
+RuleInsightEngine derives them with templated copy and no I/O, so:
+
+- a user with no generated insights yet sees rule-based ones at once
+  (and the streaming endpoint falls back to them if Claude fails)
+- the LLM gets the ranked candidates as pre-digested facts to build on
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+
+from app.intelligence.aggregation_engine import UserAnalysis
+from app.intelligence.insight_generator import MAX_INSIGHTS, Insight
+
+# Minimum data before a rule fires
+MIN_STREAK_DAYS = 3
+MIN_MERCHANT_VISITS = 3
+MIN_PATTERN_VISITS = 5
+
+# Transaction counts worth celebrating
+MILESTONES = (10, 25, 50, 100, 250, 500, 1000)
+
+# Share of visits on weekends if they were spread evenly over the week
+EVEN_WEEKEND_SHARE = 2 / 7
+
+# Title and emoji for a dominant time of day
+TIME_BUCKET_COPY = {
+    "morning": ("Early Bird", "🌅"),
+    "afternoon": ("Afternoon Regular", "☀️"),
+    "evening": ("Evening Out", "🌆"),
+    "night": ("Night Owl", "🦉"),
+}
+
+
+@dataclass
+class RankedInsight:
+    """A candidate insight with its ranking score and source fact."""
+
+    insight: Insight
+    score: float  # 0-1, higher is more interesting
+    fact: str  # Compact statement of the data behind it (for prompts)
+
+
+def category_label(category: str) -> str:
+    """Format a category key for copy (e.g., "fast_food" -> "fast food")."""
+    return category.replace("_", " ")
+
+
+class RuleInsightEngine:
+    """Derives ranked insights from user_analysis with fixed rules."""
+
+    def candidates(self, analysis: UserAnalysis | dict[str, Any]) -> list[RankedInsight]:
+        """Derive every candidate insight, most interesting first.
+
+        Each rule contributes at most one candidate.
+
+        Args:
+            analysis: UserAnalysis, or a user_analysis row / insight user
+                data dict in its to_dict() shape
+
+        Returns:
+            Candidates sorted by score (empty without enough data)
+        """
+        data = analysis.to_dict() if isinstance(analysis, UserAnalysis) else analysis
+        rules = (
+            self._streak,
+            self._go_to_spot,
+            self._weekend,
+            self._exploration,
+            self._time_of_day,
+            self._milestone,
+        )
+        found = [candidate for rule in rules if (candidate := rule(data)) is not None]
+        return sorted(found, key=lambda c: c.score, reverse=True)
+
+    def generate(
+        self,
+        analysis: UserAnalysis | dict[str, Any],
+        limit: int = MAX_INSIGHTS,
+    ) -> list[Insight]:
+        """Get the top insights (same shape as InsightGenerator's).
+
+        Args:
+            analysis: Same as candidates()
+            limit: Maximum insights to return
+
+        Returns:
+            Up to limit insights, most interesting first
+        """
+        return [candidate.insight for candidate in self.candidates(analysis)[:limit]]
+
+    def _streak(self, data: dict[str, Any]) -> RankedInsight | None:
+        """Longest current streak in any category."""
+        streaks = [
+            (category, streak)
+            for category, streak in (data.get("streaks") or {}).items()
+            if isinstance(streak, dict) and streak.get("current", 0) >= MIN_STREAK_DAYS
+        ]
+        if not streaks:
+            return None
+
+        category, streak = max(streaks, key=lambda item: item[1]["current"])
+        current = streak["current"]
+        longest = streak.get("longest", current)
+        label = category_label(category)
+        body = f"{current} days straight of {label}"
+        if current >= longest:
+            body += " - your longest yet"
+        return RankedInsight(
+            insight=Insight(type="streak", title=f"{label.title()} Streak!", body=body, emoji="🔥"),
+            score=0.5 + min(current, 14) / 28,
+            fact=f"{label} streak: {current} days (longest {longest})",
+        )
+
+    def _go_to_spot(self, data: dict[str, Any]) -> RankedInsight | None:
+        """Most visited merchant."""
+        top_merchants = data.get("top_merchants") or []
+        if not top_merchants:
+            return None
+
+        top = top_merchants[0]
+        count = top.get("count", 0)
+        name = top.get("merchant_name") or top.get("merchant_id")
+        if not name or count < MIN_MERCHANT_VISITS:
+            return None
+
+        total = data.get("total_transactions") or count
+        share = count / total
+        return RankedInsight(
+            insight=Insight(
+                type="pattern",
+                title="Your Go-To Spot",
+                body=f"{count} visits to {name} and counting",
+                emoji="📍",
+            ),
+            score=0.4 + min(share, 0.5),
+            fact=f"top spot: {name}, {count} visits ({share:.0%} of all)",
+        )
+
+    def _weekend(self, data: dict[str, Any]) -> RankedInsight | None:
+        """Weekend- or weekday-heavy habits."""
+        day_types = data.get("day_types") or {}
+        weekend = day_types.get("weekend", 0)
+        total = weekend + day_types.get("weekday", 0)
+        if total < MIN_PATTERN_VISITS:
+            return None
+
+        share = weekend / total
+        if share >= 0.5:
+            insight = Insight(
+                type="pattern",
+                title="Weekend Warrior",
+                body=f"{share:.0%} of your outings happen on weekends",
+                emoji="🎉",
+            )
+        elif share <= 0.15:
+            insight = Insight(
+                type="pattern",
+                title="Weekday Regular",
+                body=f"{1 - share:.0%} of your outings happen on weekdays",
+                emoji="💼",
+            )
+        else:
+            return None
+        return RankedInsight(
+            insight=insight,
+            score=0.3 + abs(share - EVEN_WEEKEND_SHARE),
+            fact=f"weekend share: {share:.0%} of {total} visits",
+        )
+
+    def _exploration(self, data: dict[str, Any]) -> RankedInsight | None:
+        """Category with the most (or least) new spots relative to visits."""
+        ratios = [
+            (category, stats["unique"], stats["total"])
+            for category, stats in (data.get("exploration") or {}).items()
+            if isinstance(stats, dict)
+            and stats.get("total", 0) >= MIN_PATTERN_VISITS
+            and "unique" in stats
+        ]
+        if not ratios:
+            return None
+
+        # The category furthest from an even mix is the most telling
+        category, unique, total = max(ratios, key=lambda item: abs(item[1] / item[2] - 0.5))
+        ratio = unique / total
+        label = category_label(category)
+        if ratio >= 0.6:
+            insight = Insight(
+                type="discovery",
+                title="Explorer Mode",
+                body=f"{ratio:.0%} of your {label} visits were new spots",
+                emoji="🧭",
+            )
+        elif ratio <= 0.3:
+            insight = Insight(
+                type="pattern",
+                title="Creature of Habit",
+                body=f"{total} {label} visits across just {unique} spots",
+                emoji="🏠",
+            )
+        else:
+            return None
+        return RankedInsight(
+            insight=insight,
+            score=0.3 + abs(ratio - 0.5),
+            fact=f"{label} exploration: {unique} unique of {total} visits",
+        )
+
+    def _time_of_day(self, data: dict[str, Any]) -> RankedInsight | None:
+        """Dominant time of day."""
+        buckets = {
+            bucket: count
+            for bucket, count in (data.get("time_buckets") or {}).items()
+            if bucket in TIME_BUCKET_COPY
+        }
+        total = sum(buckets.values())
+        if total < MIN_PATTERN_VISITS:
+            return None
+
+        bucket, count = max(buckets.items(), key=lambda item: item[1])
+        share = count / total
+        if share < 0.4:
+            return None
+        title, emoji = TIME_BUCKET_COPY[bucket]
+        return RankedInsight(
+            insight=Insight(
+                type="pattern",
+                title=title,
+                body=f"{share:.0%} of your visits happen in the {bucket}",
+                emoji=emoji,
+            ),
+            score=share,
+            fact=f"{bucket}: {share:.0%} of {total} timed visits",
+        )
+
+    def _milestone(self, data: dict[str, Any]) -> RankedInsight | None:
+        """Largest transaction milestone reached."""
+        total = data.get("total_transactions", 0)
+        reached = [m for m in MILESTONES if m <= total]
+        if not reached:
+            return None
+
+        milestone = reached[-1]
+        return RankedInsight(
+            insight=Insight(
+                type="milestone",
+                title=f"{milestone} Visits!",
+                body=f"You've logged {total} visits so far",
+                emoji="🎯",
+            ),
+            score=0.3 + 0.05 * len(reached),
+            fact=f"total visits: {total} (passed {milestone})",
+        )
+
+
+def highlights(analysis: dict[str, Any], limit: int = 4) -> list[str]:
+    """Get the top candidates' facts, most interesting first.
+
+    Passed to the insight prompts as pre-digested context.
+
+    Args:
+        analysis: user_analysis row
+        limit: Maximum facts
+
+    Returns:
+        Facts like "coffee streak: 5 days (longest 7)"
+    """
+    return [c.fact for c in RuleInsightEngine().candidates(analysis)[:limit]]
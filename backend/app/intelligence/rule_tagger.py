@@ -0,0 +1,175 @@
+"""RuleTagger - Instant, deterministic venue profiles from Google data.
+
+VenueTagger needs reviews and a Claude round trip, so a freshly created
+venue would sit untagged (and score near zero in MatchingEngine) until it
+returns. RuleTagger derives a provisional VenueProfile from Places types,
+price level, atmosphere flags and opening hours with no I/O, so the venue
+is usable immediately. The AI profile replaces it once tagging finishes
+(see venues.tag_source).
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from app.intelligence.venue_tagger import VenueProfile
+from app.mappings.place_type_mappings import (
+    CLUSTER_ENERGY,
+    CLUSTER_NOUNS,
+    LATE_NIGHT_HOUR,
+    PRICE_ADJECTIVES,
+    QUICK_SERVICE_TYPES,
+    get_cluster_for_types,
+    get_cuisine_for_types,
+)
+
+if TYPE_CHECKING:
+    from app.services.google_places_service import PlaceDetails
+
+# Matches VenueProfile limits from the tagging prompt
+MAX_BEST_FOR = 3
+MAX_STANDOUT = 2
+
+
+class RuleTagger:
+    """Tags venues from Google Places fields with fixed rules."""
+
+    def tag(self, details: PlaceDetails) -> VenueProfile:
+        """Derive a provisional VenueProfile from place details.
+
+        Args:
+            details: PlaceDetails from Google Places API
+
+        Returns:
+            VenueProfile built from types, price level, atmosphere and hours
+        """
+        types = details.types or []
+        taste_cluster = get_cluster_for_types(details.primary_type, types)
+        cuisine_type = (
+            get_cuisine_for_types(details.primary_type, types)
+            if taste_cluster == "dining"
+            else None
+        )
+        quick_service = details.primary_type in QUICK_SERVICE_TYPES
+        late_night = self._is_open_late(details.opening_hours)
+
+        energy = CLUSTER_ENERGY[taste_cluster]
+        if taste_cluster == "dining" and details.good_for_groups and "bar" in types:
+            energy = "lively"
+
+        return VenueProfile(
+            taste_cluster=taste_cluster,
+            cuisine_type=cuisine_type,
+            tagline=self._tagline(details, taste_cluster, cuisine_type, late_night),
+            energy=energy,
+            best_for=self._best_for(details, taste_cluster, quick_service, late_night),
+            standout=self._standout(details),
+        )
+
+    def location_fields(
+        self,
+        details: PlaceDetails,
+        taste_cluster: str,
+        cuisine_type: str | None,
+    ) -> tuple[str, list[str]]:
+        """Derive the per-location fields of a shared profile.
+
+        Locations of a chain share cluster, cuisine, energy and occasions,
+        but the tagline and standouts describe the individual location.
+
+        Args:
+            details: PlaceDetails for the location
+            taste_cluster: Cluster of the shared profile
+            cuisine_type: Cuisine of the shared profile
+
+        Returns:
+            (tagline, standout) for this location
+        """
+        late_night = self._is_open_late(details.opening_hours)
+        return (
+            self._tagline(details, taste_cluster, cuisine_type, late_night),
+            self._standout(details),
+        )
+
+    def _best_for(
+        self,
+        details: PlaceDetails,
+        taste_cluster: str,
+        quick_service: bool,
+        late_night: bool,
+    ) -> list[str]:
+        """Pick occasions from atmosphere flags, highest-signal first."""
+        price = details.price_level
+        occasions = []
+
+        if late_night:
+            occasions.append("late_night")
+        if taste_cluster == "coffee":
+            occasions.append("solo_work")
+        if quick_service or (details.takeout and price is not None and price <= 1):
+            occasions.append("quick_bite")
+        if taste_cluster == "dining" and not quick_service:
+            if (price is not None and price >= 3) or details.reservable:
+                occasions.append("date_night")
+            if details.reservable and price is not None and price >= 2:
+                occasions.append("business_lunch")
+        if details.good_for_groups:
+            if details.reservable or taste_cluster == "nightlife":
+                occasions.append("group_celebration")
+            occasions.append("casual_hangout")
+            if taste_cluster == "dining" and (price is None or price <= 2):
+                occasions.append("family_outing")
+        elif details.outdoor_seating or taste_cluster == "nightlife":
+            occasions.append("casual_hangout")
+
+        return list(dict.fromkeys(occasions))[:MAX_BEST_FOR]
+
+    def _standout(self, details: PlaceDetails) -> list[str]:
+        """Only claim standouts Google data can back up."""
+        standout = []
+        if details.price_level == 4:
+            standout.append("upscale_feel")
+        if (details.rating or 0) >= 4.7 and (details.review_count or 0) >= 1000:
+            standout.append("local_favorite")
+        return standout[:MAX_STANDOUT]
+
+    def _tagline(
+        self,
+        details: PlaceDetails,
+        taste_cluster: str,
+        cuisine_type: str | None,
+        late_night: bool,
+    ) -> str:
+        """Build a plain tagline, e.g. "Laid-back Mexican restaurant with outdoor seating"."""
+        adjective = PRICE_ADJECTIVES.get(details.price_level, "Neighborhood")
+        noun = CLUSTER_NOUNS.get(taste_cluster, "spot")
+        if cuisine_type:
+            noun = f"{cuisine_type.replace('_', ' ').title()} {noun}"
+
+        if late_night:
+            qualifier = " open late"
+        elif details.outdoor_seating:
+            qualifier = " with outdoor seating"
+        elif details.good_for_groups:
+            qualifier = " good for groups"
+        else:
+            qualifier = ""
+
+        return f"{adjective} {noun}{qualifier}"
+
+    @staticmethod
+    def _is_open_late(opening_hours: dict[str, Any] | None) -> bool:
+        """Check regularOpeningHours for closing at LATE_NIGHT_HOUR or later."""
+        if not opening_hours:
+            return False
+        for period in opening_hours.get("periods", []):
+            open_time = period.get("open", {})
+            close_time = period.get("close")
+            if close_time is None:
+                # Open 24 hours
+                return True
+            if close_time.get("day") != open_time.get("day"):
+                return True
+            if close_time.get("hour", 0) >= LATE_NIGHT_HOUR:
+                return True
+        return False
@@ -0,0 +1,231 @@
+"""TasteContentGenerator - Insights, DNA and profile title in one Claude call.
+
+A cold profile screen needs all three artifacts, and InsightGenerator,
+DNAGenerator and AIProfileTitleGenerator each send an overlapping summary
+of the same user_analysis + declared_taste data. This generator sends one
+shared context and gets all three back as one structured output.
+
+The per-artifact generators remain for single misses.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from pydantic import BaseModel
+
+from app.intelligence.dna_generator import MAX_TRAITS, DNATrait
+from app.intelligence.dna_generator import SYSTEM_PROMPT as DNA_SYSTEM_PROMPT
+from app.intelligence.generation_cache import GenerationCache, prompt_version
+from app.intelligence.insight_generator import MAX_INSIGHTS, Insight
+from app.intelligence.insight_generator import SYSTEM_PROMPT as INSIGHTS_SYSTEM_PROMPT
+from app.intelligence.llm_gateway import LLMGateway, get_llm_gateway
+from app.intelligence.profile_titles import PROFILE_TITLE_PROMPT
+from app.intelligence.prompt_builder import PromptBuilder
+
+MODEL = "claude-haiku-4-5"
+
+
+class TasteContentResponse(BaseModel):
+    """Response from Claude containing all daily taste content."""
+
+    insights: list[Insight]
+    traits: list[DNATrait]
+    title: str  # 2-3 words max (e.g., "Urban Explorer")
+    tagline: str  # 3-6 words
+
+
+# System prompt combining the three generators' rules (cached for efficiency)
+SYSTEM_PROMPT = f"""You generate a user's daily taste content from one summary of their \
+quiz answers and transaction data: insights, Taste DNA traits, and a profile title.
+
+Follow each section's rules. Only use data that exists - never fabricate.
+
+# 1. Insights (field: insights)
+
+{INSIGHTS_SYSTEM_PROMPT}
+
+# 2. Taste DNA (field: traits)
+
+{DNA_SYSTEM_PROMPT}
+
+# 3. Profile title (fields: title, tagline)
+
+{PROFILE_TITLE_PROMPT}"""
+
+# Token budget for the shared user data message
+PROMPT_BUDGET_TOKENS = 450
+
+# Cached generations are invalidated when any of these change
+PROMPT_VERSION = prompt_version(MODEL, SYSTEM_PROMPT, PROMPT_BUDGET_TOKENS)
+
+
+class TasteContentGenerator:
+    """Generates insights, DNA traits and a profile title together."""
+
+    def __init__(
+        self,
+        gateway: LLMGateway | None = None,
+        cache: GenerationCache | None = None,
+    ) -> None:
+        """Initialize generator.
+
+        Args:
+            gateway: LLM gateway (defaults to the shared one)
+            cache: Generation cache for unchanged inputs (None disables reuse)
+        """
+        self._gateway = gateway or get_llm_gateway()
+        self._cache = cache
+
+    def generate(self, user_data: dict[str, Any]) -> TasteContentResponse:
+        """Generate all daily taste content from user data.
+
+        Args:
+            user_data: Combined transaction + quiz data including
+                total_transactions, categories, streaks, exploration,
+                time_buckets, top_merchants, exploration_style,
+                vibe_preferences, social_preference and price_tier.
+
+        Returns:
+            Up to 3 insights, exactly 4 DNA traits, and a title and tagline.
+        """
+        if self._cache is None:
+            return self._generate(user_data)
+
+        stored = self._cache.get_or_generate(
+            "taste_content",
+            PROMPT_VERSION,
+            user_data,
+            lambda: self._generate(user_data).model_dump(),
+        )
+        return TasteContentResponse.model_validate(stored)
+
+    def _generate(self, user_data: dict[str, Any]) -> TasteContentResponse:
+        """Generate content with Claude (no cache)."""
+        response = self._gateway.parse(
+            "taste_content",
+            model=MODEL,
+            max_tokens=1200,
+            betas=["structured-outputs-2025-11-13"],
+            system=[
+                {
+                    "type": "text",
+                    "text": SYSTEM_PROMPT,
+                    "cache_control": {"type": "ephemeral"},
+                }
+            ],
+            messages=[
+                {
+                    "role": "user",
+                    "content": self._build_user_message(user_data),
+                }
+            ],
+            output_format=TasteContentResponse,
+        )
+
+        content = response.parsed_output
+        content.insights = content.insights[:MAX_INSIGHTS]
+        content.traits = content.traits[:MAX_TRAITS]
+        return content
+
+    def _build_user_message(self, user_data: dict[str, Any]) -> str:
+        """Build the shared user message.
+
+        Args:
+            user_data: Combined user data.
+
+        Returns:
+            Formatted message for Claude.
+        """
+        builder = PromptBuilder(PROMPT_BUDGET_TOKENS)
+        builder.add_required("## User Data Summary")
+        builder.add_required(f"Total transactions: {user_data.get('total_transactions', 0)}")
+
+        # Rule-based highlights (see RuleInsightEngine), most notable first
+        builder.add_section(
+            "\n### Highlights",
+            (f"- {fact}" for fact in user_data.get("highlights") or []),
+        )
+
+        # Quiz data (declared taste) is small and always included
+        quiz = []
+        exploration = user_data.get("exploration_style")
+        if exploration:
+            quiz.append(f"- Exploration: {exploration}")
+        vibes = user_data.get("vibe_preferences") or []
+        if vibes:
+            quiz.append(f"- Vibes: {', '.join(vibes)}")
+        social = user_data.get("social_preference")
+        if social:
+            quiz.append(f"- Social: {social}")
+        price = user_data.get("price_tier")
+        if price:
+            quiz.append(f"- Price: {price}")
+        if quiz:
+            builder.add_required("\n### From Quiz")
+            for line in quiz:
+                builder.add_required(line)
+
+        # Categories, busiest first
+        categories = user_data.get("categories") or {}
+        ranked = sorted(
+            (item for item in categories.items() if isinstance(item[1], dict)),
+            key=lambda item: item[1].get("count", 0),
+            reverse=True,
+        )
+        total = sum(data.get("count", 0) for _, data in ranked)
+        lines = []
+        for cat, data in ranked:
+            count = data.get("count", 0)
+            spend = data.get("total_spend", 0)
+            merchants = data.get("merchants", [])
+            merchant_str = ", ".join(merchants[:3]) if merchants else "none"
+            share = f"{count / total:.0%}, " if total else ""
+            lines.append(f"- {cat}: {count} visits ({share}${spend:.0f} spent, at: {merchant_str})")
+        builder.add_section("\n### Categories", lines)
+
+        # Streaks
+        streaks = user_data.get("streaks") or {}
+        builder.add_section(
+            "\n### Current Streaks",
+            (
+                f"- {cat}: {data.get('current', 0)} day streak (longest: {data.get('longest', 0)})"
+                for cat, data in streaks.items()
+                if isinstance(data, dict) and data.get("current", 0) > 0
+            ),
+        )
+
+        # Exploration
+        exploration_stats = user_data.get("exploration") or {}
+        builder.add_section(
+            "\n### Exploration (unique vs total)",
+            (
+                f"- {cat}: {data['unique']} unique out of {data['total']} visits"
+                for cat, data in exploration_stats.items()
+                if isinstance(data, dict) and data.get("total", 0) > 0 and "unique" in data
+            ),
+        )
+
+        # Top merchants
+        top_merchants = user_data.get("top_merchants") or []
+        builder.add_section(
+            "\n### Top Spots",
+            (
+                f"- {m.get('merchant_name', 'Unknown')}: {m.get('count', 0)} visits"
+                for m in top_merchants[:5]
+            ),
+        )
+
+        # Time patterns
+        time_buckets = user_data.get("time_buckets") or {}
+        total_time = sum(time_buckets.values())
+        if total_time > 0:
+            builder.add_section(
+                "\n### Time Patterns",
+                (
+                    f"- {bucket}: {count} ({count / total_time * 100:.0f}%)"
+                    for bucket, count in time_buckets.items()
+                ),
+            )
+
+        return builder.build()
@@ -6,11 +6,22 @@ venue profiles from Google Places data and reviews.
 
 from __future__ import annotations
 
+import hashlib
 from typing import Any
 
-import anthropic
 from pydantic import BaseModel
 
+from app.intelligence.llm_gateway import LLMGateway, get_llm_gateway, llm_usage
+from app.intelligence.prompt_builder import PromptBuilder, rank_reviews
+
+MODEL = "claude-haiku-4-5"
+
+# Token budget for the venue message (room for ~5 informative reviews)
+PROMPT_BUDGET_TOKENS = 450
+
+# Most reviews considered for the prompt
+MAX_REVIEWS = 10
+
 
 class VenueProfile(BaseModel):
     """AI-extracted venue profile for taste matching."""
@@ -61,9 +72,19 @@ SYSTEM_PROMPT = """You extract venue profiles for a taste-based restaurant disco
 class VenueTagger:
     """Tags venues using Claude Haiku with structured outputs."""
 
-    def __init__(self) -> None:
-        """Initialize with Anthropic client."""
-        self._client = anthropic.Anthropic()
+    def __init__(
+        self,
+        prompt_budget_tokens: int = PROMPT_BUDGET_TOKENS,
+        gateway: LLMGateway | None = None,
+    ) -> None:
+        """Initialize tagger.
+
+        Args:
+            prompt_budget_tokens: Token budget for the venue message
+            gateway: LLM gateway (defaults to the shared one)
+        """
+        self._gateway = gateway or get_llm_gateway()
+        self._prompt_budget_tokens = prompt_budget_tokens
 
     def tag(self, venue_data: dict[str, Any]) -> VenueProfile:
         """Extract VenueProfile from venue data.
@@ -80,10 +101,24 @@ class VenueTagger:
         Returns:
             VenueProfile with extracted tags.
         """
+        return self.tag_with_usage(venue_data)[0]
+
+    def tag_with_usage(
+        self, venue_data: dict[str, Any]
+    ) -> tuple[VenueProfile, dict[str, Any]]:
+        """Tag venue and return usage stats for cost tracking.
+
+        Args:
+            venue_data: Same as tag().
+
+        Returns:
+            Tuple of (VenueProfile, usage_stats dict).
+        """
         user_message = self._build_user_message(venue_data)
 
-        response = self._client.beta.messages.parse(
-            model="claude-haiku-4-5",
+        response = self._gateway.parse(
+            "venue_tagging",
+            model=MODEL,
             max_tokens=300,
             betas=["structured-outputs-2025-11-13"],
             system=SYSTEM_PROMPT,
@@ -91,12 +126,12 @@ class VenueTagger:
             output_format=VenueProfile,
         )
 
-        return response.parsed_output
+        return response.parsed_output, llm_usage(response, MODEL)
 
-    def tag_with_usage(
+    async def atag_with_usage(
         self, venue_data: dict[str, Any]
     ) -> tuple[VenueProfile, dict[str, Any]]:
-        """Tag venue and return usage stats for cost tracking.
+        """Async variant of tag_with_usage() for concurrent batches.
 
         Args:
             venue_data: Same as tag().
@@ -106,8 +141,9 @@ class VenueTagger:
         """
         user_message = self._build_user_message(venue_data)
 
-        response = self._client.beta.messages.parse(
-            model="claude-haiku-4-5",
+        response = await self._gateway.aparse(
+            "venue_tagging",
+            model=MODEL,
             max_tokens=300,
             betas=["structured-outputs-2025-11-13"],
             system=SYSTEM_PROMPT,
@@ -115,21 +151,23 @@ class VenueTagger:
             output_format=VenueProfile,
         )
 
-        # Calculate costs (Haiku pricing: $1/M input, $5/M output)
-        input_tokens = response.usage.input_tokens
-        output_tokens = response.usage.output_tokens
-        input_cost = input_tokens * 1 / 1_000_000
-        output_cost = output_tokens * 5 / 1_000_000
+        return response.parsed_output, llm_usage(response, MODEL)
+
+    def prompt_fingerprint(self, venue_data: dict[str, Any]) -> str:
+        """Hash everything that determines the tagging result.
 
-        usage = {
-            "input_tokens": input_tokens,
-            "output_tokens": output_tokens,
-            "input_cost": input_cost,
-            "output_cost": output_cost,
-            "total_cost": input_cost + output_cost,
-        }
+        Covers the model, system prompt and the rendered venue message
+        (name, category, price, truncated reviews), so any prompt change
+        produces a new fingerprint.
 
-        return response.parsed_output, usage
+        Args:
+            venue_data: Same as tag().
+
+        Returns:
+            Hex SHA-256 digest.
+        """
+        content = "\n".join([MODEL, SYSTEM_PROMPT, self._build_user_message(venue_data)])
+        return hashlib.sha256(content.encode()).hexdigest()
 
     def _build_user_message(self, venue_data: dict[str, Any]) -> str:
         """Build user message from venue data.
@@ -140,29 +178,51 @@ class VenueTagger:
         Returns:
             Formatted message for Claude.
         """
-        parts = ["## Venue Data"]
-        parts.append(f"Name: {venue_data.get('name', 'Unknown')}")
-        parts.append(f"Category: {venue_data.get('category', 'Unknown')}")
-
-        categories = venue_data.get("categories", [])
-        if categories:
-            parts.append(f"Categories: {', '.join(categories[:5])}")
-
-        rating = venue_data.get("rating")
-        if rating:
-            parts.append(f"Rating: {rating}")
-
-        price = venue_data.get("price")
-        if price:
-            parts.append(f"Price: {price}")
-
-        # Add reviews
-        reviews = venue_data.get("reviews", [])
-        if reviews:
-            parts.append(f"\n## Reviews ({len(reviews)} samples)")
-            for i, review in enumerate(reviews[:10], 1):
-                text = review.get("text", "")[:300]
-                stars = review.get("stars", "?")
-                parts.append(f"\n{i}. [{stars}*] {text}")
-
-        return "\n".join(parts)
+        return build_venue_message(venue_data, self._prompt_budget_tokens)
+
+
+def build_venue_message(
+    venue_data: dict[str, Any],
+    budget_tokens: int = PROMPT_BUDGET_TOKENS,
+) -> str:
+    """Build the tagging message for a venue within a token budget.
+
+    Venue facts always fit; reviews are ranked by informativeness,
+    near-duplicates dropped, and added until the budget is spent.
+
+    Args:
+        venue_data: Same as VenueTagger.tag().
+        budget_tokens: Token budget for the message.
+
+    Returns:
+        Formatted message for Claude.
+    """
+    builder = PromptBuilder(budget_tokens)
+    builder.add_required("## Venue Data")
+    builder.add_required(f"Name: {venue_data.get('name', 'Unknown')}")
+    builder.add_required(f"Category: {venue_data.get('category', 'Unknown')}")
+
+    categories = venue_data.get("categories", [])
+    if categories:
+        builder.add(f"Categories: {', '.join(categories[:5])}")
+
+    rating = venue_data.get("rating")
+    if rating:
+        builder.add(f"Rating: {rating}")
+
+    price = venue_data.get("price")
+    if price:
+        builder.add(f"Price: {price}")
+
+    # Most informative distinct reviews first
+    reviews = rank_reviews(venue_data.get("reviews", [])[:MAX_REVIEWS])
+    if reviews:
+        builder.add_section(
+            "\n## Reviews",
+            (
+                f"\n{i}. [{review.get('stars', '?')}*] {review['text']}"
+                for i, review in enumerate(reviews, 1)
+            ),
+        )
+
+    return builder.build()
@@ -2,20 +2,55 @@
 
 from __future__ import annotations
 
+import asyncio
+import contextlib
+from collections.abc import AsyncIterator
+from typing import Any
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.config import get_settings
+from app.dependencies import get_supabase_client
+from app.intelligence.generation_cache import get_generation_cache_stats
+from app.intelligence.llm_gateway import get_llm_gateway
 from app.routers import auth, discover, onboarding, plaid, profile, sessions, taste, users, vault
+from app.services.daily_content_cache import get_daily_content_cache_stats
+from app.services.places_transport import close_places_transport, get_places_transport
+from app.services.taste_precompute import TastePrecomputeService
+from app.services.venue_refresher import VenueDetailsRefresher
 
 settings = get_settings()
 
+
+@contextlib.asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Start background jobs that are enabled in settings; close pooled clients on shutdown."""
+    tasks = []
+    if settings.venue_details_refresh_interval_minutes > 0:
+        refresher = VenueDetailsRefresher(get_supabase_client())
+        tasks.append(asyncio.create_task(
+            refresher.run_forever(settings.venue_details_refresh_interval_minutes * 60)
+        ))
+    if settings.taste_precompute_hour_utc >= 0:
+        precompute = TastePrecomputeService(get_supabase_client())
+        tasks.append(asyncio.create_task(
+            precompute.run_forever(settings.taste_precompute_hour_utc)
+        ))
+
+    yield
+
+    for task in tasks:
+        task.cancel()
+    await close_places_transport()
+
 app = FastAPI(
     title=settings.app_name,
     description="Taste Intelligence Layer - Transaction + Quiz data → Personalized Discovery",
     version="0.1.0",
     docs_url="/docs" if settings.debug else None,
     redoc_url="/redoc" if settings.debug else None,
+    lifespan=lifespan,
 )
 
 # CORS middleware
@@ -45,6 +80,17 @@ async def health_check() -> dict[str, str]:
     return {"status": "ok"}
 
 
+@app.get("/metrics")
+async def metrics() -> dict[str, Any]:
+    """In-process call and cache metrics for LLM, taste content and Places API clients."""
+    return {
+        "llm": get_llm_gateway().metrics(),
+        "llm_generation_cache": get_generation_cache_stats(),
+        "daily_content_cache": get_daily_content_cache_stats(),
+        "places": get_places_transport().latency_stats(),
+    }
+
+
 @app.get("/")
 async def root() -> dict[str, str]:
     """Root endpoint."""
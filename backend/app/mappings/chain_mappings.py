@@ -0,0 +1,67 @@
+"""Known restaurant and coffee chains.
+
+Chain keys are names as produced by venue_matcher.normalize_merchant().
+Venues whose chain key is listed here inherit the chain's AI profile
+from an already-tagged location instead of being tagged again.
+"""
+
+from __future__ import annotations
+
+KNOWN_CHAINS = frozenset(
+    {
+        # Coffee / bakery
+        "starbucks",
+        "dunkin",
+        "peets coffee",
+        "philz coffee",
+        "blue bottle coffee",
+        "dutch bros coffee",
+        "tim hortons",
+        "coffee bean tea leaf",
+        "panera bread",
+        "krispy kreme",
+        # Fast casual
+        "chipotle",
+        "chipotle mexican grill",
+        "sweetgreen",
+        "cava",
+        "shake shack",
+        "five guys",
+        "panda express",
+        "qdoba mexican eats",
+        "noodles company",
+        "potbelly",
+        "jersey mikes subs",
+        "subway",
+        "chick fil a",
+        "raising canes chicken fingers",
+        "in n out burger",
+        "wingstop",
+        "daves hot chicken",
+        # Fast food
+        "mcdonalds",
+        "burger king",
+        "wendys",
+        "taco bell",
+        "kfc",
+        "popeyes louisiana kitchen",
+        "jack in box",
+        "del taco",
+        "carls jr",
+        "sonic drive in",
+        # Casual dining
+        "cheesecake factory",
+        "olive garden",
+        "applebees grill bar",
+        "chilis grill bar",
+        "ihop",
+        "dennys",
+        "buffalo wild wings",
+        "p f changs",
+        "red robin gourmet burgers brews",
+    }
+)
+
+# Minimum tagged locations sharing a name and primary type before an
+# unlisted name is treated as a chain (guards against same-name venues)
+MIN_CHAIN_LOCATIONS = 2
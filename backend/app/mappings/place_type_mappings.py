@@ -0,0 +1,131 @@
+"""Google Places type mappings for rule-based venue tagging.
+
+Maps Places API `primaryType` / `types` values to the taste clusters and
+cuisines used by VenueProfile, so a new venue gets a provisional profile
+before AI tagging finishes.
+"""
+
+from __future__ import annotations
+
+# Place type -> taste_cluster (coffee, dining, nightlife, bakery)
+PLACE_TYPE_CLUSTERS: dict[str, str] = {
+    # Coffee
+    "coffee_shop": "coffee",
+    "cafe": "coffee",
+    "tea_house": "coffee",
+    "internet_cafe": "coffee",
+    # Bakery / sweets
+    "bakery": "bakery",
+    "dessert_shop": "bakery",
+    "donut_shop": "bakery",
+    "ice_cream_shop": "bakery",
+    "confectionery": "bakery",
+    "chocolate_shop": "bakery",
+    "candy_store": "bakery",
+    # Nightlife
+    "bar": "nightlife",
+    "pub": "nightlife",
+    "wine_bar": "nightlife",
+    "cocktail_bar": "nightlife",
+    "night_club": "nightlife",
+    "bar_and_grill": "nightlife",
+    "karaoke": "nightlife",
+    "brewery": "nightlife",
+}
+
+# Place type -> cuisine_type (dining venues only)
+PLACE_TYPE_CUISINES: dict[str, str] = {
+    "american_restaurant": "american",
+    "hamburger_restaurant": "american",
+    "barbecue_restaurant": "american",
+    "steak_house": "american",
+    "diner": "american",
+    "italian_restaurant": "italian",
+    "pizza_restaurant": "italian",
+    "mexican_restaurant": "mexican",
+    "japanese_restaurant": "japanese",
+    "sushi_restaurant": "japanese",
+    "ramen_restaurant": "japanese",
+    "chinese_restaurant": "chinese",
+    "indian_restaurant": "indian",
+    "thai_restaurant": "thai",
+    "vietnamese_restaurant": "vietnamese",
+    "korean_restaurant": "korean",
+    "mediterranean_restaurant": "mediterranean",
+    "greek_restaurant": "greek",
+    "middle_eastern_restaurant": "middle_eastern",
+    "lebanese_restaurant": "middle_eastern",
+    "turkish_restaurant": "turkish",
+    "french_restaurant": "french",
+    "spanish_restaurant": "spanish",
+    "brazilian_restaurant": "brazilian",
+    "indonesian_restaurant": "indonesian",
+    "seafood_restaurant": "seafood",
+    "vegan_restaurant": "vegan",
+    "vegetarian_restaurant": "vegetarian",
+}
+
+# Place types for quick, counter-service food
+QUICK_SERVICE_TYPES = frozenset(
+    {
+        "fast_food_restaurant",
+        "sandwich_shop",
+        "meal_takeaway",
+        "food_court",
+    }
+)
+
+# Default energy per taste cluster
+CLUSTER_ENERGY: dict[str, str] = {
+    "coffee": "chill",
+    "bakery": "chill",
+    "dining": "moderate",
+    "nightlife": "lively",
+}
+
+# Tagline wording per Google price level (0-4)
+PRICE_ADJECTIVES: dict[int, str] = {
+    0: "Casual",
+    1: "Casual",
+    2: "Laid-back",
+    3: "Stylish",
+    4: "Upscale",
+}
+
+# Tagline noun per taste cluster
+CLUSTER_NOUNS: dict[str, str] = {
+    "coffee": "cafe",
+    "bakery": "bakery",
+    "dining": "restaurant",
+    "nightlife": "bar",
+}
+
+# A venue closing at or after this hour (or past midnight) is open late
+LATE_NIGHT_HOUR = 23
+
+
+def get_cluster_for_types(primary_type: str | None, types: list[str]) -> str:
+    """Get the taste cluster for a place's types.
+
+    The primary type wins; otherwise the first secondary type that maps.
+    Anything unmapped is treated as dining.
+
+    Args:
+        primary_type: Places API primaryType
+        types: Places API types
+
+    Returns:
+        taste_cluster (coffee, dining, nightlife, bakery)
+    """
+    for place_type in [primary_type, *types]:
+        if place_type in PLACE_TYPE_CLUSTERS:
+            return PLACE_TYPE_CLUSTERS[place_type]
+    return "dining"
+
+
+def get_cuisine_for_types(primary_type: str | None, types: list[str]) -> str | None:
+    """Get the cuisine for a place's types, or None if none maps."""
+    for place_type in [primary_type, *types]:
+        if place_type in PLACE_TYPE_CUISINES:
+            return PLACE_TYPE_CUISINES[place_type]
+    return None
@@ -0,0 +1,44 @@
+"""Lightweight in-process metrics shared by the Places and LLM clients."""
+
+from __future__ import annotations
+
+import threading
+from typing import Any
+
+
+class LatencyHistogram:
+    """Thread-safe fixed-bucket latency histogram."""
+
+    def __init__(self, buckets_ms: list[float]) -> None:
+        """Initialize histogram.
+
+        Args:
+            buckets_ms: Bucket upper bounds in milliseconds, ascending
+        """
+        self.buckets_ms = buckets_ms
+        self.counts = [0] * (len(buckets_ms) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, latency_ms: float) -> None:
+        """Record one request latency."""
+        index = len(self.buckets_ms)
+        for i, bound in enumerate(self.buckets_ms):
+            if latency_ms <= bound:
+                index = i
+                break
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.total_ms += latency_ms
+
+    def stats(self) -> dict[str, Any]:
+        """Get bucket counts (keyed by upper bound), count and mean."""
+        labels = [f"le_{bound}" for bound in self.buckets_ms] + ["inf"]
+        with self._lock:
+            return {
+                "buckets": dict(zip(labels, self.counts)),
+                "count": self.count,
+                "mean_ms": self.total_ms / self.count if self.count else 0.0,
+            }
@@ -6,16 +6,19 @@ and optional mood filtering.
 
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, Query, HTTPException, Request
+import asyncio
+
+from fastapi import APIRouter, BackgroundTasks, Depends, Query, HTTPException, Request
 from fastapi.responses import Response
 from pydantic import BaseModel
 from supabase import Client
 
 from app.dependencies import get_supabase_client
 from app.intelligence.matching_engine import MatchingEngine
-from app.intelligence.venue_tagger import VenueTagger
 from app.mappings.mood_mappings import get_available_moods
 from app.services.google_places_service import GooglePlacesService
+from app.services.row_loader import RowLoader, get_row_loader
+from app.services.venue_tagging_service import VenueTaggingService, venue_tagger_input
 
 router = APIRouter(prefix="/api/discover", tags=["discover"])
 
@@ -117,6 +120,7 @@ async def get_discover_feed(
     offset: int = Query(0, ge=0),
     supabase: Client = Depends(get_supabase_client),
     engine: MatchingEngine = Depends(get_matching_engine),
+    loader: RowLoader = Depends(get_row_loader),
 ) -> DiscoverFeedResponse:
     """Get personalized venue feed for a user.
 
@@ -136,7 +140,7 @@ async def get_discover_feed(
     print(f"[Discover] Feed request for user: {user_id}, mood: {mood}, city: {city}")
 
     # 1. Get user taste profile
-    user_taste = await _get_user_taste(user_id, supabase)
+    user_taste = await _get_user_taste(user_id, loader)
 
     if not user_taste:
         print(f"[Discover] No taste profile found for {user_id}")
@@ -279,7 +283,7 @@ async def get_discover_feed(
     )
 
 
-async def _get_user_taste(user_id: str, supabase: Client) -> dict | None:
+async def _get_user_taste(user_id: str, loader: RowLoader) -> dict | None:
     """Get user taste profile for matching.
 
     Tries fused_taste first, falls back to declared_taste for new users.
@@ -289,25 +293,12 @@ async def _get_user_taste(user_id: str, supabase: Client) -> dict | None:
         social_preference, coffee_preference, tx_weight.
         None if no taste data found.
     """
-    # Try fused_taste first (has transaction data)
-    fused_result = (
-        supabase.table("fused_taste")
-        .select("*")
-        .eq("user_id", user_id)
-        .limit(1)
-        .execute()
-    )
-
-    declared_result = (
-        supabase.table("declared_taste")
-        .select("*")
-        .eq("user_id", user_id)
-        .limit(1)
-        .execute()
+    # Try fused_taste first (has transaction data); both load in one batch
+    fused, declared = await asyncio.gather(
+        loader.load("fused_taste", user_id),
+        loader.load("declared_taste", user_id),
     )
 
-    declared = declared_result.data[0] if declared_result.data else None
-
     if not declared:
         return None
 
@@ -322,7 +313,6 @@ async def _get_user_taste(user_id: str, supabase: Client) -> dict | None:
         "coffee_preference": declared.get("coffee_preference"),
     }
 
-    fused = fused_result.data[0] if fused_result.data else None
     if fused:
         # Parse categories from fused taste (list of dicts with name, percentage)
         categories_list = fused.get("categories", [])
@@ -393,6 +383,7 @@ async def get_venue_detail(
     user_id: str = Query(..., description="User ID for personalized scoring"),
     supabase: Client = Depends(get_supabase_client),
     engine: MatchingEngine = Depends(get_matching_engine),
+    loader: RowLoader = Depends(get_row_loader),
 ) -> VenueResponse:
     """Get detailed venue info with personalized match score.
 
@@ -420,7 +411,7 @@ async def get_venue_detail(
     venue = _db_to_venue_dict(venue_result.data[0])
 
     # Get user taste
-    user_taste = await _get_user_taste(user_id, supabase)
+    user_taste = await _get_user_taste(user_id, loader)
 
     # Score venue
     if user_taste:
@@ -495,12 +486,15 @@ class SeedResponse(BaseModel):
 @router.post("/seed", response_model=SeedResponse)
 async def seed_venues(
     request: SeedRequest,
+    background_tasks: BackgroundTasks,
     supabase: Client = Depends(get_supabase_client),
 ) -> SeedResponse:
     """Seed venues for a city using Google Places API.
 
     Called on user signup or when a new city needs venues.
     Uses text search to find popular restaurants, coffee shops, and bars.
+    Venues are created with rule-based tags so they show up in the feed
+    immediately; AI tagging upgrades them after the response is sent.
 
     Args:
         request: City name and coordinates for seeding.
@@ -511,7 +505,7 @@ async def seed_venues(
     print(f"[Discover] Seeding venues for {request.city}")
 
     places_service = GooglePlacesService(supabase)
-    venue_tagger = VenueTagger()
+    tagging_service = VenueTaggingService(supabase)
 
     # Search queries for different venue types
     queries = [
@@ -522,8 +516,9 @@ async def seed_venues(
         f"trendy restaurants in {request.city}",
     ]
 
-    seeded = 0
     skipped = 0
+    new_details = []
+    seen_place_ids: set[str] = set()
 
     for query in queries:
         matches = places_service.search_venues(
@@ -535,6 +530,11 @@ async def seed_venues(
         )
 
         for match in matches:
+            # Queries overlap - only handle each place once
+            if match.place_id in seen_place_ids:
+                continue
+            seen_place_ids.add(match.place_id)
+
             # Check if venue already exists
             existing = places_service.get_venue_by_place_id(match.place_id)
             if existing:
@@ -543,44 +543,26 @@ async def seed_venues(
 
             # Get full place details
             details = places_service.get_place_details(match.place_id)
-            if not details:
-                continue
+            if details:
+                new_details.append(details)
 
-            # Run AI tagging
-            venue_data = {
-                "name": details.name,
-                "category": details.primary_type or "restaurant",
-                "categories": details.types[:5] if details.types else [],
-                "rating": details.rating,
-                "price": _price_level_to_string(details.price_level),
-                "reviews": details.reviews,
-            }
-
-            try:
-                profile = venue_tagger.tag(venue_data)
-            except Exception as e:
-                print(f"[Discover] VenueTagger failed for {details.name}: {e}")
-                profile = None
-
-            # Create venue
-            venue = places_service.create_or_update_venue(
-                details,
-                city=request.city,
-                source="discover",
-            )
+    seeded = 0
+    pending_tags = []
+    for details in new_details:
+        # Create venue with provisional rule-based tags
+        venue = places_service.create_or_update_venue(
+            details,
+            city=request.city,
+            source="discover",
+        )
+        if venue.get("id"):
+            pending_tags.append((venue["id"], venue_tagger_input(details)))
 
-            # Update with AI tags if available
-            if profile and venue.get("id"):
-                supabase.table("venues").update({
-                    "taste_cluster": profile.taste_cluster,
-                    "cuisine_type": profile.cuisine_type,
-                    "energy": profile.energy,
-                    "tagline": profile.tagline,
-                    "best_for": profile.best_for,
-                    "standout": profile.standout,
-                }).eq("id", venue["id"]).execute()
+        seeded += 1
 
-            seeded += 1
+    # Replace rule-based tags with AI profiles in one concurrent, memoized batch
+    if pending_tags:
+        background_tasks.add_task(tagging_service.aupgrade_venues, pending_tags)
 
     print(f"[Discover] Seeded {seeded} venues, skipped {skipped} for {request.city}")
 
@@ -591,13 +573,6 @@ async def seed_venues(
     )
 
 
-def _price_level_to_string(price_level: int | None) -> str | None:
-    """Convert price level int to string."""
-    if price_level is None:
-        return None
-    return {0: "Free", 1: "$", 2: "$$", 3: "$$$", 4: "$$$$"}.get(price_level)
-
-
 @router.get("/photo/{place_id}/{photo_index}")
 async def get_venue_photo(
     place_id: str,
@@ -637,7 +612,7 @@ async def get_venue_photo(
     # The photo_references store the photo name suffix
     # We need to construct the full path
     photo_name = f"places/{place_id}/photos/{photo_refs[photo_index]}"
-    photo_bytes = places_service.fetch_photo(place_id, photo_name, width)
+    photo_bytes = await places_service.fetch_photo_async(place_id, photo_name, width)
 
     if not photo_bytes:
         raise HTTPException(status_code=404, detail="Failed to fetch photo")
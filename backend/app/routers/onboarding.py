@@ -9,6 +9,7 @@ from supabase import Client
 from app.dependencies import get_supabase_client
 from app.intelligence import ProfileTitleMapper, QuizAnswer, QuizProcessor
 from app.mappings.quiz_mappings import get_question_key
+from app.services.fused_taste_service import FusedTasteService
 
 router = APIRouter(prefix="/api/onboarding", tags=["onboarding"])
 
@@ -114,6 +115,12 @@ async def submit_quiz(
         traceback.print_exc()
         raise
 
+    # Declared taste changed - re-fuse with observed taste
+    try:
+        FusedTasteService(supabase, profile_mapper).refresh(request.user_id)
+    except Exception as e:
+        print(f"[Onboarding] Fused taste refresh failed: {e}")
+
     return SubmitQuizResponse(
         success=True,
         profile_title=title,
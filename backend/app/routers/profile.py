@@ -5,6 +5,7 @@ User profile data, notification preferences, data export, and account deletion.
 
 from __future__ import annotations
 
+import asyncio
 from datetime import datetime, timezone
 from typing import Any
 
@@ -13,6 +14,8 @@ from pydantic import BaseModel
 from supabase import Client
 
 from app.dependencies import get_supabase_client
+from app.services.daily_content_cache import KINDS, invalidate_daily_content
+from app.services.row_loader import RowLoader, get_row_loader
 
 router = APIRouter(prefix="/api/profile", tags=["profile"])
 
@@ -85,22 +88,15 @@ class UpdateProfileRequest(BaseModel):
 async def get_profile(
     user_id: str,
     supabase: Client = Depends(get_supabase_client),
+    loader: RowLoader = Depends(get_row_loader),
 ) -> ProfileResponse:
     """Get user profile data including linked accounts count."""
     # Get profile
-    profile_result = (
-        supabase.table("profiles")
-        .select("id, username, display_name, phone, avatar_emoji, avatar_url, created_at")
-        .eq("id", user_id)
-        .maybe_single()
-        .execute()
-    )
+    profile = await loader.load("profiles", user_id)
 
-    if not profile_result.data:
+    if not profile:
         raise HTTPException(status_code=404, detail="Profile not found")
 
-    profile = profile_result.data
-
     # Get linked accounts count
     accounts_result = (
         supabase.table("linked_accounts")
@@ -127,6 +123,7 @@ async def update_profile(
     user_id: str,
     request: UpdateProfileRequest,
     supabase: Client = Depends(get_supabase_client),
+    loader: RowLoader = Depends(get_row_loader),
 ) -> ProfileResponse:
     """Update user profile. Only provided fields are updated."""
     # Build update dict with only non-None values
@@ -142,7 +139,7 @@ async def update_profile(
 
     if not update_data:
         # No updates, just return current profile
-        return await get_profile(user_id, supabase)
+        return await get_profile(user_id, supabase, loader)
 
     # Update profile
     result = (
@@ -156,7 +153,8 @@ async def update_profile(
         raise HTTPException(status_code=404, detail="Profile not found")
 
     # Return updated profile
-    return await get_profile(user_id, supabase)
+    loader.clear("profiles", user_id)
+    return await get_profile(user_id, supabase, loader)
 
 
 @router.get("/{user_id}/notifications", response_model=NotificationPreferencesResponse)
@@ -224,25 +222,22 @@ async def update_notification_preferences(
 async def export_user_data(
     user_id: str,
     supabase: Client = Depends(get_supabase_client),
+    loader: RowLoader = Depends(get_row_loader),
 ) -> DataExportResponse:
     """Export all user data as JSON."""
     data: dict[str, Any] = {}
 
-    # Profile
-    profile_result = supabase.table("profiles").select("*").eq("id", user_id).maybe_single().execute()
-    data["profile"] = profile_result.data
-
-    # Declared taste (quiz responses)
-    declared_result = supabase.table("declared_taste").select("*").eq("user_id", user_id).maybe_single().execute()
-    data["declared_taste"] = declared_result.data
-
-    # Fused taste
-    fused_result = supabase.table("fused_taste").select("*").eq("user_id", user_id).maybe_single().execute()
-    data["fused_taste"] = fused_result.data
-
-    # User analysis (observed taste)
-    analysis_result = supabase.table("user_analysis").select("*").eq("user_id", user_id).maybe_single().execute()
-    data["user_analysis"] = analysis_result.data
+    # Per-user rows (profile, quiz, fused and observed taste) load concurrently
+    profile, declared, fused, analysis = await asyncio.gather(
+        loader.load("profiles", user_id),
+        loader.load("declared_taste", user_id),
+        loader.load("fused_taste", user_id),
+        loader.load("user_analysis", user_id),
+    )
+    data["profile"] = profile
+    data["declared_taste"] = declared
+    data["fused_taste"] = fused
+    data["user_analysis"] = analysis
 
     # Place visits
     visits_result = (
@@ -285,6 +280,7 @@ async def export_user_data(
 async def delete_account(
     user_id: str,
     supabase: Client = Depends(get_supabase_client),
+    loader: RowLoader = Depends(get_row_loader),
     x_confirm_delete: str | None = Header(None, alias="X-Confirm-Delete"),
 ) -> DeleteAccountResponse:
     """Hard delete user account and all associated data.
@@ -298,8 +294,7 @@ async def delete_account(
         )
 
     # Verify user exists
-    profile_result = supabase.table("profiles").select("id").eq("id", user_id).maybe_single().execute()
-    if not profile_result.data:
+    if not await loader.load("profiles", user_id):
         raise HTTPException(status_code=404, detail="User not found")
 
     # Delete from all tables in order (respecting foreign key constraints)
@@ -309,6 +304,8 @@ async def delete_account(
     supabase.table("daily_insights").delete().eq("user_id", user_id).execute()
     supabase.table("daily_dna").delete().eq("user_id", user_id).execute()
     supabase.table("daily_profile_titles").delete().eq("user_id", user_id).execute()
+    for kind in KINDS:
+        invalidate_daily_content(kind, user_id)
 
     # 2. Session-related (need to handle sessions user hosts)
     # Get sessions hosted by user
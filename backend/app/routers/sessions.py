@@ -15,6 +15,7 @@ from supabase import Client
 
 from app.dependencies import get_supabase_client
 from app.intelligence.matching_engine import MatchingEngine
+from app.services.row_loader import RowLoader
 
 logger = logging.getLogger(__name__)
 
@@ -904,27 +905,18 @@ async def respond_to_invitation(
 
 
 def _calculate_group_match(
-    participant_ids: list[str],
+    fused_data: list[dict],
     venue: dict,
-    supabase: Client,
 ) -> int | None:
     """Calculate group match percentage for a venue.
 
     Aggregates fused taste profiles of all participants and scores venue against group taste.
     Returns None if no taste data available.
-    """
-    if not participant_ids:
-        return None
-
-    # Get fused taste for all participants
-    fused_result = (
-        supabase.table("fused_taste")
-        .select("categories, vibes, exploration_ratio")
-        .in_("user_id", participant_ids)
-        .execute()
-    )
 
-    fused_data = fused_result.data or []
+    Args:
+        fused_data: fused_taste rows of the participants that have one
+        venue: Venue row to score
+    """
     if not fused_data:
         return None
 
@@ -1026,8 +1018,10 @@ async def get_session_details(session_id: str, supabase: Client) -> SessionRespo
             has_voted=p["user_id"] in user_votes,
         ))
 
-    # Get participant IDs for group match calculation
+    # Get participants' fused taste once for every venue's group match
     participant_ids = [p["user_id"] for p in participants_data]
+    fused_rows = await RowLoader(supabase).load_many("fused_taste", participant_ids)
+    fused_data = [row for row in fused_rows if row]
 
     # Get session venues with full venue details for matching
     venues_result = (
@@ -1057,7 +1051,7 @@ async def get_session_details(session_id: str, supabase: Client) -> SessionRespo
             photo_url = venue["photo_references"][0]
 
         # Calculate group match percentage
-        match_pct = _calculate_group_match(participant_ids, venue, supabase)
+        match_pct = _calculate_group_match(fused_data, venue)
 
         venues.append(SessionVenueResponse(
             venue_id=venue_id,
@@ -2,23 +2,42 @@
 
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException
+import asyncio
+import json
+from collections.abc import AsyncIterator
+
+from fastapi import APIRouter, BackgroundTasks, Depends, Header, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from supabase import Client
 
 from app.dependencies import get_supabase_client
 from app.intelligence import DeclaredTaste, ProfileTitleMapper
-from app.intelligence.taste_fusion import TasteFusion
-from app.intelligence.aggregation_engine import UserAnalysis, CategoryStats
 from app.intelligence.ring_builder import RingBuilder
-from app.intelligence.insight_generator import InsightGenerator, Insight
-from app.intelligence.dna_generator import DNAGenerator, DNATrait
+from app.intelligence.generation_cache import GenerationCache
+from app.intelligence.insight_generator import InsightGenerator
 from app.intelligence.profile_titles import AIProfileTitleGenerator
+from app.intelligence.rule_insights import RuleInsightEngine
 from app.mappings.plaid_categories import NON_RECOMMENDATION_CATEGORIES
-from decimal import Decimal
-from datetime import date, datetime, timezone, timedelta
-
-router = APIRouter(prefix="/api/taste", tags=["taste"])
+from app.services.daily_content_cache import (
+    get_daily_content,
+    invalidate_daily_content,
+    set_daily_content,
+)
+from app.services.fused_taste_service import FusedTasteService, build_declared_taste
+from app.services.fused_taste_service import claim_refresh as claim_fused_refresh
+from app.services.row_loader import KEY_COLUMNS, RowLoader, get_row_loader
+from app.services.taste_precompute import (
+    TastePrecomputeService,
+    build_insight_rows,
+    claim_regeneration,
+    insight_user_data,
+)
+from app.services.user_activity import record_activity
+from datetime import date, datetime, timezone
+
+# Every taste endpoint is keyed by user_id; requests count as app activity
+router = APIRouter(prefix="/api/taste", tags=["taste"], dependencies=[Depends(record_activity)])
 
 
 class TasteTraitResponse(BaseModel):
@@ -70,6 +89,7 @@ class TasteProfileResponse(BaseModel):
     vibe_preferences: list[str]
     cuisine_preferences: list[str]
     price_tier: str | None
+    stale: bool = False  # Title is yesterday's or rule-based; a fresh one is generating
 
 
 def get_profile_mapper() -> ProfileTitleMapper:
@@ -77,99 +97,189 @@ def get_profile_mapper() -> ProfileTitleMapper:
     return ProfileTitleMapper()
 
 
-def get_ai_title_generator() -> AIProfileTitleGenerator:
-    """Dependency for AIProfileTitleGenerator."""
-    return AIProfileTitleGenerator()
+def get_ai_title_generator(
+    supabase: Client = Depends(get_supabase_client),
+) -> AIProfileTitleGenerator:
+    """Dependency for AIProfileTitleGenerator (reusing titles for unchanged inputs)."""
+    return AIProfileTitleGenerator(cache=GenerationCache(supabase))
+
+
+def get_insight_generator(
+    supabase: Client = Depends(get_supabase_client),
+) -> InsightGenerator:
+    """Dependency for InsightGenerator (reusing insights for unchanged inputs)."""
+    return InsightGenerator(cache=GenerationCache(supabase))
+
+
+def schedule_regeneration(
+    background_tasks: BackgroundTasks,
+    supabase: Client,
+    user_id: str,
+    title_generator: AIProfileTitleGenerator | None = None,
+) -> None:
+    """Regenerate a user's stale daily content after the response is sent.
+
+    Fills every missing kind (insights, DNA, title) at once, so the first
+    endpoint to miss warms the others. At most one regeneration per user
+    is queued per process.
+
+    Args:
+        background_tasks: Request's background tasks
+        supabase: Supabase client
+        user_id: User's ID
+        title_generator: Title generator to use (defaults to a new one)
+    """
+    if not claim_regeneration(user_id):
+        return
+    service = TastePrecomputeService(supabase, title_generator=title_generator)
+    background_tasks.add_task(service.regenerate, user_id)
+    print(f"[Taste] Scheduled background regeneration for {user_id}")
 
 
 async def get_or_generate_profile_title(
     user_id: str,
     supabase: Client,
     ai_generator: AIProfileTitleGenerator,
-    user_data: dict,
-    force_refresh: bool = False,
-) -> tuple[str, str]:
-    """Get cached AI profile title or generate new one.
+    declared_taste: DeclaredTaste,
+    profile_mapper: ProfileTitleMapper,
+    background_tasks: BackgroundTasks,
+    tz: str | None = None,
+) -> tuple[str, str, bool]:
+    """Get today's AI profile title, or a stale one while it regenerates.
+
+    Never waits on the LLM: when the cached title has expired (or there is
+    none), the expired title - or the rule-based title if there is none -
+    is returned and a new one is generated in the background. Unexpired
+    titles are kept in the daily content cache.
 
     Args:
         user_id: User's ID
         supabase: Supabase client
-        ai_generator: AI title generator
-        user_data: Combined quiz + transaction data
-        force_refresh: If True, regenerate even if cached
+        ai_generator: AI title generator for the background regeneration
+        declared_taste: User's declared taste (for the rule-based fallback)
+        profile_mapper: Rule-based title mapper
+        background_tasks: Request's background tasks
+        tz: User's IANA timezone (when the cached title expires)
 
     Returns:
-        Tuple of (title, tagline)
+        Tuple of (title, tagline, stale)
     """
-    # Check cache first (unless force refresh) - use execute() to avoid 406 on zero rows
-    if not force_refresh:
-        try:
-            cache_list = (
-                supabase.table("daily_profile_titles")
-                .select("title, tagline, expires_at")
-                .eq("user_id", user_id)
-                .execute()
-            )
-            if cache_list.data:
-                cache_row = cache_list.data[0]
-                expires_at = datetime.fromisoformat(
-                    cache_row["expires_at"].replace("Z", "+00:00")
-                )
-                if expires_at > datetime.now(timezone.utc):
-                    print(f"[Taste] Using cached profile title for {user_id}")
-                    return cache_row["title"], cache_row["tagline"]
-        except Exception as e:
-            print(f"[Taste] Cache check error: {e}")
-
-    # Generate new title with AI
-    print(f"[Taste] Generating AI profile title for {user_id}")
-    title, tagline = ai_generator.generate(user_data)
+    today = date.today()
+    cache_row = get_daily_content("title", user_id, today)
+    if cache_row:
+        return profile_title_from_row(user_id, cache_row, declared_taste, profile_mapper)
 
-    # Store in cache (upsert)
+    # Check stored title - use execute() to avoid 406 on zero rows
     try:
-        supabase.table("daily_profile_titles").upsert(
-            {
-                "user_id": user_id,
-                "title": title,
-                "tagline": tagline,
-                "generated_at": datetime.now(timezone.utc).isoformat(),
-                "expires_at": (
-                    datetime.now(timezone.utc).replace(hour=0, minute=0, second=0)
-                    + timedelta(days=1)
-                ).isoformat(),
-            },
-            on_conflict="user_id",
-        ).execute()
-        print(f"[Taste] Cached profile title: {title}")
+        cache_list = (
+            supabase.table("daily_profile_titles")
+            .select("title, tagline, expires_at")
+            .eq("user_id", user_id)
+            .execute()
+        )
+        cache_row = cache_list.data[0] if cache_list.data else None
     except Exception as e:
-        print(f"[Taste] Cache store error: {e}")
+        print(f"[Taste] Cache check error: {e}")
 
-    return title, tagline
+    title, tagline, stale = profile_title_from_row(
+        user_id, cache_row, declared_taste, profile_mapper
+    )
+    if stale:
+        schedule_regeneration(background_tasks, supabase, user_id, ai_generator)
+    else:
+        cache_title(user_id, cache_row, today, tz)
+    return title, tagline, stale
+
+
+def cache_title(user_id: str, cache_row: dict, today: date, tz: str | None) -> None:
+    """Keep an unexpired daily_profile_titles row in the daily content cache."""
+    expires_at = datetime.fromisoformat(cache_row["expires_at"].replace("Z", "+00:00"))
+    set_daily_content("title", user_id, today, cache_row, tz, until=expires_at)
+
+
+def profile_title_from_row(
+    user_id: str,
+    cache_row: dict | None,
+    declared_taste: DeclaredTaste,
+    profile_mapper: ProfileTitleMapper,
+) -> tuple[str, str, bool]:
+    """Pick the profile title to serve from a daily_profile_titles row.
+
+    Args:
+        user_id: User's ID (for logging)
+        cache_row: The user's daily_profile_titles row, if any
+        declared_taste: User's declared taste (for the rule-based fallback)
+        profile_mapper: Rule-based title mapper
+
+    Returns:
+        Tuple of (title, tagline, stale); stale titles need regenerating
+    """
+    if cache_row:
+        expires_at = datetime.fromisoformat(cache_row["expires_at"].replace("Z", "+00:00"))
+        if expires_at > datetime.now(timezone.utc):
+            print(f"[Taste] Using cached profile title for {user_id}")
+            return cache_row["title"], cache_row["tagline"], False
+        print(f"[Taste] Serving expired profile title for {user_id}")
+        return cache_row["title"], cache_row["tagline"], True
+
+    print(f"[Taste] Serving rule-based profile title for {user_id}")
+    title, tagline = profile_mapper.get_title(declared_taste)
+    return title, tagline, True
+
+
+def profile_response(
+    declared_taste: DeclaredTaste,
+    title: str,
+    tagline: str,
+    stale: bool,
+    profile_mapper: ProfileTitleMapper,
+) -> TasteProfileResponse:
+    """Build the taste profile response (traits are rule-based)."""
+    traits = profile_mapper.calculate_traits(declared_taste)
+    print(f"[Taste] Title: {title}, Traits: {len(traits)}")
+
+    return TasteProfileResponse(
+        title=title,
+        tagline=tagline,
+        traits=[
+            TasteTraitResponse(
+                name=t.name,
+                emoji=t.emoji,
+                description=t.description,
+                score=t.score,
+                color=t.color,
+            )
+            for t in traits
+        ],
+        exploration_style=declared_taste.exploration_style,
+        vibe_preferences=declared_taste.vibe_preferences,
+        cuisine_preferences=declared_taste.cuisine_preferences,
+        price_tier=declared_taste.price_tier,
+        stale=stale,
+    )
 
 
 @router.get("/profile/{user_id}", response_model=TasteProfileResponse)
 async def get_taste_profile(
     user_id: str,
+    background_tasks: BackgroundTasks,
     supabase: Client = Depends(get_supabase_client),
     profile_mapper: ProfileTitleMapper = Depends(get_profile_mapper),
     ai_generator: AIProfileTitleGenerator = Depends(get_ai_title_generator),
+    loader: RowLoader = Depends(get_row_loader),
+    tz: str = Query(default="UTC", description="User's IANA timezone (e.g., America/New_York)"),
 ) -> TasteProfileResponse:
     """Get taste profile for a user.
 
     Returns profile title, tagline, traits, and preferences.
-    Uses AI-generated titles with daily caching.
+    Uses AI-generated titles with daily caching; a missing or expired
+    title is served stale (stale: true) while it regenerates.
     """
     print(f"[Taste] Fetching profile for user: {user_id}")
 
     # Fetch declared_taste from database
     try:
-        result_list = (
-            supabase.table("declared_taste")
-            .select("*")
-            .eq("user_id", user_id)
-            .execute()
-        )
-        data = result_list.data[0] if result_list.data else None
+        data = await loader.load("declared_taste", user_id)
         print(f"[Taste] Query result: {data}")
     except Exception as e:
         print(f"[Taste] DB error for {user_id}: {e}")
@@ -181,64 +291,14 @@ async def get_taste_profile(
 
     try:
         # Convert DB data to DeclaredTaste
-        declared_taste = DeclaredTaste(
-            vibe_preferences=data.get("vibe_preferences") or [],
-            cuisine_preferences=data.get("cuisine_preferences") or [],
-            exploration_style=data.get("exploration_style"),
-            social_preference=data.get("social_preference"),
-            price_tier=data.get("price_tier"),
-        )
+        declared_taste = build_declared_taste(data)
 
-        # Fetch observed taste for AI context - use execute() to avoid 406 on zero rows
-        observed_data = {}
-        try:
-            analysis_list = (
-                supabase.table("user_analysis")
-                .select("categories")
-                .eq("user_id", user_id)
-                .execute()
-            )
-            if analysis_list.data:
-                observed_data["categories"] = analysis_list.data[0].get("categories", {})
-        except Exception:
-            pass  # Continue without observed data
-
-        # Build user_data for AI generation
-        user_data = {
-            "exploration_style": declared_taste.exploration_style,
-            "vibe_preferences": declared_taste.vibe_preferences,
-            "social_preference": declared_taste.social_preference,
-            "price_tier": declared_taste.price_tier,
-            **observed_data,
-        }
-
-        # Get AI-generated title with caching
-        title, tagline = await get_or_generate_profile_title(
-            user_id, supabase, ai_generator, user_data
+        # Get AI-generated title with caching (regenerated in the background)
+        title, tagline, stale = await get_or_generate_profile_title(
+            user_id, supabase, ai_generator, declared_taste, profile_mapper, background_tasks, tz
         )
 
-        # Calculate traits (rule-based)
-        traits = profile_mapper.calculate_traits(declared_taste)
-        print(f"[Taste] Title: {title}, Traits: {len(traits)}")
-
-        return TasteProfileResponse(
-            title=title,
-            tagline=tagline,
-            traits=[
-                TasteTraitResponse(
-                    name=t.name,
-                    emoji=t.emoji,
-                    description=t.description,
-                    score=t.score,
-                    color=t.color,
-                )
-                for t in traits
-            ],
-            exploration_style=declared_taste.exploration_style,
-            vibe_preferences=declared_taste.vibe_preferences,
-            cuisine_preferences=declared_taste.cuisine_preferences,
-            price_tier=declared_taste.price_tier,
-        )
+        return profile_response(declared_taste, title, tagline, stale, profile_mapper)
     except Exception as e:
         print(f"[Taste] Processing error for {user_id}: {e}")
         import traceback
@@ -265,7 +325,7 @@ def calculate_confidence(total_transactions: int) -> float:
 @router.get("/observed/{user_id}", response_model=ObservedTasteResponse)
 async def get_observed_taste(
     user_id: str,
-    supabase: Client = Depends(get_supabase_client),
+    loader: RowLoader = Depends(get_row_loader),
 ) -> ObservedTasteResponse:
     """Get observed (transaction-based) taste data for a user.
 
@@ -275,14 +335,7 @@ async def get_observed_taste(
     print(f"[Taste] Fetching observed taste for user: {user_id}")
 
     try:
-        result = (
-            supabase.table("user_analysis")
-            .select("*")
-            .eq("user_id", user_id)
-            .execute()
-        )
-        # Get first row if exists (avoid maybe_single 406 error on zero rows)
-        data_row = result.data[0] if result.data else None
+        data_row = await loader.load("user_analysis", user_id)
         print(f"[Taste] Observed query result: {data_row}")
     except Exception as e:
         print(f"[Taste] DB error for observed {user_id}: {e}")
@@ -290,6 +343,13 @@ async def get_observed_taste(
 
     if not data_row:
         print(f"[Taste] No observed data for {user_id}, returning empty")
+
+    return observed_response(data_row)
+
+
+def observed_response(data: dict | None) -> ObservedTasteResponse:
+    """Build the observed taste response from a user_analysis row."""
+    if not data:
         # Return empty data structure for users without transactions
         return ObservedTasteResponse(
             categories={},
@@ -302,7 +362,6 @@ async def get_observed_taste(
             confidence=0.0,
         )
 
-    data = data_row
     total_txns = data.get("total_transactions", 0)
 
     # Parse categories from JSONB, filtering out non-recommendation categories
@@ -364,113 +423,65 @@ class FusedTasteResponse(BaseModel):
     tx_weight: float
 
 
-@router.get("/fused/{user_id}", response_model=FusedTasteResponse)
+def fused_taste_response(row: dict) -> FusedTasteResponse:
+    """Convert a fused_taste row to the response model."""
+    return FusedTasteResponse(
+        user_id=row["user_id"],
+        profile_title=row["profile_title"],
+        profile_tagline=row["profile_tagline"],
+        categories=[FusedCategoryResponse(**c) for c in row.get("categories") or []],
+        vibes=row.get("vibes") or [],
+        top_cuisines=row.get("top_cuisines") or [],
+        exploration_ratio=row.get("exploration_ratio") or 0.0,
+        confidence=row.get("confidence") or 0.0,
+        quiz_weight=row.get("quiz_weight") if row.get("quiz_weight") is not None else 1.0,
+        tx_weight=row.get("tx_weight") or 0.0,
+    )
+
+
+@router.get(
+    "/fused/{user_id}",
+    response_model=FusedTasteResponse,
+    responses={304: {"description": "Fused taste unchanged since the If-None-Match ETag"}},
+)
 async def get_fused_taste(
     user_id: str,
+    response: Response,
+    background_tasks: BackgroundTasks,
     supabase: Client = Depends(get_supabase_client),
     profile_mapper: ProfileTitleMapper = Depends(get_profile_mapper),
-) -> FusedTasteResponse:
+    loader: RowLoader = Depends(get_row_loader),
+    if_none_match: str | None = Header(None),
+) -> FusedTasteResponse | Response:
     """Get fused taste profile combining quiz + transaction data.
 
-    Merges declared taste (from quiz) with observed taste (from transactions)
-    using a weighted algorithm based on transaction volume.
+    Fusion runs when its inputs change (quiz submission, aggregation) and
+    is stored in fused_taste; this endpoint only reads it. The ETag is the
+    row's input version, so an unchanged profile returns 304.
+
+    A user whose fused taste was never stored gets it fused in memory,
+    with one deduplicated background refresh to store it.
     """
     print(f"[Taste] Fetching fused taste for user: {user_id}")
 
-    # Fetch declared_taste - use execute() for consistency
-    declared_list = (
-        supabase.table("declared_taste")
-        .select("*")
-        .eq("user_id", user_id)
-        .execute()
-    )
-    declared_result_row = declared_list.data[0] if declared_list.data else None
-
-    # Fetch user_analysis (observed) - use execute() to avoid 406 on zero rows
-    try:
-        observed_list = (
-            supabase.table("user_analysis")
-            .select("*")
-            .eq("user_id", user_id)
-            .execute()
+    row = await loader.load("fused_taste", user_id)
+    if not row or not row.get("input_version"):
+        declared, observed = await asyncio.gather(
+            loader.load("declared_taste", user_id),
+            loader.load("user_analysis", user_id),
         )
-        observed_data_row = observed_list.data[0] if observed_list.data else None
-    except Exception as e:
-        print(f"[Taste] Error fetching user_analysis: {e}")
-        observed_data_row = None
-
-    # Build DeclaredTaste
-    declared_data = declared_result_row if declared_result_row else {}
-    declared_taste = DeclaredTaste(
-        vibe_preferences=declared_data.get("vibe_preferences") or [],
-        cuisine_preferences=declared_data.get("cuisine_preferences") or [],
-        exploration_style=declared_data.get("exploration_style"),
-        social_preference=declared_data.get("social_preference"),
-        price_tier=declared_data.get("price_tier"),
-    )
-
-    # Build UserAnalysis from DB data (may be empty if no transactions analyzed yet)
-    observed_data = observed_data_row if observed_data_row else {}
-    user_analysis = UserAnalysis(user_id=user_id)
-    user_analysis.total_transactions = observed_data.get("total_transactions", 0)
-
-    # Parse categories from JSONB
-    for cat_name, cat_data in observed_data.get("categories", {}).items():
-        user_analysis.categories[cat_name] = CategoryStats(
-            count=cat_data.get("count", 0),
-            total_spend=Decimal(str(cat_data.get("total_spend", 0))),
-            merchants=set(cat_data.get("merchants", [])),
-        )
-
-    # Parse merchant visits
-    user_analysis.merchant_visits = observed_data.get("merchant_visits", {})
+        service = FusedTasteService(supabase, profile_mapper)
+        row = service.fuse_rows(user_id, declared or {}, observed or {})
+        if claim_fused_refresh(user_id):
+            background_tasks.add_task(service.refresh_claimed, user_id)
+            print(f"[Taste] Scheduled fused taste backfill for {user_id}")
 
-    # Parse cuisine data
-    user_analysis.cuisines = observed_data.get("cuisines", {})
-    user_analysis.top_cuisines = observed_data.get("top_cuisines", [])
+    etag = f'"{row["input_version"]}"'
+    if if_none_match == etag:
+        return Response(status_code=304, headers={"ETag": etag})
 
-    # Run fusion algorithm
-    fusion = TasteFusion()
-    fused = fusion.fuse(declared_taste, user_analysis)
-
-    # Get profile title based on declared taste
-    title, tagline = profile_mapper.get_title(declared_taste)
-
-    # Store fused result in database
-    fused_dict = fused.to_dict()
-    supabase.table("fused_taste").upsert(
-        {
-            "user_id": user_id,
-            "categories": fused_dict["categories"],
-            "vibes": fused_dict["vibes"],
-            "exploration_ratio": fused_dict["exploration_ratio"],
-            "confidence": fused_dict["confidence"],
-            "mismatches": fused_dict["mismatches"],
-        },
-        on_conflict="user_id",
-    ).execute()
-
-    return FusedTasteResponse(
-        user_id=user_id,
-        profile_title=title,
-        profile_tagline=tagline,
-        categories=[
-            FusedCategoryResponse(
-                name=c.name,
-                percentage=c.percentage,
-                color=c.color,
-                count=c.count,
-                total_spend=c.total_spend,
-            )
-            for c in fused.categories
-        ],
-        vibes=fused.vibes,
-        top_cuisines=fused.top_cuisines,
-        exploration_ratio=fused.exploration_ratio,
-        confidence=fused.confidence,
-        quiz_weight=fused.quiz_weight,
-        tx_weight=fused.tx_weight,
-    )
+    response.headers["ETag"] = etag
+    return fused_taste_response(row)
 
 
 class RingSegmentResponse(BaseModel):
@@ -493,6 +504,7 @@ class TasteRingResponse(BaseModel):
 async def get_taste_ring(
     user_id: str,
     supabase: Client = Depends(get_supabase_client),
+    loader: RowLoader = Depends(get_row_loader),
 ) -> TasteRingResponse:
     """Get taste ring visualization data.
 
@@ -506,8 +518,11 @@ async def get_taste_ring(
     """
     print(f"[Taste] Building ring for user: {user_id}")
 
-    builder = RingBuilder(supabase)
-    ring_data = builder.build_ring(user_id)
+    # Load both rows in one batch
+    analysis, declared = await asyncio.gather(
+        loader.load("user_analysis", user_id), loader.load("declared_taste", user_id)
+    )
+    ring_data = RingBuilder(supabase).build_ring_from_rows(analysis, declared)
 
     return TasteRingResponse(
         segments=[
@@ -539,123 +554,261 @@ class InsightsListResponse(BaseModel):
 
     insights: list[InsightResponse]
     generated_at: datetime | None
+    stale: bool = False  # Not today's insights; fresh ones are generating
+
+
+def latest_previous_rows(
+    supabase: Client,
+    table: str,
+    user_id: str,
+    today: date,
+) -> list[dict]:
+    """Get a user's most recent day of rows before today from a daily_* table.
+
+    Args:
+        supabase: Supabase client
+        table: daily_insights or daily_dna
+        user_id: User's ID
+        today: Current day
+
+    Returns:
+        Rows from the latest earlier shown_at (empty if none)
+    """
+    result = (
+        supabase.table(table)
+        .select("*")
+        .eq("user_id", user_id)
+        .lt("shown_at", str(today))
+        .order("shown_at", desc=True)
+        .limit(10)
+        .execute()
+    )
+    rows = result.data or []
+    if not rows:
+        return []
+    latest = rows[0]["shown_at"]
+    return [row for row in rows if row["shown_at"] == latest]
+
+
+# daily_* table per cached content kind, and how many rows make a full day
+DAILY_TABLES = {"insights": ("daily_insights", 1), "dna": ("daily_dna", 4)}
+
+
+def todays_rows(
+    supabase: Client,
+    kind: str,
+    user_id: str,
+    today: date,
+    tz: str | None,
+) -> list[dict]:
+    """Get a user's rows for today from a daily_* table, via the cache.
+
+    A full day's rows are cached until the user's local midnight, so
+    repeat views don't query the table.
+
+    Args:
+        supabase: Supabase client
+        kind: insights or dna
+        user_id: User's ID
+        today: Current day
+        tz: User's IANA timezone
+
+    Returns:
+        Today's rows (empty if today's content isn't complete)
+    """
+    rows = get_daily_content(kind, user_id, today)
+    if rows is not None:
+        return rows
+
+    table, minimum = DAILY_TABLES[kind]
+    result = (
+        supabase.table(table)
+        .select("*")
+        .eq("user_id", user_id)
+        .eq("shown_at", str(today))
+        .execute()
+    )
+    rows = result.data or []
+    if len(rows) < minimum:
+        return []
+    set_daily_content(kind, user_id, today, rows, tz)
+    return rows
+
+
+def insight_responses(rows: list[dict]) -> list[InsightResponse]:
+    """Convert daily_insights rows to response models."""
+    return [
+        InsightResponse(
+            id=row["id"],
+            type=row["insight_type"],
+            title=row["title"],
+            body=row["body"],
+            emoji=row.get("emoji", "💡"),
+            created_at=row["created_at"],
+        )
+        for row in rows
+    ]
 
 
 @router.get("/insights/{user_id}", response_model=InsightsListResponse)
 async def get_insights(
     user_id: str,
+    background_tasks: BackgroundTasks,
     supabase: Client = Depends(get_supabase_client),
+    loader: RowLoader = Depends(get_row_loader),
+    tz: str = Query(default="UTC", description="User's IANA timezone (e.g., America/New_York)"),
 ) -> InsightsListResponse:
     """Get personalized insights for a user.
 
-    On-demand generation:
-    1. Check if insights exist for today
-    2. If yes → return from DB
-    3. If no → generate via LLM, store, return
+    Stale-while-revalidate (insights are normally precomputed nightly):
+    1. Check if insights exist for today (in memory, then in the DB)
+    2. If yes → return them (kept in memory until the user's midnight)
+    3. If no → return the most recent earlier insights (or rule-based
+       insights from the user's aggregates) with stale: true and
+       regenerate today's in the background
     """
     print(f"[Insights] Fetching insights for user: {user_id}")
 
     today = date.today()
 
     # Check for existing insights today
-    existing = (
-        supabase.table("daily_insights")
-        .select("*")
-        .eq("user_id", user_id)
-        .eq("shown_at", str(today))
-        .execute()
-    )
+    rows = todays_rows(supabase, "insights", user_id, today, tz)
 
-    if existing.data and len(existing.data) > 0:
-        print(f"[Insights] Found {len(existing.data)} cached insights")
+    if rows:
+        print(f"[Insights] Found {len(rows)} cached insights")
         return InsightsListResponse(
-            insights=[
-                InsightResponse(
-                    id=row["id"],
-                    type=row["insight_type"],
-                    title=row["title"],
-                    body=row["body"],
-                    emoji=row.get("emoji", "💡"),
-                    created_at=row["created_at"],
-                )
-                for row in existing.data
-            ],
-            generated_at=existing.data[0]["created_at"] if existing.data else None,
+            insights=insight_responses(rows),
+            generated_at=rows[0]["created_at"],
         )
 
-    # No insights for today - generate new ones
-    print(f"[Insights] Generating new insights for user: {user_id}")
+    # No insights for today - serve the last ones while new ones generate
+    previous = latest_previous_rows(supabase, "daily_insights", user_id, today)
+    if previous:
+        print(f"[Insights] Serving {len(previous)} stale insights for user: {user_id}")
+        response = InsightsListResponse(
+            insights=insight_responses(previous),
+            generated_at=previous[0]["created_at"],
+            stale=True,
+        )
+    else:
+        # Never generated - fall back to rule-based insights from the aggregates
+        print(f"[Insights] Serving rule-based insights for user: {user_id}")
+        response = rule_based_insights_response(await loader.load("user_analysis", user_id))
 
-    # Fetch user_analysis for the generator - use execute() to avoid 406 on zero rows
-    analysis_list = (
-        supabase.table("user_analysis")
-        .select("*")
-        .eq("user_id", user_id)
-        .execute()
+    # Schedule only once the reads succeeded, so a failed request can't hold the claim
+    schedule_regeneration(background_tasks, supabase, user_id)
+    return response
+
+
+def rule_based_insights_response(analysis: dict | None) -> InsightsListResponse:
+    """Build stale insights from the user's aggregates (empty without data)."""
+    if not analysis:
+        return InsightsListResponse(insights=[], generated_at=None, stale=True)
+
+    now = datetime.now(timezone.utc)
+    return InsightsListResponse(
+        insights=[
+            InsightResponse(
+                id=f"rule-{index}-{insight.type}",
+                type=insight.type,
+                title=insight.title,
+                body=insight.body,
+                emoji=insight.emoji,
+                created_at=now,
+            )
+            for index, insight in enumerate(RuleInsightEngine().generate(analysis))
+        ],
+        generated_at=None,
+        stale=True,
     )
-    analysis_row = analysis_list.data[0] if analysis_list.data else None
-
-    if not analysis_row:
-        print(f"[Insights] No user analysis found, returning empty")
-        return InsightsListResponse(insights=[], generated_at=None)
-
-    analysis = analysis_row
-
-    # Build user data dict for generator
-    user_data = {
-        "total_transactions": analysis.get("total_transactions", 0),
-        "categories": analysis.get("categories", {}),
-        "streaks": analysis.get("streaks", {}),
-        "exploration": analysis.get("exploration", {}),
-        "time_buckets": analysis.get("time_buckets", {}),
-        "top_merchants": analysis.get("top_merchants", []),
-    }
 
-    # Generate insights
-    try:
-        generator = InsightGenerator()
-        insights = generator.generate(user_data)
-        print(f"[Insights] Generated {len(insights)} insights")
-    except Exception as e:
-        print(f"[Insights] LLM generation failed: {e}")
-        # Return empty insights on LLM failure (API key missing, rate limit, etc.)
-        return InsightsListResponse(insights=[], generated_at=None)
-
-    # Store in database
-    now = datetime.now()
-    stored_insights = []
-
-    for insight in insights:
-        result = (
-            supabase.table("daily_insights")
-            .insert({
-                "user_id": user_id,
-                "insight_type": insight.type,
-                "title": insight.title,
-                "body": insight.body,
-                "emoji": insight.emoji,
-                "source_data": user_data,
-                "shown_at": str(today),
-            })
-            .execute()
-        )
 
-        if result.data:
-            row = result.data[0]
-            stored_insights.append(
-                InsightResponse(
-                    id=row["id"],
-                    type=row["insight_type"],
-                    title=row["title"],
-                    body=row["body"],
-                    emoji=row.get("emoji", "💡"),
-                    created_at=row["created_at"],
-                )
+def sse_event(event: str, data: dict) -> str:
+    """Format one server-sent event."""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+@router.get("/insights/{user_id}/stream")
+async def stream_insights(
+    user_id: str,
+    supabase: Client = Depends(get_supabase_client),
+    generator: InsightGenerator = Depends(get_insight_generator),
+    loader: RowLoader = Depends(get_row_loader),
+    tz: str = Query(default="UTC", description="User's IANA timezone (e.g., America/New_York)"),
+) -> StreamingResponse:
+    """Stream today's insights as server-sent events.
+
+    Each insight is sent as an "insight" event as soon as it is parsed
+    from the model stream (or at once if today's insights already exist).
+    New insights are stored with one bulk write at the end, then a "done"
+    event carries the stored list in InsightsListResponse shape. If
+    generation fails before any insight is sent, rule-based insights are
+    sent instead (done is stale: true); otherwise an "error" event is
+    sent. Either way nothing is stored.
+    """
+    print(f"[Insights] Streaming insights for user: {user_id}")
+
+    today = date.today()
+
+    existing = todays_rows(supabase, "insights", user_id, today, tz)
+
+    async def events() -> AsyncIterator[str]:
+        if existing:
+            print(f"[Insights] Found {len(existing)} cached insights")
+            stored = insight_responses(existing)
+            for insight in stored:
+                yield sse_event("insight", insight.model_dump(mode="json"))
+            response = InsightsListResponse(insights=stored, generated_at=stored[0].created_at)
+            yield sse_event("done", response.model_dump(mode="json"))
+            return
+
+        analysis = await loader.load("user_analysis", user_id)
+        if not analysis:
+            print("[Insights] No user analysis found, returning empty")
+            empty = InsightsListResponse(insights=[], generated_at=None)
+            yield sse_event("done", empty.model_dump(mode="json"))
+            return
+
+        insights = []
+        try:
+            async for insight in generator.astream(insight_user_data(analysis)):
+                insights.append(insight)
+                yield sse_event("insight", insight.model_dump())
+        except Exception as e:
+            print(f"[Insights] LLM streaming failed: {e}")
+            # Serve rule-based insights (unstored) rather than nothing
+            fallback = rule_based_insights_response(analysis)
+            if insights or not fallback.insights:
+                yield sse_event("error", {"detail": "Insight generation failed"})
+                return
+            for insight in fallback.insights:
+                yield sse_event("insight", insight.model_dump(mode="json"))
+            yield sse_event("done", fallback.model_dump(mode="json"))
+            return
+        print(f"[Insights] Streamed {len(insights)} insights")
+
+        # One bulk write; a concurrent generation for today wins quietly
+        stored = []
+        rows = build_insight_rows(user_id, insights, analysis, today)
+        if rows:
+            result = (
+                supabase.table("daily_insights")
+                .upsert(rows, on_conflict="user_id,shown_at,insight_type", ignore_duplicates=True)
+                .execute()
             )
+            stored = insight_responses(result.data or [])
+            if result.data:
+                set_daily_content("insights", user_id, today, result.data, tz)
+        response = InsightsListResponse(
+            insights=stored,
+            generated_at=stored[0].created_at if stored else None,
+        )
+        yield sse_event("done", response.model_dump(mode="json"))
 
-    return InsightsListResponse(
-        insights=stored_insights,
-        generated_at=now,
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
 
 
@@ -666,6 +819,7 @@ async def clear_insights_cache(
 ) -> dict:
     """DEV ONLY: Clear cached insights for a user to force regeneration."""
     print(f"[Insights] Clearing cache for user: {user_id}")
+    invalidate_daily_content("insights", user_id)
 
     result = (
         supabase.table("daily_insights")
@@ -699,134 +853,102 @@ class DNAListResponse(BaseModel):
 
     traits: list[DNATraitResponse]
     generated_at: datetime | None
+    stale: bool = False  # Not today's DNA; fresh traits are generating
+
+
+def dna_responses(rows: list[dict]) -> list[DNATraitResponse]:
+    """Convert daily_dna rows to response models."""
+    return [
+        DNATraitResponse(
+            id=row["id"],
+            name=row["trait_name"],
+            emoji=row["emoji"],
+            description=row["description"],
+            color=row["color"],
+            created_at=row["created_at"],
+        )
+        for row in rows
+    ]
 
 
 @router.get("/dna/{user_id}", response_model=DNAListResponse)
 async def get_dna(
     user_id: str,
+    background_tasks: BackgroundTasks,
     supabase: Client = Depends(get_supabase_client),
+    profile_mapper: ProfileTitleMapper = Depends(get_profile_mapper),
+    loader: RowLoader = Depends(get_row_loader),
+    tz: str = Query(default="UTC", description="User's IANA timezone (e.g., America/New_York)"),
 ) -> DNAListResponse:
     """Get personalized DNA traits for a user.
 
-    On-demand generation:
-    1. Check if DNA exists for today
-    2. If yes → return from DB
-    3. If no → generate via LLM, store, return
+    Stale-while-revalidate (DNA is normally precomputed nightly):
+    1. Check if DNA exists for today (in memory, then in the DB)
+    2. If yes → return it (kept in memory until the user's midnight)
+    3. If no → return the most recent earlier DNA (or rule-based traits
+       from the quiz) with stale: true and regenerate in the background
     """
     print(f"[DNA] Fetching DNA for user: {user_id}")
 
     today = date.today()
 
     # Check for existing DNA today
-    existing = (
-        supabase.table("daily_dna")
-        .select("*")
-        .eq("user_id", user_id)
-        .eq("shown_at", str(today))
-        .execute()
-    )
+    rows = todays_rows(supabase, "dna", user_id, today, tz)
 
-    if existing.data and len(existing.data) >= 4:
-        print(f"[DNA] Found {len(existing.data)} cached traits")
+    if rows:
+        print(f"[DNA] Found {len(rows)} cached traits")
         return DNAListResponse(
-            traits=[
-                DNATraitResponse(
-                    id=row["id"],
-                    name=row["trait_name"],
-                    emoji=row["emoji"],
-                    description=row["description"],
-                    color=row["color"],
-                    created_at=row["created_at"],
-                )
-                for row in existing.data
-            ],
-            generated_at=existing.data[0]["created_at"] if existing.data else None,
+            traits=dna_responses(rows),
+            generated_at=rows[0]["created_at"],
         )
 
-    # No DNA for today - generate new traits
-    print(f"[DNA] Generating new DNA for user: {user_id}")
-
-    # Fetch user_analysis (transaction data) - use execute() to avoid 406 on zero rows
-    analysis_list = (
-        supabase.table("user_analysis")
-        .select("*")
-        .eq("user_id", user_id)
-        .execute()
-    )
-    analysis_row = analysis_list.data[0] if analysis_list.data else None
-
-    # Fetch declared_taste (quiz data) - use execute() to avoid 406 on zero rows
-    declared_list = (
-        supabase.table("declared_taste")
-        .select("*")
-        .eq("user_id", user_id)
-        .execute()
-    )
-    declared_row = declared_list.data[0] if declared_list.data else None
-
-    if not analysis_row and not declared_row:
-        print(f"[DNA] No user data found, returning empty")
-        return DNAListResponse(traits=[], generated_at=None)
-
-    # Combine data for generator
-    analysis = analysis_row or {}
-    declared = declared_row or {}
-
-    user_data = {
-        # Transaction data
-        "categories": analysis.get("categories", {}),
-        "top_merchants": analysis.get("top_merchants", []),
-        "time_buckets": analysis.get("time_buckets", {}),
-        # Quiz data
-        "exploration_style": declared.get("exploration_style"),
-        "vibe_preferences": declared.get("vibe_preferences", []),
-        "social_preference": declared.get("social_preference"),
-        "price_tier": declared.get("price_tier"),
-    }
-
-    # Generate DNA traits
-    try:
-        generator = DNAGenerator()
-        traits = generator.generate(user_data)
-        print(f"[DNA] Generated {len(traits)} traits")
-    except Exception as e:
-        print(f"[DNA] LLM generation failed: {e}")
-        return DNAListResponse(traits=[], generated_at=None)
-
-    # Store in database
-    now = datetime.now()
-    stored_traits = []
-
-    for trait in traits:
-        result = (
-            supabase.table("daily_dna")
-            .insert({
-                "user_id": user_id,
-                "trait_name": trait.name,
-                "emoji": trait.emoji,
-                "description": trait.description,
-                "color": trait.color,
-                "shown_at": str(today),
-            })
-            .execute()
+    # No DNA for today - serve the last traits while new ones generate
+    previous = latest_previous_rows(supabase, "daily_dna", user_id, today)
+    if previous:
+        print(f"[DNA] Serving {len(previous)} stale traits for user: {user_id}")
+        response = DNAListResponse(
+            traits=dna_responses(previous),
+            generated_at=previous[0]["created_at"],
+            stale=True,
         )
+    else:
+        # Never generated - fall back to rule-based traits from the quiz
+        declared_row = await loader.load("declared_taste", user_id)
+        if not declared_row:
+            print(f"[DNA] No previous DNA or quiz data for user: {user_id}")
+        else:
+            print(f"[DNA] Serving rule-based traits for user: {user_id}")
+        response = rule_based_dna_response(declared_row, profile_mapper)
+
+    # Schedule only once the reads succeeded, so a failed request can't hold the claim
+    schedule_regeneration(background_tasks, supabase, user_id)
+    return response
+
+
+def rule_based_dna_response(
+    declared_row: dict | None,
+    profile_mapper: ProfileTitleMapper,
+) -> DNAListResponse:
+    """Build stale DNA from quiz-based traits (empty without quiz data)."""
+    if not declared_row:
+        return DNAListResponse(traits=[], generated_at=None, stale=True)
 
-        if result.data:
-            row = result.data[0]
-            stored_traits.append(
-                DNATraitResponse(
-                    id=row["id"],
-                    name=row["trait_name"],
-                    emoji=row["emoji"],
-                    description=row["description"],
-                    color=row["color"],
-                    created_at=row["created_at"],
-                )
-            )
-
+    declared_taste = build_declared_taste(declared_row)
+    now = datetime.now(timezone.utc)
     return DNAListResponse(
-        traits=stored_traits,
-        generated_at=now,
+        traits=[
+            DNATraitResponse(
+                id=f"rule-{trait.name.lower()}",
+                name=trait.name,
+                emoji=trait.emoji,
+                description=trait.description,
+                color=trait.color,
+                created_at=now,
+            )
+            for trait in profile_mapper.calculate_traits(declared_taste)
+        ],
+        generated_at=None,
+        stale=True,
     )
 
 
@@ -837,6 +959,7 @@ async def clear_dna_cache(
 ) -> dict:
     """DEV ONLY: Clear cached DNA for a user to force regeneration."""
     print(f"[DNA] Clearing cache for user: {user_id}")
+    invalidate_daily_content("dna", user_id)
 
     result = (
         supabase.table("daily_dna")
@@ -849,3 +972,195 @@ async def clear_dna_cache(
     print(f"[DNA] Deleted {deleted_count} cached traits")
 
     return {"deleted": deleted_count}
+
+
+# ============== Bundle Endpoint ==============
+
+# Sections the bundle can return, and the source tables each one reads
+BUNDLE_SECTIONS: dict[str, tuple[str, ...]] = {
+    "profile": ("declared_taste", "daily_profile_titles"),
+    "observed": ("user_analysis",),
+    "fused": ("fused_taste", "declared_taste", "user_analysis"),
+    "ring": ("user_analysis", "declared_taste"),
+    "insights": ("daily_insights", "user_analysis"),
+    "dna": ("daily_dna", "declared_taste"),
+}
+
+
+# daily_* tables the bundle reads, and their daily content cache kind
+CACHED_TABLES = {
+    "daily_insights": "insights",
+    "daily_dna": "dna",
+    "daily_profile_titles": "title",
+}
+
+
+class TasteBundleResponse(BaseModel):
+    """Response model for the taste bundle (unrequested sections are null)."""
+
+    profile: TasteProfileResponse | None = None
+    observed: ObservedTasteResponse | None = None
+    fused: FusedTasteResponse | None = None
+    ring: TasteRingResponse | None = None
+    insights: InsightsListResponse | None = None
+    dna: DNAListResponse | None = None
+
+
+def fetch_bundle_table(supabase: Client, table: str, user_id: str, today: date) -> list[dict]:
+    """Read one source table's rows for the bundle.
+
+    daily_* tables return the latest days up to today (enough for today's
+    rows and the previous day's stale fallback); the rest one row per user.
+    (Tables in KEY_COLUMNS go through the request's RowLoader instead.)
+    """
+    query = supabase.table(table).select("*").eq("user_id", user_id)
+    if table in ("daily_insights", "daily_dna"):
+        query = query.lte("shown_at", str(today)).order("shown_at", desc=True).limit(10)
+    return query.execute().data or []
+
+
+def split_latest_day(rows: list[dict], today: date) -> tuple[list[dict], list[dict]]:
+    """Split daily_* rows (newest first) into today's and the latest earlier day's."""
+    current = [row for row in rows if row["shown_at"] == str(today)]
+    earlier = [row for row in rows if row["shown_at"] < str(today)]
+    latest = earlier[0]["shown_at"] if earlier else None
+    return current, [row for row in earlier if row["shown_at"] == latest]
+
+
+@router.get("/bundle/{user_id}", response_model=TasteBundleResponse)
+async def get_taste_bundle(
+    user_id: str,
+    background_tasks: BackgroundTasks,
+    sections: str | None = Query(None, description="Comma-separated sections (default: all)"),
+    supabase: Client = Depends(get_supabase_client),
+    profile_mapper: ProfileTitleMapper = Depends(get_profile_mapper),
+    ai_generator: AIProfileTitleGenerator = Depends(get_ai_title_generator),
+    loader: RowLoader = Depends(get_row_loader),
+    tz: str = Query(default="UTC", description="User's IANA timezone (e.g., America/New_York)"),
+) -> TasteBundleResponse:
+    """Get several taste sections in one round trip.
+
+    Each source table the requested sections need is read once,
+    concurrently, and every section is built from those shared rows.
+    Daily content already in the daily content cache isn't read at all.
+    Sections behave like their endpoints (profile, observed, fused, ring,
+    insights, dna) - including stale-while-revalidate - except that a
+    missing profile is null rather than a 404.
+    """
+    if sections:
+        requested = [s.strip() for s in sections.split(",") if s.strip()]
+    else:
+        requested = list(BUNDLE_SECTIONS)
+    unknown = [s for s in requested if s not in BUNDLE_SECTIONS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown sections: {', '.join(unknown)}")
+
+    print(f"[Taste] Fetching bundle ({', '.join(requested)}) for user: {user_id}")
+
+    today = date.today()
+    needed = {table for s in requested for table in BUNDLE_SECTIONS[s]}
+    # Today's content already in the daily content cache needs no read
+    cached = {
+        table: get_daily_content(kind, user_id, today)
+        for table, kind in CACHED_TABLES.items()
+        if table in needed
+    }
+    tables = sorted(table for table in needed if cached.get(table) is None)
+    results = await asyncio.gather(*(
+        loader.load(table, user_id)
+        if table in KEY_COLUMNS
+        else asyncio.to_thread(fetch_bundle_table, supabase, table, user_id, today)
+        for table in tables
+    ))
+    rows = {
+        table: ([result] if result else []) if table in KEY_COLUMNS else result
+        for table, result in zip(tables, results)
+    }
+
+    def first(table: str) -> dict | None:
+        return rows[table][0] if rows.get(table) else None
+
+    declared = first("declared_taste")
+    analysis = first("user_analysis")
+    bundle = TasteBundleResponse()
+
+    if "profile" in requested and declared:
+        declared_taste = build_declared_taste(declared)
+        title_row = cached.get("daily_profile_titles") or first("daily_profile_titles")
+        title, tagline, stale = profile_title_from_row(
+            user_id, title_row, declared_taste, profile_mapper
+        )
+        if stale:
+            schedule_regeneration(background_tasks, supabase, user_id, ai_generator)
+        elif not cached.get("daily_profile_titles"):
+            cache_title(user_id, title_row, today, tz)
+        bundle.profile = profile_response(declared_taste, title, tagline, stale, profile_mapper)
+
+    if "observed" in requested:
+        bundle.observed = observed_response(analysis)
+
+    if "fused" in requested:
+        fused_row = first("fused_taste")
+        if not fused_row or not fused_row.get("input_version"):
+            service = FusedTasteService(supabase, profile_mapper)
+            fused_row = service.fuse_rows(user_id, declared or {}, analysis or {})
+            if claim_fused_refresh(user_id):
+                background_tasks.add_task(service.refresh_claimed, user_id)
+        bundle.fused = fused_taste_response(fused_row)
+
+    if "ring" in requested:
+        ring = RingBuilder(supabase).build_ring_from_rows(analysis, declared)
+        bundle.ring = TasteRingResponse(
+            segments=[RingSegmentResponse(**segment) for segment in ring["segments"]],
+            profile_title=ring["profile_title"],
+            tagline=ring["tagline"],
+        )
+
+    if "insights" in requested:
+        if cached.get("daily_insights"):
+            current, previous = cached["daily_insights"], []
+        else:
+            current, previous = split_latest_day(rows["daily_insights"], today)
+            if current:
+                set_daily_content("insights", user_id, today, current, tz)
+        if current:
+            bundle.insights = InsightsListResponse(
+                insights=insight_responses(current),
+                generated_at=current[0]["created_at"],
+            )
+        else:
+            if previous:
+                bundle.insights = InsightsListResponse(
+                    insights=insight_responses(previous),
+                    generated_at=previous[0]["created_at"],
+                    stale=True,
+                )
+            else:
+                bundle.insights = rule_based_insights_response(analysis)
+            schedule_regeneration(background_tasks, supabase, user_id)
+
+    if "dna" in requested:
+        if cached.get("daily_dna"):
+            current, previous = cached["daily_dna"], []
+        else:
+            current, previous = split_latest_day(rows["daily_dna"], today)
+            if len(current) >= 4:
+                set_daily_content("dna", user_id, today, current, tz)
+        if len(current) >= 4:
+            bundle.dna = DNAListResponse(
+                traits=dna_responses(current),
+                generated_at=current[0]["created_at"],
+            )
+        else:
+            if previous:
+                bundle.dna = DNAListResponse(
+                    traits=dna_responses(previous),
+                    generated_at=previous[0]["created_at"],
+                    stale=True,
+                )
+            else:
+                bundle.dna = rule_based_dna_response(declared, profile_mapper)
+            schedule_regeneration(background_tasks, supabase, user_id)
+
+    print(f"[Taste] Bundle for {user_id}: {len(tables)} table reads")
+    return bundle
@@ -6,18 +6,34 @@ and manually added visits.
 
 from __future__ import annotations
 
-from datetime import datetime, timezone
-from zoneinfo import ZoneInfo
+import base64
+import json
+from datetime import datetime, timedelta, timezone
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request
 from pydantic import BaseModel
 from supabase import Client
 
 from app.dependencies import get_supabase_client
 from app.services.plaid_service import PlaidService
+from app.services.vault_summary_service import (
+    VaultSummaryService,
+    get_month_key,
+    get_place_key,
+    parse_tz,
+)
 
 router = APIRouter(prefix="/api/vault", tags=["vault"])
 
+# Delta sync re-reads this window before the token to cover in-flight
+# transactions and clock skew between the API and the database.
+# Clients apply changes by visit id, so the overlap is harmless.
+CHANGES_OVERLAP_SECONDS = 30
+
+# Tombstones older than this are pruned (see 021_place_visits_changes.sql),
+# so older sync tokens get a full resync instead of a delta
+TOMBSTONE_RETENTION_DAYS = 30
+
 
 def _build_photo_url(base_url: str, venue: dict | None) -> str | None:
     """Build photo URL using the photo proxy endpoint.
@@ -38,6 +54,28 @@ def _build_photo_url(base_url: str, venue: dict | None) -> str | None:
     return None
 
 
+def _encode_cursor(*values: str | None) -> str:
+    """Encode keyset values as an opaque URL-safe cursor."""
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+
+def _decode_cursor(cursor: str | None, size: int) -> list[str | None]:
+    """Decode a cursor from _encode_cursor, or Nones for the first page.
+
+    Raises:
+        HTTPException: 400 if the cursor is malformed
+    """
+    if not cursor:
+        return [None] * size
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not isinstance(values, list) or len(values) != size:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
+
+
 # --- Request/Response Models ---
 
 
@@ -58,6 +96,7 @@ class VisitResponse(BaseModel):
 class PlaceResponse(BaseModel):
     """Aggregated place with visit history."""
 
+    place_key: str  # venue_id, or merchant name for unmatched places
     venue_id: str | None
     venue_name: str
     venue_type: str | None
@@ -85,6 +124,50 @@ class VaultResponse(BaseModel):
     stats: VaultStatsResponse
 
 
+class PlaceSummaryResponse(BaseModel):
+    """Aggregated place without nested visits (paged vault)."""
+
+    place_key: str  # venue_id, or merchant name for unmatched places
+    venue_id: str | None
+    venue_name: str
+    venue_type: str | None
+    visit_count: int
+    last_visit: str
+    total_spent: float
+    reaction: str | None
+    photo_url: str | None
+    google_place_id: str | None
+
+
+class VaultPageResponse(BaseModel):
+    """One page of places; stats are only included on the first page."""
+
+    places: list[PlaceSummaryResponse]
+    stats: VaultStatsResponse | None
+    next_cursor: str | None
+    has_more: bool
+
+
+class PlaceVisitsPageResponse(BaseModel):
+    """One page of visit history for a single place."""
+
+    visits: list[VisitResponse]
+    next_cursor: str | None
+    has_more: bool
+
+
+class VaultChangesResponse(BaseModel):
+    """Visits changed since a sync token, plus fresh current-month stats."""
+
+    upserted: list[VisitResponse]  # Inserted or updated visits
+    deleted: list[str]  # Ids of deleted visits
+    stats: VaultStatsResponse
+    next_token: str  # Pass as since= on the next call
+    resync: bool = False  # Full snapshot: replace the local copy
+    next_cursor: str | None = None  # Snapshot only: pass as cursor= for the next page
+    has_more: bool = False
+
+
 class CreateVisitRequest(BaseModel):
     """Request to create a manual visit."""
 
@@ -111,126 +194,319 @@ class UpdateVisitRequest(BaseModel):
 async def get_visits(
     request: Request,
     user_id: str,
+    background_tasks: BackgroundTasks,
     tz: str = Query(default="UTC", description="User's IANA timezone (e.g., America/New_York)"),
+    include_visits: bool = Query(
+        default=False,
+        description=(
+            "Include nested visit history (reads every visit; "
+            "prefer /places/{user_id}/visits)"
+        ),
+    ),
     supabase: Client = Depends(get_supabase_client),
 ) -> VaultResponse:
     """Get all visits for a user, aggregated by place.
 
-    Auto-syncs transactions to place_visits and matches venues before returning.
-    Returns places with visit history, plus monthly stats based on user's timezone.
+    Serves the materialized vault summary (places + monthly stats in the
+    user's timezone). Syncing new transactions and matching venues runs in
+    the background after the response and refreshes the summary, so vault
+    open never waits on Google Places or Claude.
+
+    Places come without visits unless include_visits=true, which reads the
+    user's whole history; load a place's visits from
+    /places/{user_id}/visits by its place_key instead.
     """
-    # Auto-sync: Create place_visits from transactions and match venues
+    summary_service = VaultSummaryService(supabase)
+
+    # Auto-sync off the read path: create place_visits and match venues
     plaid_service = PlaidService(supabase)
-    plaid_service._create_place_visits(user_id)
+    background_tasks.add_task(plaid_service._create_place_visits, user_id)
 
     # Get base URL for photo proxy
     base_url = str(request.base_url).rstrip("/")
 
-    # Fetch visits with venue info via join
-    result = (
-        supabase.table("place_visits")
-        .select("*, venues(id, name, taste_cluster, photo_references, google_place_id)")
-        .eq("user_id", user_id)
-        .order("visited_at", desc=True)
-        .execute()
+    visits_data: list[dict] | None = None
+    summary = summary_service.get(user_id)
+
+    if not summary or summary.get("tz") != tz:
+        # First open (or timezone change): build from the database only
+        visits_data = summary_service.fetch_visits(user_id)
+        summary = summary_service.refresh(user_id, tz=tz, visits=visits_data)
+
+    # Nested visit history, grouped by place
+    visits_by_place: dict[str, list[VisitResponse]] = {}
+    if include_visits:
+        if visits_data is None:
+            result = (
+                supabase.table("place_visits")
+                .select("id, venue_id, merchant_name, amount, visited_at, reaction, notes, source")
+                .eq("user_id", user_id)
+                .order("visited_at", desc=True)
+                .execute()
+            )
+            visits_data = result.data or []
+
+        places_by_key = {p["place_key"]: p for p in summary.get("places") or []}
+        for visit in visits_data:
+            place_key = get_place_key(visit)
+            place = places_by_key.get(place_key)
+            if not place:
+                # Visit created after the last refresh - shown once it lands
+                continue
+
+            amount = float(visit.get("amount") or 0)
+            visits_by_place.setdefault(place_key, []).append(
+                VisitResponse(
+                    id=visit["id"],
+                    venue_id=visit.get("venue_id"),
+                    venue_name=place["venue_name"],
+                    venue_type=place.get("venue_type"),
+                    visited_at=visit["visited_at"],
+                    amount=amount if amount > 0 else None,
+                    reaction=visit.get("reaction"),
+                    notes=visit.get("notes"),
+                    source=visit.get("source", "transaction"),
+                )
+            )
+
+    places = [
+        PlaceResponse(
+            place_key=place["place_key"],
+            venue_id=place.get("venue_id"),
+            venue_name=place["venue_name"],
+            venue_type=place.get("venue_type"),
+            visit_count=place["visit_count"],
+            last_visit=place["last_visit"],
+            total_spent=place["total_spent"],
+            reaction=place.get("reaction"),
+            photo_url=_build_photo_url(base_url, place),
+            google_place_id=place.get("google_place_id"),
+            visits=visits_by_place.get(place["place_key"], []),
+        )
+        for place in summary.get("places") or []
+    ]
+
+    # Current month in user's timezone
+    this_month = (summary.get("month_stats") or {}).get(
+        get_month_key(datetime.now(parse_tz(tz))), {}
     )
 
-    visits_data = result.data or []
+    return VaultResponse(
+        places=places,
+        stats=VaultStatsResponse(
+            total_places=this_month.get("total_places", 0),
+            total_visits=this_month.get("total_visits", 0),
+            this_month_spent=this_month.get("spent", 0.0),
+        ),
+    )
 
-    # Parse user timezone, fallback to UTC if invalid
-    try:
-        user_tz = ZoneInfo(tz)
-    except Exception:
-        user_tz = ZoneInfo("UTC")
-
-    # Get current time in user's timezone for "this month" calculation
-    now = datetime.now(user_tz)
-    current_year = now.year
-    current_month = now.month
-
-    # Aggregate by venue/merchant
-    places_map: dict[str, dict] = {}
-    this_month_places: set[str] = set()  # Track unique places this month
-    this_month_visits = 0
-    this_month_spent = 0.0
-
-    for visit in visits_data:
-        # Determine the place key (venue_id or merchant_name)
-        venue = visit.get("venues")
-        venue_id = visit.get("venue_id")
-        merchant_name = visit.get("merchant_name", "Unknown")
-
-        place_key = venue_id or merchant_name
-        venue_name = venue["name"] if venue else merchant_name
-        venue_type = venue["taste_cluster"] if venue else None
-        google_place_id = venue.get("google_place_id") if venue else None
-        photo_url = _build_photo_url(base_url, venue)
-
-        # Create or update place entry
-        if place_key not in places_map:
-            places_map[place_key] = {
-                "venue_id": venue_id,
-                "venue_name": venue_name,
-                "venue_type": venue_type,
-                "visit_count": 0,
-                "last_visit": visit["visited_at"],
-                "total_spent": 0.0,
-                "reaction": None,
-                "photo_url": photo_url,
-                "google_place_id": google_place_id,
-                "visits": [],
-            }
-
-        place = places_map[place_key]
-        place["visit_count"] += 1
-
-        amount = float(visit.get("amount") or 0)
-        place["total_spent"] += amount
-
-        # Check if this month (convert visit date to user's timezone)
-        visit_date_str = visit["visited_at"]
-        visit_date = datetime.fromisoformat(visit_date_str.replace("Z", "+00:00"))
-        visit_date_local = visit_date.astimezone(user_tz)
-
-        if visit_date_local.year == current_year and visit_date_local.month == current_month:
-            this_month_spent += amount
-            this_month_visits += 1
-            this_month_places.add(place_key)
-
-        # Update reaction to most recent non-null
-        if visit.get("reaction") and not place["reaction"]:
-            place["reaction"] = visit["reaction"]
-
-        # Add visit to list
-        place["visits"].append(
+
+@router.get("/places/{user_id}", response_model=VaultPageResponse)
+async def get_places_page(
+    request: Request,
+    user_id: str,
+    tz: str = Query(default="UTC", description="User's IANA timezone (e.g., America/New_York)"),
+    cursor: str | None = Query(default=None, description="next_cursor from the previous page"),
+    limit: int = Query(default=20, ge=1, le=100),
+    supabase: Client = Depends(get_supabase_client),
+) -> VaultPageResponse:
+    """Get one page of places, aggregated in Postgres.
+
+    Places are ordered by last visit (most recent first) and paginated with
+    a keyset cursor. Visit history is loaded per place from
+    /places/{user_id}/visits. Current-month stats are computed in the
+    database with the user's timezone and returned on the first page only.
+    """
+    summary_service = VaultSummaryService(supabase)
+    cursor_last_visit, cursor_place_key = _decode_cursor(cursor, 2)
+
+    # Fetch one extra row to know whether another page exists
+    rows = summary_service.get_places_page(
+        user_id,
+        limit + 1,
+        cursor_last_visit=cursor_last_visit,
+        cursor_place_key=cursor_place_key,
+    )
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    base_url = str(request.base_url).rstrip("/")
+    places = [
+        PlaceSummaryResponse(
+            place_key=row["place_key"],
+            venue_id=row.get("venue_id"),
+            venue_name=row["venue_name"],
+            venue_type=row.get("venue_type"),
+            visit_count=row["visit_count"],
+            last_visit=row["last_visit"],
+            total_spent=float(row.get("total_spent") or 0),
+            reaction=row.get("reaction"),
+            photo_url=_build_photo_url(
+                base_url,
+                {
+                    "google_place_id": row.get("google_place_id"),
+                    "photo_references": (
+                        [row["photo_reference"]] if row.get("photo_reference") else []
+                    ),
+                },
+            ),
+            google_place_id=row.get("google_place_id"),
+        )
+        for row in rows
+    ]
+
+    stats = None
+    if cursor is None:
+        month = summary_service.get_month_stats(user_id, tz)
+        stats = VaultStatsResponse(
+            total_places=month["total_places"],
+            total_visits=month["total_visits"],
+            this_month_spent=month["spent"],
+        )
+
+    next_cursor = None
+    if has_more and rows:
+        next_cursor = _encode_cursor(rows[-1]["last_visit"], rows[-1]["place_key"])
+
+    return VaultPageResponse(
+        places=places,
+        stats=stats,
+        next_cursor=next_cursor,
+        has_more=has_more,
+    )
+
+
+@router.get("/places/{user_id}/visits", response_model=PlaceVisitsPageResponse)
+async def get_place_visits(
+    user_id: str,
+    place_key: str = Query(..., description="place_key from the places page"),
+    cursor: str | None = Query(default=None, description="next_cursor from the previous page"),
+    limit: int = Query(default=50, ge=1, le=200),
+    supabase: Client = Depends(get_supabase_client),
+) -> PlaceVisitsPageResponse:
+    """Get visit history for one place, most recent first."""
+    cursor_visited_at, cursor_id = _decode_cursor(cursor, 2)
+
+    rows = VaultSummaryService(supabase).get_place_visits(
+        user_id,
+        place_key,
+        limit + 1,
+        cursor_visited_at=cursor_visited_at,
+        cursor_id=cursor_id,
+    )
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    visits = []
+    for row in rows:
+        amount = float(row.get("amount") or 0)
+        visits.append(
             VisitResponse(
-                id=visit["id"],
-                venue_id=venue_id,
-                venue_name=venue_name,
-                venue_type=venue_type,
-                visited_at=visit["visited_at"],
+                id=row["id"],
+                venue_id=row.get("venue_id"),
+                venue_name=row.get("venue_name"),
+                venue_type=row.get("venue_type"),
+                visited_at=row["visited_at"],
                 amount=amount if amount > 0 else None,
-                reaction=visit.get("reaction"),
-                notes=visit.get("notes"),
-                source=visit.get("source", "transaction"),
+                reaction=row.get("reaction"),
+                notes=row.get("notes"),
+                source=row.get("source") or "transaction",
             )
         )
 
-    # Convert to response
-    places = [
-        PlaceResponse(**place_data) for place_data in places_map.values()
-    ]
+    next_cursor = None
+    if has_more and rows:
+        next_cursor = _encode_cursor(rows[-1]["visited_at"], rows[-1]["id"])
 
-    # Sort by last visit (most recent first)
-    places.sort(key=lambda p: p.last_visit, reverse=True)
+    return PlaceVisitsPageResponse(
+        visits=visits,
+        next_cursor=next_cursor,
+        has_more=has_more,
+    )
 
-    return VaultResponse(
-        places=places,
+
+@router.get("/changes/{user_id}", response_model=VaultChangesResponse)
+async def get_vault_changes(
+    user_id: str,
+    since: str | None = Query(default=None, description="next_token from the previous call"),
+    cursor: str | None = Query(default=None, description="next_cursor from the previous page"),
+    limit: int = Query(default=500, ge=1, le=1000),
+    tz: str = Query(default="UTC", description="User's IANA timezone (e.g., America/New_York)"),
+    supabase: Client = Depends(get_supabase_client),
+) -> VaultChangesResponse:
+    """Get visits inserted, updated or deleted since a sync token.
+
+    Without a token - or with one older than TOMBSTONE_RETENTION_DAYS,
+    whose deletes may have been pruned - the response is a full snapshot
+    (resync: true) paged by next_cursor: the client replaces its local
+    copy with every page, then only fetches changes. Updates include
+    reactions, notes and venue matches.
+    """
+    summary_service = VaultSummaryService(supabase)
+
+    # Captured before reading so nothing written during the reads is missed
+    now = datetime.now(timezone.utc)
+
+    changed_since = None
+    if since:
+        (token_time,) = _decode_cursor(since, 1)
+        try:
+            token_at = datetime.fromisoformat(token_time)
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Invalid sync token")
+        if token_at.tzinfo is None:
+            token_at = token_at.replace(tzinfo=timezone.utc)
+        if now - token_at <= timedelta(days=TOMBSTONE_RETENTION_DAYS):
+            changed_since = (token_at - timedelta(seconds=CHANGES_OVERLAP_SECONDS)).isoformat()
+
+    next_cursor = None
+    if changed_since:
+        rows = summary_service.get_changed_visits(user_id, changed_since)
+        deleted = summary_service.get_deleted_visit_ids(user_id, changed_since)
+        next_token = _encode_cursor(now.isoformat())
+    else:
+        # Full snapshot, paged by visit id; every page carries its start time
+        snapshot_at, after_id = _decode_cursor(cursor, 2)
+        snapshot_at = snapshot_at or now.isoformat()
+        rows = summary_service.get_visits_page(user_id, limit + 1, after_id)
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = _encode_cursor(snapshot_at, rows[-1]["id"])
+        deleted = []
+        next_token = _encode_cursor(snapshot_at)
+
+    upserted = []
+    for row in rows:
+        venue = row.get("venues")
+        amount = float(row.get("amount") or 0)
+        upserted.append(
+            VisitResponse(
+                id=row["id"],
+                venue_id=row.get("venue_id"),
+                venue_name=venue["name"] if venue else row.get("merchant_name"),
+                venue_type=venue.get("taste_cluster") if venue else None,
+                visited_at=row["visited_at"],
+                amount=amount if amount > 0 else None,
+                reaction=row.get("reaction"),
+                notes=row.get("notes"),
+                source=row.get("source") or "transaction",
+            )
+        )
+
+    month = summary_service.get_month_stats(user_id, tz)
+
+    return VaultChangesResponse(
+        upserted=upserted,
+        deleted=deleted,
         stats=VaultStatsResponse(
-            total_places=len(this_month_places),
-            total_visits=this_month_visits,
-            this_month_spent=this_month_spent,
+            total_places=month["total_places"],
+            total_visits=month["total_visits"],
+            this_month_spent=month["spent"],
         ),
+        next_token=next_token,
+        resync=changed_since is None,
+        next_cursor=next_cursor,
+        has_more=next_cursor is not None,
     )
 
 
@@ -238,6 +514,7 @@ async def get_visits(
 async def create_visit(
     user_id: str,
     request: CreateVisitRequest,
+    background_tasks: BackgroundTasks,
     supabase: Client = Depends(get_supabase_client),
 ) -> VisitResponse:
     """Create a manual visit entry."""
@@ -258,6 +535,7 @@ async def create_visit(
         raise HTTPException(status_code=500, detail="Failed to create visit")
 
     visit = result.data[0]
+    background_tasks.add_task(VaultSummaryService(supabase).refresh, user_id)
 
     # Fetch venue info if venue_id provided
     venue_name = request.merchant_name
@@ -291,6 +569,7 @@ async def create_visit(
 async def update_visit(
     visit_id: str,
     request: UpdateVisitRequest,
+    background_tasks: BackgroundTasks,
     supabase: Client = Depends(get_supabase_client),
 ) -> VisitResponse:
     """Update a visit (reaction, notes, mood_tags)."""
@@ -318,6 +597,8 @@ async def update_visit(
         raise HTTPException(status_code=404, detail="Visit not found")
 
     visit = result.data[0]
+    if visit.get("user_id"):
+        background_tasks.add_task(VaultSummaryService(supabase).refresh, visit["user_id"])
 
     # Get venue info
     venue_name = visit.get("merchant_name", "Unknown")
@@ -361,65 +642,19 @@ async def sync_visits_from_transactions(
 ) -> SyncResponse:
     """Sync place_visits from existing transactions.
 
-    Creates place_visit entries for food/drink transactions that don't
-    already have associated visits. This is useful for backfilling data
+    Creates place_visit entries for food/drink transactions that arrived
+    after the user's visits watermark. This is useful for backfilling data
     or after initial transaction sync.
     """
-    # Categories that should create place visits
-    visit_categories = ["coffee", "dining", "fast_food", "nightlife", "other_food"]
-
-    # Fetch food/drink transactions for this user
-    tx_result = (
-        supabase.table("transactions")
-        .select("id, user_id, merchant_name, amount, date, datetime, taste_category")
-        .eq("user_id", user_id)
-        .in_("taste_category", visit_categories)
-        .execute()
-    )
-    transactions = tx_result.data or []
-
-    if not transactions:
-        return SyncResponse(created=0, message="No food/drink transactions found")
-
-    # Get existing place_visits to avoid duplicates
-    existing_result = (
-        supabase.table("place_visits")
-        .select("transaction_id")
-        .eq("user_id", user_id)
-        .execute()
-    )
-    existing_tx_ids = {pv["transaction_id"] for pv in (existing_result.data or []) if pv["transaction_id"]}
-
-    # Create place_visit records for new transactions
-    records = []
-    for tx in transactions:
-        tx_id = tx["id"]
-
-        # Skip if already has a place_visit
-        if tx_id in existing_tx_ids:
-            continue
-
-        # Determine visited_at timestamp
-        visited_at = tx.get("datetime") or tx.get("date")
-        if not visited_at:
-            continue
-
-        records.append({
-            "user_id": user_id,
-            "transaction_id": tx_id,
-            "merchant_name": tx.get("merchant_name") or "Unknown",
-            "amount": abs(float(tx.get("amount") or 0)),
-            "visited_at": visited_at,
-            "source": "transaction",
-        })
+    plaid_service = PlaidService(supabase)
+    created = plaid_service._insert_new_place_visits(user_id)
 
-    if not records:
-        return SyncResponse(created=0, message="All transactions already have visits")
+    if not created:
+        return SyncResponse(created=0, message="No new food/drink transactions to sync")
 
-    # Insert new place_visits
-    supabase.table("place_visits").insert(records).execute()
+    VaultSummaryService(supabase).refresh(user_id)
 
     return SyncResponse(
-        created=len(records),
-        message=f"Created {len(records)} place visits from transactions",
+        created=created,
+        message=f"Created {created} place visits from transactions",
     )
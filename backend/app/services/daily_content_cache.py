@@ -0,0 +1,105 @@
+"""DailyContentCache - In-process cache of today's generated taste content.
+
+daily_insights, daily_dna and daily_profile_titles rows don't change once
+they are generated for the day, yet every screen view read them from
+Supabase. This module keeps a user's rows for the day in a module-level
+TTLCache, keyed by (kind, user_id, day), so repeat views skip the query.
+
+Entries expire at the user's local midnight - or earlier, when the
+server's day (which the rows' shown_at is keyed by) rolls over, or when a
+profile title expires. Only fresh content is cached: stale fallbacks are
+re-read until today's content exists. The DELETE .../cache endpoints
+invalidate entries.
+"""
+
+from __future__ import annotations
+
+from datetime import date, datetime, time, timedelta
+from typing import Any
+
+from app.config import get_settings
+from app.services.ttl_cache import TTLCache
+from app.services.vault_summary_service import parse_tz
+
+# Cached content kinds: daily_insights rows, daily_dna rows, daily_profile_titles row
+KINDS = ("insights", "dna", "title")
+
+# Upper bound on an entry's lifetime (a day); expiry is normally earlier
+_memory = TTLCache(maxsize=get_settings().daily_content_cache_size, ttl=24 * 3600)
+
+
+def expires_at(day: date, tz: str | None, now: datetime | None = None) -> float:
+    """Get when a day's content expires (epoch seconds).
+
+    Args:
+        day: Day the content was generated for (server date)
+        tz: User's IANA timezone
+        now: Current time (defaults to now)
+
+    Returns:
+        The earlier of the user's next local midnight and the end of day
+    """
+    user_tz = parse_tz(tz)
+    local_now = (now or datetime.now(user_tz)).astimezone(user_tz)
+    local_midnight = datetime.combine(local_now.date() + timedelta(days=1), time(), tzinfo=user_tz)
+    day_end = datetime.combine(day + timedelta(days=1), time())
+    return min(local_midnight.timestamp(), day_end.timestamp())
+
+
+def get_daily_content(kind: str, user_id: str, day: date) -> Any | None:
+    """Get a user's cached content for a day, or None on a miss.
+
+    Args:
+        kind: One of KINDS
+        user_id: User's ID
+        day: Day the content was generated for
+
+    Returns:
+        Rows (insights, dna) or the title row, as stored
+    """
+    return _memory.get((kind, user_id, day))
+
+
+def set_daily_content(
+    kind: str,
+    user_id: str,
+    day: date,
+    content: Any,
+    tz: str | None = None,
+    until: datetime | None = None,
+) -> None:
+    """Cache a user's fresh content for a day.
+
+    Args:
+        kind: One of KINDS
+        user_id: User's ID
+        day: Day the content was generated for
+        content: Rows (insights, dna) or the title row
+        tz: User's IANA timezone (defaults to UTC)
+        until: Content's own expiry, if it has one (profile titles)
+    """
+    expiry = expires_at(day, tz)
+    if until is not None:
+        expiry = min(expiry, until.timestamp())
+    _memory.set((kind, user_id, day), content, expires_at=expiry)
+
+
+def invalidate_daily_content(kind: str, user_id: str) -> None:
+    """Drop a user's cached content of one kind.
+
+    Covers the days either side of today, since entries are keyed by
+    the day their content was generated for.
+    """
+    today = date.today()
+    for offset in (-1, 0, 1):
+        _memory.delete((kind, user_id, today + timedelta(days=offset)))
+
+
+def clear_daily_content_cache() -> None:
+    """Clear every cached entry and reset counters."""
+    _memory.clear()
+
+
+def get_daily_content_cache_stats() -> dict[str, Any]:
+    """Get hit/miss counters and the hit ratio."""
+    return _memory.stats()
@@ -0,0 +1,210 @@
+"""FusedTasteService - Fused taste computed when its inputs change.
+
+Fuses declared_taste (quiz) with user_analysis (transactions) through
+TasteFusion and stores the result in fused_taste. It runs on write -
+after quiz submission and after transaction aggregation - so the fused
+taste endpoint serves one stored row instead of re-fusing (and
+re-upserting) on every GET.
+
+Each row carries an input_version derived from the declared_taste and
+user_analysis versions it was built from; the endpoint uses it as the
+ETag.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+from decimal import Decimal
+from typing import Any
+
+from supabase import Client
+
+from app.intelligence import DeclaredTaste, ProfileTitleMapper
+from app.intelligence.aggregation_engine import CategoryStats, UserAnalysis
+from app.intelligence.taste_fusion import FusedTaste, TasteFusion
+
+
+def build_declared_taste(declared: dict[str, Any]) -> DeclaredTaste:
+    """Build DeclaredTaste from a declared_taste row (empty if none)."""
+    return DeclaredTaste(
+        vibe_preferences=declared.get("vibe_preferences") or [],
+        cuisine_preferences=declared.get("cuisine_preferences") or [],
+        exploration_style=declared.get("exploration_style"),
+        social_preference=declared.get("social_preference"),
+        price_tier=declared.get("price_tier"),
+    )
+
+
+def build_user_analysis(user_id: str, observed: dict[str, Any]) -> UserAnalysis:
+    """Build the UserAnalysis fields fusion needs from a user_analysis row."""
+    user_analysis = UserAnalysis(user_id=user_id)
+    user_analysis.total_transactions = observed.get("total_transactions", 0)
+
+    # Parse categories from JSONB
+    for cat_name, cat_data in (observed.get("categories") or {}).items():
+        user_analysis.categories[cat_name] = CategoryStats(
+            count=cat_data.get("count", 0),
+            total_spend=Decimal(str(cat_data.get("total_spend", 0))),
+            merchants=set(cat_data.get("merchants", [])),
+        )
+
+    user_analysis.merchant_visits = observed.get("merchant_visits") or {}
+    user_analysis.cuisines = observed.get("cuisines") or {}
+    user_analysis.top_cuisines = observed.get("top_cuisines") or []
+    return user_analysis
+
+
+def input_version(declared: dict[str, Any], observed: dict[str, Any]) -> str:
+    """Derive a version from the input rows' own versions.
+
+    Changes whenever declared_taste is updated (updated_at) or
+    user_analysis is re-aggregated (version).
+
+    Args:
+        declared: declared_taste row (empty if none)
+        observed: user_analysis row (empty if none)
+
+    Returns:
+        Short hex digest
+    """
+    parts = (
+        declared.get("updated_at"),
+        observed.get("version"),
+        observed.get("last_updated_at"),
+    )
+    return hashlib.sha256("|".join(str(p) for p in parts).encode()).hexdigest()[:16]
+
+
+# Users with a fused taste backfill queued or running in this process
+_refreshing: set[str] = set()
+_refreshing_lock = threading.Lock()
+
+
+def claim_refresh(user_id: str) -> bool:
+    """Claim a background fused taste build, deduplicating per user.
+
+    Args:
+        user_id: User with no stored fused taste
+
+    Returns:
+        True if the caller should schedule FusedTasteService.refresh_claimed;
+        False if one is already queued or running
+    """
+    with _refreshing_lock:
+        if user_id in _refreshing:
+            return False
+        _refreshing.add(user_id)
+        return True
+
+
+class FusedTasteService:
+    """Builds and serves the stored fused taste for a user."""
+
+    def __init__(self, supabase: Client, profile_mapper: ProfileTitleMapper | None = None) -> None:
+        """Initialize with Supabase client.
+
+        Args:
+            supabase: Supabase client for database operations
+            profile_mapper: Rule-based title mapper (defaults to a new one)
+        """
+        self._supabase = supabase
+        self._profile_mapper = profile_mapper or ProfileTitleMapper()
+
+    def get(self, user_id: str) -> dict[str, Any] | None:
+        """Get the stored fused taste for a user.
+
+        Args:
+            user_id: The user's ID
+
+        Returns:
+            fused_taste row, or None if it has not been built yet (or was
+            built before input versions were stored)
+        """
+        result = self._supabase.table("fused_taste").select("*").eq("user_id", user_id).execute()
+        row = result.data[0] if result.data else None
+        if not row or not row.get("input_version"):
+            return None
+        return row
+
+    def build(self, user_id: str) -> dict[str, Any]:
+        """Fuse the user's current inputs without storing the result.
+
+        Args:
+            user_id: The user's ID
+
+        Returns:
+            Row in fused_taste shape (including input_version)
+        """
+        declared_list = (
+            self._supabase.table("declared_taste").select("*").eq("user_id", user_id).execute()
+        )
+        declared = declared_list.data[0] if declared_list.data else {}
+
+        # Use execute() to avoid 406 on zero rows
+        try:
+            observed_list = (
+                self._supabase.table("user_analysis").select("*").eq("user_id", user_id).execute()
+            )
+            observed = observed_list.data[0] if observed_list.data else {}
+        except Exception as e:
+            print(f"[FusedTaste] Error fetching user_analysis: {e}")
+            observed = {}
+
+        return self.fuse_rows(user_id, declared, observed)
+
+    def fuse_rows(
+        self,
+        user_id: str,
+        declared: dict[str, Any],
+        observed: dict[str, Any],
+    ) -> dict[str, Any]:
+        """Fuse already-loaded input rows (see build()).
+
+        Args:
+            user_id: The user's ID
+            declared: declared_taste row (empty if none)
+            observed: user_analysis row (empty if none)
+
+        Returns:
+            Row in fused_taste shape (including input_version)
+        """
+        declared_taste = build_declared_taste(declared)
+        fused: FusedTaste = TasteFusion().fuse(
+            declared_taste, build_user_analysis(user_id, observed)
+        )
+        title, tagline = self._profile_mapper.get_title(declared_taste)
+
+        return {
+            "user_id": user_id,
+            **fused.to_dict(),
+            "profile_title": title,
+            "profile_tagline": tagline,
+            "input_version": input_version(declared, observed),
+        }
+
+    def refresh(self, user_id: str) -> dict[str, Any]:
+        """Rebuild and store the fused taste for a user.
+
+        Call after either input changes (quiz submission, aggregation).
+
+        Args:
+            user_id: The user's ID
+
+        Returns:
+            The stored row
+        """
+        row = self.build(user_id)
+        try:
+            self._supabase.table("fused_taste").upsert(row, on_conflict="user_id").execute()
+        except Exception as e:
+            print(f"[FusedTaste] Failed to store fused taste for {user_id}: {e}")
+        return row
+
+    def refresh_claimed(self, user_id: str) -> None:
+        """Background refresh claimed with claim_refresh(); releases the claim."""
+        try:
+            self.refresh(user_id)
+        finally:
+            with _refreshing_lock:
+                _refreshing.discard(user_id)
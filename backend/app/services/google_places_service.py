@@ -1,21 +1,27 @@
 """GooglePlacesService - Google Places API (New) integration for venue data.
 
 Uses the new Places API (places.googleapis.com/v1) with AI features.
-Provides caching via places_lookup_cache table for merchant matching.
+Provides two-tier caching for merchant matching: an in-process LRU shared
+by every service instance, backed by the places_lookup_cache table.
 """
 
 from __future__ import annotations
 
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
+from datetime import datetime, timezone
 from typing import Any
 
-import requests
+import httpx
 from supabase import Client
 
 from app.config import get_settings
-
-BASE_URL = "https://places.googleapis.com/v1"
+from app.intelligence.rule_tagger import RuleTagger
+from app.services.places_transport import BASE_URL, PlacesTransport, get_places_transport
+from app.services.ttl_cache import TTLCache
+from app.services.venue_matcher import normalize_merchant
 
 # Standard fields for venue data
 VENUE_FIELDS = [
@@ -70,6 +76,12 @@ DETAIL_FIELDS = [
     "generativeSummary",
 ]
 
+# Same as DETAIL_FIELDS without reviews (reviews are only needed for tagging)
+DETAIL_FIELDS_NO_REVIEWS = [f for f in DETAIL_FIELDS if f != "reviews"]
+
+# Fields that change after a venue is created, re-pulled by the refresher
+VOLATILE_FIELDS = ["rating", "userRatingCount", "regularOpeningHours"]
+
 
 @dataclass
 class PlaceMatch:
@@ -113,48 +125,123 @@ class PlaceDetails:
     reviews: list[dict[str, Any]] = field(default_factory=list)
 
 
-class RateLimiter:
-    """Token bucket rate limiter for API calls."""
+# Cache key for a merchant lookup: (normalized name, grid lat, grid lng)
+LookupKey = tuple[str, float | None, float | None]
 
-    def __init__(self, rate: float = 500, per: float = 60.0) -> None:
-        """Initialize rate limiter.
+# In-process tier of the lookup cache, shared by all service instances
+_lookup_memory = TTLCache(
+    maxsize=get_settings().places_lookup_memory_size,
+    ttl=get_settings().places_lookup_memory_ttl_seconds,
+)
 
-        Args:
-            rate: Number of requests allowed per period
-            per: Period in seconds (default 60s = 1 minute)
-        """
-        self.rate = rate
-        self.per = per
-        self.tokens = rate
-        self.last_update = time.time()
-
-    def acquire(self) -> None:
-        """Acquire a token, blocking if rate limit exceeded."""
-        now = time.time()
-        elapsed = now - self.last_update
-        self.tokens = min(self.rate, self.tokens + elapsed * (self.rate / self.per))
-        self.last_update = now
-
-        if self.tokens < 1:
-            sleep_time = (1 - self.tokens) * (self.per / self.rate)
-            time.sleep(sleep_time)
-            self.tokens = 0
-        else:
-            self.tokens -= 1
+# Parsed place details by place_id, stored as (PlaceDetails, includes reviews)
+_details_memory = TTLCache(
+    maxsize=get_settings().places_details_cache_size,
+    ttl=get_settings().places_details_cache_ttl_seconds,
+)
+
+# Hit/miss counters for the places_lookup_cache table tier
+_lookup_db_stats = {"hits": 0, "misses": 0}
+_lookup_db_stats_lock = threading.Lock()
+
+
+def _record_db_lookup(hit: bool) -> None:
+    """Count a places_lookup_cache probe."""
+    with _lookup_db_stats_lock:
+        _lookup_db_stats["hits" if hit else "misses"] += 1
+
+
+def get_lookup_cache_stats() -> dict[str, dict[str, Any]]:
+    """Get hit ratios for each tier of the places lookup cache.
+
+    Returns:
+        Dict with memory and database tier stats
+    """
+    with _lookup_db_stats_lock:
+        hits, misses = _lookup_db_stats["hits"], _lookup_db_stats["misses"]
+    total = hits + misses
+    return {
+        "memory": _lookup_memory.stats(),
+        "database": {
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": hits / total if total else 0.0,
+        },
+    }
+
+
+def clear_lookup_memory() -> None:
+    """Clear the in-process lookup tier and reset all counters."""
+    _lookup_memory.clear()
+    with _lookup_db_stats_lock:
+        _lookup_db_stats["hits"] = 0
+        _lookup_db_stats["misses"] = 0
+
+
+def clear_details_memory() -> None:
+    """Clear the in-process place details cache."""
+    _details_memory.clear()
+
+
+def normalize_merchant_name(merchant_name: str) -> str:
+    """Normalize a merchant name for cache keys."""
+    return merchant_name.lower().strip()
+
+
+def get_lookup_key(normalized_name: str, lat: float | None, lng: float | None) -> LookupKey:
+    """Build a lookup cache key, rounding location to a ~1km grid cell."""
+    if lat is None or lng is None:
+        return (normalized_name, None, None)
+    return (normalized_name, round(lat, 2), round(lng, 2))
+
+
+def get_lookup_expiry(row: dict[str, Any]) -> float:
+    """Get when a cached lookup row stops being trusted (epoch seconds).
+
+    Matches are re-checked after the positive refresh horizon; no-match
+    rows expire after the (much shorter) negative TTL so new or renamed
+    places get picked up.
+    """
+    settings = get_settings()
+    if row.get("google_place_id"):
+        ttl = settings.places_positive_cache_refresh_days * 86400
+    else:
+        ttl = settings.places_negative_cache_ttl_seconds
+
+    refreshed_at = row.get("refreshed_at") or row.get("created_at")
+    try:
+        refreshed = datetime.fromisoformat(str(refreshed_at).replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return 0.0
+    return refreshed + ttl
+
+
+def _match_from_row(row: dict[str, Any]) -> PlaceMatch | None:
+    """Convert a cached lookup row into a PlaceMatch (None for no-match rows)."""
+    if not row.get("google_place_id"):
+        return None
+    return PlaceMatch(
+        place_id=row["google_place_id"],
+        name=row["matched_name"],
+        formatted_address=row["formatted_address"],
+        lat=float(row["lat"]) if row.get("lat") else None,
+        lng=float(row["lng"]) if row.get("lng") else None,
+    )
 
 
 class GooglePlacesService:
     """Service for Google Places API operations with caching."""
 
-    def __init__(self, supabase: Client) -> None:
+    def __init__(self, supabase: Client, transport: PlacesTransport | None = None) -> None:
         """Initialize with Supabase client for caching.
 
         Args:
             supabase: Supabase client for database operations
+            transport: HTTP transport (defaults to the shared, rate-limited one)
         """
         self._supabase = supabase
         self._api_key = get_settings().google_places_api_key
-        self._rate_limiter = RateLimiter(rate=500, per=60.0)
+        self._transport = transport or get_places_transport()
 
     def _make_request(
         self,
@@ -177,9 +264,6 @@ class GooglePlacesService:
         Raises:
             ValueError: If API returns an error
         """
-        self._rate_limiter.acquire()
-
-        url = f"{BASE_URL}{endpoint}"
         headers = {
             "Content-Type": "application/json",
             "X-Goog-Api-Key": self._api_key,
@@ -188,14 +272,25 @@ class GooglePlacesService:
         if field_mask:
             headers["X-Goog-FieldMask"] = ",".join(field_mask)
 
-        if method == "POST":
-            response = requests.post(url, json=data, headers=headers, timeout=10)
-        else:
-            response = requests.get(url, headers=headers, timeout=10)
+        # Label details calls by endpoint, not by place ID
+        label = "places/details" if endpoint.startswith("/places/") else endpoint.lstrip("/")
+
+        try:
+            response = self._transport.request(
+                method,
+                endpoint,
+                endpoint=label,
+                json=data if method == "POST" else None,
+                headers=headers,
+            )
+        except httpx.TransportError as e:
+            raise ValueError(f"Places API error: {e}") from e
 
         if response.status_code != 200:
-            error = response.json().get("error", {})
-            msg = error.get("message", response.text)
+            try:
+                msg = response.json().get("error", {}).get("message", response.text)
+            except ValueError:
+                msg = response.text
             raise ValueError(f"Places API error: {msg}")
 
         return response.json()
@@ -219,22 +314,122 @@ class GooglePlacesService:
             PlaceMatch if found, None otherwise
         """
         # Normalize merchant name for caching
-        normalized = merchant_name.lower().strip()
+        normalized = normalize_merchant_name(merchant_name)
 
-        # Check cache first
+        # Check cache first (None row = not cached, no-match rows return None)
         cached = self._get_cached_lookup(normalized, lat, lng)
         if cached is not None:
-            if cached.get("google_place_id"):
-                return PlaceMatch(
-                    place_id=cached["google_place_id"],
-                    name=cached["matched_name"],
-                    formatted_address=cached["formatted_address"],
-                    lat=float(cached["lat"]) if cached.get("lat") else None,
-                    lng=float(cached["lng"]) if cached.get("lng") else None,
+            return _match_from_row(cached)
+
+        return self._search_place(normalized, merchant_name, lat, lng)
+
+    def find_places(
+        self,
+        queries: list[tuple[str, float | None, float | None]],
+        max_workers: int = 4,
+    ) -> list[PlaceMatch | None]:
+        """Find places for many merchants at once.
+
+        Probes the in-process tier, then the places_lookup_cache table in a
+        single query for every remaining merchant, and only searches the
+        API for true misses (concurrently, bounded by max_workers).
+
+        Args:
+            queries: (merchant_name, lat, lng) tuples
+            max_workers: Maximum concurrent API searches
+
+        Returns:
+            PlaceMatch or None for each query, in input order
+        """
+        keys = [
+            get_lookup_key(normalize_merchant_name(name), lat, lng)
+            for name, lat, lng in queries
+        ]
+
+        # Tier 1: in-process cache
+        resolved: dict[LookupKey, dict[str, Any]] = {}
+        pending: dict[LookupKey, tuple[str, float | None, float | None]] = {}
+        for key, query in zip(keys, queries):
+            if key in resolved or key in pending:
+                continue
+            row = _lookup_memory.get(key)
+            if row is not None:
+                resolved[key] = row
+            else:
+                pending[key] = query
+
+        # Tier 2: one places_lookup_cache query for all remaining names
+        if pending:
+            names = list({key[0] for key in pending})
+            result = (
+                self._supabase.table("places_lookup_cache")
+                .select("*")
+                .in_("merchant_name_normalized", names)
+                .execute()
+            )
+            rows_by_key: dict[LookupKey, dict[str, Any]] = {}
+            for row in result.data or []:
+                row_lat = row.get("search_lat")
+                row_lng = row.get("search_lng")
+                row_key = get_lookup_key(
+                    row["merchant_name_normalized"],
+                    float(row_lat) if row_lat is not None else None,
+                    float(row_lng) if row_lng is not None else None,
                 )
-            # Cached as no-match
-            return None
+                rows_by_key[row_key] = row
+
+            now = time.time()
+            for key in list(pending):
+                row = rows_by_key.get(key)
+                expires_at = get_lookup_expiry(row) if row else 0.0
+                _record_db_lookup(expires_at > now)
+                if expires_at > now:
+                    self._remember_lookup(key, row, expires_at)
+                    resolved[key] = row
+                    del pending[key]
+
+        # Tier 3: Places API for true misses
+        if pending:
+            def search(
+                item: tuple[LookupKey, tuple[str, float | None, float | None]],
+            ) -> PlaceMatch | None:
+                key, (name, lat, lng) = item
+                try:
+                    return self._search_place(key[0], name, lat, lng)
+                except Exception as e:
+                    print(f"[GooglePlaces] Lookup failed for {name}: {e}")
+                    return None
+
+            items = list(pending.items())
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+                searched = list(executor.map(search, items))
+            matches = {key: match for (key, _), match in zip(items, searched)}
+        else:
+            matches = {}
 
+        for key, row in resolved.items():
+            matches[key] = _match_from_row(row)
+
+        return [matches.get(key) for key in keys]
+
+    def _search_place(
+        self,
+        normalized: str,
+        merchant_name: str,
+        lat: float | None,
+        lng: float | None,
+    ) -> PlaceMatch | None:
+        """Search the Places API for a merchant and cache the result.
+
+        Args:
+            normalized: Normalized merchant name
+            merchant_name: The merchant name from Plaid
+            lat: Latitude for location bias
+            lng: Longitude for location bias
+
+        Returns:
+            PlaceMatch if found, None otherwise
+        """
         # Search using textSearch with location bias
         data: dict[str, Any] = {
             "textQuery": merchant_name,
@@ -287,24 +482,82 @@ class GooglePlacesService:
 
         return match
 
-    def get_place_details(self, place_id: str) -> PlaceDetails | None:
+    def get_place_details(
+        self,
+        place_id: str,
+        include_reviews: bool = True,
+    ) -> PlaceDetails | None:
         """Get full details for a place.
 
+        Responses are cached in-process by place_id; a cached payload with
+        reviews also serves requests that don't need them.
+
         Args:
             place_id: Google Place ID
+            include_reviews: Fetch reviews too (only needed for AI tagging)
 
         Returns:
             PlaceDetails if found, None on error
         """
+        cached = _details_memory.get(place_id)
+        if cached is not None:
+            details, has_reviews = cached
+            if has_reviews or not include_reviews:
+                return details
+
+        try:
+            result = self._make_request(
+                f"/places/{place_id}",
+                method="GET",
+                field_mask=DETAIL_FIELDS if include_reviews else DETAIL_FIELDS_NO_REVIEWS,
+            )
+        except ValueError:
+            return None
+
+        details = self._parse_place_details(place_id, result)
+        _details_memory.set(place_id, (details, include_reviews))
+        return details
+
+    def get_volatile_details(self, place_id: str) -> dict[str, Any] | None:
+        """Re-pull only the fields that change over time.
+
+        Uses the narrow VOLATILE_FIELDS mask, so refreshes skip reviews,
+        photos and summaries.
+
+        Args:
+            place_id: Google Place ID
+
+        Returns:
+            Dict with rating, review_count and opening_hours, or None on error
+        """
         try:
             result = self._make_request(
                 f"/places/{place_id}",
                 method="GET",
-                field_mask=DETAIL_FIELDS,
+                field_mask=VOLATILE_FIELDS,
             )
         except ValueError:
             return None
 
+        # Cached full details would now be out of date
+        _details_memory.delete(place_id)
+
+        return {
+            "rating": result.get("rating"),
+            "review_count": result.get("userRatingCount"),
+            "opening_hours": result.get("regularOpeningHours"),
+        }
+
+    def _parse_place_details(self, place_id: str, result: dict[str, Any]) -> PlaceDetails:
+        """Build PlaceDetails from a Place Details API response.
+
+        Args:
+            place_id: Google Place ID
+            result: Raw API response
+
+        Returns:
+            Parsed PlaceDetails
+        """
         loc = result.get("location", {})
         opening_hours = result.get("regularOpeningHours")
 
@@ -462,15 +715,40 @@ class GooglePlacesService:
         Returns:
             Photo bytes or None on error
         """
-        self._rate_limiter.acquire()
+        path = f"/{photo_name}/media?maxWidthPx={max_width}&key={self._api_key}"
 
-        url = f"{BASE_URL}/{photo_name}/media?maxWidthPx={max_width}&key={self._api_key}"
+        try:
+            response = self._transport.request("GET", path, endpoint="photo")
+            if response.status_code == 200:
+                return response.content
+        except httpx.HTTPError:
+            pass
+
+        return None
+
+    async def fetch_photo_async(
+        self,
+        place_id: str,
+        photo_name: str,
+        max_width: int = 400,
+    ) -> bytes | None:
+        """Fetch photo binary data without blocking the event loop.
+
+        Args:
+            place_id: Google Place ID
+            photo_name: Full photo name from place details
+            max_width: Maximum width in pixels
+
+        Returns:
+            Photo bytes or None on error
+        """
+        path = f"/{photo_name}/media?maxWidthPx={max_width}&key={self._api_key}"
 
         try:
-            response = requests.get(url, timeout=10)
+            response = await self._transport.arequest("GET", path, endpoint="photo")
             if response.status_code == 200:
                 return response.content
-        except requests.RequestException:
+        except httpx.HTTPError:
             pass
 
         return None
@@ -483,6 +761,9 @@ class GooglePlacesService:
     ) -> dict[str, Any] | None:
         """Get cached merchant lookup result.
 
+        Checks the in-process tier first, then places_lookup_cache. Rows
+        past their negative TTL or positive refresh horizon count as misses.
+
         Args:
             normalized_name: Normalized merchant name
             lat: Search latitude
@@ -491,6 +772,11 @@ class GooglePlacesService:
         Returns:
             Cached result dict or None if not cached
         """
+        key = get_lookup_key(normalized_name, lat, lng)
+        row = _lookup_memory.get(key)
+        if row is not None:
+            return row
+
         query = (
             self._supabase.table("places_lookup_cache")
             .select("*")
@@ -506,7 +792,23 @@ class GooglePlacesService:
             query = query.is_("search_lat", "null").is_("search_lng", "null")
 
         result = query.execute()
-        return result.data[0] if result.data else None
+        row = result.data[0] if result.data else None
+
+        expires_at = get_lookup_expiry(row) if row else 0.0
+        if expires_at <= time.time():
+            _record_db_lookup(False)
+            return None
+
+        _record_db_lookup(True)
+        self._remember_lookup(key, row, expires_at)
+        return row
+
+    def _remember_lookup(self, key: LookupKey, row: dict[str, Any], expires_at: float) -> None:
+        """Store a lookup row in the in-process tier.
+
+        Entries never outlive the database row they mirror.
+        """
+        _lookup_memory.set(key, row, min(expires_at, time.time() + _lookup_memory.ttl))
 
     def _cache_lookup(
         self,
@@ -526,8 +828,8 @@ class GooglePlacesService:
             match: PlaceMatch result or None for no-match
         """
         # Round coordinates to grid cell
-        rounded_lat = round(lat, 2) if lat is not None else None
-        rounded_lng = round(lng, 2) if lng is not None else None
+        key = get_lookup_key(normalized_name, lat, lng)
+        _, rounded_lat, rounded_lng = key
 
         record = {
             "merchant_name_normalized": normalized_name,
@@ -539,8 +841,11 @@ class GooglePlacesService:
             "formatted_address": match.formatted_address if match else None,
             "lat": match.lat if match else None,
             "lng": match.lng if match else None,
+            "refreshed_at": datetime.now(timezone.utc).isoformat(),
         }
 
+        self._remember_lookup(key, record, get_lookup_expiry(record))
+
         try:
             self._supabase.table("places_lookup_cache").upsert(
                 record,
@@ -558,6 +863,11 @@ class GooglePlacesService:
     ) -> dict[str, Any]:
         """Create or update a venue from PlaceDetails.
 
+        Google fields are always refreshed. Provisional rule-based tags
+        (tag_source 'rules') are only written to venues that have no tags
+        yet, so a refresh never overwrites an AI profile; VenueTaggingService
+        replaces them later.
+
         Args:
             details: PlaceDetails from API
             city: City name for geo-filtering
@@ -570,35 +880,6 @@ class GooglePlacesService:
         price_tier_map = {0: "free", 1: "$", 2: "$$", 3: "$$$", 4: "$$$$"}
         price_tier = price_tier_map.get(details.price_level) if details.price_level else None
 
-        # Map primary_type to taste_cluster (default until AI tagging updates it)
-        type_to_cluster = {
-            "coffee_shop": "coffee",
-            "cafe": "coffee",
-            "restaurant": "restaurant",
-            "fast_food_restaurant": "fast_food",
-            "bar": "bar",
-            "bakery": "bakery",
-            "ice_cream_shop": "dessert",
-            "pizza_restaurant": "restaurant",
-            "american_restaurant": "restaurant",
-            "italian_restaurant": "restaurant",
-            "mexican_restaurant": "restaurant",
-            "japanese_restaurant": "restaurant",
-            "chinese_restaurant": "restaurant",
-            "indian_restaurant": "restaurant",
-            "thai_restaurant": "restaurant",
-            "vietnamese_restaurant": "restaurant",
-            "korean_restaurant": "restaurant",
-            "mediterranean_restaurant": "restaurant",
-            "seafood_restaurant": "restaurant",
-            "steak_house": "restaurant",
-            "breakfast_restaurant": "restaurant",
-            "brunch_restaurant": "restaurant",
-            "vegetarian_restaurant": "restaurant",
-            "vegan_restaurant": "restaurant",
-        }
-        taste_cluster = type_to_cluster.get(details.primary_type, "restaurant")
-
         record = {
             "google_place_id": details.place_id,
             "name": details.name,
@@ -606,7 +887,6 @@ class GooglePlacesService:
             "lat": details.lat,
             "lng": details.lng,
             "city": city,
-            "taste_cluster": taste_cluster,
             "google_rating": details.rating,
             "google_review_count": details.review_count,
             "google_price_level": details.price_level,
@@ -625,14 +905,39 @@ class GooglePlacesService:
             "editorial_summary": details.editorial_summary,
             "generative_summary": details.generative_summary,
             "source": source,
+            "chain_key": normalize_merchant(details.name),
+            "details_refreshed_at": datetime.now(timezone.utc).isoformat(),
         }
 
         result = self._supabase.table("venues").upsert(
             record,
             on_conflict="google_place_id",
         ).execute()
+        venue = result.data[0] if result.data else record
+
+        if venue.get("tag_source") is None:
+            # Provisional rule-based tags until AI tagging replaces them.
+            # Guarded on tag_source so a concurrent AI upgrade always wins.
+            profile = RuleTagger().tag(details)
+            tags = {
+                "taste_cluster": profile.taste_cluster,
+                "cuisine_type": profile.cuisine_type,
+                "energy": profile.energy,
+                "tagline": profile.tagline,
+                "best_for": profile.best_for,
+                "standout": profile.standout,
+                "tag_source": "rules",
+            }
+            tagged = (
+                self._supabase.table("venues")
+                .update(tags)
+                .eq("google_place_id", details.place_id)
+                .is_("tag_source", "null")
+                .execute()
+            )
+            venue = tagged.data[0] if tagged.data else {**venue, **tags}
 
-        return result.data[0] if result.data else record
+        return venue
 
     def get_venue_by_place_id(self, place_id: str) -> dict[str, Any] | None:
         """Get venue by Google Place ID.
@@ -0,0 +1,226 @@
+"""PlacesTransport - Pooled HTTP transport for the Google Places API.
+
+Owns long-lived httpx clients (sync and async) so connections are kept
+alive between calls, uses HTTP/2 when the h2 package is installed,
+retries 429/5xx responses with jittered exponential backoff, and records
+per-endpoint latency histograms. One instance is shared per process (see
+get_places_transport).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import threading
+import time
+from typing import Any
+
+import httpx
+
+from app.config import get_settings
+from app.metrics import LatencyHistogram
+from app.services.rate_limiter import RateLimiter, get_places_rate_limiter
+
+BASE_URL = "https://places.googleapis.com/v1"
+
+try:
+    import h2  # noqa: F401
+
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Status codes worth retrying
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# Latency histogram bucket upper bounds in milliseconds
+LATENCY_BUCKETS_MS = [50, 100, 250, 500, 1000, 2500, 5000]
+
+
+class PlacesTransport:
+    """Pooled, retrying HTTP client for the Places API."""
+
+    def __init__(
+        self,
+        base_url: str = BASE_URL,
+        rate_limiter: RateLimiter | None = None,
+        max_retries: int | None = None,
+        backoff_base: float = 0.5,
+        backoff_max: float = 8.0,
+        timeout: float = 10.0,
+    ) -> None:
+        """Initialize transport.
+
+        Args:
+            base_url: API base URL (overridable for tests)
+            rate_limiter: Limiter acquired before every attempt
+            max_retries: Retries after the first attempt on 429/5xx/network errors
+            backoff_base: First backoff ceiling in seconds
+            backoff_max: Maximum backoff ceiling in seconds
+            timeout: Per-request timeout in seconds
+        """
+        settings = get_settings()
+        self.base_url = base_url
+        self.max_retries = settings.places_http_max_retries if max_retries is None else max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._rate_limiter = rate_limiter or get_places_rate_limiter()
+        self._limits = httpx.Limits(
+            max_connections=settings.places_http_max_connections,
+            max_keepalive_connections=settings.places_http_max_keepalive,
+        )
+        self._timeout = timeout
+        self._client = httpx.Client(
+            http2=HTTP2_AVAILABLE,
+            limits=self._limits,
+            timeout=timeout,
+            follow_redirects=True,
+        )
+        self._async_client: httpx.AsyncClient | None = None
+        self._histograms: dict[str, LatencyHistogram] = {}
+        self._histograms_lock = threading.Lock()
+
+    def request(
+        self,
+        method: str,
+        path: str,
+        endpoint: str,
+        json: dict | None = None,
+        headers: dict[str, str] | None = None,
+    ) -> httpx.Response:
+        """Send a request, retrying 429/5xx responses and network errors.
+
+        Args:
+            method: HTTP method
+            path: Path appended to the base URL
+            endpoint: Label used for latency stats (e.g., "searchText")
+            json: JSON request body
+            headers: Request headers
+
+        Returns:
+            The final response (may still be an error status)
+
+        Raises:
+            httpx.TransportError: If every attempt failed at the network level
+        """
+        url = f"{self.base_url}{path}"
+        for attempt in range(self.max_retries + 1):
+            self._rate_limiter.acquire()
+            start = time.monotonic()
+            try:
+                response = self._client.request(method, url, json=json, headers=headers)
+            except httpx.TransportError:
+                if attempt == self.max_retries:
+                    raise
+                time.sleep(self._backoff(attempt))
+                continue
+            finally:
+                self._record(endpoint, start)
+
+            if response.status_code not in RETRY_STATUS_CODES or attempt == self.max_retries:
+                return response
+            time.sleep(self._backoff(attempt, response))
+
+        raise AssertionError("unreachable")
+
+    async def arequest(
+        self,
+        method: str,
+        path: str,
+        endpoint: str,
+        json: dict | None = None,
+        headers: dict[str, str] | None = None,
+    ) -> httpx.Response:
+        """Async variant of request() that never blocks the event loop."""
+        client = self._get_async_client()
+        url = f"{self.base_url}{path}"
+        for attempt in range(self.max_retries + 1):
+            await self._rate_limiter.acquire_async()
+            start = time.monotonic()
+            try:
+                response = await client.request(method, url, json=json, headers=headers)
+            except httpx.TransportError:
+                if attempt == self.max_retries:
+                    raise
+                await asyncio.sleep(self._backoff(attempt))
+                continue
+            finally:
+                self._record(endpoint, start)
+
+            if response.status_code not in RETRY_STATUS_CODES or attempt == self.max_retries:
+                return response
+            await asyncio.sleep(self._backoff(attempt, response))
+
+        raise AssertionError("unreachable")
+
+    def latency_stats(self) -> dict[str, dict[str, Any]]:
+        """Get latency histograms keyed by endpoint label."""
+        with self._histograms_lock:
+            histograms = dict(self._histograms)
+        return {endpoint: h.stats() for endpoint, h in histograms.items()}
+
+    def close(self) -> None:
+        """Close the sync client (the async client is closed by aclose)."""
+        self._client.close()
+
+    async def aclose(self) -> None:
+        """Close both clients."""
+        self._client.close()
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+
+    def _get_async_client(self) -> httpx.AsyncClient:
+        """Create the async client on first use (inside the running loop)."""
+        if self._async_client is None:
+            self._async_client = httpx.AsyncClient(
+                http2=HTTP2_AVAILABLE,
+                limits=self._limits,
+                timeout=self._timeout,
+                follow_redirects=True,
+            )
+        return self._async_client
+
+    def _backoff(self, attempt: int, response: httpx.Response | None = None) -> float:
+        """Get the delay before the next attempt.
+
+        Honors a numeric Retry-After header, otherwise uses full-jitter
+        exponential backoff so concurrent retries spread out.
+        """
+        if response is not None:
+            retry_after = response.headers.get("Retry-After")
+            if retry_after and retry_after.isdigit():
+                return min(float(retry_after), self.backoff_max)
+        ceiling = min(self.backoff_max, self.backoff_base * (2**attempt))
+        return random.uniform(0, ceiling)
+
+    def _record(self, endpoint: str, start: float) -> None:
+        """Record latency for one attempt."""
+        with self._histograms_lock:
+            histogram = self._histograms.setdefault(endpoint, LatencyHistogram(LATENCY_BUCKETS_MS))
+        histogram.record((time.monotonic() - start) * 1000)
+
+
+_places_transport: PlacesTransport | None = None
+_places_transport_lock = threading.Lock()
+
+
+def get_places_transport() -> PlacesTransport:
+    """Get the process-wide Places transport."""
+    global _places_transport
+    with _places_transport_lock:
+        if _places_transport is None:
+            _places_transport = PlacesTransport()
+        return _places_transport
+
+
+async def close_places_transport() -> None:
+    """Close the process-wide Places transport, if one was created.
+
+    The next get_places_transport() call creates a fresh one.
+    """
+    global _places_transport
+    with _places_transport_lock:
+        transport, _places_transport = _places_transport, None
+    if transport is not None:
+        await transport.aclose()
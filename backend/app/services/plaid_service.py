@@ -2,18 +2,35 @@
 
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Any, Optional
 
 from supabase import Client
 
+from app.config import get_settings
 from app.mappings.plaid_categories import get_taste_category, get_cuisine
 from app.services.plaid_client import sync_transactions
-from app.services.google_places_service import GooglePlacesService
+from app.services.google_places_service import (
+    GooglePlacesService,
+    PlaceMatch,
+    get_lookup_cache_stats,
+)
+from app.services.vault_summary_service import VaultSummaryService
+from app.services.venue_tagging_service import VenueTaggingService, venue_tagger_input
+from app.services.venue_matcher import get_venue_index
 from app.intelligence.aggregation_engine import AggregationEngine, UserAnalysis
-from app.intelligence.venue_tagger import VenueTagger
 from app.models.plaid import ProcessedTransaction
 
+# Taste categories that should create place visits
+VISIT_CATEGORIES = ["coffee", "dining", "fast_food", "nightlife", "other_food"]
+
+# Transactions read per round trip when creating place visits
+VISIT_SYNC_BATCH_SIZE = 500
+
+# Distinct merchants resolved to venues in parallel
+VENUE_MATCH_CONCURRENCY = 4
+
 
 def _get_time_bucket(dt: Optional[datetime]) -> str:
     """Get time bucket from datetime.
@@ -63,13 +80,8 @@ class PlaidService:
         """
         self._supabase = supabase
         self._places_service = GooglePlacesService(supabase)
-        self._venue_tagger: VenueTagger | None = None
-
-    def _get_venue_tagger(self) -> VenueTagger:
-        """Lazy-load VenueTagger (expensive due to Anthropic client)."""
-        if self._venue_tagger is None:
-            self._venue_tagger = VenueTagger()
-        return self._venue_tagger
+        # Memoized tagging; the Anthropic client is created on first miss
+        self._tagging_service = VenueTaggingService(supabase)
 
     def link_account(
         self,
@@ -390,93 +402,192 @@ class PlaidService:
             on_conflict="user_id",
         ).execute()
 
+        # Observed taste changed - re-fuse with declared taste
+        # (imported here: app.intelligence imports app.services via its caches)
+        from app.services.fused_taste_service import FusedTasteService
+        FusedTasteService(self._supabase).refresh(user_id)
+
         return analysis_dict
 
     def _create_place_visits(self, user_id: str) -> int:
         """Create place_visits entries from food/drink transactions.
 
         Only creates visits for transactions in relevant taste categories
-        (coffee, dining, fast_food, nightlife, other_food).
-        Uses upsert to avoid duplicates.
+        (coffee, dining, fast_food, nightlife, other_food) that arrived
+        after the user's visits watermark, then matches venues for them and
+        refreshes the vault summary.
 
         Args:
             user_id: The user's ID
 
         Returns:
-            Number of place visits created/updated
+            Number of place visits created
         """
-        # Categories that should create place visits
-        visit_categories = {"coffee", "dining", "fast_food", "nightlife", "other_food"}
+        created = self._insert_new_place_visits(user_id)
 
-        # Fetch food/drink transactions that don't have place_visits yet
-        result = (
-            self._supabase.table("transactions")
-            .select("id, user_id, merchant_name, amount, date, datetime, taste_category")
-            .eq("user_id", user_id)
-            .in_("taste_category", list(visit_categories))
-            .execute()
-        )
-        transactions = result.data or []
+        if created:
+            # Match venues for new place visits (in background-friendly way)
+            self._match_venues_for_user(user_id)
+            # Keep the materialized vault summary in step with new visits
+            VaultSummaryService(self._supabase).refresh(user_id)
 
-        if not transactions:
-            return 0
+        return created
 
-        # Get existing place_visits for this user to check for duplicates
-        existing_result = (
-            self._supabase.table("place_visits")
-            .select("transaction_id")
-            .eq("user_id", user_id)
-            .execute()
-        )
-        existing_tx_ids = {pv["transaction_id"] for pv in (existing_result.data or [])}
+    def _insert_new_place_visits(self, user_id: str) -> int:
+        """Insert place_visits for transactions past the visits watermark.
 
-        # Create place_visit records for new transactions
-        records = []
-        for tx in transactions:
-            tx_id = tx["id"]
+        The watermark is the (created_at, id) of the last transaction
+        processed for the user, stored on user_analysis. Only transactions
+        after it are read, so the cost is O(new transactions) rather than
+        O(history). Existing visits are only checked for the transactions
+        in the current batch, which keeps the first (unwatermarked) run
+        safe for users who already have visits.
 
-            # Skip if already has a place_visit
-            if tx_id in existing_tx_ids:
-                continue
+        Args:
+            user_id: The user's ID
 
-            # Determine visited_at timestamp
-            visited_at = tx.get("datetime") or tx.get("date")
-            if not visited_at:
-                continue
+        Returns:
+            Number of place visits inserted
+        """
+        watermark_at, watermark_tx_id = self._get_visits_watermark(user_id)
+        start_watermark = (watermark_at, watermark_tx_id)
+        created = 0
 
-            records.append({
-                "user_id": user_id,
-                "transaction_id": tx_id,
-                "merchant_name": tx.get("merchant_name") or "Unknown",
-                "amount": abs(float(tx.get("amount") or 0)),
-                "visited_at": visited_at,
-                "source": "transaction",
-            })
+        while True:
+            query = (
+                self._supabase.table("transactions")
+                .select("id, merchant_name, amount, date, datetime, taste_category, created_at")
+                .eq("user_id", user_id)
+                .in_("taste_category", VISIT_CATEGORIES)
+            )
+            if watermark_at and watermark_tx_id:
+                query = query.or_(
+                    f'created_at.gt."{watermark_at}",'
+                    f'and(created_at.eq."{watermark_at}",id.gt.{watermark_tx_id})'
+                )
+            elif watermark_at:
+                query = query.gt("created_at", watermark_at)
+
+            result = (
+                query.order("created_at")
+                .order("id")
+                .limit(VISIT_SYNC_BATCH_SIZE)
+                .execute()
+            )
+            transactions = result.data or []
 
-        if not records:
-            return 0
+            if not transactions:
+                break
+
+            # Only the current batch is checked against existing visits
+            tx_ids = [tx["id"] for tx in transactions]
+            existing_result = (
+                self._supabase.table("place_visits")
+                .select("transaction_id")
+                .in_("transaction_id", tx_ids)
+                .execute()
+            )
+            existing_tx_ids = {pv["transaction_id"] for pv in (existing_result.data or [])}
+
+            records = []
+            for tx in transactions:
+                if tx["id"] in existing_tx_ids:
+                    continue
 
-        # Insert new place_visits
-        self._supabase.table("place_visits").insert(records).execute()
+                # Determine visited_at timestamp
+                visited_at = tx.get("datetime") or tx.get("date")
+                if not visited_at:
+                    continue
 
-        print(f"[PlaidService] Created {len(records)} place visits for user {user_id}")
+                records.append({
+                    "user_id": user_id,
+                    "transaction_id": tx["id"],
+                    "merchant_name": tx.get("merchant_name") or "Unknown",
+                    "amount": abs(float(tx.get("amount") or 0)),
+                    "visited_at": visited_at,
+                    "source": "transaction",
+                })
 
-        # Match venues for new place visits (in background-friendly way)
-        self._match_venues_for_user(user_id)
+            if records:
+                # A concurrent sync may have inserted some of these since the check
+                inserted = (
+                    self._supabase.table("place_visits")
+                    .upsert(records, on_conflict="user_id,transaction_id", ignore_duplicates=True)
+                    .execute()
+                )
+                created += len(inserted.data or [])
 
-        return len(records)
+            last_tx = transactions[-1]
+            watermark_at, watermark_tx_id = last_tx.get("created_at"), last_tx["id"]
+
+            if len(transactions) < VISIT_SYNC_BATCH_SIZE:
+                break
+
+        if (watermark_at, watermark_tx_id) != start_watermark:
+            self._set_visits_watermark(user_id, watermark_at, watermark_tx_id)
+
+        if created:
+            print(f"[PlaidService] Created {created} place visits for user {user_id}")
+
+        return created
+
+    def _get_visits_watermark(self, user_id: str) -> tuple[str | None, str | None]:
+        """Get the last transaction processed into place_visits for a user.
+
+        Args:
+            user_id: The user's ID
+
+        Returns:
+            Tuple of (transaction created_at, transaction id), both None if
+            no transactions have been processed yet
+        """
+        result = (
+            self._supabase.table("user_analysis")
+            .select("visits_watermark_at, visits_watermark_tx_id")
+            .eq("user_id", user_id)
+            .execute()
+        )
+        row = result.data[0] if result.data else None
+        if not row:
+            return None, None
+        return row.get("visits_watermark_at"), row.get("visits_watermark_tx_id")
+
+    def _set_visits_watermark(
+        self,
+        user_id: str,
+        watermark_at: str | None,
+        watermark_tx_id: str | None,
+    ) -> None:
+        """Advance the place_visits watermark for a user.
+
+        Args:
+            user_id: The user's ID
+            watermark_at: created_at of the last processed transaction
+            watermark_tx_id: id of the last processed transaction
+        """
+        self._supabase.table("user_analysis").upsert(
+            {
+                "user_id": user_id,
+                "visits_watermark_at": watermark_at,
+                "visits_watermark_tx_id": watermark_tx_id,
+            },
+            on_conflict="user_id",
+        ).execute()
 
     def _match_venues_for_user(self, user_id: str) -> int:
         """Match venues for place_visits that don't have venue_id set.
 
         Uses Google Places API to find matching venues from merchant names.
-        Creates venues if they don't exist and links them to place_visits.
+        Visits are grouped by normalized merchant and location grid cell,
+        distinct places are resolved concurrently (groups matching the same
+        place share one venue), and each matched venue is linked to its
+        visits with a single update.
 
         Args:
             user_id: The user's ID
 
         Returns:
-            Number of venues matched
+            Number of visits matched to a venue
         """
         # Get place_visits without venue_id, joined with transaction location data
         result = (
@@ -504,8 +615,9 @@ class PlaidService:
         else:
             tx_locations = {}
 
-        matched_count = 0
-
+        # Group visits by (normalized merchant, ~1km grid cell) so each
+        # distinct merchant/location is looked up once
+        groups: dict[tuple[str, float | None, float | None], dict[str, Any]] = {}
         for visit in visits:
             merchant_name = visit.get("merchant_name")
             if not merchant_name:
@@ -516,46 +628,151 @@ class PlaidService:
             tx_loc = tx_locations.get(tx_id, {}) if tx_id else {}
             lat = float(tx_loc["location_lat"]) if tx_loc.get("location_lat") else None
             lng = float(tx_loc["location_lng"]) if tx_loc.get("location_lng") else None
-            city = tx_loc.get("location_city") or "Unknown"
 
-            # Try to match venue
-            venue_id = self._match_or_create_venue(merchant_name, lat, lng, city)
+            key = (
+                merchant_name.lower().strip(),
+                round(lat, 2) if lat is not None else None,
+                round(lng, 2) if lng is not None else None,
+            )
+            if key not in groups:
+                groups[key] = {
+                    "merchant_name": merchant_name,
+                    "lat": lat,
+                    "lng": lng,
+                    "city": tx_loc.get("location_city") or "Unknown",
+                    "visit_ids": [],
+                }
+            groups[key]["visit_ids"].append(visit["id"])
+
+        if not groups:
+            return 0
 
-            if venue_id:
-                # Update place_visit with venue_id
-                self._supabase.table("place_visits").update(
-                    {"venue_id": venue_id}
-                ).eq("id", visit["id"]).execute()
-                matched_count += 1
+        group_list = list(groups.values())
+
+        # Merchants already in the venues catalog resolve locally
+        venue_ids = self._match_groups_locally(group_list)
+        remote = [(i, g) for i, g in enumerate(group_list) if i not in venue_ids]
+
+        # New venues start with rule-based tags; AI profiles follow in the background
+        pending_tags: list[tuple[str, dict[str, Any]]] = []
+
+        if remote:
+            # Look up the rest at once (one cache query, API for misses)
+            place_matches = self._places_service.find_places(
+                [(g["merchant_name"], g["lat"], g["lng"]) for _, g in remote],
+                max_workers=VENUE_MATCH_CONCURRENCY,
+            )
+
+            # Groups that matched the same place (e.g. two spellings of one
+            # merchant) share one venue, so it is only created once
+            groups_by_place: dict[str, list[int]] = {}
+            first_match: dict[str, tuple[PlaceMatch, dict[str, Any]]] = {}
+            for (i, group), match in zip(remote, place_matches):
+                if match is None:
+                    continue
+                groups_by_place.setdefault(match.place_id, []).append(i)
+                first_match.setdefault(match.place_id, (match, group))
+
+            def resolve(item: tuple[PlaceMatch, dict[str, Any]]) -> str | None:
+                match, group = item
+                try:
+                    return self._get_or_create_venue(
+                        match, group["merchant_name"], group["city"], pending_tags
+                    )
+                except Exception as e:
+                    print(f"[PlaidService] Venue match failed for {group['merchant_name']}: {e}")
+                    return None
+
+            # Resolve distinct places concurrently with bounded parallelism
+            if first_match:
+                workers = min(VENUE_MATCH_CONCURRENCY, len(first_match))
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    place_ids = list(first_match)
+                    remote_ids = executor.map(resolve, first_match.values())
+                    for place_id, venue_id in zip(place_ids, remote_ids):
+                        if venue_id:
+                            for i in groups_by_place[place_id]:
+                                venue_ids[i] = venue_id
+
+        # One update per matched venue, covering every visit in its groups
+        visits_by_venue: dict[str, list[str]] = {}
+        for i, venue_id in venue_ids.items():
+            visits_by_venue.setdefault(venue_id, []).extend(group_list[i]["visit_ids"])
+
+        matched_count = 0
+        for venue_id, visit_ids in visits_by_venue.items():
+            self._supabase.table("place_visits").update(
+                {"venue_id": venue_id}
+            ).in_("id", visit_ids).execute()
+            matched_count += len(visit_ids)
+
+        self._tagging_service.schedule_upgrade(pending_tags)
 
         if matched_count > 0:
-            print(f"[PlaidService] Matched {matched_count} venues for user {user_id}")
+            print(
+                f"[PlaidService] Matched {matched_count} visits to {len(visits_by_venue)} "
+                f"venues ({len(group_list)} distinct merchants) for user {user_id}"
+            )
+            cache_stats = get_lookup_cache_stats()
+            print(
+                f"[PlaidService] Places lookup cache hit ratio: "
+                f"memory {cache_stats['memory']['hit_ratio']:.0%}, "
+                f"database {cache_stats['database']['hit_ratio']:.0%}"
+            )
 
         return matched_count
 
-    def _match_or_create_venue(
+    def _match_groups_locally(self, groups: list[dict[str, Any]]) -> dict[int, str]:
+        """Match merchant groups against the in-memory venue index.
+
+        Args:
+            groups: Merchant groups with merchant_name, lat and lng
+
+        Returns:
+            Venue id by group index, for matches at or above the threshold
+        """
+        try:
+            venue_index = get_venue_index(self._supabase)
+        except Exception as e:
+            print(f"[PlaidService] Venue index unavailable: {e}")
+            return {}
+
+        threshold = get_settings().venue_match_confidence_threshold
+        matched: dict[int, str] = {}
+        for i, group in enumerate(groups):
+            match = venue_index.match(group["merchant_name"], group["lat"], group["lng"])
+            if match and match.confidence >= threshold:
+                matched[i] = match.venue_id
+
+        if matched:
+            print(
+                f"[PlaidService] Matched {len(matched)}/{len(groups)} merchants "
+                f"to known venues locally"
+            )
+        return matched
+
+    def _get_or_create_venue(
         self,
+        match: PlaceMatch,
         merchant_name: str,
-        lat: float | None,
-        lng: float | None,
         city: str,
+        pending_tags: list[tuple[str, dict[str, Any]]] | None = None,
     ) -> str | None:
-        """Match merchant to Google Place and create venue if needed.
+        """Get the venue for a matched place, creating it if new.
+
+        New venues are created with rule-based tags so they can be matched
+        right away; AI tagging replaces them in the background.
 
         Args:
-            merchant_name: Merchant name from Plaid
-            lat: Transaction latitude
-            lng: Transaction longitude
+            match: PlaceMatch for the merchant
+            merchant_name: Merchant name from Plaid (for logging)
             city: City name for venue record
+            pending_tags: Collects (venue_id, tagger input) for a batched
+                AI upgrade; if None, the upgrade is scheduled immediately
 
         Returns:
-            Venue UUID if matched/created, None otherwise
+            Venue UUID if found/created, None otherwise
         """
-        # Find place using Google Places API (uses cache)
-        match = self._places_service.find_place(merchant_name, lat, lng)
-        if not match:
-            return None
-
         # Check if venue already exists
         existing = self._places_service.get_venue_by_place_id(match.place_id)
         if existing:
@@ -566,52 +783,20 @@ class PlaidService:
         if not details:
             return None
 
-        # Run AI tagging
-        venue_data = self._build_venue_tagger_input(details)
-        try:
-            profile = self._get_venue_tagger().tag(venue_data)
-        except Exception as e:
-            print(f"[PlaidService] VenueTagger failed for {merchant_name}: {e}")
-            profile = None
-
-        # Create venue with combined data
+        # Create venue with provisional rule-based tags
         venue = self._places_service.create_or_update_venue(
             details,
             city=city,
             source="transaction",
         )
+        get_venue_index(self._supabase).add(venue)
 
-        # Update with AI tags if available
-        if profile and venue.get("id"):
-            self._supabase.table("venues").update({
-                "taste_cluster": profile.taste_cluster,
-                "cuisine_type": profile.cuisine_type,
-                "energy": profile.energy,
-                "tagline": profile.tagline,
-                "best_for": profile.best_for,
-                "standout": profile.standout,
-            }).eq("id", venue["id"]).execute()
+        venue_id = venue.get("id")
+        if venue_id:
+            pending = (venue_id, venue_tagger_input(details))
+            if pending_tags is None:
+                self._tagging_service.schedule_upgrade([pending])
+            else:
+                pending_tags.append(pending)
 
-        return venue.get("id")
-
-    def _build_venue_tagger_input(self, details) -> dict:
-        """Build input dict for VenueTagger from PlaceDetails.
-
-        Args:
-            details: PlaceDetails from Google Places API
-
-        Returns:
-            Dict formatted for VenueTagger.tag()
-        """
-        # Map price_level to price string
-        price_map = {0: "Free", 1: "$", 2: "$$", 3: "$$$", 4: "$$$$"}
-        price = price_map.get(details.price_level) if details.price_level else None
-
-        return {
-            "name": details.name,
-            "category": details.primary_type or "restaurant",
-            "categories": details.types[:5] if details.types else [],
-            "rating": details.rating,
-            "price": price,
-            "reviews": details.reviews,
-        }
+        return venue_id
@@ -0,0 +1,140 @@
+"""RateLimiter - Token bucket rate limiting shared across threads and workers.
+
+A single limiter instance is meant to be shared per process (see
+get_places_rate_limiter). Callers reserve a slot under a lock and then
+sleep outside it, so waiters are served in arrival order and the lock is
+never held while sleeping. With a state_path the bucket lives in a
+SQLite file, so every worker process on the host shares one budget.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sqlite3
+import threading
+import time
+from contextlib import closing
+
+from app.config import get_settings
+
+
+class RateLimiter:
+    """Thread-safe token bucket with sync and async acquire."""
+
+    def __init__(
+        self,
+        rate: float = 500,
+        per: float = 60.0,
+        state_path: str | None = None,
+        name: str = "default",
+    ) -> None:
+        """Initialize rate limiter.
+
+        Args:
+            rate: Number of requests allowed per period
+            per: Period in seconds (default 60s = 1 minute)
+            state_path: SQLite file for a bucket shared across processes
+            name: Bucket name within the SQLite file
+        """
+        self.rate = rate
+        self.per = per
+        self.state_path = state_path
+        self.name = name
+        self.tokens = rate
+        self.last_update = time.time()
+        self._lock = threading.Lock()
+
+        if state_path:
+            with closing(self._connect()) as conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS buckets "
+                    "(name TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)"
+                )
+
+    def acquire(self) -> None:
+        """Acquire a token, blocking the calling thread if rate limit exceeded."""
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self) -> None:
+        """Acquire a token without blocking the event loop.
+
+        The SQLite-backed bucket is reserved in a worker thread, since it
+        can wait on other processes' write locks.
+        """
+        if self.state_path:
+            wait = await asyncio.to_thread(self.reserve)
+        else:
+            wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def reserve(self) -> float:
+        """Take a token, going into debt if the bucket is empty.
+
+        Returns:
+            Seconds the caller must wait before using its token
+        """
+        with self._lock:
+            if self.state_path:
+                return self._reserve_shared()
+
+            self.tokens, self.last_update, wait = self._take(self.tokens, self.last_update)
+            return wait
+
+    def _take(self, tokens: float, last_update: float) -> tuple[float, float, float]:
+        """Refill a bucket and take one token.
+
+        Tokens may go negative: each caller queued behind an empty bucket
+        owes one more token than the one before it, which keeps waiters in
+        FIFO order.
+
+        Returns:
+            (new tokens, new last_update, seconds to wait)
+        """
+        now = time.time()
+        elapsed = max(0.0, now - last_update)
+        tokens = min(self.rate, tokens + elapsed * (self.rate / self.per)) - 1
+        wait = -tokens * (self.per / self.rate) if tokens < 0 else 0.0
+        return tokens, now, wait
+
+    def _reserve_shared(self) -> float:
+        """Reserve a token from the SQLite-backed bucket."""
+        with closing(self._connect()) as conn:
+            # Take the write lock up front so concurrent workers serialize
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT tokens, updated FROM buckets WHERE name = ?", (self.name,)
+            ).fetchone()
+            tokens, updated = row if row else (self.rate, time.time())
+            tokens, updated, wait = self._take(tokens, updated)
+            conn.execute(
+                "INSERT OR REPLACE INTO buckets (name, tokens, updated) VALUES (?, ?, ?)",
+                (self.name, tokens, updated),
+            )
+            conn.execute("COMMIT")
+        return wait
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection to the shared bucket file."""
+        return sqlite3.connect(self.state_path, timeout=10, isolation_level=None)
+
+
+_places_rate_limiter: RateLimiter | None = None
+_places_rate_limiter_lock = threading.Lock()
+
+
+def get_places_rate_limiter() -> RateLimiter:
+    """Get the process-wide Google Places rate limiter."""
+    global _places_rate_limiter
+    with _places_rate_limiter_lock:
+        if _places_rate_limiter is None:
+            settings = get_settings()
+            _places_rate_limiter = RateLimiter(
+                rate=settings.places_rate_limit_per_minute,
+                per=60.0,
+                state_path=settings.places_rate_limit_state_path or None,
+                name="google_places",
+            )
+        return _places_rate_limiter
@@ -0,0 +1,111 @@
+"""RowLoader - Request-scoped batching loader for per-user rows.
+
+Routers and intelligence classes look up the same few one-row-per-user
+tables (declared_taste, fused_taste, user_analysis, profiles) several
+times within one request. RowLoader is a DataLoader: keys requested in
+the same event loop tick are fetched with one in_() query per table, and
+every result (including misses) is memoized for the loader's lifetime.
+
+Create one per request via the get_row_loader dependency (FastAPI caches
+it per request) - never share one across requests, since memoized rows
+go stale. Call clear() after writing a row through another path.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+from fastapi import Depends
+from supabase import Client
+
+from app.dependencies import get_supabase_client
+
+# Tables the loader serves, and the column each one is keyed by
+KEY_COLUMNS = {
+    "declared_taste": "user_id",
+    "fused_taste": "user_id",
+    "user_analysis": "user_id",
+    "profiles": "id",
+}
+
+
+class RowLoader:
+    """Batches and memoizes single-row lookups by key."""
+
+    def __init__(self, supabase: Client) -> None:
+        """Initialize with Supabase client.
+
+        Args:
+            supabase: Supabase client for database operations
+        """
+        self._supabase = supabase
+        self._rows: dict[tuple[str, str], dict[str, Any] | None] = {}
+        self._inflight: dict[tuple[str, str], asyncio.Future[dict[str, Any] | None]] = {}
+        self._pending: dict[str, list[str]] = {}
+        self._tasks: set[asyncio.Task[None]] = set()
+        self.queries = 0
+
+    async def load(self, table: str, key: str) -> dict[str, Any] | None:
+        """Load one row, batched with other loads issued in the same tick.
+
+        Args:
+            table: One of KEY_COLUMNS
+            key: Value of the table's key column
+
+        Returns:
+            The row, or None if there is none
+        """
+        if (table, key) in self._rows:
+            return self._rows[(table, key)]
+
+        future = self._inflight.get((table, key))
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            self._inflight[(table, key)] = future
+            pending = self._pending.setdefault(table, [])
+            if not pending:
+                # Runs after every task already scheduled for this tick
+                task = asyncio.ensure_future(self._dispatch(table))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+            pending.append(key)
+        return await asyncio.shield(future)
+
+    async def load_many(self, table: str, keys: list[str]) -> list[dict[str, Any] | None]:
+        """Load several rows in one batch (results in key order)."""
+        return list(await asyncio.gather(*(self.load(table, key) for key in keys)))
+
+    def prime(self, table: str, key: str, row: dict[str, Any] | None) -> None:
+        """Seed the memo with a row already in hand."""
+        self._rows[(table, key)] = row
+
+    def clear(self, table: str, key: str) -> None:
+        """Forget a memoized row (after writing it)."""
+        self._rows.pop((table, key), None)
+
+    async def _dispatch(self, table: str) -> None:
+        """Fetch every key queued for a table this tick in one query."""
+        keys = self._pending.pop(table, [])
+        try:
+            rows = await asyncio.to_thread(self._fetch, table, keys)
+        except Exception as e:
+            # Failures aren't memoized; the next load() retries
+            for key in keys:
+                self._inflight.pop((table, key)).set_exception(e)
+            return
+        for key in keys:
+            self._rows[(table, key)] = rows.get(key)
+            self._inflight.pop((table, key)).set_result(rows.get(key))
+
+    def _fetch(self, table: str, keys: list[str]) -> dict[str, dict[str, Any]]:
+        """Fetch rows for keys with one in_() query, keyed by key."""
+        column = KEY_COLUMNS[table]
+        self.queries += 1
+        result = self._supabase.table(table).select("*").in_(column, keys).execute()
+        return {row[column]: row for row in result.data or []}
+
+
+def get_row_loader(supabase: Client = Depends(get_supabase_client)) -> RowLoader:
+    """Dependency for a request-scoped RowLoader."""
+    return RowLoader(supabase)
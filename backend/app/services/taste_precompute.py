@@ -0,0 +1,524 @@
+"""TastePrecomputeService - Nightly batch generation of daily taste content.
+
+Daily insights, DNA traits and profile titles are generated once a day.
+This job generates them ahead of time: it walks recently active users
+(optionally one shard of them), reads their user_analysis and
+declared_taste rows in bulk, generates through a bounded worker pool (the
+shared LLM gateway caps concurrency further), and bulk-writes
+daily_insights, daily_dna and daily_profile_titles. A user missing more
+than one kind gets them from a single TasteContentGenerator call. For
+anyone the job missed, the endpoints serve the previous content with
+stale: true and call regenerate() in the background.
+
+Run in-process (TASTE_PRECOMPUTE_HOUR_UTC >= 0) or from cron via
+scripts/precompute_taste_content.py.
+
+Content is generated for the server's (UTC) date, which is also what the
+endpoints key "today" by. Users far from UTC therefore get the new day's
+content at the UTC rollover rather than their local morning; pick
+TASTE_PRECOMPUTE_HOUR_UTC for the largest audience.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import zlib
+from collections.abc import Collection
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta, timezone
+from typing import Any
+
+from supabase import Client
+
+from app.config import get_settings
+from app.intelligence.dna_generator import DNAGenerator
+from app.intelligence.generation_cache import GenerationCache
+from app.intelligence.insight_generator import InsightGenerator
+from app.intelligence.profile_titles import AIProfileTitleGenerator
+from app.intelligence.rule_insights import highlights
+from app.intelligence.taste_content_generator import TasteContentGenerator
+
+# Page size when listing active users
+ACTIVE_USERS_PAGE_SIZE = 1000
+
+# Page size when checking a batch for existing content (PostgREST's row cap)
+EXISTING_ROWS_PAGE_SIZE = 1000
+
+# The DNA endpoint treats fewer traits than this as missing
+DNA_TRAIT_COUNT = 4
+
+# Kinds of daily content, as named in generation counts
+CONTENT_KINDS = ("insights", "dna", "titles")
+
+
+def insight_user_data(analysis: dict[str, Any]) -> dict[str, Any]:
+    """Build InsightGenerator input from a user_analysis row."""
+    return {
+        "total_transactions": analysis.get("total_transactions", 0),
+        "categories": analysis.get("categories", {}),
+        "streaks": analysis.get("streaks", {}),
+        "exploration": analysis.get("exploration", {}),
+        "time_buckets": analysis.get("time_buckets", {}),
+        "top_merchants": analysis.get("top_merchants", []),
+        "highlights": highlights(analysis),
+    }
+
+
+def dna_user_data(analysis: dict[str, Any], declared: dict[str, Any]) -> dict[str, Any]:
+    """Build DNAGenerator input from user_analysis and declared_taste rows."""
+    return {
+        # Transaction data
+        "categories": analysis.get("categories", {}),
+        "top_merchants": analysis.get("top_merchants", []),
+        "time_buckets": analysis.get("time_buckets", {}),
+        # Quiz data
+        "exploration_style": declared.get("exploration_style"),
+        "vibe_preferences": declared.get("vibe_preferences", []),
+        "social_preference": declared.get("social_preference"),
+        "price_tier": declared.get("price_tier"),
+    }
+
+
+def title_user_data(analysis: dict[str, Any], declared: dict[str, Any]) -> dict[str, Any]:
+    """Build AIProfileTitleGenerator input from user_analysis and declared_taste rows."""
+    user_data = {
+        "exploration_style": declared.get("exploration_style"),
+        "vibe_preferences": declared.get("vibe_preferences") or [],
+        "social_preference": declared.get("social_preference"),
+        "price_tier": declared.get("price_tier"),
+    }
+    if analysis:
+        user_data["categories"] = analysis.get("categories", {})
+    return user_data
+
+
+def taste_user_data(analysis: dict[str, Any], declared: dict[str, Any]) -> dict[str, Any]:
+    """Build TasteContentGenerator input (all three artifacts) from both rows."""
+    return {
+        **insight_user_data(analysis),
+        **dna_user_data(analysis, declared),
+        "vibe_preferences": declared.get("vibe_preferences") or [],
+    }
+
+
+def build_insight_rows(
+    user_id: str,
+    insights: list[Any],
+    analysis: dict[str, Any],
+    target_date: date,
+) -> list[dict[str, Any]]:
+    """Build daily_insights rows, one per type ((user_id, shown_at, insight_type) is unique)."""
+    source_data = insight_user_data(analysis)
+    by_type = {insight.type: insight for insight in insights}
+    return [
+        {
+            "user_id": user_id,
+            "insight_type": insight.type,
+            "title": insight.title,
+            "body": insight.body,
+            "emoji": insight.emoji,
+            "source_data": source_data,
+            "shown_at": str(target_date),
+        }
+        for insight in by_type.values()
+    ]
+
+
+def build_dna_rows(user_id: str, traits: list[Any], target_date: date) -> list[dict[str, Any]]:
+    """Build daily_dna rows, one per trait name."""
+    by_name = {trait.name: trait for trait in traits}
+    return [
+        {
+            "user_id": user_id,
+            "trait_name": trait.name,
+            "emoji": trait.emoji,
+            "description": trait.description,
+            "color": trait.color,
+            "shown_at": str(target_date),
+        }
+        for trait in by_name.values()
+    ]
+
+
+def title_expires_at(now: datetime | None = None) -> datetime:
+    """Get when a profile title generated now expires (next UTC midnight)."""
+    now = now or datetime.now(timezone.utc)
+    return now.replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
+
+
+def user_shard(user_id: str, shard_count: int) -> int:
+    """Get a user's shard (stable across processes and runs)."""
+    return zlib.crc32(user_id.encode()) % shard_count
+
+
+# Users with a regeneration queued or running in this process
+_regenerating: set[str] = set()
+_regenerating_lock = threading.Lock()
+
+
+def claim_regeneration(user_id: str) -> bool:
+    """Claim a background regeneration, deduplicating per user.
+
+    One regeneration fills every missing kind of content, so the first
+    endpoint to miss claims it for all of them.
+
+    Args:
+        user_id: User whose content is stale
+
+    Returns:
+        True if the caller should schedule TastePrecomputeService.regenerate;
+        False if one is already queued or running
+    """
+    with _regenerating_lock:
+        if user_id in _regenerating:
+            return False
+        _regenerating.add(user_id)
+        return True
+
+
+class TastePrecomputeService:
+    """Generates daily taste content ahead of the first request."""
+
+    def __init__(
+        self,
+        supabase: Client,
+        insight_generator: InsightGenerator | None = None,
+        dna_generator: DNAGenerator | None = None,
+        title_generator: AIProfileTitleGenerator | None = None,
+        content_generator: TasteContentGenerator | None = None,
+        workers: int | None = None,
+    ) -> None:
+        """Initialize with Supabase client.
+
+        Args:
+            supabase: Supabase client for database operations
+            insight_generator: Insight generator (defaults to a cached one)
+            dna_generator: DNA generator (defaults to a cached one)
+            title_generator: Profile title generator (defaults to a cached one)
+            content_generator: Combined generator used when a user needs more
+                than one kind (defaults to a cached one)
+            workers: Worker pool size (defaults to TASTE_PRECOMPUTE_WORKERS)
+        """
+        self._supabase = supabase
+        cache = GenerationCache(supabase)
+        self._insight_generator = insight_generator or InsightGenerator(cache=cache)
+        self._dna_generator = dna_generator or DNAGenerator(cache=cache)
+        self._title_generator = title_generator or AIProfileTitleGenerator(cache=cache)
+        self._content_generator = content_generator or TasteContentGenerator(cache=cache)
+        self._workers = workers or get_settings().taste_precompute_workers
+
+    def get_active_user_ids(self, shard: int = 0, shard_count: int = 1) -> list[str]:
+        """Get users who used the app within the activity window.
+
+        Activity is profiles.last_active_at, stamped by the taste endpoints
+        (see user_activity) - never by this job, so lapsed users drop out.
+
+        Args:
+            shard: Shard to return (0-based)
+            shard_count: Total number of shards
+
+        Returns:
+            Sorted user IDs in the shard
+        """
+        days = get_settings().taste_precompute_active_days
+        cutoff = datetime.now(timezone.utc) - timedelta(days=days)
+        user_ids: list[str] = []
+        start = 0
+        while True:
+            result = (
+                self._supabase.table("profiles")
+                .select("id")
+                .gte("last_active_at", cutoff.isoformat())
+                .order("id")
+                .range(start, start + ACTIVE_USERS_PAGE_SIZE - 1)
+                .execute()
+            )
+            rows = result.data or []
+            user_ids.extend(row["id"] for row in rows)
+            if len(rows) < ACTIVE_USERS_PAGE_SIZE:
+                break
+            start += ACTIVE_USERS_PAGE_SIZE
+
+        return sorted(u for u in user_ids if user_shard(u, shard_count) == shard)
+
+    def run(
+        self,
+        target_date: date | None = None,
+        shard: int = 0,
+        shard_count: int = 1,
+        batch_size: int | None = None,
+    ) -> dict[str, int]:
+        """Precompute content for every active user in a shard.
+
+        Args:
+            target_date: Day to generate for (defaults to today)
+            shard: Shard to process (0-based)
+            shard_count: Total number of shards
+            batch_size: Users per batch (defaults to TASTE_PRECOMPUTE_BATCH_SIZE)
+
+        Returns:
+            Counts of users and generated insights, DNA sets and titles
+        """
+        target_date = target_date or date.today()
+        batch_size = batch_size or get_settings().taste_precompute_batch_size
+        user_ids = self.get_active_user_ids(shard, shard_count)
+
+        totals = {"users": len(user_ids), "insights": 0, "dna": 0, "titles": 0, "failures": 0}
+        with ThreadPoolExecutor(max_workers=self._workers) as executor:
+            for i in range(0, len(user_ids), batch_size):
+                counts = self.precompute_batch(user_ids[i : i + batch_size], target_date, executor)
+                for key, count in counts.items():
+                    totals[key] += count
+
+        print(
+            f"[TastePrecompute] Shard {shard}/{shard_count} for {target_date}: "
+            f"{totals['users']} users, {totals['insights']} insight sets, "
+            f"{totals['dna']} DNA sets, {totals['titles']} titles, {totals['failures']} failures"
+        )
+        return totals
+
+    def precompute_batch(
+        self,
+        user_ids: list[str],
+        target_date: date,
+        executor: ThreadPoolExecutor | None = None,
+        kinds: Collection[str] = CONTENT_KINDS,
+    ) -> dict[str, int]:
+        """Generate and store missing content for one batch of users.
+
+        Args:
+            user_ids: Users in the batch
+            target_date: Day to generate for
+            executor: Worker pool for generator calls (defaults to a new one)
+            kinds: Content kinds to generate
+
+        Returns:
+            Counts of generated insights, DNA sets, titles and failures
+        """
+        need_insights, need_dna, need_titles = self._find_missing(user_ids, target_date)
+        need_insights = need_insights if "insights" in kinds else set()
+        need_dna = need_dna if "dna" in kinds else set()
+        need_titles = need_titles if "titles" in kinds else set()
+        pending = need_insights | need_dna | need_titles
+        if not pending:
+            return {"insights": 0, "dna": 0, "titles": 0, "failures": 0}
+
+        if executor is None:
+            with ThreadPoolExecutor(max_workers=self._workers) as executor:
+                return self.precompute_batch(user_ids, target_date, executor, kinds)
+
+        analyses = self._fetch_rows("user_analysis", list(pending))
+        declared = self._fetch_rows("declared_taste", list(pending))
+
+        # One combined call when a user needs several kinds, else one per kind
+        jobs = []
+        for user_id in sorted(pending):
+            analysis = analyses.get(user_id)
+            declared_row = declared.get(user_id)
+            needed = []
+            if user_id in need_insights and analysis:
+                needed.append("insights")
+            if user_id in need_dna and (analysis or declared_row):
+                needed.append("dna")
+            if user_id in need_titles and declared_row:
+                needed.append("titles")
+
+            if len(needed) > 1:
+                data = taste_user_data(analysis or {}, declared_row or {})
+                future = executor.submit(self._content_generator.generate, data)
+            elif needed == ["insights"]:
+                future = executor.submit(
+                    self._insight_generator.generate, insight_user_data(analysis)
+                )
+            elif needed == ["dna"]:
+                data = dna_user_data(analysis or {}, declared_row or {})
+                future = executor.submit(self._dna_generator.generate, data)
+            elif needed == ["titles"]:
+                data = title_user_data(analysis or {}, declared_row)
+                future = executor.submit(self._title_generator.generate, data)
+            else:
+                continue
+            jobs.append((user_id, needed, analysis, future))
+
+        insight_rows: list[dict[str, Any]] = []
+        dna_rows: list[dict[str, Any]] = []
+        title_rows: list[dict[str, Any]] = []
+        counts = {"insights": 0, "dna": 0, "titles": 0, "failures": 0}
+        now = datetime.now(timezone.utc)
+
+        for user_id, needed, analysis, future in jobs:
+            try:
+                result = future.result()
+            except Exception as e:
+                print(f"[TastePrecompute] {'/'.join(needed)} generation failed for {user_id}: {e}")
+                counts["failures"] += 1
+                continue
+
+            if len(needed) > 1:
+                artifacts = {
+                    "insights": result.insights,
+                    "dna": result.traits,
+                    "titles": (result.title, result.tagline),
+                }
+            else:
+                artifacts = {needed[0]: result}
+
+            for kind in needed:
+                counts[kind] += 1
+                if kind == "insights":
+                    insight_rows.extend(
+                        build_insight_rows(user_id, artifacts[kind], analysis, target_date)
+                    )
+                elif kind == "dna":
+                    dna_rows.extend(build_dna_rows(user_id, artifacts[kind], target_date))
+                else:
+                    title, tagline = artifacts[kind]
+                    title_rows.append(
+                        {
+                            "user_id": user_id,
+                            "title": title,
+                            "tagline": tagline,
+                            "generated_at": now.isoformat(),
+                            "expires_at": title_expires_at(now).isoformat(),
+                        }
+                    )
+
+        # Ignore duplicates so a concurrent on-demand generation wins quietly
+        if insight_rows:
+            self._supabase.table("daily_insights").upsert(
+                insight_rows,
+                on_conflict="user_id,shown_at,insight_type",
+                ignore_duplicates=True,
+            ).execute()
+        if dna_rows:
+            self._supabase.table("daily_dna").upsert(
+                dna_rows,
+                on_conflict="user_id,shown_at,trait_name",
+                ignore_duplicates=True,
+            ).execute()
+        if title_rows:
+            # Titles are one row per user: clear the expired ones being replaced
+            day_start = datetime.combine(target_date, datetime.min.time(), tzinfo=timezone.utc)
+            self._supabase.table("daily_profile_titles").delete().in_(
+                "user_id", [row["user_id"] for row in title_rows]
+            ).lte("expires_at", day_start.isoformat()).execute()
+            self._supabase.table("daily_profile_titles").upsert(
+                title_rows,
+                on_conflict="user_id",
+                ignore_duplicates=True,
+            ).execute()
+
+        return counts
+
+    def regenerate(self, user_id: str) -> None:
+        """Regenerate all of today's missing content for a user.
+
+        Runs as a background task after an endpoint served stale content,
+        filling insights, DNA and title together (one combined call when
+        more than one is missing). The caller must have claimed it with
+        claim_regeneration(); the claim is released when this finishes.
+
+        Args:
+            user_id: User whose content is stale
+        """
+        try:
+            counts = self.precompute_batch([user_id], date.today())
+            if counts["failures"]:
+                print(f"[TastePrecompute] Background regeneration failed for {user_id}")
+        except Exception as e:
+            print(f"[TastePrecompute] Background regeneration error for {user_id}: {e}")
+        finally:
+            with _regenerating_lock:
+                _regenerating.discard(user_id)
+
+    def _find_missing(
+        self,
+        user_ids: list[str],
+        target_date: date,
+    ) -> tuple[set[str], set[str], set[str]]:
+        """Find which users still need insights, DNA and a title for the day."""
+        day = str(target_date)
+        have_insights = set(self._count_rows("daily_insights", user_ids, "shown_at", day))
+        dna_counts = self._count_rows("daily_dna", user_ids, "shown_at", day)
+        have_dna = {u for u, n in dna_counts.items() if n >= DNA_TRAIT_COUNT}
+
+        # A title is fresh if it outlives the start of the target day
+        day_start = datetime.combine(target_date, datetime.min.time(), tzinfo=timezone.utc)
+        have_titles = set(
+            self._count_rows(
+                "daily_profile_titles",
+                user_ids,
+                "expires_at",
+                day_start.isoformat(),
+                op="gt",
+                key="user_id",
+            )
+        )
+
+        everyone = set(user_ids)
+        return everyone - have_insights, everyone - have_dna, everyone - have_titles
+
+    def _count_rows(
+        self,
+        table: str,
+        user_ids: list[str],
+        column: str,
+        value: str,
+        op: str = "eq",
+        key: str = "id",
+    ) -> dict[str, int]:
+        """Count matching rows per user, a page at a time.
+
+        Args:
+            table: daily_insights, daily_dna or daily_profile_titles
+            user_ids: Users to check
+            column: Column to filter on
+            value: Value to compare it with
+            op: PostgREST filter ("eq" or "gt")
+            key: Unique column to page in order of
+
+        Returns:
+            Row counts for users with at least one matching row
+        """
+        counts: dict[str, int] = {}
+        start = 0
+        while True:
+            query = self._supabase.table(table).select("user_id").in_("user_id", user_ids)
+            result = (
+                getattr(query, op)(column, value)
+                .order(key)
+                .range(start, start + EXISTING_ROWS_PAGE_SIZE - 1)
+                .execute()
+            )
+            rows = result.data or []
+            for row in rows:
+                counts[row["user_id"]] = counts.get(row["user_id"], 0) + 1
+            if len(rows) < EXISTING_ROWS_PAGE_SIZE:
+                break
+            start += EXISTING_ROWS_PAGE_SIZE
+        return counts
+
+    def _fetch_rows(self, table: str, user_ids: list[str]) -> dict[str, dict[str, Any]]:
+        """Fetch one row per user from a user_id-keyed table."""
+        result = self._supabase.table(table).select("*").in_("user_id", user_ids).execute()
+        return {row["user_id"]: row for row in result.data or []}
+
+    async def run_forever(self, hour_utc: int) -> None:
+        """Run once a day at the given UTC hour until cancelled.
+
+        Each run happens in a worker thread so the event loop stays free.
+
+        Args:
+            hour_utc: Hour of day (UTC) to run at
+        """
+        while True:
+            now = datetime.now(timezone.utc)
+            next_run = now.replace(hour=hour_utc, minute=0, second=0, microsecond=0)
+            if next_run <= now:
+                next_run += timedelta(days=1)
+            await asyncio.sleep((next_run - now).total_seconds())
+            try:
+                await asyncio.to_thread(self.run)
+            except Exception as e:
+                print(f"[TastePrecompute] Run failed: {e}")
@@ -0,0 +1,76 @@
+"""User activity - When each user last used the app.
+
+TastePrecomputeService only warms content for recently active users. Its
+own daily_insights / daily_dna / daily_profile_titles rows can't be the
+signal - the job writes them every night, so nobody would ever lapse -
+so the taste endpoints stamp profiles.last_active_at instead.
+
+Stamps are written after the response is sent, at most once per user per
+ACTIVITY_STAMP_SECONDS in each process.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+from fastapi import BackgroundTasks, Depends
+from supabase import Client
+
+from app.dependencies import get_supabase_client
+from app.services.ttl_cache import TTLCache
+
+# How often a user's last_active_at is refreshed (activity is counted in days)
+ACTIVITY_STAMP_SECONDS = 3600
+
+# Users stamped within the last ACTIVITY_STAMP_SECONDS
+_recently_stamped = TTLCache(maxsize=50_000, ttl=ACTIVITY_STAMP_SECONDS)
+
+
+def claim_stamp(user_id: str) -> bool:
+    """Claim this hour's activity stamp for a user.
+
+    Args:
+        user_id: User making a request
+
+    Returns:
+        True if the caller should write last_active_at; False if it was
+        written recently
+    """
+    if _recently_stamped.get(user_id):
+        return False
+    _recently_stamped.set(user_id, True)
+    return True
+
+
+def stamp_activity(supabase: Client, user_id: str) -> None:
+    """Set a user's profiles.last_active_at to now.
+
+    Args:
+        supabase: Supabase client
+        user_id: User to stamp
+    """
+    try:
+        supabase.table("profiles").update(
+            {
+                "last_active_at": datetime.now(timezone.utc).isoformat(),
+            }
+        ).eq("id", user_id).execute()
+    except Exception as e:
+        # Allow a retry on the next request
+        _recently_stamped.delete(user_id)
+        print(f"[UserActivity] Failed to stamp activity for {user_id}: {e}")
+
+
+def record_activity(
+    user_id: str,
+    background_tasks: BackgroundTasks,
+    supabase: Client = Depends(get_supabase_client),
+) -> None:
+    """Dependency that records a request by user_id as app activity."""
+    if claim_stamp(user_id):
+        background_tasks.add_task(stamp_activity, supabase, user_id)
+
+
+def clear_activity_stamps() -> None:
+    """Forget recent stamps (so the next request writes again)."""
+    _recently_stamped.clear()
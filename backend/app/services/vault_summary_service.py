@@ -0,0 +1,353 @@
+"""VaultSummaryService - Materialized per-user vault summary.
+
+Aggregates place_visits into per-place totals and per-month stats and
+stores them in the vault_summaries table, so the vault read path serves
+one precomputed row instead of re-aggregating every visit.
+
+Also wraps the vault_* Postgres functions used by the paged vault API,
+which aggregate per place and per month inside the database.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Any
+from zoneinfo import ZoneInfo
+
+from supabase import Client
+
+# Columns needed to build the summary (venue info via join)
+SUMMARY_VISIT_COLUMNS = (
+    "id, venue_id, merchant_name, amount, visited_at, reaction, source, "
+    "venues(id, name, taste_cluster, photo_references, google_place_id)"
+)
+
+# Columns returned by the delta sync endpoint
+CHANGED_VISIT_COLUMNS = (
+    "id, venue_id, merchant_name, amount, visited_at, reaction, notes, source, updated_at, "
+    "venues(name, taste_cluster)"
+)
+
+
+def get_place_key(visit: dict[str, Any]) -> str:
+    """Key a visit by its venue, falling back to the merchant name."""
+    return visit.get("venue_id") or visit.get("merchant_name") or "Unknown"
+
+
+def get_month_key(dt: datetime) -> str:
+    """Format a datetime as a YYYY-MM month key."""
+    return f"{dt.year:04d}-{dt.month:02d}"
+
+
+def parse_tz(tz: str | None) -> ZoneInfo:
+    """Parse an IANA timezone, falling back to UTC if invalid."""
+    try:
+        return ZoneInfo(tz or "UTC")
+    except Exception:
+        return ZoneInfo("UTC")
+
+
+def build_summary(visits: list[dict[str, Any]], tz: str) -> dict[str, Any]:
+    """Aggregate visits into per-place totals and per-month stats.
+
+    Args:
+        visits: place_visits rows joined with venues, most recent first
+        tz: IANA timezone used to bucket visits into months
+
+    Returns:
+        Dict with places (most recent first), month_stats and tz
+    """
+    user_tz = parse_tz(tz)
+
+    places_map: dict[str, dict[str, Any]] = {}
+    month_places: dict[str, set[str]] = {}
+    month_stats: dict[str, dict[str, Any]] = {}
+
+    for visit in visits:
+        venue = visit.get("venues")
+        place_key = get_place_key(visit)
+        amount = float(visit.get("amount") or 0)
+
+        if place_key not in places_map:
+            merchant_name = visit.get("merchant_name") or "Unknown"
+            places_map[place_key] = {
+                "place_key": place_key,
+                "venue_id": visit.get("venue_id"),
+                "venue_name": venue["name"] if venue else merchant_name,
+                "venue_type": venue.get("taste_cluster") if venue else None,
+                "google_place_id": venue.get("google_place_id") if venue else None,
+                # Only the first reference is needed to build the photo URL
+                "photo_references": (venue.get("photo_references") or [])[:1] if venue else [],
+                "visit_count": 0,
+                "last_visit": visit["visited_at"],
+                "total_spent": 0.0,
+                "reaction": None,
+            }
+
+        place = places_map[place_key]
+        place["visit_count"] += 1
+        place["total_spent"] += amount
+
+        # Most recent non-null reaction wins (visits are newest first)
+        if visit.get("reaction") and not place["reaction"]:
+            place["reaction"] = visit["reaction"]
+
+        visit_date = datetime.fromisoformat(visit["visited_at"].replace("Z", "+00:00"))
+        if visit_date.tzinfo is None:
+            visit_date = visit_date.replace(tzinfo=timezone.utc)
+        month_key = get_month_key(visit_date.astimezone(user_tz))
+
+        stats = month_stats.setdefault(
+            month_key, {"total_places": 0, "total_visits": 0, "spent": 0.0}
+        )
+        stats["total_visits"] += 1
+        stats["spent"] += amount
+        month_places.setdefault(month_key, set()).add(place_key)
+
+    for month_key, keys in month_places.items():
+        month_stats[month_key]["total_places"] = len(keys)
+
+    places = sorted(places_map.values(), key=lambda p: p["last_visit"], reverse=True)
+
+    return {
+        "places": places,
+        "month_stats": month_stats,
+        "tz": tz,
+    }
+
+
+class VaultSummaryService:
+    """Builds and serves the materialized vault summary for a user."""
+
+    def __init__(self, supabase: Client) -> None:
+        """Initialize with Supabase client.
+
+        Args:
+            supabase: Supabase client for database operations
+        """
+        self._supabase = supabase
+
+    def get(self, user_id: str) -> dict[str, Any] | None:
+        """Get the stored vault summary for a user.
+
+        Args:
+            user_id: The user's ID
+
+        Returns:
+            Summary row or None if it has not been built yet
+        """
+        result = (
+            self._supabase.table("vault_summaries")
+            .select("places, month_stats, tz, refreshed_at")
+            .eq("user_id", user_id)
+            .execute()
+        )
+        return result.data[0] if result.data else None
+
+    def fetch_visits(self, user_id: str) -> list[dict[str, Any]]:
+        """Fetch a user's visits with venue info, most recent first.
+
+        Args:
+            user_id: The user's ID
+
+        Returns:
+            List of place_visits rows joined with venues
+        """
+        result = (
+            self._supabase.table("place_visits")
+            .select(SUMMARY_VISIT_COLUMNS)
+            .eq("user_id", user_id)
+            .order("visited_at", desc=True)
+            .execute()
+        )
+        return result.data or []
+
+    def refresh(
+        self,
+        user_id: str,
+        tz: str | None = None,
+        visits: list[dict[str, Any]] | None = None,
+    ) -> dict[str, Any]:
+        """Rebuild and store the vault summary for a user.
+
+        Only reads the database - never calls external APIs.
+
+        Args:
+            user_id: The user's ID
+            tz: IANA timezone for month stats (defaults to the stored one)
+            visits: Pre-fetched visits from fetch_visits() to avoid a re-read
+
+        Returns:
+            The rebuilt summary
+        """
+        if tz is None:
+            existing = self.get(user_id)
+            tz = existing.get("tz") if existing else None
+
+        if visits is None:
+            visits = self.fetch_visits(user_id)
+
+        summary = build_summary(visits, tz or "UTC")
+
+        try:
+            self._supabase.table("vault_summaries").upsert(
+                {
+                    "user_id": user_id,
+                    "places": summary["places"],
+                    "month_stats": summary["month_stats"],
+                    "tz": summary["tz"],
+                    "refreshed_at": datetime.now(timezone.utc).isoformat(),
+                },
+                on_conflict="user_id",
+            ).execute()
+        except Exception as e:
+            print(f"[VaultSummary] Failed to store summary for {user_id}: {e}")
+
+        return summary
+
+    def get_places_page(
+        self,
+        user_id: str,
+        limit: int,
+        cursor_last_visit: str | None = None,
+        cursor_place_key: str | None = None,
+    ) -> list[dict[str, Any]]:
+        """Get one page of per-place aggregates computed in Postgres.
+
+        Args:
+            user_id: The user's ID
+            limit: Maximum number of places to return
+            cursor_last_visit: last_visit of the previous page's final place
+            cursor_place_key: place_key of the previous page's final place
+
+        Returns:
+            Place rows from the vault_places_page function, most recent first
+        """
+        result = self._supabase.rpc(
+            "vault_places_page",
+            {
+                "p_user_id": user_id,
+                "p_limit": limit,
+                "p_cursor_last_visit": cursor_last_visit,
+                "p_cursor_place_key": cursor_place_key,
+            },
+        ).execute()
+        return result.data or []
+
+    def get_month_stats(self, user_id: str, tz: str) -> dict[str, Any]:
+        """Get current-month stats with the month boundary in the user's timezone.
+
+        Args:
+            user_id: The user's ID
+            tz: IANA timezone name
+
+        Returns:
+            Dict with total_places, total_visits and spent
+        """
+        result = self._supabase.rpc(
+            "vault_month_stats",
+            {"p_user_id": user_id, "p_tz": parse_tz(tz).key},
+        ).execute()
+        row = result.data[0] if result.data else {}
+        return {
+            "total_places": int(row.get("total_places") or 0),
+            "total_visits": int(row.get("total_visits") or 0),
+            "spent": float(row.get("spent") or 0),
+        }
+
+    def get_place_visits(
+        self,
+        user_id: str,
+        place_key: str,
+        limit: int,
+        cursor_visited_at: str | None = None,
+        cursor_id: str | None = None,
+    ) -> list[dict[str, Any]]:
+        """Get one page of visit history for a single place.
+
+        Args:
+            user_id: The user's ID
+            place_key: venue_id, or merchant name for unmatched places
+            limit: Maximum number of visits to return
+            cursor_visited_at: visited_at of the previous page's final visit
+            cursor_id: id of the previous page's final visit
+
+        Returns:
+            Visit rows from the vault_place_visits function, most recent first
+        """
+        result = self._supabase.rpc(
+            "vault_place_visits",
+            {
+                "p_user_id": user_id,
+                "p_place_key": place_key,
+                "p_limit": limit,
+                "p_cursor_visited_at": cursor_visited_at,
+                "p_cursor_id": cursor_id,
+            },
+        ).execute()
+        return result.data or []
+
+    def get_changed_visits(self, user_id: str, since: str) -> list[dict[str, Any]]:
+        """Get visits inserted or updated after a point in time.
+
+        Args:
+            user_id: The user's ID
+            since: ISO timestamp
+
+        Returns:
+            place_visits rows joined with venues, oldest change first
+        """
+        result = (
+            self._supabase.table("place_visits")
+            .select(CHANGED_VISIT_COLUMNS)
+            .eq("user_id", user_id)
+            .gt("updated_at", since)
+            .order("updated_at")
+            .execute()
+        )
+        return result.data or []
+
+    def get_visits_page(
+        self,
+        user_id: str,
+        limit: int,
+        after_id: str | None = None,
+    ) -> list[dict[str, Any]]:
+        """Get one page of a user's visits for a full delta sync snapshot.
+
+        Args:
+            user_id: The user's ID
+            limit: Maximum number of visits to return
+            after_id: id of the previous page's final visit
+
+        Returns:
+            place_visits rows joined with venues, ordered by id
+        """
+        query = (
+            self._supabase.table("place_visits")
+            .select(CHANGED_VISIT_COLUMNS)
+            .eq("user_id", user_id)
+        )
+        if after_id:
+            query = query.gt("id", after_id)
+        result = query.order("id").limit(limit).execute()
+        return result.data or []
+
+    def get_deleted_visit_ids(self, user_id: str, since: str) -> list[str]:
+        """Get ids of visits deleted after a point in time.
+
+        Args:
+            user_id: The user's ID
+            since: ISO timestamp
+
+        Returns:
+            Deleted visit ids from place_visit_tombstones
+        """
+        result = (
+            self._supabase.table("place_visit_tombstones")
+            .select("visit_id")
+            .eq("user_id", user_id)
+            .gt("deleted_at", since)
+            .execute()
+        )
+        return [row["visit_id"] for row in (result.data or [])]
@@ -0,0 +1,293 @@
+"""VenueMatcher - Local fuzzy matching of Plaid merchants to known venues.
+
+Keeps an in-memory index over the venues catalog (a trigram inverted
+index on normalized names plus a ~1km geo grid) so merchant strings like
+"STARBUCKS #1234" or "SQ *BLUE BOTTLE" resolve to an existing venue
+without a Google Places lookup. Only matches at or above the confidence
+threshold are used; everything else falls through to the API.
+"""
+
+from __future__ import annotations
+
+import math
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any
+
+from supabase import Client
+
+from app.config import get_settings
+
+# Payment processor / aggregator prefixes Plaid leaves on merchant strings
+PROCESSOR_PREFIX = re.compile(
+    r"^(sq|tst|sp|py|pp|paypal|cke|clv|ls|toast|square|in|pos|dd|doordash|ubr|uber eats)\s*\*\s*"
+)
+
+# Store numbers and reference codes ("#1234", "No. 55", "0423")
+STORE_NUMBER = re.compile(r"(#\s*\d+|\bno\.?\s*\d+|\b\d{3,}\b)")
+
+# Words that carry no identity ("the", legal suffixes)
+NOISE_WORDS = {"the", "inc", "llc", "co", "corp", "ltd", "and", "&"}
+
+# Generic words that don't identify a venue on their own ("COFFEE")
+GENERIC_WORDS = {
+    "bar",
+    "bakery",
+    "cafe",
+    "coffee",
+    "deli",
+    "diner",
+    "food",
+    "grill",
+    "kitchen",
+    "market",
+    "pizza",
+    "restaurant",
+    "tea",
+}
+
+# Geo grid cell size in degrees (~1km, matches the lookup cache grid)
+GRID_SIZE = 0.01
+
+# Page size when loading the catalog from Supabase
+LOAD_PAGE_SIZE = 1000
+
+
+def normalize_merchant(name: str) -> str:
+    """Normalize a merchant or venue name for fuzzy matching.
+
+    "SQ *BLUE BOTTLE" -> "blue bottle", "STARBUCKS #1234" -> "starbucks".
+    """
+    text = name.lower().strip()
+    text = PROCESSOR_PREFIX.sub("", text)
+    text = STORE_NUMBER.sub(" ", text)
+    # Drop location qualifiers like "Softies Burger - USC Village"
+    text = text.split(" - ")[0]
+    text = re.sub(r"[^a-z0-9 ]+", " ", text.replace("'", ""))
+    words = [w for w in text.split() if w not in NOISE_WORDS]
+    return " ".join(words)
+
+
+def trigrams(text: str) -> set[str]:
+    """Get character trigrams of a normalized name (padded at word edges)."""
+    padded = f"  {text} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def name_similarity(a: str, b: str, a_grams: set[str], b_grams: set[str]) -> float:
+    """Score two normalized names between 0 and 1.
+
+    Uses the Dice coefficient over trigrams, boosted when one name is a
+    leading-word prefix of the other ("blue bottle" vs "blue bottle coffee").
+    """
+    if not a_grams or not b_grams:
+        return 0.0
+    if a == b:
+        return 1.0
+    dice = 2 * len(a_grams & b_grams) / (len(a_grams) + len(b_grams))
+    shorter, longer = (a, b) if len(a) <= len(b) else (b, a)
+    if longer.startswith(shorter + " ") and not set(shorter.split()) <= GENERIC_WORDS:
+        return max(dice, 0.9)
+    return dice
+
+
+def grid_cell(lat: float, lng: float) -> tuple[int, int]:
+    """Get the geo grid cell for a coordinate."""
+    return (math.floor(lat / GRID_SIZE), math.floor(lng / GRID_SIZE))
+
+
+def distance_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """Approximate distance in km (equirectangular, fine at city scale)."""
+    x = math.radians(lng2 - lng1) * math.cos(math.radians((lat1 + lat2) / 2))
+    y = math.radians(lat2 - lat1)
+    return 6371 * math.hypot(x, y)
+
+
+@dataclass
+class VenueMatch:
+    """A catalog venue matched to a merchant string."""
+
+    venue_id: str
+    name: str
+    confidence: float
+    google_place_id: str | None = None
+
+
+class VenueIndex:
+    """Trigram + geo grid index over venue names."""
+
+    def __init__(self, venues: list[dict[str, Any]] | None = None) -> None:
+        """Build the index.
+
+        Args:
+            venues: Venue rows with id, name, lat, lng and google_place_id
+        """
+        self._venues: list[dict[str, Any]] = []
+        self._names: list[str] = []
+        self._grams: list[set[str]] = []
+        self._postings: dict[str, list[int]] = {}
+        self._grid: dict[tuple[int, int], list[int]] = {}
+        self._name_counts: dict[str, int] = {}
+        self._ids: set[str] = set()
+        self._lock = threading.Lock()
+        for venue in venues or []:
+            self.add(venue)
+
+    def __len__(self) -> int:
+        return len(self._venues)
+
+    def add(self, venue: dict[str, Any]) -> None:
+        """Add a venue (no-op if its id is already indexed)."""
+        if not venue.get("id") or not venue.get("name"):
+            return
+        name = normalize_merchant(venue["name"])
+        if not name:
+            return
+
+        with self._lock:
+            if venue["id"] in self._ids:
+                return
+            self._ids.add(venue["id"])
+            index = len(self._venues)
+            self._venues.append(venue)
+            self._names.append(name)
+            grams = trigrams(name)
+            self._grams.append(grams)
+            for gram in grams:
+                self._postings.setdefault(gram, []).append(index)
+            self._name_counts[name] = self._name_counts.get(name, 0) + 1
+
+            if venue.get("lat") is not None and venue.get("lng") is not None:
+                cell = grid_cell(float(venue["lat"]), float(venue["lng"]))
+                self._grid.setdefault(cell, []).append(index)
+
+    def match(
+        self,
+        merchant_name: str,
+        lat: float | None = None,
+        lng: float | None = None,
+    ) -> VenueMatch | None:
+        """Find the best catalog venue for a merchant string.
+
+        With a location, only venues in the surrounding 3x3 grid cells are
+        considered, and the closest wins among equally good names. Without
+        one, a match is only returned if the name is unique in the catalog
+        (otherwise a chain could resolve to the wrong branch).
+
+        Args:
+            merchant_name: Merchant string from Plaid
+            lat: Transaction latitude
+            lng: Transaction longitude
+
+        Returns:
+            Best VenueMatch with its confidence, or None
+        """
+        name = normalize_merchant(merchant_name)
+        if not name:
+            return None
+        grams = trigrams(name)
+
+        with self._lock:
+            if lat is not None and lng is not None:
+                row, col = grid_cell(lat, lng)
+                allowed: set[int] | None = set()
+                for d_row in (-1, 0, 1):
+                    for d_col in (-1, 0, 1):
+                        allowed.update(self._grid.get((row + d_row, col + d_col), []))
+                if not allowed:
+                    return None
+            else:
+                allowed = None
+
+            # Candidates share at least one trigram with the merchant
+            shared: dict[int, int] = {}
+            for gram in grams:
+                for index in self._postings.get(gram, []):
+                    if allowed is None or index in allowed:
+                        shared[index] = shared.get(index, 0) + 1
+
+            best: tuple[float, float, int] | None = None
+            for index in shared:
+                score = name_similarity(name, self._names[index], grams, self._grams[index])
+                venue = self._venues[index]
+                if lat is not None and lng is not None and venue.get("lat") is not None:
+                    dist = distance_km(lat, lng, float(venue["lat"]), float(venue["lng"]))
+                else:
+                    dist = 0.0
+                # Highest score first, then nearest
+                if best is None or (score, -dist) > (best[0], -best[1]):
+                    best = (score, dist, index)
+
+            if best is None:
+                return None
+            # Without a location a chain name can't pick a branch
+            if allowed is None and self._name_counts[self._names[best[2]]] > 1:
+                return None
+            venue = self._venues[best[2]]
+
+        return VenueMatch(
+            venue_id=venue["id"],
+            name=venue["name"],
+            confidence=round(best[0], 3),
+            google_place_id=venue.get("google_place_id"),
+        )
+
+
+def load_venue_index(supabase: Client) -> VenueIndex:
+    """Build a VenueIndex from the venues catalog.
+
+    Args:
+        supabase: Supabase client
+
+    Returns:
+        Populated VenueIndex
+    """
+    venues: list[dict[str, Any]] = []
+    start = 0
+    while True:
+        result = (
+            supabase.table("venues")
+            .select("id, name, lat, lng, google_place_id")
+            .order("id")
+            .range(start, start + LOAD_PAGE_SIZE - 1)
+            .execute()
+        )
+        rows = result.data or []
+        venues.extend(rows)
+        if len(rows) < LOAD_PAGE_SIZE:
+            break
+        start += LOAD_PAGE_SIZE
+    return VenueIndex(venues)
+
+
+_venue_index: VenueIndex | None = None
+_venue_index_loaded_at = 0.0
+_venue_index_lock = threading.Lock()
+
+
+def get_venue_index(supabase: Client) -> VenueIndex:
+    """Get the process-wide venue index, rebuilding it when it gets old.
+
+    Args:
+        supabase: Supabase client used if the index needs (re)building
+
+    Returns:
+        The shared VenueIndex
+    """
+    global _venue_index, _venue_index_loaded_at
+    max_age = get_settings().venue_index_refresh_seconds
+    with _venue_index_lock:
+        if _venue_index is None or time.time() - _venue_index_loaded_at > max_age:
+            _venue_index = load_venue_index(supabase)
+            _venue_index_loaded_at = time.time()
+        return _venue_index
+
+
+def reset_venue_index() -> None:
+    """Drop the shared index so the next call rebuilds it."""
+    global _venue_index, _venue_index_loaded_at
+    with _venue_index_lock:
+        _venue_index = None
+        _venue_index_loaded_at = 0.0
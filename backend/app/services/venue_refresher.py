@@ -0,0 +1,126 @@
+"""VenueDetailsRefresher - Keeps venues' volatile Google fields current.
+
+Venues are created with full place details, but rating, review count and
+opening hours drift. Rather than re-fetching full details (with reviews),
+the refresher re-pulls only those fields with a narrow field mask for
+venues whose details are older than the staleness window.
+
+Run in-process (VENUE_DETAILS_REFRESH_INTERVAL_MINUTES > 0) or from cron
+via scripts/refresh_venue_details.py.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from supabase import Client
+
+from app.config import get_settings
+from app.services.google_places_service import GooglePlacesService
+
+
+class VenueDetailsRefresher:
+    """Refreshes rating, review count and hours for stale venues."""
+
+    def __init__(
+        self,
+        supabase: Client,
+        places_service: GooglePlacesService | None = None,
+    ) -> None:
+        """Initialize with Supabase client.
+
+        Args:
+            supabase: Supabase client for database operations
+            places_service: Places service (defaults to a new one)
+        """
+        self._supabase = supabase
+        self._places_service = places_service or GooglePlacesService(supabase)
+
+    def get_stale_venues(self, limit: int) -> list[dict[str, Any]]:
+        """Get venues whose details are older than the staleness window.
+
+        Args:
+            limit: Maximum number of venues to return
+
+        Returns:
+            Venue rows (id, google_place_id), oldest refresh first
+        """
+        cutoff = datetime.now(timezone.utc) - timedelta(
+            days=get_settings().venue_details_stale_days
+        )
+        stale = f"details_refreshed_at.lt.{cutoff:%Y-%m-%dT%H:%M:%SZ}"
+        result = (
+            self._supabase.table("venues")
+            .select("id, google_place_id")
+            .or_(f"details_refreshed_at.is.null,{stale}")
+            .order("details_refreshed_at", nullsfirst=True)
+            .limit(limit)
+            .execute()
+        )
+        return result.data or []
+
+    def refresh_stale(self, limit: int | None = None) -> int:
+        """Refresh one batch of stale venues.
+
+        Args:
+            limit: Batch size (defaults to VENUE_DETAILS_REFRESH_BATCH_SIZE)
+
+        Returns:
+            Number of venues refreshed
+        """
+        if limit is None:
+            limit = get_settings().venue_details_refresh_batch_size
+
+        refreshed = 0
+        for venue in self.get_stale_venues(limit):
+            fields = self._places_service.get_volatile_details(venue["google_place_id"])
+            update: dict[str, Any] = {
+                "details_refreshed_at": datetime.now(timezone.utc).isoformat(),
+            }
+            if fields is None:
+                # Stamp failures too (closed, NOT_FOUND, API error) so they
+                # rotate to the back of the queue instead of blocking it
+                self._stamp_failure(venue["id"], update)
+                continue
+
+            # Keep existing values when Google omits a field
+            if fields["rating"] is not None:
+                update["google_rating"] = fields["rating"]
+            if fields["review_count"] is not None:
+                update["google_review_count"] = fields["review_count"]
+            if fields["opening_hours"] is not None:
+                update["opening_hours"] = fields["opening_hours"]
+
+            try:
+                self._supabase.table("venues").update(update).eq("id", venue["id"]).execute()
+                refreshed += 1
+            except Exception as e:
+                print(f"[VenueRefresher] Failed to update venue {venue['id']}: {e}")
+
+        if refreshed:
+            print(f"[VenueRefresher] Refreshed details for {refreshed} venues")
+        return refreshed
+
+    def _stamp_failure(self, venue_id: str, update: dict[str, Any]) -> None:
+        """Record a failed refresh attempt (fields untouched)."""
+        try:
+            self._supabase.table("venues").update(update).eq("id", venue_id).execute()
+        except Exception as e:
+            print(f"[VenueRefresher] Failed to stamp venue {venue_id}: {e}")
+
+    async def run_forever(self, interval_seconds: float) -> None:
+        """Refresh a batch every interval until cancelled.
+
+        Each batch runs in a worker thread so the event loop stays free.
+
+        Args:
+            interval_seconds: Seconds between batches
+        """
+        while True:
+            try:
+                await asyncio.to_thread(self.refresh_stale)
+            except Exception as e:
+                print(f"[VenueRefresher] Refresh batch failed: {e}")
+            await asyncio.sleep(interval_seconds)
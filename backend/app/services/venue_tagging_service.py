@@ -0,0 +1,499 @@
+"""VenueTaggingService - Memoized, batched venue tagging.
+
+Wraps VenueTagger with a memo table (venue_tag_memo) keyed by a hash of
+the prompt inputs, so a venue that is recreated or re-imported with the
+same data is never sent to Claude twice. New locations of a chain
+inherit the cluster, cuisine, energy and occasions of an already-tagged
+location, with a tagline and standouts derived for the location itself
+by RuleTagger. Batches tag their
+remaining misses concurrently with the async client, bounded by a
+semaphore.
+
+Venues are created with RuleTagger profiles (tag_source 'rules') so they
+are usable immediately; upgrade_venues() swaps in the AI profile later.
+Venues whose upgrade failed or was lost (the in-process queue doesn't
+survive restarts) are picked up by upgrade_rule_tagged(), run from
+scripts/upgrade_rule_tagged_venues.py.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any
+
+from supabase import Client
+
+from app.config import get_settings
+from app.intelligence.rule_tagger import RuleTagger
+from app.intelligence.venue_tagger import MODEL, VenueProfile, VenueTagger
+from app.mappings.chain_mappings import KNOWN_CHAINS, MIN_CHAIN_LOCATIONS
+from app.services.google_places_service import PlaceDetails
+from app.services.venue_matcher import normalize_merchant
+
+if TYPE_CHECKING:
+    from app.services.google_places_service import GooglePlacesService
+
+# Venue columns that make up a chain's inheritable profile (tagline and
+# standout describe one location, so they are derived per location instead)
+CHAIN_PROFILE_COLUMNS = "chain_key, primary_type, taste_cluster, cuisine_type, energy, best_for"
+
+# Category of venues Google returns without a primary type
+DEFAULT_CATEGORY = "restaurant"
+
+# Map price strings back to Google price levels
+PRICE_LEVELS = {"Free": 0, "$": 1, "$$": 2, "$$$": 3, "$$$$": 4}
+
+# Runs AI upgrades scheduled from synchronous code, off the caller's thread
+_upgrade_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="venue-tag-upgrade")
+
+
+def get_chain_key(venue_data: dict[str, Any]) -> tuple[str, str]:
+    """Key a venue by normalized name and Google primary type."""
+    return (
+        normalize_merchant(venue_data.get("name") or ""),
+        venue_data.get("category") or DEFAULT_CATEGORY,
+    )
+
+
+def location_profile(chain: dict[str, Any], venue_data: dict[str, Any]) -> VenueProfile:
+    """Build one location's profile from the fields its chain shares.
+
+    Keeps the chain's cluster, cuisine, energy and occasions, and derives
+    the tagline and standouts from the location's own data.
+
+    Args:
+        chain: taste_cluster, cuisine_type, energy and best_for of the chain
+        venue_data: Venue data for this location (as from venue_tagger_input())
+
+    Returns:
+        VenueProfile for this location
+
+    Raises:
+        ValueError: If the chain fields don't form a valid VenueProfile
+    """
+    details = PlaceDetails(
+        place_id="",
+        name=venue_data.get("name") or "",
+        rating=venue_data.get("rating"),
+        price_level=PRICE_LEVELS.get(venue_data.get("price") or ""),
+        primary_type=venue_data.get("category"),
+        types=venue_data.get("categories") or [],
+    )
+    tagline, standout = RuleTagger().location_fields(
+        details, chain["taste_cluster"], chain.get("cuisine_type")
+    )
+    return VenueProfile(
+        taste_cluster=chain["taste_cluster"],
+        cuisine_type=chain.get("cuisine_type"),
+        tagline=tagline,
+        energy=chain.get("energy") or "moderate",
+        best_for=chain.get("best_for") or [],
+        standout=standout,
+    )
+
+
+def venue_tagger_input(details: PlaceDetails) -> dict[str, Any]:
+    """Build VenueTagger input from PlaceDetails.
+
+    Args:
+        details: PlaceDetails from Google Places API
+
+    Returns:
+        Dict formatted for VenueTagger.tag()
+    """
+    # Map price_level to price string
+    price_map = {0: "Free", 1: "$", 2: "$$", 3: "$$$", 4: "$$$$"}
+    price = price_map.get(details.price_level) if details.price_level else None
+
+    return {
+        "name": details.name,
+        "category": details.primary_type or DEFAULT_CATEGORY,
+        "categories": details.types[:5] if details.types else [],
+        "rating": details.rating,
+        "price": price,
+        "reviews": details.reviews,
+    }
+
+
+def profile_to_venue_update(profile: VenueProfile) -> dict[str, Any]:
+    """Map an AI VenueProfile to venues table columns."""
+    return {
+        "taste_cluster": profile.taste_cluster,
+        "cuisine_type": profile.cuisine_type,
+        "energy": profile.energy,
+        "tagline": profile.tagline,
+        "best_for": profile.best_for,
+        "standout": profile.standout,
+        "tag_source": "ai",
+    }
+
+
+class VenueTaggingService:
+    """Tags venues through a content-hash memo and concurrent batches."""
+
+    def __init__(
+        self,
+        supabase: Client | None,
+        tagger: VenueTagger | None = None,
+        concurrency: int | None = None,
+    ) -> None:
+        """Initialize tagging service.
+
+        Args:
+            supabase: Supabase client for the memo table (None disables memoization)
+            tagger: Tagger to use on memo misses (defaults to VenueTagger)
+            concurrency: Maximum concurrent tagging calls per batch
+        """
+        self._supabase = supabase
+        self._tagger = tagger
+        self._concurrency = concurrency or get_settings().venue_tagging_concurrency
+        self.stats = {
+            "memo_hits": 0,
+            "chain_hits": 0,
+            "tagged": 0,
+            "failed": 0,
+            "total_cost": 0.0,
+        }
+        self._stats_lock = threading.Lock()
+        self._tagger_lock = threading.Lock()
+
+    @property
+    def tagger(self) -> VenueTagger:
+        """Lazy-load VenueTagger (uses the shared LLM gateway)."""
+        with self._tagger_lock:
+            if self._tagger is None:
+                self._tagger = VenueTagger()
+            return self._tagger
+
+    def tag(self, venue_data: dict[str, Any]) -> VenueProfile | None:
+        """Tag one venue synchronously, using the memo when possible.
+
+        Args:
+            venue_data: Venue data as accepted by VenueTagger.tag()
+
+        Returns:
+            VenueProfile, or None if tagging failed
+        """
+        content_hash = self.tagger.prompt_fingerprint(venue_data)
+        memo = self._load_memo([content_hash])
+        if content_hash in memo:
+            self._count("memo_hits")
+            return memo[content_hash]
+
+        chain_profile = self._load_chain_profiles([venue_data]).get(0)
+        if chain_profile is not None:
+            self._count("chain_hits")
+            return chain_profile
+
+        try:
+            profile, usage = self.tagger.tag_with_usage(venue_data)
+        except Exception as e:
+            print(f"[VenueTagging] Tagging failed for {venue_data.get('name')}: {e}")
+            self._count("failed")
+            return None
+
+        self._record_usage(usage)
+        self._store_memo({content_hash: profile})
+        return profile
+
+    def tag_many(self, venues: list[dict[str, Any]]) -> list[VenueProfile | None]:
+        """Tag a batch of venues from synchronous code (scripts, worker threads).
+
+        Args:
+            venues: Venue data dicts
+
+        Returns:
+            VenueProfile or None for each venue, in input order
+        """
+        return asyncio.run(self.atag_many(venues))
+
+    async def atag_many(self, venues: list[dict[str, Any]]) -> list[VenueProfile | None]:
+        """Tag a batch of venues.
+
+        Memo hits are served from one table query; distinct misses are
+        tagged concurrently (bounded by the concurrency limit) and written
+        back to the memo in one upsert.
+
+        Args:
+            venues: Venue data dicts
+
+        Returns:
+            VenueProfile or None for each venue, in input order
+        """
+        hashes = [self.tagger.prompt_fingerprint(v) for v in venues]
+        profiles = await asyncio.to_thread(self._load_memo, list(set(hashes)))
+        self._count("memo_hits", sum(1 for h in hashes if h in profiles))
+
+        # New locations of already-tagged chains inherit the chain profile
+        unresolved = [i for i, h in enumerate(hashes) if h not in profiles]
+        chain_profiles = await asyncio.to_thread(
+            self._load_chain_profiles, [venues[i] for i in unresolved]
+        )
+        resolved: dict[int, VenueProfile] = {}
+        for position, profile in chain_profiles.items():
+            resolved[unresolved[position]] = profile
+        self._count("chain_hits", len(resolved))
+
+        # Tag each distinct prompt once, and each known chain once per batch
+        misses: dict[str, dict[str, Any]] = {}
+        chain_hashes: dict[tuple[str, str], str] = {}
+        shared: list[int] = []
+        for i in unresolved:
+            if i in resolved:
+                continue
+            content_hash, venue = hashes[i], venues[i]
+            chain_key = get_chain_key(venue)
+            if chain_key[0] in KNOWN_CHAINS:
+                content_hash = chain_hashes.setdefault(chain_key, content_hash)
+                if content_hash != hashes[i]:
+                    shared.append(i)
+                hashes[i] = content_hash
+            misses.setdefault(content_hash, venue)
+
+        if misses:
+            semaphore = asyncio.Semaphore(self._concurrency)
+
+            async def run(
+                content_hash: str, venue: dict[str, Any]
+            ) -> tuple[str, VenueProfile | None]:
+                async with semaphore:
+                    try:
+                        profile, usage = await self.tagger.atag_with_usage(venue)
+                    except Exception as e:
+                        print(f"[VenueTagging] Tagging failed for {venue.get('name')}: {e}")
+                        self._count("failed")
+                        return content_hash, None
+                self._record_usage(usage)
+                return content_hash, profile
+
+            results = await asyncio.gather(*(run(h, v) for h, v in misses.items()))
+            tagged = {h: p for h, p in results if p is not None}
+            await asyncio.to_thread(self._store_memo, tagged)
+            profiles.update(tagged)
+
+        # Locations that shared another location's call get their own tagline
+        for i in shared:
+            if hashes[i] in profiles:
+                resolved[i] = location_profile(profiles[hashes[i]].model_dump(), venues[i])
+
+        return [resolved.get(i) or profiles.get(h) for i, h in enumerate(hashes)]
+
+    def upgrade_venues(self, pending: list[tuple[str, dict[str, Any]]]) -> int:
+        """Replace rule-based tags with AI profiles from synchronous code.
+
+        Args:
+            pending: (venue_id, venue_data) pairs for rule-tagged venues
+
+        Returns:
+            Number of venues upgraded
+        """
+        return asyncio.run(self.aupgrade_venues(pending))
+
+    def schedule_upgrade(self, pending: list[tuple[str, dict[str, Any]]]) -> Future[int] | None:
+        """Upgrade venues in the background so the caller isn't blocked.
+
+        Args:
+            pending: (venue_id, venue_data) pairs for rule-tagged venues
+
+        Returns:
+            Future for the upgrade count, or None if nothing was pending
+        """
+        if not pending:
+            return None
+        return _upgrade_executor.submit(self.upgrade_venues, pending)
+
+    async def aupgrade_venues(self, pending: list[tuple[str, dict[str, Any]]]) -> int:
+        """Tag rule-tagged venues and write their AI profiles.
+
+        Venues whose tagging fails keep their rule-based tags
+        (tag_source 'rules') and are retried by upgrade_rule_tagged().
+
+        Args:
+            pending: (venue_id, venue_data) pairs for rule-tagged venues
+
+        Returns:
+            Number of venues upgraded
+        """
+        if self._supabase is None or not pending:
+            return 0
+
+        profiles = await self.atag_many([venue_data for _, venue_data in pending])
+
+        upgraded = 0
+        for (venue_id, _), profile in zip(pending, profiles):
+            if profile is None:
+                continue
+            try:
+                await asyncio.to_thread(
+                    self._supabase.table("venues")
+                    .update(profile_to_venue_update(profile))
+                    .eq("id", venue_id)
+                    .execute
+                )
+                upgraded += 1
+            except Exception as e:
+                print(f"[VenueTagging] Failed to upgrade venue {venue_id}: {e}")
+
+        if upgraded:
+            print(f"[VenueTagging] Upgraded {upgraded} venues to AI profiles")
+        return upgraded
+
+    def upgrade_rule_tagged(
+        self,
+        places_service: GooglePlacesService,
+        batch_size: int = 50,
+        max_venues: int | None = None,
+    ) -> int:
+        """Upgrade every venue still on rule-based tags.
+
+        Pages through tag_source 'rules' venues by id, so venues that keep
+        failing don't stop the sweep from reaching the rest.
+
+        Args:
+            places_service: Places client for the details (with reviews) to tag from
+            batch_size: Venues per page
+            max_venues: Stop after this many venues (None for all)
+
+        Returns:
+            Number of venues upgraded
+        """
+        if self._supabase is None:
+            return 0
+
+        upgraded = 0
+        seen = 0
+        last_id: str | None = None
+        while max_venues is None or seen < max_venues:
+            limit = batch_size if max_venues is None else min(batch_size, max_venues - seen)
+            query = (
+                self._supabase.table("venues")
+                .select("id, google_place_id")
+                .eq("tag_source", "rules")
+            )
+            if last_id is not None:
+                query = query.gt("id", last_id)
+            venues = query.order("id").limit(limit).execute().data or []
+            if not venues:
+                break
+            seen += len(venues)
+            last_id = venues[-1]["id"]
+
+            pending = []
+            for venue in venues:
+                details = places_service.get_place_details(venue["google_place_id"])
+                if details is not None:
+                    pending.append((venue["id"], venue_tagger_input(details)))
+            upgraded += self.upgrade_venues(pending)
+
+        print(f"[VenueTagging] Swept {seen} rule-tagged venues, upgraded {upgraded}")
+        return upgraded
+
+    def _count(self, stat: str, amount: int = 1) -> None:
+        """Increment a stats counter."""
+        with self._stats_lock:
+            self.stats[stat] += amount
+
+    def _record_usage(self, usage: dict[str, Any]) -> None:
+        """Accumulate usage from one tagging call."""
+        with self._stats_lock:
+            self.stats["tagged"] += 1
+            self.stats["total_cost"] += usage.get("total_cost", 0.0)
+
+    def _load_memo(self, hashes: list[str]) -> dict[str, VenueProfile]:
+        """Load memoized profiles for content hashes.
+
+        Args:
+            hashes: Content hashes to look up
+
+        Returns:
+            VenueProfile by content hash (misses omitted)
+        """
+        if self._supabase is None or not hashes:
+            return {}
+        try:
+            result = (
+                self._supabase.table("venue_tag_memo")
+                .select("content_hash, profile")
+                .in_("content_hash", hashes)
+                .execute()
+            )
+        except Exception as e:
+            print(f"[VenueTagging] Memo lookup failed: {e}")
+            return {}
+
+        memo = {}
+        for row in result.data or []:
+            try:
+                memo[row["content_hash"]] = VenueProfile.model_validate(row["profile"])
+            except ValueError:
+                # Stale shape from an older VenueProfile - re-tag
+                continue
+        return memo
+
+    def _load_chain_profiles(self, venues: list[dict[str, Any]]) -> dict[int, VenueProfile]:
+        """Find chain profiles for venues from already-tagged locations.
+
+        A venue inherits a profile when another AI-tagged venue shares its
+        normalized name and primary type, and the name is a known chain or
+        has at least MIN_CHAIN_LOCATIONS tagged locations.
+
+        Args:
+            venues: Venue data dicts
+
+        Returns:
+            VenueProfile by position in venues (venues without one omitted)
+        """
+        if self._supabase is None or not venues:
+            return {}
+
+        keys = [get_chain_key(v) for v in venues]
+        names = list({name for name, _ in keys if name})
+        if not names:
+            return {}
+
+        try:
+            result = (
+                self._supabase.table("venues")
+                .select(CHAIN_PROFILE_COLUMNS)
+                .in_("chain_key", names)
+                .eq("tag_source", "ai")
+                .execute()
+            )
+        except Exception as e:
+            print(f"[VenueTagging] Chain lookup failed: {e}")
+            return {}
+
+        locations: dict[tuple[str, str], list[dict[str, Any]]] = {}
+        for row in result.data or []:
+            key = (row["chain_key"], row.get("primary_type") or DEFAULT_CATEGORY)
+            locations.setdefault(key, []).append(row)
+
+        profiles: dict[int, VenueProfile] = {}
+        for position, key in enumerate(keys):
+            rows = locations.get(key)
+            if not rows:
+                continue
+            if key[0] not in KNOWN_CHAINS and len(rows) < MIN_CHAIN_LOCATIONS:
+                continue
+            try:
+                profiles[position] = location_profile(rows[0], venues[position])
+            except ValueError:
+                continue
+        return profiles
+
+    def _store_memo(self, profiles: dict[str, VenueProfile]) -> None:
+        """Write newly tagged profiles to the memo table."""
+        if self._supabase is None or not profiles:
+            return
+        records = [
+            {"content_hash": h, "profile": p.model_dump(), "model": MODEL}
+            for h, p in profiles.items()
+        ]
+        try:
+            self._supabase.table("venue_tag_memo").upsert(
+                records, on_conflict="content_hash"
+            ).execute()
+        except Exception as e:
+            print(f"[VenueTagging] Memo write failed: {e}")
@@ -0,0 +1,167 @@
+"""Benchmark the local merchant -> venue matcher.
+
+Builds a VenueIndex from venues_with_reviews.json and times lookups over
+a merchant corpus. With --merchants, reads a recorded corpus (CSV with
+merchant_name,lat,lng; lat/lng may be empty). Otherwise generates
+Plaid-style merchant strings ("SQ *NAME", "NAME #1234") from the venues,
+plus unknown merchants, so accuracy can be measured too.
+
+Usage:
+    cd backend
+    python scripts/benchmark_venue_matcher.py
+    python scripts/benchmark_venue_matcher.py --merchants merchants.csv --repeat 5
+"""
+
+import argparse
+import csv
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add app to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.config import get_settings
+from app.services.venue_matcher import VenueIndex
+
+DEFAULT_VENUES_FILE = Path(__file__).parent.parent / "data" / "venues_with_reviews.json"
+
+PLAID_PATTERNS = [
+    "{name}",
+    "{upper}",
+    "SQ *{upper}",
+    "TST* {name}",
+    "{upper} #{store}",
+    "{upper} {store}",
+]
+
+UNKNOWN_MERCHANTS = [
+    "AMAZON MKTPL",
+    "SHELL OIL 5744",
+    "CVS/PHARMACY #0923",
+    "UBER *TRIP",
+    "SPOTIFY USA",
+    "VENMO PAYMENT",
+    "TARGET T-1234",
+    "LYFT *RIDE",
+]
+
+
+def load_venues(filepath: Path) -> list[dict]:
+    """Load venues with coordinates from venues_with_reviews.json."""
+    with open(filepath) as f:
+        data = json.load(f)
+    venues = []
+    for venue in data.get("venues", []):
+        if not venue.get("lat") or not venue.get("lng"):
+            continue
+        venues.append(
+            {
+                "id": venue["place_id"],
+                "name": venue["name"],
+                "lat": float(venue["lat"]),
+                "lng": float(venue["lng"]),
+            }
+        )
+    return venues
+
+
+def generate_corpus(venues: list[dict], size: int, seed: int) -> list[dict]:
+    """Generate Plaid-style merchant strings with the expected venue id."""
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(size):
+        if rng.random() < 0.2:
+            venue = rng.choice(venues)
+            corpus.append(
+                {
+                    "merchant_name": rng.choice(UNKNOWN_MERCHANTS),
+                    "lat": venue["lat"],
+                    "lng": venue["lng"],
+                    "expected": None,
+                }
+            )
+            continue
+        venue = rng.choice(venues)
+        name = venue["name"].split(" - ")[0]
+        merchant = rng.choice(PLAID_PATTERNS).format(
+            name=name, upper=name.upper(), store=rng.randint(100, 9999)
+        )
+        corpus.append(
+            {
+                "merchant_name": merchant,
+                # Transactions land within a few hundred meters of the venue
+                "lat": venue["lat"] + rng.uniform(-0.003, 0.003),
+                "lng": venue["lng"] + rng.uniform(-0.003, 0.003),
+                "expected": venue["id"],
+            }
+        )
+    return corpus
+
+
+def load_corpus(filepath: Path) -> list[dict]:
+    """Load a recorded merchant corpus (merchant_name,lat,lng CSV)."""
+    corpus = []
+    with open(filepath) as f:
+        for row in csv.DictReader(f):
+            corpus.append(
+                {
+                    "merchant_name": row["merchant_name"],
+                    "lat": float(row["lat"]) if row.get("lat") else None,
+                    "lng": float(row["lng"]) if row.get("lng") else None,
+                    "expected": None,
+                }
+            )
+    return corpus
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the local venue matcher")
+    parser.add_argument("--venues", type=Path, default=DEFAULT_VENUES_FILE)
+    parser.add_argument("--merchants", type=Path, help="Recorded merchant CSV")
+    parser.add_argument("--size", type=int, default=5000, help="Generated corpus size")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    threshold = get_settings().venue_match_confidence_threshold
+
+    venues = load_venues(args.venues)
+    start = time.perf_counter()
+    index = VenueIndex(venues)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    if args.merchants:
+        corpus = load_corpus(args.merchants)
+    else:
+        corpus = generate_corpus(venues, args.size, args.seed)
+
+    print(f"Indexed {len(index)} venues in {build_ms:.1f}ms")
+    print(f"Corpus: {len(corpus)} merchants, threshold {threshold}")
+
+    best_rate = 0.0
+    for run in range(args.repeat):
+        start = time.perf_counter()
+        results = [index.match(m["merchant_name"], m["lat"], m["lng"]) for m in corpus]
+        elapsed = time.perf_counter() - start
+        rate = len(corpus) / elapsed
+        best_rate = max(best_rate, rate)
+        print(f"  Run {run + 1}: {rate:,.0f} lookups/s ({elapsed * 1e6 / len(corpus):.1f}us each)")
+
+    accepted = [r for r in results if r and r.confidence >= threshold]
+    print(f"\nBest throughput: {best_rate:,.0f} lookups/s")
+    print(f"Resolved locally: {len(accepted)}/{len(corpus)} ({len(accepted) / len(corpus):.0%})")
+
+    # Generated corpora know the right answer for every merchant
+    if not args.merchants:
+        resolved = [r.venue_id if r and r.confidence >= threshold else None for r in results]
+        correct = sum(1 for m, v in zip(corpus, resolved) if v == m["expected"])
+        wrong = sum(1 for m, v in zip(corpus, resolved) if v and v != m["expected"])
+        accuracy = correct / len(corpus)
+        print(f"Correct: {correct}/{len(corpus)} ({accuracy:.0%}), wrong matches: {wrong}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,7 @@
 """Import venues pipeline.
 
 Reads venue data from venues_with_reviews.json (from discover_venues.py),
-tags with Claude, inserts into Supabase.
+tags with Claude (memoized, concurrent batch), inserts into Supabase.
 
 Usage:
     cd backend
@@ -20,7 +20,7 @@ from supabase import create_client
 # Add app to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from app.intelligence.venue_tagger import VenueTagger
+from app.services.venue_tagging_service import VenueTaggingService
 
 # Load environment variables
 load_dotenv()
@@ -71,20 +71,23 @@ def import_venues(
     Returns:
         Summary dict with stats.
     """
-    # Tag with Claude
-    tagger = VenueTagger()
-    total_cost = 0.0
+    supabase = create_client(SUPABASE_URL, SUPABASE_KEY) if SUPABASE_URL else None
+
+    # Tag with Claude - memo hits are free, misses run concurrently
+    tagging_service = VenueTaggingService(supabase)
     tagged_venues = []
 
     print("\n" + "=" * 60)
     print("TAGGING VENUES")
     print("=" * 60)
 
-    for venue in venues:
-        print(f"\n[Tagging] {venue['name']}...")
+    profiles = tagging_service.tag_many(venues)
 
-        profile, usage = tagger.tag_with_usage(venue)
-        total_cost += usage["total_cost"]
+    for venue, profile in zip(venues, profiles):
+        print(f"\n[Tagged] {venue['name']}")
+        if profile is None:
+            print("  [ERR] Tagging failed, skipping")
+            continue
 
         # Build DB record
         db_record = {
@@ -106,6 +109,7 @@ def import_venues(
             "tagline": profile.tagline,
             "best_for": profile.best_for,
             "standout": profile.standout,
+            "tag_source": "ai",
             # Legacy boolean fields (for backwards compat)
             "date_friendly": "date_night" in profile.best_for,
             "group_friendly": "group_celebration" in profile.best_for or "casual_hangout" in profile.best_for,
@@ -118,7 +122,6 @@ def import_venues(
 
         print(f"  Tagline: \"{profile.tagline}\"")
         print(f"  Cluster: {profile.taste_cluster} | Energy: {profile.energy}")
-        print(f"  Cost: ${usage['total_cost']:.5f}")
 
     # 3. Insert into Supabase
     if not dry_run and tagged_venues:
@@ -126,8 +129,6 @@ def import_venues(
         print("INSERTING INTO DATABASE")
         print("=" * 60)
 
-        supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
-
         for record in tagged_venues:
             try:
                 supabase.table("venues").upsert(
@@ -139,8 +140,11 @@ def import_venues(
                 print(f"  [ERR] {record['name']}: {e}")
 
     # Summary
+    total_cost = tagging_service.stats["total_cost"]
     summary = {
         "venues_processed": len(tagged_venues),
+        "memo_hits": tagging_service.stats["memo_hits"],
+        "claude_calls": tagging_service.stats["tagged"],
         "total_cost": total_cost,
         "avg_cost_per_venue": total_cost / len(tagged_venues) if tagged_venues else 0,
         "dry_run": dry_run,
@@ -150,6 +154,7 @@ def import_venues(
     print("IMPORT SUMMARY")
     print("=" * 60)
     print(f"Venues processed: {summary['venues_processed']}")
+    print(f"Memo hits: {summary['memo_hits']} | Claude calls: {summary['claude_calls']}")
     print(f"Total AI cost: ${summary['total_cost']:.4f}")
     print(f"Avg cost/venue: ${summary['avg_cost_per_venue']:.5f}")
     if dry_run:
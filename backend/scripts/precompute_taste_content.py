@@ -0,0 +1,60 @@
+"""Precompute daily insights, DNA traits and profile titles.
+
+Generates the day's taste content for recently active users so the first
+screen open doesn't wait on Claude. Run nightly from cron (once per shard
+to spread users across machines) when the in-process job is disabled.
+
+Usage:
+    cd backend
+    source .venv/bin/activate
+    python scripts/precompute_taste_content.py
+    python scripts/precompute_taste_content.py --shard 0 --shards 4 --date 2026-10-19
+"""
+
+import argparse
+import os
+import sys
+from datetime import date
+from pathlib import Path
+
+from dotenv import load_dotenv
+from supabase import create_client
+
+# Add app to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.taste_precompute import TastePrecomputeService
+
+# Load environment variables
+load_dotenv()
+
+# Supabase config
+SUPABASE_URL = os.getenv("SUPABASE_URL")
+SUPABASE_KEY = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompute daily taste content")
+    parser.add_argument("--shard", type=int, default=0, help="Shard to process (0-based)")
+    parser.add_argument("--shards", type=int, default=1, help="Total number of shards")
+    parser.add_argument("--date", type=date.fromisoformat, default=None, help="Day to generate for")
+    parser.add_argument("--batch-size", type=int, default=None)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    service = TastePrecomputeService(
+        create_client(SUPABASE_URL, SUPABASE_KEY),
+        workers=args.workers,
+    )
+    totals = service.run(
+        target_date=args.date,
+        shard=args.shard,
+        shard_count=args.shards,
+        batch_size=args.batch_size,
+    )
+
+    print(f"Precomputed content for {totals['users']} users ({totals['failures']} failures)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Refresh volatile Google fields for stale venues.
+
+Re-pulls rating, review count and opening hours (narrow field mask, no
+reviews) for venues whose details are older than VENUE_DETAILS_STALE_DAYS.
+Meant to run from cron when the in-process refresher is disabled.
+
+Usage:
+    cd backend
+    source .venv/bin/activate
+    python scripts/refresh_venue_details.py --batches 5
+"""
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+from dotenv import load_dotenv
+from supabase import create_client
+
+# Add app to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.venue_refresher import VenueDetailsRefresher
+
+# Load environment variables
+load_dotenv()
+
+# Supabase config
+SUPABASE_URL = os.getenv("SUPABASE_URL")
+SUPABASE_KEY = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Refresh stale venue details")
+    parser.add_argument("--batches", type=int, default=1, help="Number of batches to run")
+    parser.add_argument("--batch-size", type=int, default=None)
+    args = parser.parse_args()
+
+    refresher = VenueDetailsRefresher(create_client(SUPABASE_URL, SUPABASE_KEY))
+
+    total = 0
+    for _ in range(args.batches):
+        refreshed = refresher.refresh_stale(args.batch_size)
+        total += refreshed
+        if not refreshed:
+            break
+
+    print(f"Refreshed {total} venues")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Upgrade venues still on rule-based tags to AI profiles.
+
+New venues get instant RuleTagger profiles (tag_source 'rules') and are
+upgraded in the background, but upgrades that fail - or are queued when
+the process restarts - leave venues on rules. This sweeps them all.
+Meant to run from cron.
+
+Usage:
+    cd backend
+    source .venv/bin/activate
+    python scripts/upgrade_rule_tagged_venues.py --max-venues 500
+"""
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+from dotenv import load_dotenv
+from supabase import create_client
+
+# Add app to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.google_places_service import GooglePlacesService
+from app.services.venue_tagging_service import VenueTaggingService
+
+# Load environment variables
+load_dotenv()
+
+# Supabase config
+SUPABASE_URL = os.getenv("SUPABASE_URL")
+SUPABASE_KEY = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Upgrade rule-tagged venues to AI profiles")
+    parser.add_argument("--batch-size", type=int, default=50, help="Venues per page")
+    parser.add_argument("--max-venues", type=int, default=None, help="Stop after this many venues")
+    args = parser.parse_args()
+
+    supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
+    tagging_service = VenueTaggingService(supabase)
+
+    upgraded = tagging_service.upgrade_rule_tagged(
+        GooglePlacesService(supabase),
+        batch_size=args.batch_size,
+        max_venues=args.max_venues,
+    )
+
+    print(f"Upgraded {upgraded} venues")
+    print(f"Stats: {tagging_service.stats}")
+
+
+if __name__ == "__main__":
+    main()
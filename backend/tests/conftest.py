@@ -8,6 +8,9 @@ import pytest
 from dotenv import load_dotenv
 from fastapi.testclient import TestClient
 
+from app.services.daily_content_cache import clear_daily_content_cache
+from app.services.user_activity import clear_activity_stamps
+
 
 # Load test environment before importing app modules
 test_env_path = Path(__file__).parent.parent / ".env.test"
@@ -24,6 +27,8 @@ def clear_caches() -> None:
     """Clear lru_cache before each test to ensure fresh settings."""
     get_settings.cache_clear()
     get_supabase_client.cache_clear()
+    clear_daily_content_cache()
+    clear_activity_stamps()
 
 
 @pytest.fixture
@@ -0,0 +1,115 @@
+"""Tests for GenerationCache - reusing LLM generations for unchanged inputs."""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.intelligence.dna_generator import DNAGenerator, DNAResponse, DNATrait
+from app.intelligence.generation_cache import (
+    GenerationCache,
+    clear_generation_cache,
+    input_fingerprint,
+)
+from app.intelligence.llm_gateway import FakeLLMBackend, LLMGateway, fake_response
+from app.intelligence.profile_titles import AIProfileTitleGenerator
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    """Start each test with an empty in-process tier."""
+    clear_generation_cache()
+    yield
+    clear_generation_cache()
+
+
+def dna_response() -> DNAResponse:
+    """Build a four-trait DNA response."""
+    return DNAResponse(
+        traits=[
+            DNATrait(name=f"Trait {i}", emoji="✨", description="d", color="#FF6B6B")
+            for i in range(4)
+        ]
+    )
+
+
+class TestInputFingerprint:
+    """Tests for input_fingerprint()."""
+
+    def test_key_order_does_not_matter(self):
+        """Equal inputs fingerprint the same regardless of dict order."""
+        a = {"vibe_preferences": ["chill"], "categories": {"coffee": {"count": 3}}}
+        b = {"categories": {"coffee": {"count": 3}}, "vibe_preferences": ["chill"]}
+
+        assert input_fingerprint(a) == input_fingerprint(b)
+        assert input_fingerprint(a) != input_fingerprint({**a, "price_tier": "premium"})
+
+
+class TestGenerationCache:
+    """Tests for GenerationCache.get_or_generate()."""
+
+    def test_unchanged_input_reuses_generation(self):
+        """A second DNA request with the same input makes no model call."""
+        backend = FakeLLMBackend(handler=lambda kwargs: fake_response(parsed_output=dna_response()))
+        generator = DNAGenerator(gateway=LLMGateway(backend=backend), cache=GenerationCache())
+        user_data = {"exploration_style": "adventurous", "vibe_preferences": ["trendy"]}
+
+        first = generator.generate(user_data)
+        second = generator.generate(dict(user_data))
+        generator.generate({**user_data, "price_tier": "premium"})
+
+        assert second == first
+        assert len(backend.calls) == 2
+
+    def test_variants_are_collected_then_reused(self):
+        """New outputs are generated until enough variants exist."""
+        generated = iter(["a", "b", "c"])
+        cache = GenerationCache()
+
+        outputs = [
+            cache.get_or_generate("insights", "v1", {"x": 1}, lambda: next(generated), variants=2)
+            for _ in range(4)
+        ]
+
+        assert outputs[:2] == ["a", "b"]
+        assert set(outputs[2:]) <= {"a", "b"}
+
+    def test_shared_tier_is_read_before_generating(self):
+        """Outputs stored by another process are reused."""
+        supabase = MagicMock()
+        lookup = supabase.table.return_value.select.return_value.eq.return_value.gt.return_value
+        lookup.execute.return_value.data = [
+            {
+                "outputs": [["Night Owl", "Always out late"]],
+                "expires_at": "2999-01-01T00:00:00+00:00",
+            }
+        ]
+        backend = FakeLLMBackend()
+        generator = AIProfileTitleGenerator(
+            gateway=LLMGateway(backend=backend), cache=GenerationCache(supabase)
+        )
+
+        assert generator.generate({"exploration_style": "moderate"}) == (
+            "Night Owl",
+            "Always out late",
+        )
+        assert backend.calls == []
+
+    def test_rule_based_fallback_is_not_cached(self):
+        """A failed title generation falls back without poisoning the cache."""
+        backend = FakeLLMBackend(
+            [
+                ValueError("bad request"),
+                fake_response(text="Cozy Regular"),
+                fake_response(text='{"title": "Cozy Regular", "tagline": "Same spot, every time"}'),
+            ]
+        )
+        generator = AIProfileTitleGenerator(
+            gateway=LLMGateway(backend=backend), cache=GenerationCache()
+        )
+        user_data = {"exploration_style": "routine", "vibe_preferences": ["chill"]}
+
+        fallback = generator.generate(user_data)
+        title = generator.generate(user_data)
+
+        assert fallback != title
+        assert title == ("Cozy Regular", "Same spot, every time")
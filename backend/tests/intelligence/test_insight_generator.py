@@ -1,13 +1,14 @@
 """Tests for InsightGenerator - AI-powered insight generation."""
 
 import pytest
-from unittest.mock import Mock, patch
 from datetime import date
 
+from app.intelligence.llm_gateway import FakeLLMBackend, LLMGateway, fake_response
 from app.intelligence.insight_generator import (
     InsightGenerator,
     Insight,
     InsightsResponse,
+    InsightStreamParser,
 )
 
 
@@ -65,39 +66,26 @@ class TestInsightGenerator:
 
     def test_generates_insights_from_user_data(self, mock_anthropic_response, sample_user_data):
         """InsightGenerator should generate insights from user data."""
-        with patch("app.intelligence.insight_generator.anthropic") as mock_anthropic:
-            # Set up mock
-            mock_client = Mock()
-            mock_anthropic.Anthropic.return_value = mock_client
-            mock_client.beta.messages.parse.return_value = Mock(
-                parsed_output=mock_anthropic_response
-            )
-
-            generator = InsightGenerator()
-            insights = generator.generate(sample_user_data)
+        backend = FakeLLMBackend([fake_response(parsed_output=mock_anthropic_response)])
+        generator = InsightGenerator(gateway=LLMGateway(backend=backend))
+        insights = generator.generate(sample_user_data)
 
-            assert len(insights) == 2
-            assert insights[0].type == "streak"
-            assert insights[0].title == "Coffee Streak!"
+        assert len(insights) == 2
+        assert insights[0].type == "streak"
+        assert insights[0].title == "Coffee Streak!"
 
     def test_returns_list_of_insight_objects(self, mock_anthropic_response, sample_user_data):
         """Each insight should be an Insight object with required fields."""
-        with patch("app.intelligence.insight_generator.anthropic") as mock_anthropic:
-            mock_client = Mock()
-            mock_anthropic.Anthropic.return_value = mock_client
-            mock_client.beta.messages.parse.return_value = Mock(
-                parsed_output=mock_anthropic_response
-            )
+        backend = FakeLLMBackend([fake_response(parsed_output=mock_anthropic_response)])
+        generator = InsightGenerator(gateway=LLMGateway(backend=backend))
+        insights = generator.generate(sample_user_data)
 
-            generator = InsightGenerator()
-            insights = generator.generate(sample_user_data)
-
-            for insight in insights:
-                assert isinstance(insight, Insight)
-                assert insight.type in ["streak", "discovery", "pattern", "milestone"]
-                assert len(insight.title) > 0
-                assert len(insight.body) > 0
-                assert len(insight.emoji) > 0
+        for insight in insights:
+            assert isinstance(insight, Insight)
+            assert insight.type in ["streak", "discovery", "pattern", "milestone"]
+            assert len(insight.title) > 0
+            assert len(insight.body) > 0
+            assert len(insight.emoji) > 0
 
     def test_limits_to_max_3_insights(self, sample_user_data):
         """Generator should return at most 3 insights."""
@@ -110,82 +98,58 @@ class TestInsightGenerator:
             ]
         )
 
-        with patch("app.intelligence.insight_generator.anthropic") as mock_anthropic:
-            mock_client = Mock()
-            mock_anthropic.Anthropic.return_value = mock_client
-            mock_client.beta.messages.parse.return_value = Mock(
-                parsed_output=four_insights
-            )
-
-            generator = InsightGenerator()
-            insights = generator.generate(sample_user_data)
+        backend = FakeLLMBackend([fake_response(parsed_output=four_insights)])
+        generator = InsightGenerator(gateway=LLMGateway(backend=backend))
+        insights = generator.generate(sample_user_data)
 
-            # Should be limited to 3 max
-            assert len(insights) <= 3
+        # Should be limited to 3 max
+        assert len(insights) <= 3
 
     def test_uses_structured_outputs_beta(self, sample_user_data):
         """Generator should use Anthropic's structured outputs beta."""
-        with patch("app.intelligence.insight_generator.anthropic") as mock_anthropic:
-            mock_client = Mock()
-            mock_anthropic.Anthropic.return_value = mock_client
-            mock_response = InsightsResponse(
-                insights=[Insight(type="streak", title="T", body="B", emoji="🎯")]
-            )
-            mock_client.beta.messages.parse.return_value = Mock(
-                parsed_output=mock_response
-            )
-
-            generator = InsightGenerator()
-            generator.generate(sample_user_data)
+        mock_response = InsightsResponse(
+            insights=[Insight(type="streak", title="T", body="B", emoji="🎯")]
+        )
+        backend = FakeLLMBackend([fake_response(parsed_output=mock_response)])
+        generator = InsightGenerator(gateway=LLMGateway(backend=backend))
+        generator.generate(sample_user_data)
 
-            # Verify beta.messages.parse was called
-            mock_client.beta.messages.parse.assert_called_once()
-            call_kwargs = mock_client.beta.messages.parse.call_args.kwargs
+        # Verify one structured-output call was made
+        assert len(backend.calls) == 1
+        call_kwargs = backend.calls[0]
 
-            # Should include structured outputs beta
-            assert "betas" in call_kwargs
-            assert "structured-outputs-2025-11-13" in call_kwargs["betas"]
+        # Should include structured outputs beta
+        assert "betas" in call_kwargs
+        assert "structured-outputs-2025-11-13" in call_kwargs["betas"]
 
     def test_uses_haiku_model(self, sample_user_data):
         """Generator should use Claude Haiku for cost efficiency."""
-        with patch("app.intelligence.insight_generator.anthropic") as mock_anthropic:
-            mock_client = Mock()
-            mock_anthropic.Anthropic.return_value = mock_client
-            mock_response = InsightsResponse(
-                insights=[Insight(type="streak", title="T", body="B", emoji="🎯")]
-            )
-            mock_client.beta.messages.parse.return_value = Mock(
-                parsed_output=mock_response
-            )
-
-            generator = InsightGenerator()
-            generator.generate(sample_user_data)
+        mock_response = InsightsResponse(
+            insights=[Insight(type="streak", title="T", body="B", emoji="🎯")]
+        )
+        backend = FakeLLMBackend([fake_response(parsed_output=mock_response)])
+        generator = InsightGenerator(gateway=LLMGateway(backend=backend))
+        generator.generate(sample_user_data)
 
-            call_kwargs = mock_client.beta.messages.parse.call_args.kwargs
-            assert "claude-haiku" in call_kwargs["model"]
+        call_kwargs = backend.calls[0]
+        assert "claude-haiku" in call_kwargs["model"]
 
     def test_includes_user_data_in_prompt(self, sample_user_data):
         """User data should be included in the prompt."""
-        with patch("app.intelligence.insight_generator.anthropic") as mock_anthropic:
-            mock_client = Mock()
-            mock_anthropic.Anthropic.return_value = mock_client
-            mock_response = InsightsResponse(
-                insights=[Insight(type="streak", title="T", body="B", emoji="🎯")]
-            )
-            mock_client.beta.messages.parse.return_value = Mock(
-                parsed_output=mock_response
-            )
-
-            generator = InsightGenerator()
-            generator.generate(sample_user_data)
+        mock_response = InsightsResponse(
+            insights=[Insight(type="streak", title="T", body="B", emoji="🎯")]
+        )
+        backend = FakeLLMBackend([fake_response(parsed_output=mock_response)])
+        generator = InsightGenerator(gateway=LLMGateway(backend=backend))
+        generator.generate(sample_user_data)
 
-            call_kwargs = mock_client.beta.messages.parse.call_args.kwargs
-            messages = call_kwargs["messages"]
+        call_kwargs = backend.calls[0]
+        messages = call_kwargs["messages"]
 
-            # User data should be in the message content
-            user_message = messages[0]["content"]
-            assert "48" in user_message  # total_transactions
-            assert "Blue Bottle" in user_message  # merchant name
+        # User data should be in the message content
+        user_message = messages[0]["content"]
+        assert "48" in user_message  # total_transactions
+        assert "Blue Bottle" in user_message  # merchant name
 
     def test_handles_empty_user_data(self):
         """Generator should handle users with no transaction data gracefully."""
@@ -198,28 +162,65 @@ class TestInsightGenerator:
             "top_merchants": [],
         }
 
-        with patch("app.intelligence.insight_generator.anthropic") as mock_anthropic:
-            mock_client = Mock()
-            mock_anthropic.Anthropic.return_value = mock_client
-            mock_response = InsightsResponse(
-                insights=[
-                    Insight(
-                        type="discovery",
-                        title="Getting Started",
-                        body="Link your card to start tracking your taste!",
-                        emoji="🚀",
-                    )
-                ]
-            )
-            mock_client.beta.messages.parse.return_value = Mock(
-                parsed_output=mock_response
-            )
+        mock_response = InsightsResponse(
+            insights=[
+                Insight(
+                    type="discovery",
+                    title="Getting Started",
+                    body="Link your card to start tracking your taste!",
+                    emoji="🚀",
+                )
+            ]
+        )
+        backend = FakeLLMBackend([fake_response(parsed_output=mock_response)])
+        generator = InsightGenerator(gateway=LLMGateway(backend=backend))
+        insights = generator.generate(empty_data)
+
+        # Should still return something (starter insight)
+        assert len(insights) >= 1
+
+
+class TestInsightStreaming:
+    """Test InsightGenerator.astream() and the incremental parser."""
+
+    def test_parser_emits_each_insight_when_it_closes(self):
+        """Insights are returned by the chunk that completes them, even with braces in strings."""
+        text = InsightsResponse(
+            insights=[
+                Insight(type="streak", title='Say "hi" {now}', body="Back\\slash ]", emoji="☕"),
+                Insight(type="pattern", title="Early Bird", body="Mornings", emoji="🌅"),
+            ]
+        ).model_dump_json()
+        second_start = text.index('{"type":"pattern"')
+
+        parser = InsightStreamParser()
+        first = parser.feed(text[:second_start])
+        second = parser.feed(text[second_start:-3])
+        rest = parser.feed(text[-3:])
+
+        assert [i.title for i in first] == ['Say "hi" {now}']
+        assert first[0].body == "Back\\slash ]"
+        assert second == []
+        assert [i.title for i in rest] == ["Early Bird"]
+
+    async def test_astream_yields_insights_from_model_stream(self):
+        """astream() yields parsed insights, capped at MAX_INSIGHTS."""
+        four_insights = InsightsResponse(
+            insights=[
+                Insight(type="streak", title=f"T{i}", body="B", emoji="🎯")
+                for i in range(4)
+            ]
+        )
+        backend = FakeLLMBackend(
+            [fake_response(text=four_insights.model_dump_json())], stream_chunk_size=5
+        )
+        generator = InsightGenerator(gateway=LLMGateway(backend=backend))
 
-            generator = InsightGenerator()
-            insights = generator.generate(empty_data)
+        insights = [i async for i in generator.astream({"total_transactions": 10})]
 
-            # Should still return something (starter insight)
-            assert len(insights) >= 1
+        assert [i.title for i in insights] == ["T0", "T1", "T2"]
+        assert backend.calls[0]["method"] == "stream"
+        assert backend.calls[0]["output_format"] is InsightsResponse
 
 
 class TestInsightModel:
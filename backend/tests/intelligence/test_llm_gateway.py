@@ -0,0 +1,280 @@
+"""Tests for LLMGateway - shared Claude access with limits and metrics."""
+
+import asyncio
+import threading
+
+import pytest
+
+from app.intelligence.llm_gateway import (
+    AnthropicBackend,
+    FakeLLMBackend,
+    LLMGateway,
+    LLMTimeoutError,
+    UseCasePolicy,
+    fake_response,
+)
+
+
+def make_gateway(backend, **policy):
+    """Build a gateway with a single test policy and no backoff."""
+    defaults = {"concurrency": 4, "timeout_seconds": 5.0, "max_retries": 2}
+    return LLMGateway(
+        backend=backend,
+        policies={"test": UseCasePolicy(**{**defaults, **policy})},
+        backoff_base=0.0,
+    )
+
+
+class TestLLMGateway:
+    """Tests for LLMGateway."""
+
+    def test_transient_errors_are_retried(self):
+        """Connection errors are retried until a response arrives."""
+        backend = FakeLLMBackend([ConnectionError(), fake_response(text="ok")])
+        gateway = make_gateway(backend)
+
+        response = gateway.create("test", model="claude-haiku-4-5", messages=[])
+
+        assert response.content[0].text == "ok"
+        assert len(backend.calls) == 2
+        assert gateway.metrics()["test"]["retries"] == 1
+
+    def test_non_transient_errors_are_raised_immediately(self):
+        """Other errors fail on the first attempt."""
+        backend = FakeLLMBackend([ValueError("bad request")])
+        gateway = make_gateway(backend)
+
+        with pytest.raises(ValueError):
+            gateway.parse("test", model="claude-haiku-4-5", messages=[])
+
+        assert len(backend.calls) == 1
+        assert gateway.metrics()["test"]["failures"] == 1
+
+    def test_retries_stop_at_max_retries(self):
+        """The last transient error is raised once retries run out."""
+        backend = FakeLLMBackend([ConnectionError()] * 3)
+        gateway = make_gateway(backend, max_retries=1)
+
+        with pytest.raises(ConnectionError):
+            gateway.create("test", model="claude-haiku-4-5", messages=[])
+
+        assert len(backend.calls) == 2
+
+    def test_remaining_deadline_is_passed_to_backend(self):
+        """Each attempt gets at most the policy's deadline as its timeout."""
+        backend = FakeLLMBackend([fake_response()])
+        gateway = make_gateway(backend, timeout_seconds=3.0)
+
+        gateway.create("test", model="claude-haiku-4-5", messages=[])
+
+        assert 0 < backend.calls[0]["timeout"] <= 3.0
+
+    def test_concurrency_is_capped_per_use_case(self):
+        """No more than the policy's concurrency calls run at once."""
+        in_flight = 0
+        max_in_flight = 0
+        lock = threading.Lock()
+        release = threading.Event()
+
+        def handler(kwargs):
+            nonlocal in_flight, max_in_flight
+            with lock:
+                in_flight += 1
+                max_in_flight = max(max_in_flight, in_flight)
+            release.wait(0.05)
+            with lock:
+                in_flight -= 1
+            return fake_response()
+
+        gateway = make_gateway(FakeLLMBackend(handler=handler), concurrency=2)
+        threads = [
+            threading.Thread(target=gateway.create, args=("test",), kwargs={"messages": []})
+            for _ in range(6)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert max_in_flight == 2
+        assert gateway.metrics()["test"]["calls"] == 6
+
+    def test_usage_and_cost_are_recorded(self):
+        """Tokens and cost accumulate per use case."""
+        backend = FakeLLMBackend(
+            [
+                fake_response(input_tokens=1000, output_tokens=200),
+                fake_response(input_tokens=500, output_tokens=100),
+            ]
+        )
+        gateway = make_gateway(backend)
+
+        gateway.create("test", model="claude-haiku-4-5", messages=[])
+        gateway.create("test", model="claude-haiku-4-5", messages=[])
+
+        stats = gateway.metrics()["test"]
+        assert stats["calls"] == 2
+        assert stats["input_tokens"] == 1500
+        assert stats["output_tokens"] == 300
+        assert stats["total_cost"] == pytest.approx((1500 * 1.0 + 300 * 5.0) / 1_000_000)
+        assert stats["latency"]["count"] == 2
+
+
+class TestLLMGatewayAsync:
+    """Tests for the async path."""
+
+    async def test_async_call_returns_response(self):
+        """aparse() goes through the backend's async call."""
+        backend = FakeLLMBackend([fake_response(parsed_output="profile")])
+        gateway = make_gateway(backend)
+
+        response = await gateway.aparse("test", model="claude-haiku-4-5", messages=[])
+
+        assert response.parsed_output == "profile"
+        assert backend.calls[0]["method"] == "parse"
+
+    async def test_async_deadline_raises_timeout(self):
+        """A call that outlives the deadline raises LLMTimeoutError."""
+        backend = FakeLLMBackend([fake_response()], delay=0.5)
+        gateway = make_gateway(backend, timeout_seconds=0.05)
+
+        with pytest.raises(LLMTimeoutError):
+            await gateway.acreate("test", model="claude-haiku-4-5", messages=[])
+
+        assert gateway.metrics()["test"]["timeouts"] == 1
+
+    async def test_async_concurrency_is_capped(self):
+        """Concurrent async calls respect the use case's semaphore."""
+        in_flight = 0
+        max_in_flight = 0
+
+        class TrackingBackend(FakeLLMBackend):
+            async def acall(self, method, timeout, **kwargs):
+                nonlocal in_flight, max_in_flight
+                in_flight += 1
+                max_in_flight = max(max_in_flight, in_flight)
+                await asyncio.sleep(0.01)
+                in_flight -= 1
+                return fake_response()
+
+        gateway = make_gateway(TrackingBackend(), concurrency=3)
+
+        await asyncio.gather(*(gateway.acreate("test", messages=[]) for _ in range(9)))
+
+        assert max_in_flight == 3
+
+    def test_concurrency_is_capped_across_event_loops(self):
+        """Threads and separate event loops share one cap per use case."""
+        in_flight = 0
+        max_in_flight = 0
+        lock = threading.Lock()
+
+        def track(delta):
+            nonlocal in_flight, max_in_flight
+            with lock:
+                in_flight += delta
+                max_in_flight = max(max_in_flight, in_flight)
+
+        class TrackingBackend(FakeLLMBackend):
+            def call(self, method, timeout, **kwargs):
+                track(1)
+                threading.Event().wait(0.02)
+                track(-1)
+                return fake_response()
+
+            async def acall(self, method, timeout, **kwargs):
+                track(1)
+                await asyncio.sleep(0.02)
+                track(-1)
+                return fake_response()
+
+        gateway = make_gateway(TrackingBackend(), concurrency=2)
+
+        async def batch():
+            await asyncio.gather(*(gateway.acreate("test", messages=[]) for _ in range(4)))
+
+        threads = [threading.Thread(target=asyncio.run, args=(batch(),)) for _ in range(3)]
+        threads += [
+            threading.Thread(target=gateway.create, args=("test",), kwargs={"messages": []})
+            for _ in range(3)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert max_in_flight == 2
+        assert gateway.metrics()["test"]["calls"] == 15
+
+    async def test_waiting_for_capacity_times_out(self):
+        """An async call that can't get a permit in time raises LLMTimeoutError."""
+        gateway = make_gateway(FakeLLMBackend([fake_response()]), timeout_seconds=0.05)
+        limiter = gateway._get_limiter("test", gateway.policy("test"))
+        for _ in range(gateway.policy("test").concurrency):
+            assert limiter.acquire(timeout=0)
+
+        with pytest.raises(LLMTimeoutError):
+            await gateway.acreate("test", messages=[])
+
+        limiter.release()
+        assert (await gateway.acreate("test", messages=[])).usage.input_tokens == 0
+
+
+class TestAnthropicBackend:
+    """Tests for AnthropicBackend's per-loop clients."""
+
+    def test_async_client_is_closed_with_its_loop(self, monkeypatch):
+        """asyncio.run() closes and forgets the loop's client on exit."""
+        monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+        backend = AnthropicBackend()
+
+        async def get_clients():
+            return await backend._get_async_client(), await backend._get_async_client()
+
+        first, second = asyncio.run(get_clients())
+
+        assert first is second
+        assert first.is_closed()
+        assert len(backend._async_clients) == 0
+
+
+class TestLLMGatewayStream:
+    """Tests for astream()."""
+
+    async def test_stream_yields_text_and_records_usage(self):
+        """Deltas are forwarded in order; usage comes from the final message."""
+        backend = FakeLLMBackend(
+            [fake_response(text='{"insights": []}', input_tokens=100, output_tokens=20)],
+            stream_chunk_size=4,
+        )
+        gateway = make_gateway(backend)
+
+        chunks = [c async for c in gateway.astream("test", model="claude-haiku-4-5", messages=[])]
+
+        assert "".join(chunks) == '{"insights": []}'
+        assert len(chunks) == 4
+        metrics = gateway.metrics()["test"]
+        assert metrics["calls"] == 1
+        assert metrics["output_tokens"] == 20
+        assert metrics["first_token_latency"]["count"] == 1
+
+    async def test_stream_retries_before_first_delta(self):
+        """A transient error before any output is retried."""
+        backend = FakeLLMBackend([ConnectionError(), fake_response(text="ok")])
+        gateway = make_gateway(backend)
+
+        chunks = [c async for c in gateway.astream("test", messages=[])]
+
+        assert chunks == ["ok"]
+        assert gateway.metrics()["test"]["retries"] == 1
+
+    async def test_stream_deadline_raises_timeout(self):
+        """A stream that outlives the deadline raises LLMTimeoutError."""
+        backend = FakeLLMBackend([fake_response(text="late")], delay=0.5)
+        gateway = make_gateway(backend, timeout_seconds=0.05)
+
+        with pytest.raises(LLMTimeoutError):
+            async for _ in gateway.astream("test", messages=[]):
+                pass
+
+        assert gateway.metrics()["test"]["timeouts"] == 1
@@ -0,0 +1,100 @@
+"""Tests for PromptBuilder and review ranking."""
+
+from app.intelligence.insight_generator import PROMPT_BUDGET_TOKENS, InsightGenerator
+from app.intelligence.prompt_builder import (
+    PromptBuilder,
+    estimate_tokens,
+    rank_reviews,
+)
+from app.intelligence.venue_tagger import build_venue_message
+
+
+class TestPromptBuilder:
+    """Tests for PromptBuilder."""
+
+    def test_lines_past_budget_are_dropped_whole(self):
+        """Optional lines are only added while they fit."""
+        builder = PromptBuilder(budget_tokens=10)
+        builder.add_required("## Data")
+
+        assert builder.add("short line")
+        assert not builder.add("x" * 100)
+        assert builder.build() == "## Data\nshort line"
+        assert builder.used_tokens <= 10
+
+    def test_section_stops_at_first_line_that_does_not_fit(self):
+        """Sections keep priority order and omit an empty header."""
+        builder = PromptBuilder(budget_tokens=12)
+
+        added = builder.add_section("## Top", ["- one", "- two", "x" * 80, "- three"])
+
+        assert added == 2
+        assert builder.build() == "## Top\n- one\n- two"
+        assert builder.add_section("## Empty", ["x" * 80]) == 0
+        assert "## Empty" not in builder.build()
+
+
+class TestRankReviews:
+    """Tests for rank_reviews()."""
+
+    def test_informative_reviews_rank_first_and_duplicates_drop(self):
+        """Specific reviews beat generic ones; near-identical reviews are deduped."""
+        cozy = "Cozy spot with quiet corners, great wifi for laptop work and strong espresso"
+        reviews = [
+            {"text": "Good.", "stars": 4},
+            {"text": cozy, "stars": 5},
+            {"text": cozy + "!!", "stars": 5},
+            {"text": "Lively patio, fun with groups of friends on weekends", "stars": 4},
+        ]
+
+        ranked = rank_reviews(reviews)
+
+        assert [r["text"][:10] for r in ranked] == ["Cozy spot ", "Lively pat", "Good."]
+
+    def test_text_is_truncated(self):
+        """Review text is cut to max_chars."""
+        ranked = rank_reviews([{"text": "a" * 500, "stars": 5}], max_chars=300)
+
+        assert len(ranked[0]["text"]) == 300
+
+
+class TestBudgetedMessages:
+    """Generators stay within their token budgets."""
+
+    def test_venue_message_respects_budget(self):
+        """Venue facts always appear; reviews fill the remaining budget."""
+        venue = {
+            "name": "Tartine",
+            "category": "bakery",
+            "reviews": [
+                {
+                    "text": f"Review {i} about the morning bun, croissants and {i} friends",
+                    "stars": 5,
+                }
+                for i in range(10)
+            ],
+        }
+
+        message = build_venue_message(venue, budget_tokens=80)
+
+        assert message.startswith("## Venue Data\nName: Tartine\nCategory: bakery")
+        assert estimate_tokens(message) <= 80
+        assert "1. [5*]" in message
+
+    def test_insight_message_respects_budget(self):
+        """Large user data is trimmed to the insight budget."""
+        user_data = {
+            "total_transactions": 500,
+            "categories": {
+                f"category_{i}": {"count": i, "total_spend": i * 10, "merchants": ["A", "B", "C"]}
+                for i in range(50)
+            },
+            "top_merchants": [{"merchant_name": f"Spot {i}", "count": i} for i in range(50)],
+        }
+
+        message = InsightGenerator.__new__(InsightGenerator)._build_user_message(user_data)
+
+        assert estimate_tokens(message) <= PROMPT_BUDGET_TOKENS
+        # Busiest categories survive truncation
+        assert "category_49" in message
+        assert "category_0:" not in message
@@ -0,0 +1,81 @@
+"""Tests for RuleInsightEngine - rule-based insights from aggregates."""
+
+from __future__ import annotations
+
+from app.intelligence.aggregation_engine import StreakData, UserAnalysis
+from app.intelligence.rule_insights import RuleInsightEngine, highlights
+from app.services.taste_precompute import insight_user_data
+
+
+def make_analysis() -> dict:
+    """A user_analysis row where several rules fire."""
+    return {
+        "user_id": "user-1",
+        "total_transactions": 60,
+        "categories": {"coffee": {"count": 30, "total_spend": 150.0, "merchants": ["Blue Bottle"]}},
+        "streaks": {
+            "coffee": {"current": 6, "longest": 6},
+            "dining": {"current": 2, "longest": 4},
+        },
+        "top_merchants": [{"merchant_id": "m1", "merchant_name": "Blue Bottle", "count": 18}],
+        "day_types": {"weekend": 40, "weekday": 20},
+        "exploration": {"dining": {"unique": 9, "total": 10}, "coffee": {"unique": 6, "total": 30}},
+        "time_buckets": {"morning": 20, "afternoon": 20, "evening": 20},
+    }
+
+
+class TestCandidates:
+    """Tests for RuleInsightEngine.candidates()."""
+
+    def test_candidates_are_ranked_one_per_rule(self) -> None:
+        """Each rule fires once, for its most telling data, best first."""
+        candidates = RuleInsightEngine().candidates(make_analysis())
+
+        titles = [c.insight.title for c in candidates]
+        assert titles[0] == "Coffee Streak!"
+        assert candidates[0].insight.body == "6 days straight of coffee - your longest yet"
+        assert set(titles) == {
+            "Coffee Streak!",
+            "Your Go-To Spot",
+            "Weekend Warrior",
+            "Explorer Mode",
+            "50 Visits!",
+        }
+        scores = [c.score for c in candidates]
+        assert scores == sorted(scores, reverse=True)
+
+    def test_even_time_of_day_and_short_streaks_are_skipped(self) -> None:
+        """No dominant time bucket and streaks under 3 days produce nothing."""
+        candidates = RuleInsightEngine().candidates(make_analysis())
+
+        assert not any(c.insight.title == "Dining Streak!" for c in candidates)
+        assert not any(c.insight.title in ("Early Bird", "Evening Out") for c in candidates)
+
+    def test_empty_analysis_has_no_candidates(self) -> None:
+        """A user without transactions gets no rule-based insights."""
+        assert RuleInsightEngine().candidates({"user_id": "user-1", "total_transactions": 0}) == []
+
+    def test_accepts_user_analysis(self) -> None:
+        """UserAnalysis and its row form give the same insights."""
+        analysis = UserAnalysis(user_id="user-1", total_transactions=12)
+        analysis.streaks["bars"] = StreakData(current=4, longest=7)
+
+        engine = RuleInsightEngine()
+        assert engine.generate(analysis) == engine.generate(analysis.to_dict())
+        assert [i.type for i in engine.generate(analysis)] == ["streak", "milestone"]
+
+
+class TestGenerate:
+    """Tests for RuleInsightEngine.generate() and highlights()."""
+
+    def test_generate_limits_to_max_insights(self) -> None:
+        """At most three insights, like the LLM tier."""
+        assert len(RuleInsightEngine().generate(make_analysis())) == 3
+
+    def test_highlights_are_passed_to_the_insight_prompt(self) -> None:
+        """Insight user data carries the top facts for the LLM."""
+        user_data = insight_user_data(make_analysis())
+
+        assert user_data["highlights"] == highlights(make_analysis())
+        assert user_data["highlights"][0] == "coffee streak: 6 days (longest 6)"
+        assert len(user_data["highlights"]) == 4
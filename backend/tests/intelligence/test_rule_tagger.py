@@ -0,0 +1,104 @@
+"""Tests for RuleTagger - deterministic venue profiles from Google data."""
+
+import pytest
+
+from app.intelligence.rule_tagger import RuleTagger
+from app.services.google_places_service import PlaceDetails
+
+
+def _hours(open_day: int, open_hour: int, close_day: int, close_hour: int) -> dict:
+    return {
+        "periods": [
+            {
+                "open": {"day": open_day, "hour": open_hour, "minute": 0},
+                "close": {"day": close_day, "hour": close_hour, "minute": 0},
+            }
+        ]
+    }
+
+
+class TestRuleTagger:
+    """Tests for RuleTagger.tag()."""
+
+    @pytest.fixture
+    def tagger(self):
+        return RuleTagger()
+
+    def test_coffee_shop(self, tagger):
+        """Coffee shops are chill solo-work spots."""
+        profile = tagger.tag(
+            PlaceDetails(
+                place_id="p1",
+                name="Blue Bottle",
+                primary_type="coffee_shop",
+                types=["coffee_shop", "cafe", "food"],
+                price_level=1,
+                takeout=True,
+                opening_hours=_hours(1, 7, 1, 17),
+            )
+        )
+
+        assert profile.taste_cluster == "coffee"
+        assert profile.cuisine_type is None
+        assert profile.energy == "chill"
+        assert profile.best_for == ["solo_work", "quick_bite"]
+        assert profile.tagline == "Casual cafe"
+
+    def test_dining_cuisine_and_occasions(self, tagger):
+        """Restaurant types map to a cuisine; atmosphere flags pick occasions."""
+        profile = tagger.tag(
+            PlaceDetails(
+                place_id="p2",
+                name="La Trattoria",
+                primary_type="italian_restaurant",
+                types=["italian_restaurant", "restaurant"],
+                price_level=3,
+                reservable=True,
+                good_for_groups=True,
+                outdoor_seating=True,
+            )
+        )
+
+        assert profile.taste_cluster == "dining"
+        assert profile.cuisine_type == "italian"
+        assert profile.energy == "moderate"
+        assert profile.best_for == ["date_night", "business_lunch", "group_celebration"]
+        assert profile.tagline == "Stylish Italian restaurant with outdoor seating"
+
+    def test_late_night_bar(self, tagger):
+        """Bars closing after midnight are lively late-night spots."""
+        profile = tagger.tag(
+            PlaceDetails(
+                place_id="p3",
+                name="The Owl",
+                primary_type="bar",
+                types=["bar"],
+                good_for_groups=True,
+                opening_hours=_hours(5, 18, 6, 2),
+            )
+        )
+
+        assert profile.taste_cluster == "nightlife"
+        assert profile.energy == "lively"
+        assert profile.best_for[0] == "late_night"
+        assert "group_celebration" in profile.best_for
+        assert profile.tagline == "Neighborhood bar open late"
+
+    def test_unmapped_type_defaults_to_dining(self, tagger):
+        """Unknown types still produce a usable profile."""
+        profile = tagger.tag(PlaceDetails(place_id="p4", name="Mystery", primary_type="food"))
+
+        assert profile.taste_cluster == "dining"
+        assert profile.best_for == []
+        assert profile.standout == []
+
+    def test_location_fields_use_shared_cluster(self, tagger):
+        """Chain locations get their own tagline in the chain's cluster and cuisine."""
+        tagline, standout = tagger.location_fields(
+            PlaceDetails(place_id="p9", name="Chipotle", price_level=4, outdoor_seating=True),
+            "dining",
+            "tex_mex",
+        )
+
+        assert tagline == "Upscale Tex Mex restaurant with outdoor seating"
+        assert standout == ["upscale_feel"]
@@ -0,0 +1,101 @@
+"""Tests for TasteContentGenerator - combined insights, DNA and title call."""
+
+from app.intelligence.dna_generator import DNATrait
+from app.intelligence.generation_cache import GenerationCache, clear_generation_cache
+from app.intelligence.insight_generator import Insight
+from app.intelligence.llm_gateway import FakeLLMBackend, LLMGateway, fake_response
+from app.intelligence.prompt_builder import estimate_tokens
+from app.intelligence.taste_content_generator import (
+    PROMPT_BUDGET_TOKENS,
+    TasteContentGenerator,
+    TasteContentResponse,
+)
+
+USER_DATA = {
+    "total_transactions": 48,
+    "categories": {
+        "coffee": {"count": 20, "total_spend": 150.0, "merchants": ["Blue Bottle", "Starbucks"]},
+        "dining": {"count": 15, "total_spend": 400.0, "merchants": ["Tartine"]},
+    },
+    "streaks": {"coffee": {"current": 5, "longest": 7}},
+    "exploration": {"coffee": {"unique": 4, "total": 20}},
+    "time_buckets": {"morning": 25, "evening": 8},
+    "top_merchants": [{"merchant_name": "Blue Bottle", "count": 12}],
+    "exploration_style": "adventurous",
+    "vibe_preferences": ["trendy", "cozy"],
+    "social_preference": "group",
+    "price_tier": "moderate",
+}
+
+
+def make_content(insights: int = 2, traits: int = 4) -> TasteContentResponse:
+    return TasteContentResponse(
+        insights=[
+            Insight(type="streak", title=f"Insight {i}", body="Body", emoji="🔥")
+            for i in range(insights)
+        ],
+        traits=[
+            DNATrait(name=f"Trait {i}", emoji="✨", description="Desc", color="#14B8A6")
+            for i in range(traits)
+        ],
+        title="Urban Explorer",
+        tagline="Always finding new spots",
+    )
+
+
+def test_one_call_returns_all_three_artifacts():
+    """Insights, traits and title come back from a single model call."""
+    backend = FakeLLMBackend([fake_response(make_content())])
+    generator = TasteContentGenerator(gateway=LLMGateway(backend))
+
+    content = generator.generate(USER_DATA)
+
+    assert len(backend.calls) == 1
+    assert backend.calls[0]["output_format"] is TasteContentResponse
+    assert [i.title for i in content.insights] == ["Insight 0", "Insight 1"]
+    assert len(content.traits) == 4
+    assert content.title == "Urban Explorer"
+    assert content.tagline == "Always finding new spots"
+
+
+def test_output_is_truncated_to_each_generators_limits():
+    """Extra insights and traits from the model are dropped."""
+    backend = FakeLLMBackend([fake_response(make_content(insights=5, traits=6))])
+    generator = TasteContentGenerator(gateway=LLMGateway(backend))
+
+    content = generator.generate(USER_DATA)
+
+    assert len(content.insights) == 3
+    assert len(content.traits) == 4
+
+
+def test_user_message_fits_budget_and_keeps_quiz_data():
+    """The shared summary stays within budget and always includes the quiz."""
+    generator = TasteContentGenerator(gateway=LLMGateway(FakeLLMBackend([])))
+    data = dict(USER_DATA)
+    data["categories"] = {
+        f"category_{i}": {"count": i, "total_spend": i * 10.0, "merchants": [f"Spot {i}"]}
+        for i in range(200)
+    }
+
+    message = generator._build_user_message(data)
+
+    assert estimate_tokens(message) <= PROMPT_BUDGET_TOKENS
+    assert "- Exploration: adventurous" in message
+    assert "- Price: moderate" in message
+    # Busiest categories survive truncation
+    assert "category_199" in message
+
+
+def test_unchanged_input_reuses_cached_generation():
+    """A second generate() with the same input doesn't call the model."""
+    clear_generation_cache()
+    backend = FakeLLMBackend([fake_response(make_content())])
+    generator = TasteContentGenerator(gateway=LLMGateway(backend), cache=GenerationCache())
+
+    first = generator.generate(USER_DATA)
+    second = generator.generate(USER_DATA)
+
+    assert len(backend.calls) == 1
+    assert second == first
+    clear_generation_cache()
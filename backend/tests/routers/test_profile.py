@@ -5,6 +5,7 @@ TDD: Tests written to verify profile endpoint behavior.
 
 from __future__ import annotations
 
+from datetime import date
 from unittest.mock import MagicMock
 
 import pytest
@@ -12,6 +13,7 @@ from fastapi.testclient import TestClient
 
 from app.dependencies import get_supabase_client
 from app.main import app
+from app.services.daily_content_cache import get_daily_content, set_daily_content
 
 
 @pytest.fixture
@@ -37,15 +39,16 @@ class TestGetProfile:
     ) -> None:
         """Should return profile data with linked accounts count."""
         # Mock profile query
-        mock_supabase.table.return_value.select.return_value.eq.return_value.maybe_single.return_value.execute.return_value = MagicMock(
-            data={
+        in_query = mock_supabase.table.return_value.select.return_value.in_.return_value
+        in_query.execute.return_value = MagicMock(
+            data=[{
                 "id": "test-user-123",
                 "username": "testuser",
                 "display_name": "Test User",
                 "phone": "+1234567890",
                 "avatar_url": "https://example.com/avatar.jpg",
                 "created_at": "2024-12-01T00:00:00Z",
-            }
+            }]
         )
 
         # Mock linked accounts count query
@@ -69,8 +72,9 @@ class TestGetProfile:
         self, client: TestClient, mock_supabase: MagicMock
     ) -> None:
         """Should return 404 when profile doesn't exist."""
-        mock_supabase.table.return_value.select.return_value.eq.return_value.maybe_single.return_value.execute.return_value = MagicMock(
-            data=None
+        in_query = mock_supabase.table.return_value.select.return_value.in_.return_value
+        in_query.execute.return_value = MagicMock(
+            data=[]
         )
 
         response = client.get("/api/profile/nonexistent-user")
@@ -82,15 +86,16 @@ class TestGetProfile:
         self, client: TestClient, mock_supabase: MagicMock
     ) -> None:
         """Should return 0 linked accounts for user with no banks connected."""
-        mock_supabase.table.return_value.select.return_value.eq.return_value.maybe_single.return_value.execute.return_value = MagicMock(
-            data={
+        in_query = mock_supabase.table.return_value.select.return_value.in_.return_value
+        in_query.execute.return_value = MagicMock(
+            data=[{
                 "id": "new-user",
                 "username": None,
                 "display_name": None,
                 "phone": "+1111111111",
                 "avatar_url": None,
                 "created_at": "2025-01-01T00:00:00Z",
-            }
+            }]
         )
         mock_supabase.table.return_value.select.return_value.eq.return_value.execute.return_value = MagicMock(
             count=0
@@ -226,9 +231,14 @@ class TestExportUserData:
         self, client: TestClient, mock_supabase: MagicMock
     ) -> None:
         """Should export data from all user-related tables."""
-        # Mock profile
+        # Mock per-user rows (profile, tastes, analysis) loaded by key
+        in_query = mock_supabase.table.return_value.select.return_value.in_.return_value
+        in_query.execute.return_value = MagicMock(
+            data=[{"id": "test-user-123", "user_id": "test-user-123", "display_name": "Test"}]
+        )
+        # Mock notification preferences
         mock_supabase.table.return_value.select.return_value.eq.return_value.maybe_single.return_value.execute.return_value = MagicMock(
-            data={"id": "test-user", "display_name": "Test"}
+            data={"user_id": "test-user-123"}
         )
         # Mock list queries (visits, transactions, sessions)
         mock_supabase.table.return_value.select.return_value.eq.return_value.execute.return_value = MagicMock(
@@ -251,11 +261,16 @@ class TestExportUserData:
         assert "transactions" in export_data
         assert "session_participations" in export_data
         assert "notification_preferences" in export_data
+        assert export_data["profile"]["display_name"] == "Test"
 
     def test_returns_empty_data_for_new_user(
         self, client: TestClient, mock_supabase: MagicMock
     ) -> None:
         """Should return null/empty values for user with no data."""
+        in_query = mock_supabase.table.return_value.select.return_value.in_.return_value
+        in_query.execute.return_value = MagicMock(
+            data=[]
+        )
         mock_supabase.table.return_value.select.return_value.eq.return_value.maybe_single.return_value.execute.return_value = MagicMock(
             data=None
         )
@@ -298,8 +313,9 @@ class TestDeleteAccount:
         self, client: TestClient, mock_supabase: MagicMock
     ) -> None:
         """Should return 404 if user doesn't exist."""
-        mock_supabase.table.return_value.select.return_value.eq.return_value.maybe_single.return_value.execute.return_value = MagicMock(
-            data=None
+        in_query = mock_supabase.table.return_value.select.return_value.in_.return_value
+        in_query.execute.return_value = MagicMock(
+            data=[]
         )
 
         response = client.delete(
@@ -315,14 +331,18 @@ class TestDeleteAccount:
     ) -> None:
         """Should delete user data from all tables."""
         # Mock user exists check
-        mock_supabase.table.return_value.select.return_value.eq.return_value.maybe_single.return_value.execute.return_value = MagicMock(
-            data={"id": "test-user-123"}
+        in_query = mock_supabase.table.return_value.select.return_value.in_.return_value
+        in_query.execute.return_value = MagicMock(
+            data=[{"id": "test-user-123"}]
         )
         # Mock all delete operations
         mock_supabase.table.return_value.delete.return_value.eq.return_value.execute.return_value = MagicMock(data=[])
         mock_supabase.table.return_value.select.return_value.eq.return_value.execute.return_value = MagicMock(data=[])
         # Mock auth.admin.delete_user
         mock_supabase.auth.admin.delete_user.return_value = None
+        today = date.today()
+        for kind in ("insights", "dna", "title"):
+            set_daily_content(kind, "test-user-123", today, [{"id": kind}])
 
         response = client.delete(
             "/api/profile/test-user-123",
@@ -333,13 +353,17 @@ class TestDeleteAccount:
         data = response.json()
         assert data["success"] is True
         assert "permanently deleted" in data["message"]
+        # Cached daily content is dropped with the rows
+        for kind in ("insights", "dna", "title"):
+            assert get_daily_content(kind, "test-user-123", today) is None
 
     def test_handles_auth_deletion_error_gracefully(
         self, client: TestClient, mock_supabase: MagicMock
     ) -> None:
         """Should succeed even if auth.users deletion fails."""
-        mock_supabase.table.return_value.select.return_value.eq.return_value.maybe_single.return_value.execute.return_value = MagicMock(
-            data={"id": "test-user-123"}
+        in_query = mock_supabase.table.return_value.select.return_value.in_.return_value
+        in_query.execute.return_value = MagicMock(
+            data=[{"id": "test-user-123"}]
         )
         mock_supabase.table.return_value.delete.return_value.eq.return_value.execute.return_value = MagicMock(data=[])
         mock_supabase.table.return_value.select.return_value.eq.return_value.execute.return_value = MagicMock(data=[])
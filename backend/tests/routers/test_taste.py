@@ -5,13 +5,18 @@ TDD: Write tests first, then implement.
 
 from __future__ import annotations
 
-from unittest.mock import MagicMock
+import json
+from unittest.mock import MagicMock, patch
 
 import pytest
 from fastapi.testclient import TestClient
 
 from app.dependencies import get_supabase_client
+from app.intelligence.insight_generator import Insight, InsightsResponse
+from app.intelligence.llm_gateway import FakeLLMBackend, LLMGateway, fake_response
 from app.main import app
+from app.routers.taste import InsightGenerator, get_insight_generator
+from app.services import fused_taste_service, taste_precompute
 
 
 @pytest.fixture
@@ -162,3 +167,527 @@ class TestGetTasteProfile:
         assert response.status_code == 200
         data = response.json()
         assert data["title"] == "Taste Explorer"  # Default title
+
+
+@pytest.fixture
+def mock_precompute() -> MagicMock:
+    """Replace background regeneration and reset its per-user dedupe."""
+    taste_precompute._regenerating.clear()
+    with patch("app.routers.taste.TastePrecomputeService") as service_cls:
+        yield service_cls.return_value
+    taste_precompute._regenerating.clear()
+
+
+class TestStaleWhileRevalidate:
+    """Test suite for stale taste content while it regenerates."""
+
+    def test_insights_missing_today_serves_previous_and_regenerates(
+        self, client: TestClient, mock_supabase: MagicMock, mock_precompute: MagicMock
+    ) -> None:
+        """Yesterday's insights are returned as stale; today's generate in the background."""
+        table = mock_supabase.table.return_value
+        table.select.return_value.eq.return_value.eq.return_value.execute.return_value.data = []
+        previous = table.select.return_value.eq.return_value.lt.return_value.order.return_value
+        previous.limit.return_value.execute.return_value.data = [
+            {
+                "id": "insight-1",
+                "insight_type": "streak",
+                "title": "Coffee Streak!",
+                "body": "5 days straight",
+                "emoji": "🔥",
+                "shown_at": "2026-10-17",
+                "created_at": "2026-10-17T04:00:00+00:00",
+            },
+            {
+                "id": "insight-0",
+                "insight_type": "pattern",
+                "title": "Old",
+                "body": "Two days ago",
+                "emoji": "🌅",
+                "shown_at": "2026-10-16",
+                "created_at": "2026-10-16T04:00:00+00:00",
+            },
+        ]
+
+        response = client.get("/api/taste/insights/user-1")
+        client.get("/api/taste/insights/user-1")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["stale"] is True
+        assert [i["title"] for i in data["insights"]] == ["Coffee Streak!"]
+        # Regeneration is deduplicated per user while one is pending
+        mock_precompute.regenerate.assert_called_once_with("user-1")
+
+    def test_insights_never_generated_fall_back_to_rule_based(
+        self, client: TestClient, mock_supabase: MagicMock, mock_precompute: MagicMock
+    ) -> None:
+        """Without any previous insights, ones derived from the aggregates are served stale."""
+        table = mock_supabase.table.return_value
+        table.select.return_value.eq.return_value.eq.return_value.execute.return_value.data = []
+        previous = table.select.return_value.eq.return_value.lt.return_value.order.return_value
+        previous.limit.return_value.execute.return_value.data = []
+        table.select.return_value.in_.return_value.execute.return_value.data = [{
+            "user_id": "user-5",
+            "total_transactions": 12,
+            "time_buckets": {"morning": 9, "evening": 3},
+            "day_types": {"weekend": 8, "weekday": 4},
+        }]
+
+        response = client.get("/api/taste/insights/user-5")
+
+        data = response.json()
+        assert data["stale"] is True
+        titles = [i["title"] for i in data["insights"]]
+        assert titles == ["Early Bird", "Weekend Warrior", "10 Visits!"]
+        # Ids are unique even when rules share a type (used as list keys)
+        ids = [i["id"] for i in data["insights"]]
+        assert ids == ["rule-0-pattern", "rule-1-pattern", "rule-2-milestone"]
+        mock_precompute.regenerate.assert_called_once_with("user-5")
+
+    def test_failed_fallback_read_does_not_claim_regeneration(
+        self, client: TestClient, mock_supabase: MagicMock, mock_precompute: MagicMock
+    ) -> None:
+        """A request that errors before responding leaves the dedupe slot free."""
+        table = mock_supabase.table.return_value
+        table.select.return_value.eq.return_value.eq.return_value.execute.return_value.data = []
+        previous = table.select.return_value.eq.return_value.lt.return_value.order.return_value
+        previous.limit.return_value.execute.return_value.data = []
+        table.select.return_value.in_.return_value.execute.side_effect = RuntimeError("timeout")
+
+        with pytest.raises(RuntimeError):
+            client.get("/api/taste/insights/user-6")
+
+        mock_precompute.regenerate.assert_not_called()
+        assert "user-6" not in taste_precompute._regenerating
+
+    def test_dna_never_generated_falls_back_to_rule_based_traits(
+        self, client: TestClient, mock_supabase: MagicMock, mock_precompute: MagicMock
+    ) -> None:
+        """Without any previous DNA, quiz-based traits are served as stale."""
+        table = mock_supabase.table.return_value
+        table.select.return_value.eq.return_value.eq.return_value.execute.return_value.data = []
+        previous = table.select.return_value.eq.return_value.lt.return_value.order.return_value
+        previous.limit.return_value.execute.return_value.data = []
+        table.select.return_value.in_.return_value.execute.return_value.data = [
+            {
+                "user_id": "user-2",
+                "vibe_preferences": ["chill"],
+                "cuisine_preferences": [],
+                "exploration_style": "moderate",
+                "social_preference": None,
+                "price_tier": None,
+            }
+        ]
+
+        response = client.get("/api/taste/dna/user-2")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["stale"] is True
+        assert len(data["traits"]) == 4
+        mock_precompute.regenerate.assert_called_once_with("user-2")
+
+    def test_profile_title_expired_is_served_stale(
+        self, client: TestClient, mock_supabase: MagicMock, mock_precompute: MagicMock
+    ) -> None:
+        """An expired AI title is returned as stale instead of blocking on the LLM."""
+        declared = MagicMock(data=[{
+            "user_id": "user-3",
+            "vibe_preferences": ["trendy"],
+            "cuisine_preferences": [],
+            "exploration_style": "adventurous",
+            "social_preference": None,
+            "price_tier": None,
+        }])
+        expired = MagicMock(data=[{
+            "title": "Night Owl",
+            "tagline": "Always out late",
+            "expires_at": "2020-01-01T00:00:00+00:00",
+        }])
+        table = mock_supabase.table.return_value
+        table.select.return_value.in_.return_value.execute.return_value = declared
+        table.select.return_value.eq.return_value.execute.return_value = expired
+
+        response = client.get("/api/taste/profile/user-3")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["title"] == "Night Owl"
+        assert data["stale"] is True
+        mock_precompute.regenerate.assert_called_once_with("user-3")
+
+
+class TestDailyContentCache:
+    """Test suite for serving today's content from the in-process cache."""
+
+    def test_repeat_insight_views_skip_the_database_until_cleared(
+        self, client: TestClient, mock_supabase: MagicMock
+    ) -> None:
+        """Today's insights are read once; the cache endpoint forces a re-read."""
+        table = mock_supabase.table.return_value
+        todays = table.select.return_value.eq.return_value.eq.return_value.execute
+        todays.return_value.data = [
+            {
+                "id": "insight-1",
+                "insight_type": "streak",
+                "title": "Coffee Streak!",
+                "body": "5 days straight",
+                "emoji": "🔥",
+                "created_at": "2026-10-18T04:00:00+00:00",
+            }
+        ]
+        table.delete.return_value.eq.return_value.execute.return_value.data = []
+
+        first = client.get("/api/taste/insights/user-1?tz=America/New_York")
+        second = client.get("/api/taste/insights/user-1?tz=America/New_York")
+
+        assert first.json() == second.json()
+        assert second.json()["insights"][0]["title"] == "Coffee Streak!"
+        assert todays.call_count == 1
+
+        client.delete("/api/taste/insights/user-1/cache")
+        client.get("/api/taste/insights/user-1")
+        assert todays.call_count == 2
+
+    def test_unexpired_profile_title_is_cached(
+        self, client: TestClient, mock_supabase: MagicMock
+    ) -> None:
+        """A valid AI title is read from daily_profile_titles only once."""
+        table = mock_supabase.table.return_value
+        table.select.return_value.in_.return_value.execute.return_value.data = [{
+            "user_id": "user-4",
+            "vibe_preferences": ["chill"],
+            "cuisine_preferences": [],
+            "exploration_style": "moderate",
+            "social_preference": None,
+            "price_tier": None,
+        }]
+        titles = table.select.return_value.eq.return_value.execute
+        titles.return_value.data = [{
+            "title": "Night Owl",
+            "tagline": "Always out late",
+            "expires_at": "2099-01-01T00:00:00+00:00",
+        }]
+
+        client.get("/api/taste/profile/user-4")
+        response = client.get("/api/taste/profile/user-4")
+
+        assert response.json()["title"] == "Night Owl"
+        assert response.json()["stale"] is False
+        assert titles.call_count == 1
+
+
+def parse_sse(body: str) -> list[tuple[str, dict]]:
+    """Split a text/event-stream body into (event, data) pairs."""
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+class TestStreamInsights:
+    """Test suite for the streaming insights endpoint."""
+
+    def test_streams_each_insight_then_bulk_stores(
+        self, client: TestClient, mock_supabase: MagicMock
+    ) -> None:
+        """Insights arrive as separate events; storage is one upsert at the end."""
+        table = mock_supabase.table.return_value
+        table.select.return_value.eq.return_value.eq.return_value.execute.return_value.data = []
+        table.select.return_value.in_.return_value.execute.return_value.data = [
+            {"user_id": "user-1", "total_transactions": 30, "categories": {}}
+        ]
+        table.upsert.return_value.execute.return_value.data = [
+            {
+                "id": f"insight-{i}",
+                "insight_type": kind,
+                "title": title,
+                "body": "Body",
+                "emoji": "🔥",
+                "created_at": "2026-10-18T08:00:00+00:00",
+            }
+            for i, (kind, title) in enumerate(
+                [("streak", "Coffee Streak!"), ("pattern", "Early Bird")]
+            )
+        ]
+        generated = InsightsResponse(insights=[
+            Insight(type="streak", title="Coffee Streak!", body="Body", emoji="🔥"),
+            Insight(type="pattern", title="Early Bird", body="Body", emoji="🔥"),
+        ])
+        backend = FakeLLMBackend(
+            [fake_response(text=generated.model_dump_json())], stream_chunk_size=7
+        )
+        app.dependency_overrides[get_insight_generator] = lambda: InsightGenerator(
+            gateway=LLMGateway(backend)
+        )
+
+        response = client.get("/api/taste/insights/user-1/stream")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        events = parse_sse(response.text)
+        assert [e for e, _ in events] == ["insight", "insight", "done"]
+        assert events[0][1]["title"] == "Coffee Streak!"
+        assert [i["id"] for i in events[2][1]["insights"]] == ["insight-0", "insight-1"]
+        rows = table.upsert.call_args[0][0]
+        assert [row["insight_type"] for row in rows] == ["streak", "pattern"]
+        assert table.upsert.call_count == 1
+        assert not table.insert.called
+
+    def test_existing_insights_are_streamed_without_generating(
+        self, client: TestClient, mock_supabase: MagicMock
+    ) -> None:
+        """Today's stored insights are sent straight away."""
+        table = mock_supabase.table.return_value
+        table.select.return_value.eq.return_value.eq.return_value.execute.return_value.data = [
+            {
+                "id": "insight-1",
+                "insight_type": "streak",
+                "title": "Coffee Streak!",
+                "body": "Body",
+                "emoji": "🔥",
+                "created_at": "2026-10-18T08:00:00+00:00",
+            }
+        ]
+        backend = FakeLLMBackend([])
+        app.dependency_overrides[get_insight_generator] = lambda: InsightGenerator(
+            gateway=LLMGateway(backend)
+        )
+
+        events = parse_sse(client.get("/api/taste/insights/user-1/stream").text)
+
+        assert [e for e, _ in events] == ["insight", "done"]
+        assert events[0][1]["id"] == "insight-1"
+        assert backend.calls == []
+
+    def test_generation_failure_sends_error_and_stores_nothing(
+        self, client: TestClient, mock_supabase: MagicMock
+    ) -> None:
+        """A failed stream with no rule-based fallback ends with an error event."""
+        table = mock_supabase.table.return_value
+        table.select.return_value.eq.return_value.eq.return_value.execute.return_value.data = []
+        table.select.return_value.in_.return_value.execute.return_value.data = [
+            {"user_id": "user-1", "total_transactions": 3}
+        ]
+        backend = FakeLLMBackend([RuntimeError("bad request")])
+        app.dependency_overrides[get_insight_generator] = lambda: InsightGenerator(
+            gateway=LLMGateway(backend)
+        )
+
+        events = parse_sse(client.get("/api/taste/insights/user-1/stream").text)
+
+        assert [e for e, _ in events] == ["error"]
+        assert not table.upsert.called
+
+    def test_generation_failure_falls_back_to_rule_based_insights(
+        self, client: TestClient, mock_supabase: MagicMock
+    ) -> None:
+        """Insights derived from the aggregates are streamed, marked stale and not stored."""
+        table = mock_supabase.table.return_value
+        table.select.return_value.eq.return_value.eq.return_value.execute.return_value.data = []
+        table.select.return_value.in_.return_value.execute.return_value.data = [{
+            "user_id": "user-1",
+            "total_transactions": 30,
+            "streaks": {"coffee": {"current": 5, "longest": 9}},
+        }]
+        backend = FakeLLMBackend([RuntimeError("overloaded")])
+        app.dependency_overrides[get_insight_generator] = lambda: InsightGenerator(
+            gateway=LLMGateway(backend)
+        )
+
+        events = parse_sse(client.get("/api/taste/insights/user-1/stream").text)
+
+        assert [e for e, _ in events] == ["insight", "insight", "done"]
+        assert events[0][1]["title"] == "Coffee Streak!"
+        assert events[2][1]["stale"] is True
+        assert not table.upsert.called
+
+
+FUSED_ROW = {
+    "user_id": "user-1",
+    "categories": [
+        {"name": "coffee", "percentage": 100, "color": "#F59E0B", "count": 20, "total_spend": 100.0}
+    ],
+    "vibes": ["chill"],
+    "top_cuisines": [],
+    "exploration_ratio": 0.5,
+    "confidence": 0.4,
+    "quiz_weight": 0.6,
+    "tx_weight": 0.4,
+    "mismatches": [],
+    "profile_title": "Coffee Explorer",
+    "profile_tagline": "Always finding new spots",
+    "input_version": "abc123",
+}
+
+
+class TestGetFusedTaste:
+    """Test suite for the stored fused taste endpoint."""
+
+    def test_serves_stored_row_with_etag_and_never_writes(
+        self, client: TestClient, mock_supabase: MagicMock
+    ) -> None:
+        """A stored fused taste is returned as-is; the GET doesn't upsert."""
+        table = mock_supabase.table.return_value
+        table.select.return_value.in_.return_value.execute.return_value.data = [FUSED_ROW]
+
+        response = client.get("/api/taste/fused/user-1")
+
+        assert response.status_code == 200
+        assert response.headers["etag"] == '"abc123"'
+        assert response.json()["profile_title"] == "Coffee Explorer"
+        assert response.json()["categories"][0]["name"] == "coffee"
+        assert not table.upsert.called
+
+    def test_matching_if_none_match_returns_304(
+        self, client: TestClient, mock_supabase: MagicMock
+    ) -> None:
+        """An unchanged profile isn't resent."""
+        table = mock_supabase.table.return_value
+        table.select.return_value.in_.return_value.execute.return_value.data = [FUSED_ROW]
+
+        response = client.get("/api/taste/fused/user-1", headers={"If-None-Match": '"abc123"'})
+
+        assert response.status_code == 304
+        assert response.content == b""
+
+    def test_missing_row_is_backfilled_once(
+        self, client: TestClient, mock_supabase: MagicMock
+    ) -> None:
+        """Concurrent first reads share one background refresh."""
+        fused_taste_service._refreshing.clear()
+        with patch.object(fused_taste_service.FusedTasteService, "refresh_claimed") as refresh:
+            table = mock_supabase.table.return_value
+            table.select.return_value.in_.return_value.execute.return_value.data = []
+
+            first = client.get("/api/taste/fused/user-1")
+            client.get("/api/taste/fused/user-1")
+
+        assert first.status_code == 200
+        assert first.headers["etag"]
+        refresh.assert_called_once_with("user-1")
+        assert not table.upsert.called
+        fused_taste_service._refreshing.clear()
+
+
+def make_bundle_supabase(rows: dict[str, list[dict]]) -> MagicMock:
+    """Supabase mock whose tables return fixed rows for any filter chain."""
+    tables: dict[str, MagicMock] = {}
+
+    def table(name: str) -> MagicMock:
+        mock = MagicMock()
+        query = mock.select.return_value.eq.return_value
+        query.execute.return_value.data = rows.get(name, [])
+        mock.select.return_value.in_.return_value.execute.return_value.data = rows.get(name, [])
+        latest = query.lte.return_value.order.return_value.limit.return_value
+        latest.execute.return_value.data = rows.get(name, [])
+        tables.setdefault(name, []).append(mock)
+        return mock
+
+    supabase = MagicMock()
+    supabase.table.side_effect = table
+    supabase.tables = tables
+    return supabase
+
+
+BUNDLE_ROWS = {
+    "declared_taste": [{
+        "user_id": "user-1",
+        "vibe_preferences": ["chill"],
+        "cuisine_preferences": [],
+        "exploration_style": "adventurous",
+        "social_preference": None,
+        "price_tier": None,
+    }],
+    "user_analysis": [{
+        "user_id": "user-1",
+        "total_transactions": 20,
+        "categories": {"coffee": {"count": 15, "total_spend": 80.0, "merchants": ["Blue Bottle"]},
+                       "dining": {"count": 5, "total_spend": 120.0, "merchants": []}},
+        "top_merchants": [],
+    }],
+    "fused_taste": [FUSED_ROW],
+    "daily_profile_titles": [
+        {"title": "Night Owl", "tagline": "Out late", "expires_at": "2999-01-01T00:00:00+00:00"}
+    ],
+    "daily_insights": [{
+        "id": "insight-1",
+        "insight_type": "streak",
+        "title": "Coffee Streak!",
+        "body": "5 days",
+        "emoji": "🔥",
+        "shown_at": "2020-01-01",
+        "created_at": "2020-01-01T04:00:00+00:00",
+    }],
+}
+
+
+class TestTasteBundle:
+    """Test suite for the one-round-trip taste bundle."""
+
+    def test_all_sections_read_each_table_once(self, mock_precompute: MagicMock) -> None:
+        """Every section is built from one read per source table."""
+        supabase = make_bundle_supabase(BUNDLE_ROWS)
+        app.dependency_overrides[get_supabase_client] = lambda: supabase
+
+        response = TestClient(app).get("/api/taste/bundle/user-1")
+        app.dependency_overrides.clear()
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["profile"]["title"] == "Night Owl"
+        assert data["observed"]["total_transactions"] == 20
+        assert data["fused"]["profile_title"] == "Coffee Explorer"
+        assert data["ring"]["segments"][0]["category"] == "coffee"
+        # Yesterday's insights are served stale; DNA falls back to the quiz
+        assert data["insights"]["stale"] is True
+        assert data["insights"]["insights"][0]["title"] == "Coffee Streak!"
+        assert data["dna"]["stale"] is True
+        assert len(data["dna"]["traits"]) == 4
+        # The one profiles access is the activity stamp, a write
+        (profiles,) = supabase.tables.pop("profiles")
+        assert "last_active_at" in profiles.update.call_args[0][0]
+        assert {name: len(reads) for name, reads in supabase.tables.items()} == {
+            name: 1
+            for name in ("declared_taste", "user_analysis", "fused_taste",
+                         "daily_profile_titles", "daily_insights", "daily_dna")
+        }
+        mock_precompute.regenerate.assert_called_once_with("user-1")
+
+    def test_sections_parameter_limits_reads(self, mock_precompute: MagicMock) -> None:
+        """Only the tables the selected sections need are read."""
+        supabase = make_bundle_supabase(BUNDLE_ROWS)
+        app.dependency_overrides[get_supabase_client] = lambda: supabase
+
+        response = TestClient(app).get("/api/taste/bundle/user-1?sections=observed,ring")
+        app.dependency_overrides.clear()
+
+        data = response.json()
+        assert data["observed"] is not None
+        assert data["ring"] is not None
+        assert data["profile"] is None and data["insights"] is None
+        assert set(supabase.tables) == {"declared_taste", "user_analysis", "profiles"}
+
+    def test_unknown_section_is_rejected(self, client: TestClient) -> None:
+        """Typos in sections= are a 400, not silently empty."""
+        response = client.get("/api/taste/bundle/user-1?sections=observed,rings")
+
+        assert response.status_code == 400
+        assert "rings" in response.json()["detail"]
+
+    def test_repeat_bundle_skips_cached_daily_tables(self, mock_precompute: MagicMock) -> None:
+        """Today's cached content isn't read again by the next bundle."""
+        supabase = make_bundle_supabase(BUNDLE_ROWS)
+        app.dependency_overrides[get_supabase_client] = lambda: supabase
+
+        client = TestClient(app)
+        client.get("/api/taste/bundle/user-1?sections=profile,insights")
+        response = client.get("/api/taste/bundle/user-1?sections=profile,insights")
+        app.dependency_overrides.clear()
+
+        assert response.json()["profile"]["title"] == "Night Owl"
+        # The title is today's and cached; yesterday's insights are re-read
+        assert len(supabase.tables["daily_profile_titles"]) == 1
+        assert len(supabase.tables["daily_insights"]) == 2
@@ -5,6 +5,7 @@ TDD: Write tests first, then implement.
 
 from __future__ import annotations
 
+from datetime import datetime, timedelta, timezone
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -210,13 +211,358 @@ class TestGetVaultVisits:
         assert place["photo_url"] is None
 
 
+class TestVaultSummary:
+    """Test suite for serving the materialized vault summary."""
+
+    @staticmethod
+    def _summary(tz: str = "UTC") -> dict:
+        from datetime import datetime
+
+        from app.services.vault_summary_service import get_month_key
+
+        return {
+            "places": [
+                {
+                    "place_key": "venue-1",
+                    "venue_id": "venue-1",
+                    "venue_name": "Blue Bottle Coffee",
+                    "venue_type": "coffee",
+                    "google_place_id": "ChIJ_bluebottle",
+                    "photo_references": ["ref1"],
+                    "visit_count": 3,
+                    "last_visit": "2025-12-29T10:00:00Z",
+                    "total_spent": 21.0,
+                    "reaction": "loved",
+                }
+            ],
+            "month_stats": {
+                get_month_key(datetime.now()): {
+                    "total_places": 1,
+                    "total_visits": 3,
+                    "spent": 21.0,
+                }
+            },
+            "tz": tz,
+        }
+
+    def test_serves_stored_summary_without_visits(
+        self, client: TestClient, mock_supabase: MagicMock
+    ) -> None:
+        """The default vault open should be served from the summary row alone."""
+        summaries = MagicMock()
+        summaries.select.return_value.eq.return_value.execute.return_value = MagicMock(
+            data=[self._summary()]
+        )
+        place_visits = MagicMock()
+        tables = {"vault_summaries": summaries, "place_visits": place_visits}
+        mock_supabase.table.side_effect = lambda name: tables.get(name, MagicMock())
+
+        with patch("app.routers.vault.PlaidService"):
+            response = client.get("/api/vault/visits/test-user-123")
+
+        assert response.status_code == 200
+        data = response.json()
+        place = data["places"][0]
+        assert place["place_key"] == "venue-1"
+        assert place["visit_count"] == 3
+        assert place["total_spent"] == 21.0
+        assert place["reaction"] == "loved"
+        assert place["visits"] == []
+        assert "/api/discover/photo/ChIJ_bluebottle/0" in place["photo_url"]
+        assert data["stats"]["total_visits"] == 3
+        place_visits.select.assert_not_called()
+        summaries.upsert.assert_not_called()
+
+    def test_rebuilds_summary_when_timezone_changes(
+        self, client: TestClient, mock_supabase: MagicMock
+    ) -> None:
+        """A summary built for another timezone should be rebuilt and stored."""
+        summaries = MagicMock()
+        summaries.select.return_value.eq.return_value.execute.return_value = MagicMock(
+            data=[self._summary(tz="America/New_York")]
+        )
+        place_visits = MagicMock()
+        visits_query = place_visits.select.return_value.eq.return_value.order.return_value
+        visits_query.execute.return_value = MagicMock(data=[])
+        tables = {"vault_summaries": summaries, "place_visits": place_visits}
+        mock_supabase.table.side_effect = lambda name: tables.get(name, MagicMock())
+
+        with patch("app.routers.vault.PlaidService"):
+            response = client.get("/api/vault/visits/test-user-123?tz=Europe/London")
+
+        assert response.status_code == 200
+        assert response.json()["places"] == []
+        stored = summaries.upsert.call_args[0][0]
+        assert stored["tz"] == "Europe/London"
+
+
+class TestGetPlacesPage:
+    """Test suite for GET /api/vault/places/{user_id} endpoint."""
+
+    @staticmethod
+    def _place(place_key: str, last_visit: str) -> dict:
+        return {
+            "place_key": place_key,
+            "venue_id": place_key,
+            "venue_name": f"Place {place_key}",
+            "venue_type": "coffee",
+            "google_place_id": f"ChIJ_{place_key}",
+            "photo_reference": "ref1",
+            "visit_count": 2,
+            "total_spent": "11.50",
+            "last_visit": last_visit,
+            "reaction": None,
+        }
+
+    def test_first_page_includes_stats_and_cursor(
+        self, client: TestClient, mock_supabase: MagicMock
+    ) -> None:
+        """First page should return stats and a cursor when more places exist."""
+
+        def rpc(name: str, params: dict) -> MagicMock:
+            if name == "vault_places_page":
+                assert params["p_limit"] == 3  # limit + 1
+                assert params["p_cursor_last_visit"] is None
+                data = [
+                    self._place("venue-3", "2025-12-29T10:00:00+00:00"),
+                    self._place("venue-2", "2025-12-20T10:00:00+00:00"),
+                    self._place("venue-1", "2025-12-10T10:00:00+00:00"),
+                ]
+            else:
+                assert name == "vault_month_stats"
+                assert params["p_tz"] == "America/New_York"
+                data = [{"total_places": 2, "total_visits": 5, "spent": "30.25"}]
+            call = MagicMock()
+            call.execute.return_value = MagicMock(data=data)
+            return call
+
+        mock_supabase.rpc.side_effect = rpc
+
+        response = client.get(
+            "/api/vault/places/test-user-123?limit=2&tz=America/New_York"
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert [p["place_key"] for p in data["places"]] == ["venue-3", "venue-2"]
+        assert data["places"][0]["total_spent"] == 11.5
+        assert "/api/discover/photo/ChIJ_venue-3/0" in data["places"][0]["photo_url"]
+        assert data["stats"] == {
+            "total_places": 2,
+            "total_visits": 5,
+            "this_month_spent": 30.25,
+        }
+        assert data["has_more"] is True
+
+        # The cursor resumes after the last place on this page
+        from app.routers.vault import _decode_cursor
+
+        assert _decode_cursor(data["next_cursor"], 2) == [
+            "2025-12-20T10:00:00+00:00",
+            "venue-2",
+        ]
+
+    def test_next_page_uses_cursor_and_skips_stats(
+        self, client: TestClient, mock_supabase: MagicMock
+    ) -> None:
+        """Later pages pass the keyset cursor to Postgres and omit stats."""
+        from app.routers.vault import _encode_cursor
+
+        mock_supabase.rpc.return_value.execute.return_value = MagicMock(
+            data=[self._place("venue-1", "2025-12-10T10:00:00+00:00")]
+        )
+
+        cursor = _encode_cursor("2025-12-20T10:00:00+00:00", "venue-2")
+        response = client.get(f"/api/vault/places/test-user-123?limit=2&cursor={cursor}")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["stats"] is None
+        assert data["has_more"] is False
+        assert data["next_cursor"] is None
+        name, params = mock_supabase.rpc.call_args[0]
+        assert name == "vault_places_page"
+        assert params["p_cursor_last_visit"] == "2025-12-20T10:00:00+00:00"
+        assert params["p_cursor_place_key"] == "venue-2"
+
+    def test_rejects_malformed_cursor(self, client: TestClient) -> None:
+        """A cursor that wasn't issued by the API should be a 400."""
+        response = client.get("/api/vault/places/test-user-123?cursor=not-a-cursor")
+
+        assert response.status_code == 400
+
+    def test_place_visits_are_loaded_per_place(
+        self, client: TestClient, mock_supabase: MagicMock
+    ) -> None:
+        """Visit history is fetched lazily for a single place."""
+        mock_supabase.rpc.return_value.execute.return_value = MagicMock(
+            data=[
+                {
+                    "id": "visit-2",
+                    "venue_id": None,
+                    "venue_name": "Corner Deli",
+                    "venue_type": None,
+                    "visited_at": "2025-12-29T10:00:00+00:00",
+                    "amount": "9.00",
+                    "reaction": "loved",
+                    "notes": None,
+                    "source": "transaction",
+                }
+            ]
+        )
+
+        response = client.get(
+            "/api/vault/places/test-user-123/visits?place_key=Corner%20Deli"
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["visits"][0]["venue_name"] == "Corner Deli"
+        assert data["visits"][0]["amount"] == 9.0
+        assert data["has_more"] is False
+        name, params = mock_supabase.rpc.call_args[0]
+        assert name == "vault_place_visits"
+        assert params["p_place_key"] == "Corner Deli"
+
+
+class TestGetVaultChanges:
+    """Test suite for GET /api/vault/changes/{user_id} endpoint."""
+
+    @staticmethod
+    def _tables(changed: list[dict], deleted: list[dict]) -> dict[str, MagicMock]:
+        place_visits = MagicMock()
+        query = place_visits.select.return_value.eq.return_value
+        for filtered in (query, query.gt.return_value):
+            filtered.order.return_value.execute.return_value = MagicMock(data=changed)
+            filtered.order.return_value.limit.return_value.execute.return_value = MagicMock(
+                data=changed
+            )
+        tombstones = MagicMock()
+        tombstones_query = tombstones.select.return_value.eq.return_value.gt.return_value
+        tombstones_query.execute.return_value = MagicMock(data=deleted)
+        return {"place_visits": place_visits, "place_visit_tombstones": tombstones}
+
+    def test_returns_changes_since_token(
+        self, client: TestClient, mock_supabase: MagicMock
+    ) -> None:
+        """Only visits changed after the token (minus overlap) are returned."""
+        from app.routers.vault import _decode_cursor, _encode_cursor
+
+        tables = self._tables(
+            changed=[
+                {
+                    "id": "visit-1",
+                    "venue_id": "venue-1",
+                    "merchant_name": "Starbucks",
+                    "amount": 5.5,
+                    "visited_at": "2025-12-29T10:00:00+00:00",
+                    "reaction": "loved",
+                    "notes": None,
+                    "source": "transaction",
+                    "updated_at": "2025-12-30T10:00:00+00:00",
+                    "venues": {"name": "Starbucks Reserve", "taste_cluster": "coffee"},
+                }
+            ],
+            deleted=[{"visit_id": "visit-9"}],
+        )
+        mock_supabase.table.side_effect = lambda name: tables[name]
+        mock_supabase.rpc.return_value.execute.return_value = MagicMock(
+            data=[{"total_places": 1, "total_visits": 1, "spent": 5.5}]
+        )
+
+        token_at = datetime.now(timezone.utc) - timedelta(hours=1)
+        since = _encode_cursor(token_at.isoformat())
+        response = client.get(f"/api/vault/changes/test-user-123?since={since}")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["upserted"][0]["venue_name"] == "Starbucks Reserve"
+        assert data["upserted"][0]["reaction"] == "loved"
+        assert data["deleted"] == ["visit-9"]
+        assert data["stats"]["total_visits"] == 1
+        assert data["resync"] is False
+        assert _decode_cursor(data["next_token"], 1)[0] > token_at.isoformat()
+
+        gt_call = tables["place_visits"].select.return_value.eq.return_value.gt.call_args[0]
+        assert gt_call == ("updated_at", (token_at - timedelta(seconds=30)).isoformat())
+
+    def test_bootstrap_without_token_returns_all_visits(
+        self, client: TestClient, mock_supabase: MagicMock
+    ) -> None:
+        """Without a token every visit is returned and no tombstones are read."""
+        tables = self._tables(changed=[], deleted=[])
+        mock_supabase.table.side_effect = lambda name: tables[name]
+        mock_supabase.rpc.return_value.execute.return_value = MagicMock(data=[])
+
+        response = client.get("/api/vault/changes/test-user-123")
+
+        assert response.status_code == 200
+        assert response.json()["deleted"] == []
+        assert response.json()["resync"] is True
+        tables["place_visits"].select.return_value.eq.return_value.gt.assert_not_called()
+        tables["place_visit_tombstones"].select.assert_not_called()
+
+    def test_bootstrap_is_paged_and_keeps_its_start_token(
+        self, client: TestClient, mock_supabase: MagicMock
+    ) -> None:
+        """Snapshot pages are keyed by visit id and share one sync token."""
+        from app.routers.vault import _decode_cursor
+
+        visits = [
+            {"id": f"visit-{i}", "merchant_name": "Deli", "visited_at": "2025-12-29T10:00:00+00:00"}
+            for i in range(3)
+        ]
+        tables = self._tables(changed=visits, deleted=[])
+        mock_supabase.table.side_effect = lambda name: tables[name]
+        mock_supabase.rpc.return_value.execute.return_value = MagicMock(data=[])
+
+        first = client.get("/api/vault/changes/test-user-123?limit=2").json()
+
+        assert [v["id"] for v in first["upserted"]] == ["visit-0", "visit-1"]
+        assert first["has_more"] is True
+        snapshot_at, after_id = _decode_cursor(first["next_cursor"], 2)
+        assert after_id == "visit-1"
+        assert _decode_cursor(first["next_token"], 1) == [snapshot_at]
+
+        after = tables["place_visits"].select.return_value.eq.return_value.gt.return_value
+        after.order.return_value.limit.return_value.execute.return_value = MagicMock(
+            data=visits[2:]
+        )
+        second = client.get(
+            f"/api/vault/changes/test-user-123?limit=2&cursor={first['next_cursor']}"
+        ).json()
+
+        assert [v["id"] for v in second["upserted"]] == ["visit-2"]
+        assert second["has_more"] is False and second["next_cursor"] is None
+        assert second["next_token"] == first["next_token"]
+        gt_call = tables["place_visits"].select.return_value.eq.return_value.gt.call_args[0]
+        assert gt_call == ("id", "visit-1")
+
+    def test_token_past_tombstone_retention_forces_resync(
+        self, client: TestClient, mock_supabase: MagicMock
+    ) -> None:
+        """Deletes older tokens depend on may be pruned, so they get a snapshot."""
+        from app.routers.vault import _encode_cursor
+
+        tables = self._tables(changed=[], deleted=[{"visit_id": "visit-9"}])
+        mock_supabase.table.side_effect = lambda name: tables[name]
+        mock_supabase.rpc.return_value.execute.return_value = MagicMock(data=[])
+
+        since = _encode_cursor((datetime.now(timezone.utc) - timedelta(days=31)).isoformat())
+        response = client.get(f"/api/vault/changes/test-user-123?since={since}")
+
+        assert response.json()["resync"] is True
+        assert response.json()["deleted"] == []
+        tables["place_visit_tombstones"].select.assert_not_called()
+
+
 class TestVaultAutoSync:
     """Test suite for auto-sync functionality on vault load."""
 
     def test_calls_create_place_visits_on_load(
         self, client: TestClient, mock_supabase: MagicMock
     ) -> None:
-        """Should call PlaidService._create_place_visits on vault load."""
+        """Should call PlaidService._create_place_visits in the background on vault load."""
         # Mock empty result
         mock_supabase.table.return_value.select.return_value.eq.return_value.order.return_value.execute.return_value = MagicMock(
             data=[]
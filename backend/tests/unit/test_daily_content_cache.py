@@ -0,0 +1,80 @@
+"""Unit tests for the daily content cache."""
+
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta, timezone
+from unittest.mock import patch
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from app.services.daily_content_cache import (
+    expires_at,
+    get_daily_content,
+    invalidate_daily_content,
+    set_daily_content,
+)
+
+TODAY = date.today()
+
+
+class TestExpiresAt:
+    """Tests for expires_at()."""
+
+    @pytest.mark.unit
+    def test_expires_at_users_local_midnight(self) -> None:
+        """Content expires when the user's day ends, not the server's."""
+        tz = ZoneInfo("America/Los_Angeles")
+        now = datetime(2026, 10, 18, 15, 30, tzinfo=tz)
+
+        expiry = expires_at(date(2026, 10, 19), "America/Los_Angeles", now=now)
+
+        assert expiry == datetime(2026, 10, 19, tzinfo=tz).timestamp()
+
+    @pytest.mark.unit
+    def test_never_outlives_the_content_day(self) -> None:
+        """A user ahead of the server still drops the entry when its day ends."""
+        now = datetime(2026, 10, 18, 23, 0, tzinfo=timezone.utc)
+
+        expiry = expires_at(date(2026, 10, 18), "Pacific/Kiritimati", now=now)
+
+        assert expiry == datetime(2026, 10, 19).timestamp()
+
+    @pytest.mark.unit
+    def test_invalid_timezone_falls_back_to_utc(self) -> None:
+        """An unknown tz behaves like UTC."""
+        now = datetime(2026, 10, 18, 12, 0, tzinfo=timezone.utc)
+
+        assert expires_at(date(2026, 10, 20), "Mars/Olympus", now=now) == expires_at(
+            date(2026, 10, 20), "UTC", now=now
+        )
+
+
+class TestDailyContent:
+    """Tests for caching and invalidating daily content."""
+
+    @pytest.mark.unit
+    def test_set_get_and_invalidate(self) -> None:
+        """Entries are per kind and user; invalidation drops only that kind."""
+        rows = [{"id": "insight-1"}]
+        set_daily_content("insights", "user-1", TODAY, rows, "Europe/London")
+        set_daily_content("dna", "user-1", TODAY, [{"id": "trait-1"}])
+
+        assert get_daily_content("insights", "user-1", TODAY) == rows
+        assert get_daily_content("insights", "user-2", TODAY) is None
+        assert get_daily_content("insights", "user-1", TODAY - timedelta(days=1)) is None
+
+        invalidate_daily_content("insights", "user-1")
+
+        assert get_daily_content("insights", "user-1", TODAY) is None
+        assert get_daily_content("dna", "user-1", TODAY) is not None
+
+    @pytest.mark.unit
+    def test_title_expires_with_its_row(self) -> None:
+        """A title's own expiry wins when it is earlier than midnight."""
+        until = datetime.now(timezone.utc) + timedelta(seconds=30)
+        set_daily_content("title", "user-1", TODAY, {"title": "Night Owl"}, until=until)
+
+        assert get_daily_content("title", "user-1", TODAY) == {"title": "Night Owl"}
+        with patch("app.services.ttl_cache.time.time", return_value=until.timestamp() + 1):
+            assert get_daily_content("title", "user-1", TODAY) is None
@@ -0,0 +1,94 @@
+"""Unit tests for FusedTasteService (fused taste computed on write)."""
+
+from __future__ import annotations
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.services.fused_taste_service import FusedTasteService, claim_refresh, input_version
+
+DECLARED = {
+    "user_id": "user-1",
+    "vibe_preferences": ["chill"],
+    "cuisine_preferences": [],
+    "exploration_style": "adventurous",
+    "social_preference": None,
+    "price_tier": None,
+    "updated_at": "2026-10-18T08:00:00+00:00",
+}
+OBSERVED = {
+    "user_id": "user-1",
+    "total_transactions": 20,
+    "categories": {"coffee": {"count": 20, "total_spend": 100.0, "merchants": ["Blue Bottle"]}},
+    "top_cuisines": ["thai"],
+    "version": 3,
+    "last_updated_at": "2026-10-18T09:00:00",
+}
+
+
+def make_supabase(tables: dict[str, MagicMock], rows: dict[str, list[dict]]) -> MagicMock:
+    """Build a Supabase mock with one MagicMock per table."""
+    for name in ("declared_taste", "user_analysis", "fused_taste"):
+        table = MagicMock()
+        table.select.return_value.eq.return_value.execute.return_value.data = rows.get(name, [])
+        tables[name] = table
+    supabase = MagicMock()
+    supabase.table.side_effect = lambda name: tables[name]
+    return supabase
+
+
+class TestFusedTasteService:
+    """Tests for FusedTasteService."""
+
+    @pytest.mark.unit
+    def test_refresh_fuses_and_stores_everything_the_endpoint_serves(self) -> None:
+        """One upsert holds the fused result, title and input version."""
+        tables: dict[str, MagicMock] = {}
+        supabase = make_supabase(
+            tables, {"declared_taste": [DECLARED], "user_analysis": [OBSERVED]}
+        )
+
+        row = FusedTasteService(supabase).refresh("user-1")
+
+        stored = tables["fused_taste"].upsert.call_args[0][0]
+        assert stored == row
+        assert stored["categories"][0]["name"] == "Coffee"
+        assert stored["top_cuisines"] == ["thai"]
+        assert stored["profile_title"]
+        assert stored["input_version"] == input_version(DECLARED, OBSERVED)
+
+    @pytest.mark.unit
+    def test_input_version_changes_with_either_input(self) -> None:
+        """Re-aggregation or a new quiz answer changes the version."""
+        base = input_version(DECLARED, OBSERVED)
+
+        assert input_version(DECLARED, OBSERVED) == base
+        assert input_version(DECLARED, {**OBSERVED, "version": 4}) != base
+        assert (
+            input_version({**DECLARED, "updated_at": "2026-10-19T00:00:00+00:00"}, OBSERVED) != base
+        )
+
+    @pytest.mark.unit
+    def test_get_ignores_rows_without_input_version(self) -> None:
+        """Rows stored before compute-on-write count as missing."""
+        tables: dict[str, MagicMock] = {}
+        supabase = make_supabase(tables, {"fused_taste": [{"user_id": "user-1", "categories": []}]})
+
+        assert FusedTasteService(supabase).get("user-1") is None
+
+    @pytest.mark.unit
+    def test_refresh_claim_is_deduplicated_until_it_finishes(self) -> None:
+        """Only one background build per user is pending at a time."""
+        tables: dict[str, MagicMock] = {}
+        supabase = make_supabase(tables, {"declared_taste": [DECLARED]})
+        service = FusedTasteService(supabase)
+
+        assert claim_refresh("user-9")
+        assert not claim_refresh("user-9")
+
+        service.refresh_claimed("user-9")
+
+        assert tables["fused_taste"].upsert.call_count == 1
+        assert claim_refresh("user-9")
+        service.refresh_claimed("user-9")
@@ -0,0 +1,225 @@
+"""Unit tests for GooglePlacesService caching.
+
+These tests mock the Supabase client and the Places API request.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.services.google_places_service import (
+    DETAIL_FIELDS,
+    VOLATILE_FIELDS,
+    GooglePlacesService,
+    PlaceDetails,
+    clear_details_memory,
+    clear_lookup_memory,
+    get_lookup_cache_stats,
+)
+
+
+@pytest.fixture(autouse=True)
+def clear_memory_tier():
+    """Start every test with empty in-process caches."""
+    clear_lookup_memory()
+    clear_details_memory()
+    yield
+    clear_lookup_memory()
+    clear_details_memory()
+
+
+def _cache_row(name: str, place_id: str | None, age: timedelta, lat=None, lng=None) -> dict:
+    return {
+        "merchant_name_normalized": name,
+        "search_lat": lat,
+        "search_lng": lng,
+        "google_place_id": place_id,
+        "matched_name": name.title() if place_id else None,
+        "formatted_address": None,
+        "lat": None,
+        "lng": None,
+        "refreshed_at": (datetime.now(timezone.utc) - age).isoformat(),
+    }
+
+
+def _search_response(place_id: str, name: str) -> dict:
+    return {"places": [{"id": place_id, "displayName": {"text": name}}]}
+
+
+class TestFindPlace:
+    """Tests for GooglePlacesService.find_place()."""
+
+    @pytest.mark.unit
+    def test_memory_tier_is_shared_across_instances(self) -> None:
+        """A lookup cached by one instance is served from memory to the next."""
+        mock_supabase = MagicMock()
+        query = mock_supabase.table.return_value.select.return_value.eq.return_value
+        query.is_.return_value.is_.return_value.execute.return_value.data = [
+            _cache_row("blue bottle", "place-1", timedelta(days=1))
+        ]
+
+        first = GooglePlacesService(mock_supabase).find_place("Blue Bottle")
+        second = GooglePlacesService(mock_supabase).find_place("  BLUE BOTTLE")
+
+        assert first.place_id == second.place_id == "place-1"
+        assert query.is_.return_value.is_.return_value.execute.call_count == 1
+        stats = get_lookup_cache_stats()
+        assert stats["memory"]["hits"] == 1
+        assert stats["database"]["hits"] == 1
+
+    @pytest.mark.unit
+    def test_expired_negative_row_is_searched_again(self) -> None:
+        """No-match rows older than the negative TTL go back to the API."""
+        mock_supabase = MagicMock()
+        query = mock_supabase.table.return_value.select.return_value.eq.return_value
+        query.is_.return_value.is_.return_value.execute.return_value.data = [
+            _cache_row("new cafe", None, timedelta(days=30))
+        ]
+        service = GooglePlacesService(mock_supabase)
+
+        with patch.object(
+            service, "_make_request", return_value=_search_response("place-2", "New Cafe")
+        ) as mock_request:
+            match = service.find_place("New Cafe")
+
+        assert match.place_id == "place-2"
+        mock_request.assert_called_once()
+        record = mock_supabase.table.return_value.upsert.call_args[0][0]
+        assert record["google_place_id"] == "place-2"
+        assert record["refreshed_at"]
+
+    @pytest.mark.unit
+    def test_fresh_negative_row_skips_api(self) -> None:
+        """Recent no-match rows are trusted."""
+        mock_supabase = MagicMock()
+        query = mock_supabase.table.return_value.select.return_value.eq.return_value
+        query.is_.return_value.is_.return_value.execute.return_value.data = [
+            _cache_row("atm withdrawal", None, timedelta(hours=1))
+        ]
+        service = GooglePlacesService(mock_supabase)
+
+        with patch.object(service, "_make_request") as mock_request:
+            assert service.find_place("ATM Withdrawal") is None
+
+        mock_request.assert_not_called()
+
+
+class TestFindPlaces:
+    """Tests for GooglePlacesService.find_places()."""
+
+    @pytest.mark.unit
+    def test_probes_table_once_and_searches_only_misses(self) -> None:
+        """Bulk lookups use one cache query and hit the API only for misses."""
+        mock_supabase = MagicMock()
+        in_query = mock_supabase.table.return_value.select.return_value.in_
+        in_query.return_value.execute.return_value.data = [
+            _cache_row("starbucks", "place-sb", timedelta(days=1), lat=37.76, lng=-122.43),
+            # Cached for a different grid cell - does not apply
+            _cache_row("tartine", "place-other", timedelta(days=1), lat=34.05, lng=-118.25),
+        ]
+        service = GooglePlacesService(mock_supabase)
+
+        with patch.object(
+            service, "_make_request", return_value=_search_response("place-t", "Tartine")
+        ) as mock_request:
+            matches = service.find_places(
+                [
+                    ("Starbucks", 37.7601, -122.4301),
+                    ("Tartine", 37.7612, -122.4299),
+                    ("STARBUCKS", 37.7612, -122.4299),
+                ]
+            )
+
+        assert [m.place_id for m in matches] == ["place-sb", "place-t", "place-sb"]
+        in_query.assert_called_once()
+        assert sorted(in_query.call_args[0][1]) == ["starbucks", "tartine"]
+        mock_request.assert_called_once()
+
+        # Second bulk call is served entirely from memory
+        with patch.object(service, "_make_request") as mock_request:
+            again = service.find_places([("Tartine", 37.7612, -122.4299)])
+
+        assert again[0].place_id == "place-t"
+        assert in_query.call_count == 1
+        mock_request.assert_not_called()
+
+
+DETAILS_RESPONSE = {
+    "displayName": {"text": "Tartine"},
+    "rating": 4.6,
+    "userRatingCount": 1200,
+    "reviews": [{"text": {"text": "Great bread"}, "rating": 5}],
+}
+
+
+class TestPlaceDetails:
+    """Tests for GooglePlacesService.get_place_details() caching."""
+
+    @pytest.mark.unit
+    def test_details_are_cached_by_place_id(self) -> None:
+        """A second call for the same place doesn't hit the API."""
+        service = GooglePlacesService(MagicMock())
+
+        with patch.object(service, "_make_request", return_value=DETAILS_RESPONSE) as mock_request:
+            first = service.get_place_details("place-1")
+            second = GooglePlacesService(MagicMock()).get_place_details("place-1")
+
+        assert first.reviews[0]["text"] == "Great bread"
+        assert second is first
+        mock_request.assert_called_once()
+        assert mock_request.call_args[1]["field_mask"] == DETAIL_FIELDS
+
+    @pytest.mark.unit
+    def test_reviews_are_only_fetched_when_needed(self) -> None:
+        """Details without reviews use a narrower mask and are upgraded on demand."""
+        service = GooglePlacesService(MagicMock())
+
+        with patch.object(service, "_make_request", return_value=DETAILS_RESPONSE) as mock_request:
+            service.get_place_details("place-1", include_reviews=False)
+            service.get_place_details("place-1", include_reviews=False)
+            service.get_place_details("place-1")
+            service.get_place_details("place-1", include_reviews=False)
+
+        masks = [c[1]["field_mask"] for c in mock_request.call_args_list]
+        assert len(masks) == 2
+        assert "reviews" not in masks[0]
+        assert "reviews" in masks[1]
+
+    @pytest.mark.unit
+    def test_volatile_refresh_uses_narrow_mask_and_invalidates(self) -> None:
+        """Volatile refreshes only request rating, count and hours."""
+        service = GooglePlacesService(MagicMock())
+
+        with patch.object(service, "_make_request", return_value=DETAILS_RESPONSE) as mock_request:
+            service.get_place_details("place-1")
+            fields = service.get_volatile_details("place-1")
+            service.get_place_details("place-1")
+
+        assert fields == {"rating": 4.6, "review_count": 1200, "opening_hours": None}
+        masks = [c[1]["field_mask"] for c in mock_request.call_args_list]
+        assert masks == [DETAIL_FIELDS, VOLATILE_FIELDS, DETAIL_FIELDS]
+
+
+class TestCreateOrUpdateVenue:
+    """Tests for GooglePlacesService.create_or_update_venue() tagging."""
+
+    @pytest.mark.unit
+    def test_refresh_does_not_overwrite_ai_profile(self) -> None:
+        """Existing tagged venues only get their Google fields refreshed."""
+        supabase = MagicMock()
+        venues = supabase.table.return_value
+        venues.upsert.return_value.execute.return_value.data = [
+            {"id": "venue-1", "tag_source": "ai", "taste_cluster": "cafe"}
+        ]
+        details = PlaceDetails(place_id="place-1", name="Tartine", primary_type="bakery")
+
+        venue = GooglePlacesService(supabase).create_or_update_venue(details, city="SF")
+
+        record = venues.upsert.call_args[0][0]
+        assert "taste_cluster" not in record
+        assert "tag_source" not in record
+        venues.update.assert_not_called()
+        assert venue["taste_cluster"] == "cafe"
@@ -0,0 +1,190 @@
+"""Unit tests for PlacesTransport against a local stub server."""
+
+from __future__ import annotations
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.services.google_places_service import GooglePlacesService
+from app.services.places_transport import (
+    PlacesTransport,
+    close_places_transport,
+    get_places_transport,
+)
+from app.services.rate_limiter import RateLimiter
+
+
+class StubPlacesHandler(BaseHTTPRequestHandler):
+    """Replays queued (status, body, headers) responses and records requests."""
+
+    protocol_version = "HTTP/1.1"
+
+    def _respond(self) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        self.server.requests.append(
+            {
+                "method": self.command,
+                "path": self.path,
+                "headers": dict(self.headers),
+                "body": json.loads(body) if body else None,
+                "client_port": self.client_address[1],
+            }
+        )
+        status, payload, headers = (
+            self.server.responses.pop(0) if self.server.responses else (200, {}, {})
+        )
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    do_GET = _respond  # noqa: N815 - BaseHTTPRequestHandler dispatch name
+    do_POST = _respond  # noqa: N815
+
+    def log_message(self, format, *args) -> None:  # noqa: A002
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    """Run a stub Places API on a free local port."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubPlacesHandler)
+    server.requests = []
+    server.responses = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def transport(stub_server):
+    """Transport pointed at the stub server with fast backoff."""
+    host, port = stub_server.server_address
+    transport = PlacesTransport(
+        base_url=f"http://{host}:{port}",
+        rate_limiter=RateLimiter(rate=1000, per=1.0),
+        max_retries=2,
+        backoff_base=0.01,
+    )
+    yield transport
+    transport.close()
+
+
+class TestPlacesTransport:
+    """Tests for PlacesTransport."""
+
+    @pytest.mark.unit
+    def test_retries_server_errors_then_succeeds(self, stub_server, transport) -> None:
+        """5xx and 429 responses are retried until a success."""
+        stub_server.responses = [
+            (503, {}, {}),
+            (429, {}, {"Retry-After": "0"}),
+            (200, {"ok": True}, {}),
+        ]
+
+        response = transport.request("POST", "/places:searchText", endpoint="searchText", json={})
+
+        assert response.status_code == 200
+        assert len(stub_server.requests) == 3
+
+    @pytest.mark.unit
+    def test_gives_up_after_max_retries(self, stub_server, transport) -> None:
+        """The last error response is returned once retries are exhausted."""
+        stub_server.responses = [(500, {}, {})] * 5
+
+        response = transport.request("GET", "/places/abc", endpoint="places/details")
+
+        assert response.status_code == 500
+        assert len(stub_server.requests) == 3
+
+    @pytest.mark.unit
+    def test_client_errors_are_not_retried(self, stub_server, transport) -> None:
+        """4xx responses other than 429 return immediately."""
+        stub_server.responses = [(400, {"error": {"message": "bad"}}, {})]
+
+        response = transport.request("GET", "/places/abc", endpoint="places/details")
+
+        assert response.status_code == 400
+        assert len(stub_server.requests) == 1
+
+    @pytest.mark.unit
+    def test_connections_are_kept_alive(self, stub_server, transport) -> None:
+        """Sequential requests reuse one pooled connection."""
+        for _ in range(3):
+            transport.request("GET", "/places/abc", endpoint="places/details")
+
+        assert len({r["client_port"] for r in stub_server.requests}) == 1
+
+    @pytest.mark.unit
+    def test_records_latency_per_endpoint(self, stub_server, transport) -> None:
+        """Every attempt lands in its endpoint's histogram."""
+        stub_server.responses = [(503, {}, {}), (200, {}, {})]
+        transport.request("POST", "/places:searchText", endpoint="searchText", json={})
+        transport.request("GET", "/places/abc", endpoint="places/details")
+
+        stats = transport.latency_stats()
+
+        assert stats["searchText"]["count"] == 2
+        assert stats["places/details"]["count"] == 1
+        assert sum(stats["searchText"]["buckets"].values()) == 2
+
+    @pytest.mark.unit
+    async def test_async_request_retries(self, stub_server, transport) -> None:
+        """The async client shares the retry policy."""
+        stub_server.responses = [(502, {}, {}), (200, {"ok": True}, {})]
+
+        response = await transport.arequest("GET", "/places/abc", endpoint="places/details")
+
+        assert response.json() == {"ok": True}
+        assert len(stub_server.requests) == 2
+        await transport.aclose()
+
+    @pytest.mark.unit
+    async def test_shutdown_closes_the_shared_transport(self) -> None:
+        """Closing the shared transport closes its clients; the next get makes a new one."""
+        shared = get_places_transport()
+
+        await close_places_transport()
+
+        assert shared._client.is_closed
+        assert get_places_transport() is not shared
+
+
+class TestGooglePlacesServiceTransport:
+    """Tests for GooglePlacesService requests through the transport."""
+
+    @pytest.mark.unit
+    def test_find_place_searches_through_transport(self, stub_server, transport) -> None:
+        """Search requests carry the API key, field mask and query."""
+        stub_server.responses = [
+            (200, {"places": [{"id": "place-1", "displayName": {"text": "Tartine"}}]}, {}),
+        ]
+        service = GooglePlacesService(MagicMock(), transport=transport)
+
+        match = service._search_place("tartine", "Tartine", 37.76, -122.42)
+
+        assert match.place_id == "place-1"
+        request = stub_server.requests[0]
+        assert request["path"] == "/places:searchText"
+        assert request["body"]["textQuery"] == "Tartine"
+        assert "places.id" in request["headers"]["X-Goog-FieldMask"]
+
+    @pytest.mark.unit
+    def test_api_error_raises_value_error(self, stub_server, transport) -> None:
+        """Non-200 responses surface as ValueError with the API message."""
+        stub_server.responses = [(403, {"error": {"message": "API key invalid"}}, {})]
+        service = GooglePlacesService(MagicMock(), transport=transport)
+
+        with pytest.raises(ValueError, match="API key invalid"):
+            service._make_request("/places/abc", method="GET")
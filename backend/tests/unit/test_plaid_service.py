@@ -11,7 +11,9 @@ from uuid import uuid4
 
 import pytest
 
+from app.services.google_places_service import PlaceDetails, PlaceMatch
 from app.services.plaid_service import PlaidService
+from app.services.venue_matcher import VenueIndex
 
 
 class TestPlaidServiceLinkAccount:
@@ -262,3 +264,299 @@ class TestPlaidServiceDeleteAccount:
         result = service.delete_account("non-existent-id")
 
         assert result is False
+
+
+class TestPlaidServiceInsertNewPlaceVisits:
+    """Tests for PlaidService._insert_new_place_visits()."""
+
+    @staticmethod
+    def _mock_supabase(
+        watermark: dict | None,
+        transactions: list[dict],
+        existing_visits: list[dict] | None = None,
+    ) -> tuple[MagicMock, dict[str, MagicMock]]:
+        """Build a Supabase mock with one MagicMock per table."""
+        tables = {
+            "user_analysis": MagicMock(),
+            "transactions": MagicMock(),
+            "place_visits": MagicMock(),
+        }
+        tables["user_analysis"].select.return_value.eq.return_value.execute.return_value.data = (
+            [watermark] if watermark else []
+        )
+        tx_query = tables["transactions"].select.return_value.eq.return_value.in_.return_value
+        for filtered in (tx_query, tx_query.or_.return_value, tx_query.gt.return_value):
+            batch = filtered.order.return_value.order.return_value.limit.return_value
+            batch.execute.return_value.data = transactions
+        tables["place_visits"].select.return_value.in_.return_value.execute.return_value.data = (
+            existing_visits or []
+        )
+
+        def upsert(records: list[dict], **kwargs) -> MagicMock:
+            # Echo the rows back, as PostgREST does for rows it inserted
+            query = MagicMock()
+            query.execute.return_value.data = records
+            return query
+
+        tables["place_visits"].upsert.side_effect = upsert
+
+        mock_supabase = MagicMock()
+        mock_supabase.table.side_effect = lambda name: tables[name]
+        return mock_supabase, tables
+
+    @pytest.mark.unit
+    def test_filters_transactions_past_watermark(self) -> None:
+        """Only transactions after the stored (created_at, id) should be read."""
+        mock_supabase, tables = self._mock_supabase(
+            {"visits_watermark_at": "2025-12-01T00:00:00+00:00", "visits_watermark_tx_id": "tx-9"},
+            [],
+        )
+
+        service = PlaidService(mock_supabase)
+        created = service._insert_new_place_visits("user-123")
+
+        assert created == 0
+        tx_query = tables["transactions"].select.return_value.eq.return_value.in_.return_value
+        or_filter = tx_query.or_.call_args[0][0]
+        assert 'created_at.gt."2025-12-01T00:00:00+00:00"' in or_filter
+        assert "id.gt.tx-9" in or_filter
+        # Nothing new: watermark is left untouched
+        tables["user_analysis"].upsert.assert_not_called()
+
+    @pytest.mark.unit
+    def test_inserts_new_visits_and_advances_watermark(self) -> None:
+        """New transactions create visits and move the watermark to the last one."""
+        mock_supabase, tables = self._mock_supabase(
+            None,
+            [
+                {
+                    "id": "tx-1",
+                    "merchant_name": "Blue Bottle",
+                    "amount": -5.5,
+                    "date": "2025-12-02",
+                    "datetime": None,
+                    "created_at": "2025-12-03T00:00:00+00:00",
+                },
+                {
+                    "id": "tx-2",
+                    "merchant_name": "Tartine",
+                    "amount": 20,
+                    "date": "2025-12-02",
+                    "datetime": "2025-12-02T19:00:00+00:00",
+                    "created_at": "2025-12-03T00:00:00+00:00",
+                },
+            ],
+            existing_visits=[{"transaction_id": "tx-2"}],
+        )
+
+        service = PlaidService(mock_supabase)
+        created = service._insert_new_place_visits("user-123")
+
+        assert created == 1
+        args, options = tables["place_visits"].upsert.call_args
+        inserted = args[0]
+        assert options == {"on_conflict": "user_id,transaction_id", "ignore_duplicates": True}
+        assert [r["transaction_id"] for r in inserted] == ["tx-1"]
+        assert inserted[0]["amount"] == 5.5
+        assert inserted[0]["visited_at"] == "2025-12-02"
+
+        # Existing visits are only checked for this batch of transactions
+        tables["place_visits"].select.return_value.in_.assert_called_once_with(
+            "transaction_id", ["tx-1", "tx-2"]
+        )
+
+        watermark = tables["user_analysis"].upsert.call_args[0][0]
+        assert watermark["visits_watermark_at"] == "2025-12-03T00:00:00+00:00"
+        assert watermark["visits_watermark_tx_id"] == "tx-2"
+
+    @pytest.mark.unit
+    def test_visits_inserted_by_a_concurrent_sync_are_not_counted(self) -> None:
+        """Rows skipped as duplicates by the unique index don't count as created."""
+        mock_supabase, tables = self._mock_supabase(
+            None,
+            [
+                {
+                    "id": "tx-1",
+                    "merchant_name": "Blue Bottle",
+                    "amount": 5,
+                    "date": "2025-12-02",
+                    "created_at": "2025-12-03T00:00:00+00:00",
+                },
+            ],
+        )
+        tables["place_visits"].upsert.side_effect = None
+        tables["place_visits"].upsert.return_value.execute.return_value.data = []
+
+        created = PlaidService(mock_supabase)._insert_new_place_visits("user-123")
+
+        assert created == 0
+        tables["place_visits"].upsert.assert_called_once()
+
+
+def _tx_location(tx_id: str, lat: float, lng: float, city: str) -> dict:
+    return {"id": tx_id, "location_lat": lat, "location_lng": lng, "location_city": city}
+
+
+class TestPlaidServiceMatchVenues:
+    """Tests for PlaidService._match_venues_for_user()."""
+
+    @pytest.mark.unit
+    def test_groups_visits_by_merchant_and_location(self) -> None:
+        """Repeat visits to one merchant are resolved once and updated together."""
+        tables = {"place_visits": MagicMock(), "transactions": MagicMock()}
+        unmatched = tables["place_visits"].select.return_value.eq.return_value.is_.return_value
+        unmatched.execute.return_value.data = [
+            {"id": "pv-1", "merchant_name": "Starbucks", "transaction_id": "tx-1"},
+            {"id": "pv-2", "merchant_name": "STARBUCKS ", "transaction_id": "tx-2"},
+            {"id": "pv-3", "merchant_name": "Starbucks", "transaction_id": "tx-3"},
+            {"id": "pv-4", "merchant_name": "Tartine", "transaction_id": None},
+        ]
+        tables["transactions"].select.return_value.in_.return_value.execute.return_value.data = [
+            _tx_location("tx-1", 37.7601, -122.4301, "SF"),
+            _tx_location("tx-2", 37.7612, -122.4299, "SF"),
+            # Same merchant in another grid cell is a separate lookup
+            _tx_location("tx-3", 34.05, -118.25, "LA"),
+        ]
+        mock_supabase = MagicMock()
+        mock_supabase.table.side_effect = lambda name: tables[name]
+
+        service = PlaidService(mock_supabase)
+        place_by_merchant = {
+            ("Starbucks", 37.7601): PlaceMatch(place_id="place-sf", name="Starbucks"),
+            ("Starbucks", 34.05): PlaceMatch(place_id="place-la", name="Starbucks"),
+            ("Tartine", None): None,
+        }
+        venue_by_place = {"place-sf": "venue-sf", "place-la": "venue-la"}
+        with patch.object(
+            service._places_service,
+            "find_places",
+            side_effect=lambda queries, max_workers: [
+                place_by_merchant[(name, lat)] for name, lat, _ in queries
+            ],
+        ) as mock_find, patch.object(
+            service,
+            "_get_or_create_venue",
+            side_effect=lambda match, name, city, pending: venue_by_place[match.place_id],
+        ) as mock_venue, patch(
+            "app.services.plaid_service.get_venue_index", return_value=VenueIndex()
+        ):
+            matched = service._match_venues_for_user("user-123")
+
+        assert matched == 3
+        # All distinct merchants are looked up in one bulk call
+        mock_find.assert_called_once()
+        assert len(mock_find.call_args[0][0]) == 3
+        # Unmatched merchants never reach venue creation
+        assert mock_venue.call_count == 2
+
+        updates = {
+            call[0][0]["venue_id"]: sorted(in_call[0][1])
+            for call, in_call in zip(
+                tables["place_visits"].update.call_args_list,
+                tables["place_visits"].update.return_value.in_.call_args_list,
+            )
+        }
+        assert updates == {"venue-sf": ["pv-1", "pv-2"], "venue-la": ["pv-3"]}
+
+    @pytest.mark.unit
+    def test_groups_matching_one_place_create_one_venue(self) -> None:
+        """Different merchant spellings of the same place share one venue."""
+        tables = {"place_visits": MagicMock(), "transactions": MagicMock()}
+        unmatched = tables["place_visits"].select.return_value.eq.return_value.is_.return_value
+        unmatched.execute.return_value.data = [
+            {"id": "pv-1", "merchant_name": "SQ *TARTINE", "transaction_id": None},
+            {"id": "pv-2", "merchant_name": "Tartine Bakery", "transaction_id": None},
+        ]
+        mock_supabase = MagicMock()
+        mock_supabase.table.side_effect = lambda name: tables[name]
+
+        service = PlaidService(mock_supabase)
+        match = PlaceMatch(place_id="place-1", name="Tartine")
+        with patch.object(
+            service._places_service, "find_places", return_value=[match, match]
+        ), patch.object(
+            service, "_get_or_create_venue", return_value="venue-1"
+        ) as mock_venue, patch(
+            "app.services.plaid_service.get_venue_index", return_value=VenueIndex()
+        ):
+            matched = service._match_venues_for_user("user-123")
+
+        assert matched == 2
+        mock_venue.assert_called_once()
+        tables["place_visits"].update.assert_called_once_with({"venue_id": "venue-1"})
+        assert sorted(tables["place_visits"].update.return_value.in_.call_args[0][1]) == [
+            "pv-1",
+            "pv-2",
+        ]
+
+    @pytest.mark.unit
+    def test_known_venues_skip_google_lookup(self) -> None:
+        """Merchants matching the local venue index never reach find_places."""
+        tables = {"place_visits": MagicMock(), "transactions": MagicMock()}
+        unmatched = tables["place_visits"].select.return_value.eq.return_value.is_.return_value
+        unmatched.execute.return_value.data = [
+            {"id": "pv-1", "merchant_name": "SQ *BLUE BOTTLE", "transaction_id": "tx-1"},
+            {"id": "pv-2", "merchant_name": "Tartine", "transaction_id": "tx-1"},
+        ]
+        tables["transactions"].select.return_value.in_.return_value.execute.return_value.data = [
+            _tx_location("tx-1", 37.7761, -122.4231, "SF"),
+        ]
+        mock_supabase = MagicMock()
+        mock_supabase.table.side_effect = lambda name: tables[name]
+        venue_index = VenueIndex([
+            {"id": "venue-bb", "name": "Blue Bottle Coffee", "lat": 37.776, "lng": -122.423},
+        ])
+
+        service = PlaidService(mock_supabase)
+        with patch.object(
+            service._places_service, "find_places", return_value=[None]
+        ) as mock_find, patch(
+            "app.services.plaid_service.get_venue_index", return_value=venue_index
+        ):
+            matched = service._match_venues_for_user("user-123")
+
+        assert matched == 1
+        assert [q[0] for q in mock_find.call_args[0][0]] == ["Tartine"]
+        tables["place_visits"].update.assert_called_once_with({"venue_id": "venue-bb"})
+
+
+class TestPlaidServiceGetOrCreateVenue:
+    """Tests for PlaidService._get_or_create_venue()."""
+
+    @pytest.mark.unit
+    def test_new_venue_is_rule_tagged_and_queued_for_ai(self) -> None:
+        """New venues are created without waiting on AI tagging."""
+        mock_supabase = MagicMock()
+        service = PlaidService(mock_supabase)
+        details = PlaceDetails(
+            place_id="place-1", name="Tartine", primary_type="bakery", types=["bakery"]
+        )
+        pending: list = []
+
+        with patch.object(
+            service._places_service, "get_venue_by_place_id", return_value=None
+        ), patch.object(
+            service._places_service, "get_place_details", return_value=details
+        ), patch(
+            "app.services.plaid_service.get_venue_index", return_value=VenueIndex()
+        ), patch.object(service._tagging_service, "tag") as mock_tag:
+            venue = {"id": "venue-1", "name": "Tartine", "lat": None, "lng": None}
+            venues = mock_supabase.table.return_value
+            venues.upsert.return_value.execute.return_value.data = [{**venue, "tag_source": None}]
+            untagged = venues.update.return_value.eq.return_value.is_.return_value
+            untagged.execute.return_value.data = [{**venue, "tag_source": "rules"}]
+            venue_id = service._get_or_create_venue(
+                PlaceMatch(place_id="place-1", name="Tartine"), "TARTINE", "SF", pending
+            )
+
+        assert venue_id == "venue-1"
+        mock_tag.assert_not_called()
+        assert "tag_source" not in venues.upsert.call_args[0][0]
+        tags = venues.update.call_args[0][0]
+        assert tags["taste_cluster"] == "bakery"
+        assert tags["tag_source"] == "rules"
+        untagged.execute.assert_called_once()
+        venues.update.return_value.eq.return_value.is_.assert_called_once_with(
+            "tag_source", "null"
+        )
+        assert [(v, d["name"]) for v, d in pending] == [("venue-1", "Tartine")]
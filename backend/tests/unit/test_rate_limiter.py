@@ -0,0 +1,111 @@
+"""Unit tests for the token bucket RateLimiter."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.services.rate_limiter import RateLimiter, get_places_rate_limiter
+
+
+class TestRateLimiter:
+    """Tests for RateLimiter."""
+
+    @pytest.mark.unit
+    def test_burst_within_capacity_does_not_wait(self) -> None:
+        """Requests up to the bucket size are served immediately."""
+        limiter = RateLimiter(rate=5, per=1.0)
+
+        assert [limiter.reserve() for _ in range(5)] == [0.0] * 5
+
+    @pytest.mark.unit
+    def test_waiters_are_queued_in_order(self) -> None:
+        """Each caller past capacity waits one interval longer than the last."""
+        limiter = RateLimiter(rate=10, per=1.0)
+        for _ in range(10):
+            limiter.reserve()
+
+        waits = [limiter.reserve() for _ in range(3)]
+
+        assert waits == sorted(waits)
+        assert waits[0] == pytest.approx(0.1, abs=0.02)
+        assert waits[2] == pytest.approx(0.3, abs=0.02)
+
+    @pytest.mark.unit
+    def test_concurrent_threads_share_one_budget(self) -> None:
+        """Tokens are never handed out twice under contention."""
+        limiter = RateLimiter(rate=100, per=1000.0)
+        waits: list[float] = []
+        lock = threading.Lock()
+
+        def worker() -> None:
+            for _ in range(25):
+                wait = limiter.reserve()
+                with lock:
+                    waits.append(wait)
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert sum(1 for w in waits if w == 0.0) == 100
+        assert len(waits) == 200
+
+    @pytest.mark.unit
+    async def test_acquire_async_does_not_block_event_loop(self) -> None:
+        """Async waiters yield to other tasks while queued."""
+        limiter = RateLimiter(rate=1, per=0.2)
+        limiter.reserve()
+        ticks = 0
+
+        async def ticker() -> None:
+            nonlocal ticks
+            for _ in range(5):
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        start = time.monotonic()
+        await asyncio.gather(limiter.acquire_async(), ticker())
+
+        assert ticks == 5
+        assert time.monotonic() - start >= 0.15
+
+    @pytest.mark.unit
+    def test_sqlite_bucket_is_shared_between_limiters(self, tmp_path) -> None:
+        """Limiters pointing at the same state file share one budget."""
+        path = str(tmp_path / "bucket.db")
+        first = RateLimiter(rate=3, per=1000.0, state_path=path, name="places")
+        second = RateLimiter(rate=3, per=1000.0, state_path=path, name="places")
+        other = RateLimiter(rate=3, per=1000.0, state_path=path, name="other")
+
+        waits = [first.reserve(), second.reserve(), first.reserve(), second.reserve()]
+
+        assert waits[:3] == [0.0, 0.0, 0.0]
+        assert waits[3] > 0
+        assert other.reserve() == 0.0
+
+    @pytest.mark.unit
+    async def test_acquire_async_reserves_sqlite_bucket_off_the_loop(self, tmp_path) -> None:
+        """SQLite I/O for the shared bucket runs in a worker thread."""
+        limiter = RateLimiter(rate=3, per=1000.0, state_path=str(tmp_path / "bucket.db"))
+        reserve_shared = limiter._reserve_shared
+        threads: list[threading.Thread] = []
+
+        def record_thread() -> float:
+            threads.append(threading.current_thread())
+            return reserve_shared()
+
+        limiter._reserve_shared = record_thread
+        await limiter.acquire_async()
+
+        assert threads and threads[0] is not threading.current_thread()
+
+    @pytest.mark.unit
+    def test_places_limiter_is_process_wide(self) -> None:
+        """Every caller gets the same Places limiter instance."""
+        assert get_places_rate_limiter() is get_places_rate_limiter()
@@ -0,0 +1,77 @@
+"""Unit tests for RowLoader."""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.services.row_loader import RowLoader
+
+
+def make_supabase(rows: list[dict]) -> MagicMock:
+    """Build a Supabase mock whose in_() query returns the given rows."""
+    supabase = MagicMock()
+    supabase.table.return_value.select.return_value.in_.return_value.execute.return_value.data = (
+        rows
+    )
+    return supabase
+
+
+class TestRowLoader:
+    """Tests for RowLoader batching and memoization."""
+
+    @pytest.mark.unit
+    async def test_loads_in_the_same_tick_share_one_query(self) -> None:
+        """Concurrent loads for one table are fetched with a single in_() query."""
+        supabase = make_supabase(
+            [
+                {"user_id": "user-1", "vibes": ["cozy"]},
+                {"user_id": "user-2", "vibes": ["lively"]},
+            ]
+        )
+        loader = RowLoader(supabase)
+
+        first, second, missing = await asyncio.gather(
+            loader.load("fused_taste", "user-1"),
+            loader.load("fused_taste", "user-2"),
+            loader.load("fused_taste", "user-3"),
+        )
+
+        assert first["vibes"] == ["cozy"]
+        assert second["vibes"] == ["lively"]
+        assert missing is None
+        assert loader.queries == 1
+        supabase.table.return_value.select.return_value.in_.assert_called_once_with(
+            "user_id", ["user-1", "user-2", "user-3"]
+        )
+
+    @pytest.mark.unit
+    async def test_rows_and_misses_are_memoized(self) -> None:
+        """Repeat loads don't query again, even for misses."""
+        supabase = make_supabase([{"id": "user-1", "display_name": "Sam"}])
+        loader = RowLoader(supabase)
+
+        await loader.load_many("profiles", ["user-1", "user-2"])
+        assert (await loader.load("profiles", "user-1"))["display_name"] == "Sam"
+        assert await loader.load("profiles", "user-2") is None
+        assert loader.queries == 1
+
+        loader.clear("profiles", "user-1")
+        await loader.load("profiles", "user-1")
+        assert loader.queries == 2
+
+    @pytest.mark.unit
+    async def test_failed_fetch_is_not_memoized(self) -> None:
+        """A query error reaches every waiter, and the next load retries."""
+        supabase = MagicMock()
+        execute = supabase.table.return_value.select.return_value.in_.return_value.execute
+        execute.side_effect = [RuntimeError("timeout"), MagicMock(data=[{"user_id": "user-1"}])]
+        loader = RowLoader(supabase)
+
+        with pytest.raises(RuntimeError):
+            await loader.load("user_analysis", "user-1")
+
+        assert await loader.load("user_analysis", "user-1") == {"user_id": "user-1"}
+        assert loader.queries == 2
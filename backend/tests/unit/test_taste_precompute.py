@@ -0,0 +1,273 @@
+"""Unit tests for TastePrecomputeService."""
+
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from unittest.mock import ANY, MagicMock
+
+import pytest
+
+from app.intelligence.dna_generator import DNATrait
+from app.intelligence.insight_generator import Insight
+from app.intelligence.taste_content_generator import TasteContentResponse
+from app.services.taste_precompute import TastePrecomputeService, claim_regeneration, user_shard
+
+TODAY = date(2026, 10, 19)
+
+
+def make_supabase(
+    tables: dict[str, MagicMock],
+    existing: dict[str, list[dict]] | None = None,
+    rows: dict[str, list[dict]] | None = None,
+) -> MagicMock:
+    """Build a Supabase mock with one MagicMock per table.
+
+    Args:
+        tables: Receives the table mocks, keyed by name
+        existing: Rows returned by the "already generated" checks
+        rows: user_analysis / declared_taste rows
+    """
+    existing = existing or {}
+    rows = rows or {}
+    for name in (
+        "daily_insights",
+        "daily_dna",
+        "daily_profile_titles",
+        "user_analysis",
+        "declared_taste",
+    ):
+        table = MagicMock()
+        select = table.select.return_value.in_.return_value
+        for op in (select.eq, select.gt):
+            page = op.return_value.order.return_value.range.return_value
+            page.execute.return_value.data = existing.get(name, [])
+        select.execute.return_value.data = rows.get(name, [])
+        tables[name] = table
+
+    supabase = MagicMock()
+    supabase.table.side_effect = lambda name: tables[name]
+    return supabase
+
+
+def make_service(
+    supabase: MagicMock, insights=None, dna=None, title=None, content=None
+) -> TastePrecomputeService:
+    """Build a service with stub generators (overridable per test)."""
+    make_insights = insights or (
+        lambda data: [
+            Insight(type="streak", title="Coffee Streak!", body="5 days", emoji="🔥"),
+            Insight(type="pattern", title="Early Bird", body="Mornings", emoji="🌅"),
+        ]
+    )
+    make_dna = dna or (
+        lambda data: [
+            DNATrait(name=f"Trait {i}", emoji="✨", description="d", color="#FFFFFF")
+            for i in range(4)
+        ]
+    )
+    make_title = title or (lambda data: ("Night Owl", "Always out late"))
+
+    insight_generator = MagicMock()
+    insight_generator.generate.side_effect = make_insights
+    dna_generator = MagicMock()
+    dna_generator.generate.side_effect = make_dna
+    title_generator = MagicMock()
+    title_generator.generate.side_effect = make_title
+    content_generator = MagicMock()
+    content_generator.generate.side_effect = content or (
+        lambda data: TasteContentResponse(
+            insights=make_insights(data),
+            traits=make_dna(data),
+            title=make_title(data)[0],
+            tagline=make_title(data)[1],
+        )
+    )
+    return TastePrecomputeService(
+        supabase,
+        insight_generator=insight_generator,
+        dna_generator=dna_generator,
+        title_generator=title_generator,
+        content_generator=content_generator,
+        workers=2,
+    )
+
+
+class TestPrecomputeBatch:
+    """Tests for TastePrecomputeService.precompute_batch()."""
+
+    @pytest.mark.unit
+    def test_generates_only_missing_content_and_bulk_writes(self) -> None:
+        """Users with today's content are skipped; the rest is upserted in one call per table."""
+        tables: dict[str, MagicMock] = {}
+        supabase = make_supabase(
+            tables,
+            existing={"daily_insights": [{"user_id": "user-1"}]},
+            rows={
+                "user_analysis": [
+                    {
+                        "user_id": "user-1",
+                        "total_transactions": 40,
+                        "categories": {"coffee": {"count": 10}},
+                    },
+                    {"user_id": "user-2", "total_transactions": 12},
+                ],
+                "declared_taste": [{"user_id": "user-1", "exploration_style": "adventurous"}],
+            },
+        )
+        service = make_service(supabase)
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            counts = service.precompute_batch(["user-1", "user-2"], TODAY, executor)
+
+        assert counts == {"insights": 1, "dna": 2, "titles": 1, "failures": 0}
+        # Both users needed two kinds: one combined call each, no per-kind calls
+        assert service._content_generator.generate.call_count == 2
+        assert not service._insight_generator.generate.called
+
+        insight_rows = tables["daily_insights"].upsert.call_args[0][0]
+        assert {row["user_id"] for row in insight_rows} == {"user-2"}
+        assert all(row["shown_at"] == "2026-10-19" for row in insight_rows)
+        assert tables["daily_insights"].upsert.call_args.kwargs["ignore_duplicates"] is True
+
+        dna_rows = tables["daily_dna"].upsert.call_args[0][0]
+        assert len(dna_rows) == 8
+
+        # Titles need quiz data, so only user-1 gets one
+        title_rows = tables["daily_profile_titles"].upsert.call_args[0][0]
+        assert [row["user_id"] for row in title_rows] == ["user-1"]
+        assert title_rows[0]["title"] == "Night Owl"
+        # Expired titles are cleared first; a fresh one written meanwhile is kept
+        titles = tables["daily_profile_titles"]
+        titles.delete.return_value.in_.assert_called_once_with("user_id", ["user-1"])
+        assert titles.upsert.call_args.kwargs["ignore_duplicates"] is True
+
+    @pytest.mark.unit
+    def test_single_missing_kind_uses_its_own_generator(self) -> None:
+        """A user missing only insights gets one insight call, not a combined one."""
+        tables: dict[str, MagicMock] = {}
+        supabase = make_supabase(
+            tables,
+            existing={
+                "daily_dna": [{"user_id": "user-1"}] * 4,
+                "daily_profile_titles": [{"user_id": "user-1"}],
+            },
+            rows={"user_analysis": [{"user_id": "user-1", "total_transactions": 8}]},
+        )
+        service = make_service(supabase)
+
+        counts = service.precompute_batch(["user-1"], TODAY)
+
+        assert counts == {"insights": 1, "dna": 0, "titles": 0, "failures": 0}
+        service._insight_generator.generate.assert_called_once()
+        assert not service._content_generator.generate.called
+
+    @pytest.mark.unit
+    def test_failed_generation_is_counted_and_skipped(self) -> None:
+        """One user's LLM failure doesn't stop the batch."""
+        tables: dict[str, MagicMock] = {}
+        supabase = make_supabase(
+            tables,
+            existing={"daily_dna": [{"user_id": "user-1"}] * 4 + [{"user_id": "user-2"}] * 4},
+            rows={
+                "user_analysis": [
+                    {"user_id": "user-1", "total_transactions": 0},
+                    {"user_id": "user-2", "total_transactions": 50},
+                ]
+            },
+        )
+
+        def flaky_insights(data):
+            if data["total_transactions"] == 0:
+                raise RuntimeError("overloaded")
+            return [Insight(type="milestone", title="T", body="B", emoji="🎯")]
+
+        service = make_service(supabase, insights=flaky_insights)
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            counts = service.precompute_batch(["user-1", "user-2"], TODAY, executor)
+
+        assert counts["insights"] == 1
+        assert counts["failures"] == 1
+        insight_rows = tables["daily_insights"].upsert.call_args[0][0]
+        assert [row["user_id"] for row in insight_rows] == ["user-2"]
+
+    @pytest.mark.unit
+    def test_existing_content_check_pages_past_the_row_cap(self) -> None:
+        """DNA rows beyond the first page still count towards a user's traits."""
+        tables: dict[str, MagicMock] = {}
+        supabase = make_supabase(
+            tables,
+            existing={
+                "daily_insights": [{"user_id": "user-1"}],
+                "daily_profile_titles": [{"user_id": "user-1"}],
+            },
+        )
+        first_page = [{"user_id": "user-0"}] * 997 + [{"user_id": "user-1"}] * 3
+        dna_filter = tables["daily_dna"].select.return_value.in_.return_value.eq
+        range_ = dna_filter.return_value.order.return_value.range
+        range_.return_value.execute.side_effect = [
+            MagicMock(data=first_page),
+            MagicMock(data=[{"user_id": "user-1"}]),
+        ]
+        service = make_service(supabase)
+
+        counts = service.precompute_batch(["user-1"], TODAY)
+
+        assert counts == {"insights": 0, "dna": 0, "titles": 0, "failures": 0}
+        assert [c.args for c in range_.call_args_list] == [(0, 999), (1000, 1999)]
+
+
+class TestActiveUsers:
+    """Tests for TastePrecomputeService.get_active_user_ids()."""
+
+    @pytest.mark.unit
+    def test_users_are_read_from_last_activity_and_sharded(self) -> None:
+        """Active users come from profiles.last_active_at, in their shard only."""
+        tables: dict[str, MagicMock] = {}
+        supabase = make_supabase(tables)
+        tables["profiles"] = MagicMock()
+        chain = tables["profiles"].select.return_value.gte.return_value.order.return_value.range
+        chain.return_value.execute.return_value.data = [
+            {"id": "user-1"},
+            {"id": "user-2"},
+            {"id": "user-3"},
+            {"id": "user-4"},
+        ]
+        service = make_service(supabase)
+
+        everyone = service.get_active_user_ids()
+        shard_0 = service.get_active_user_ids(shard=0, shard_count=2)
+        shard_1 = service.get_active_user_ids(shard=1, shard_count=2)
+
+        assert everyone == ["user-1", "user-2", "user-3", "user-4"]
+        tables["profiles"].select.return_value.gte.assert_called_with("last_active_at", ANY)
+        assert sorted(shard_0 + shard_1) == everyone
+        assert all(user_shard(u, 2) == 0 for u in shard_0)
+
+
+class TestRegenerate:
+    """Tests for background regeneration after serving stale content."""
+
+    @pytest.mark.unit
+    def test_claim_is_deduplicated_until_regeneration_finishes(self) -> None:
+        """Only one regeneration per user is pending at a time."""
+        tables: dict[str, MagicMock] = {}
+        supabase = make_supabase(
+            tables,
+            rows={"user_analysis": [{"user_id": "user-1", "total_transactions": 5}]},
+        )
+        service = make_service(supabase)
+
+        assert claim_regeneration("user-1")
+        assert not claim_regeneration("user-1")
+        assert claim_regeneration("user-2")
+
+        service.regenerate("user-1")
+
+        # Every missing kind is filled, not just the one that was requested
+        assert tables["daily_insights"].upsert.called
+        assert tables["daily_dna"].upsert.called
+        assert claim_regeneration("user-1")
+        service.regenerate("user-1")
+        service.regenerate("user-2")
@@ -0,0 +1,34 @@
+"""Unit tests for user activity stamps."""
+
+from __future__ import annotations
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.services.user_activity import claim_stamp, stamp_activity
+
+
+class TestUserActivity:
+    """Tests for throttled profiles.last_active_at stamps."""
+
+    @pytest.mark.unit
+    def test_stamps_are_throttled_per_user(self) -> None:
+        """Only the first request in the window writes."""
+        assert claim_stamp("user-1")
+        assert not claim_stamp("user-1")
+        assert claim_stamp("user-2")
+
+    @pytest.mark.unit
+    def test_failed_stamp_is_retried_next_request(self) -> None:
+        """A write error releases the claim."""
+        supabase = MagicMock()
+        supabase.table.return_value.update.return_value.eq.return_value.execute.side_effect = (
+            RuntimeError("timeout")
+        )
+        assert claim_stamp("user-1")
+
+        stamp_activity(supabase, "user-1")
+
+        assert "last_active_at" in supabase.table.return_value.update.call_args[0][0]
+        assert claim_stamp("user-1")
@@ -0,0 +1,97 @@
+"""Unit tests for the materialized vault summary."""
+
+from __future__ import annotations
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.services.vault_summary_service import VaultSummaryService, build_summary
+
+
+def _visit(
+    visit_id: str,
+    venue_id: str | None,
+    merchant: str,
+    amount: float,
+    visited_at: str,
+    reaction: str | None = None,
+) -> dict:
+    return {
+        "id": visit_id,
+        "venue_id": venue_id,
+        "merchant_name": merchant,
+        "amount": amount,
+        "visited_at": visited_at,
+        "reaction": reaction,
+        "source": "transaction",
+        "venues": (
+            {
+                "id": venue_id,
+                "name": f"{merchant} Venue",
+                "taste_cluster": "coffee",
+                "photo_references": ["ref1", "ref2"],
+                "google_place_id": f"ChIJ_{venue_id}",
+            }
+            if venue_id
+            else None
+        ),
+    }
+
+
+class TestBuildSummary:
+    """Tests for build_summary()."""
+
+    @pytest.mark.unit
+    def test_aggregates_places_and_reaction(self) -> None:
+        """Visits are grouped per place with counts, totals and latest reaction."""
+        summary = build_summary(
+            [
+                _visit("v3", "venue-1", "Starbucks", 6.0, "2025-12-29T10:00:00Z"),
+                _visit("v2", None, "Corner Deli", 9.0, "2025-12-20T12:00:00Z"),
+                _visit("v1", "venue-1", "Starbucks", 5.5, "2025-11-02T09:00:00Z", "loved"),
+            ],
+            "UTC",
+        )
+
+        places = summary["places"]
+        assert [p["place_key"] for p in places] == ["venue-1", "Corner Deli"]
+        assert places[0]["visit_count"] == 2
+        assert places[0]["total_spent"] == 11.5
+        assert places[0]["last_visit"] == "2025-12-29T10:00:00Z"
+        assert places[0]["reaction"] == "loved"
+        assert places[0]["photo_references"] == ["ref1"]
+        assert places[1]["venue_name"] == "Corner Deli"
+
+    @pytest.mark.unit
+    def test_month_stats_use_user_timezone(self) -> None:
+        """A visit just after UTC midnight on the 1st belongs to the prior local month."""
+        summary = build_summary(
+            [_visit("v1", "venue-1", "Starbucks", 5.0, "2025-12-01T03:00:00Z")],
+            "America/Los_Angeles",
+        )
+
+        assert summary["month_stats"] == {
+            "2025-11": {"total_places": 1, "total_visits": 1, "spent": 5.0}
+        }
+
+
+class TestVaultSummaryServiceRefresh:
+    """Tests for VaultSummaryService.refresh()."""
+
+    @pytest.mark.unit
+    def test_refresh_reuses_stored_timezone(self) -> None:
+        """Refreshing without a timezone keeps the one stored on the summary."""
+        mock_supabase = MagicMock()
+        summaries = mock_supabase.table.return_value
+        summaries.select.return_value.eq.return_value.execute.return_value.data = [
+            {"places": [], "month_stats": {}, "tz": "Asia/Tokyo", "refreshed_at": None}
+        ]
+
+        service = VaultSummaryService(mock_supabase)
+        summary = service.refresh("user-123", visits=[])
+
+        assert summary["tz"] == "Asia/Tokyo"
+        stored = mock_supabase.table.return_value.upsert.call_args[0][0]
+        assert stored["user_id"] == "user-123"
+        assert stored["tz"] == "Asia/Tokyo"
@@ -0,0 +1,103 @@
+"""Unit tests for local merchant -> venue matching."""
+
+from __future__ import annotations
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.services.venue_matcher import VenueIndex, load_venue_index, normalize_merchant
+
+VENUES = [
+    {"id": "v-bb", "name": "Blue Bottle Coffee", "lat": 37.7760, "lng": -122.4230},
+    {"id": "v-sb-sf", "name": "Starbucks", "lat": 37.7601, "lng": -122.4301},
+    {"id": "v-sb-la", "name": "Starbucks", "lat": 34.0500, "lng": -118.2500},
+    {"id": "v-softies", "name": "Softies Burger - USC Village", "lat": 34.0256, "lng": -118.2851},
+    {"id": "v-coffee-bar", "name": "Coffee Bar", "lat": 37.7760, "lng": -122.4230},
+]
+
+
+class TestNormalizeMerchant:
+    """Tests for normalize_merchant()."""
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize(
+        "raw, expected",
+        [
+            ("STARBUCKS #1234", "starbucks"),
+            ("SQ *BLUE BOTTLE", "blue bottle"),
+            ("TST* Tartine Bakery", "tartine bakery"),
+            ("Softies Burger - USC Village", "softies burger"),
+            ("The Mill", "mill"),
+            ("Rock & Reilly's", "rock reillys"),
+        ],
+    )
+    def test_strips_processor_prefixes_and_store_numbers(self, raw: str, expected: str) -> None:
+        assert normalize_merchant(raw) == expected
+
+
+class TestVenueIndex:
+    """Tests for VenueIndex.match()."""
+
+    @pytest.mark.unit
+    def test_prefix_name_matches_nearby_venue(self) -> None:
+        match = VenueIndex(VENUES).match("SQ *BLUE BOTTLE", 37.7765, -122.4235)
+
+        assert match.venue_id == "v-bb"
+        assert match.confidence >= 0.85
+
+    @pytest.mark.unit
+    def test_chain_resolves_to_nearest_branch(self) -> None:
+        match = VenueIndex(VENUES).match("STARBUCKS #1234", 34.0505, -118.2510)
+
+        assert match.venue_id == "v-sb-la"
+        assert match.confidence == 1.0
+
+    @pytest.mark.unit
+    def test_chain_without_location_is_not_matched(self) -> None:
+        assert VenueIndex(VENUES).match("STARBUCKS #1234") is None
+
+    @pytest.mark.unit
+    def test_unique_name_matches_without_location(self) -> None:
+        match = VenueIndex(VENUES).match("SOFTIES BURGER")
+
+        assert match.venue_id == "v-softies"
+
+    @pytest.mark.unit
+    def test_no_venues_nearby_returns_none(self) -> None:
+        assert VenueIndex(VENUES).match("Blue Bottle", 40.71, -74.0) is None
+
+    @pytest.mark.unit
+    def test_generic_word_scores_below_threshold(self) -> None:
+        match = VenueIndex(VENUES).match("COFFEE", 37.776, -122.423)
+
+        assert match is None or match.confidence < 0.85
+
+    @pytest.mark.unit
+    def test_added_venue_is_matchable(self) -> None:
+        index = VenueIndex(VENUES)
+        index.add({"id": "v-new", "name": "Tartine Bakery", "lat": 37.7614, "lng": -122.4241})
+        index.add({"id": "v-new", "name": "Tartine Bakery", "lat": 37.7614, "lng": -122.4241})
+
+        assert index.match("TST* TARTINE BAKERY", 37.761, -122.424).venue_id == "v-new"
+        assert len(index) == len(VENUES) + 1
+
+
+class TestLoadVenueIndex:
+    """Tests for load_venue_index()."""
+
+    @pytest.mark.unit
+    def test_pages_through_catalog(self, monkeypatch) -> None:
+        monkeypatch.setattr("app.services.venue_matcher.LOAD_PAGE_SIZE", 2)
+        mock_supabase = MagicMock()
+        query = mock_supabase.table.return_value.select.return_value.order.return_value
+        query.range.return_value.execute.side_effect = [
+            MagicMock(data=VENUES[:2]),
+            MagicMock(data=VENUES[2:4]),
+            MagicMock(data=VENUES[4:]),
+        ]
+
+        index = load_venue_index(mock_supabase)
+
+        assert len(index) == len(VENUES)
+        assert [c[0] for c in query.range.call_args_list] == [(0, 1), (2, 3), (4, 5)]
@@ -0,0 +1,47 @@
+"""Unit tests for VenueDetailsRefresher."""
+
+from __future__ import annotations
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.services.venue_refresher import VenueDetailsRefresher
+
+
+class TestVenueDetailsRefresher:
+    """Tests for VenueDetailsRefresher.refresh_stale()."""
+
+    @pytest.mark.unit
+    def test_updates_volatile_fields_for_stale_venues(self) -> None:
+        """Stale venues get rating, count, hours and a new refresh time."""
+        mock_supabase = MagicMock()
+        venues = mock_supabase.table.return_value
+        stale = venues.select.return_value.or_.return_value.order.return_value
+        stale.limit.return_value.execute.return_value.data = [
+            {"id": "venue-1", "google_place_id": "place-1"},
+            {"id": "venue-2", "google_place_id": "place-2"},
+        ]
+        places_service = MagicMock()
+        places_service.get_volatile_details.side_effect = [
+            {"rating": 4.4, "review_count": 310, "opening_hours": None},
+            None,  # API error - stamped so it rotates to the back of the queue
+        ]
+
+        refreshed = VenueDetailsRefresher(mock_supabase, places_service).refresh_stale(limit=10)
+
+        assert refreshed == 1
+        venues.select.return_value.or_.return_value.order.return_value.limit.assert_called_once_with(
+            10
+        )
+        update, failed = (call[0][0] for call in venues.update.call_args_list)
+        assert update["google_rating"] == 4.4
+        assert update["google_review_count"] == 310
+        assert "opening_hours" not in update
+        assert update["details_refreshed_at"]
+        # The failed venue only gets its refresh time advanced
+        assert list(failed) == ["details_refreshed_at"]
+        assert [call[0] for call in venues.update.return_value.eq.call_args_list] == [
+            ("id", "venue-1"),
+            ("id", "venue-2"),
+        ]
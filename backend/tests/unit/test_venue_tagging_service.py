@@ -0,0 +1,353 @@
+"""Unit tests for VenueTaggingService.
+
+Uses an offline fake tagger - no Anthropic calls are made.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.intelligence.venue_tagger import PROMPT_BUDGET_TOKENS, VenueProfile, VenueTagger
+from app.services.venue_tagging_service import VenueTaggingService
+
+USAGE = {"input_tokens": 500, "output_tokens": 80, "total_cost": 0.0009}
+
+
+class FakeVenueTagger(VenueTagger):
+    """Offline tagger that derives a profile from the venue name."""
+
+    def __init__(self, fail_on: set[str] | None = None, delay: float = 0.0) -> None:
+        self._prompt_budget_tokens = PROMPT_BUDGET_TOKENS
+        self.calls: list[str] = []
+        self.fail_on = fail_on or set()
+        self.delay = delay
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def _profile(self, venue_data: dict) -> VenueProfile:
+        name = venue_data["name"]
+        self.calls.append(name)
+        if name in self.fail_on:
+            raise RuntimeError("overloaded")
+        return VenueProfile(
+            taste_cluster="coffee",
+            cuisine_type=None,
+            tagline=f"{name} tagline",
+            energy="chill",
+            best_for=["solo_work"],
+            standout=[],
+        )
+
+    def tag_with_usage(self, venue_data: dict) -> tuple[VenueProfile, dict]:
+        return self._profile(venue_data), USAGE
+
+    async def atag_with_usage(self, venue_data: dict) -> tuple[VenueProfile, dict]:
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            return self._profile(venue_data), USAGE
+        finally:
+            self.in_flight -= 1
+
+
+def _venue(name: str, review: str = "Great coffee") -> dict:
+    return {
+        "name": name,
+        "category": "cafe",
+        "price": "$",
+        "reviews": [{"text": review, "stars": 5}],
+    }
+
+
+def _memo_supabase(rows: list[dict]) -> MagicMock:
+    mock_supabase = MagicMock()
+    memo = mock_supabase.table.return_value
+    memo.select.return_value.in_.return_value.execute.return_value.data = rows
+    return mock_supabase
+
+
+class TestVenueTaggingService:
+    """Tests for VenueTaggingService."""
+
+    @pytest.mark.unit
+    async def test_memo_hits_skip_tagger_and_duplicates_tag_once(self) -> None:
+        """Only distinct, unmemoized venues reach the tagger."""
+        tagger = FakeVenueTagger()
+        cached_profile = FakeVenueTagger()._profile(_venue("Blue Bottle")).model_dump()
+        mock_supabase = _memo_supabase(
+            [
+                {
+                    "content_hash": tagger.prompt_fingerprint(_venue("Blue Bottle")),
+                    "profile": cached_profile,
+                },
+            ]
+        )
+        service = VenueTaggingService(mock_supabase, tagger=tagger)
+
+        profiles = await service.atag_many(
+            [
+                _venue("Blue Bottle"),
+                _venue("Tartine"),
+                _venue("Tartine"),
+                _venue("Sightglass"),
+            ]
+        )
+
+        assert [p.tagline for p in profiles] == [
+            "Blue Bottle tagline",
+            "Tartine tagline",
+            "Tartine tagline",
+            "Sightglass tagline",
+        ]
+        assert sorted(tagger.calls) == ["Sightglass", "Tartine"]
+        assert service.stats["memo_hits"] == 1
+        assert service.stats["tagged"] == 2
+
+        stored = mock_supabase.table.return_value.upsert.call_args[0][0]
+        assert len(stored) == 2
+        assert stored[0]["profile"]["taste_cluster"] == "coffee"
+
+    @pytest.mark.unit
+    async def test_concurrency_is_bounded(self) -> None:
+        """No more than the configured number of calls run at once."""
+        tagger = FakeVenueTagger(delay=0.01)
+        service = VenueTaggingService(None, tagger=tagger, concurrency=3)
+
+        profiles = await service.atag_many([_venue(f"Cafe {i}") for i in range(12)])
+
+        assert all(profiles)
+        assert tagger.max_in_flight == 3
+
+    @pytest.mark.unit
+    async def test_failures_return_none_and_are_not_memoized(self) -> None:
+        """A failed venue doesn't sink the batch or get cached."""
+        tagger = FakeVenueTagger(fail_on={"Broken"})
+        mock_supabase = _memo_supabase([])
+        service = VenueTaggingService(mock_supabase, tagger=tagger)
+
+        profiles = await service.atag_many([_venue("Broken"), _venue("Tartine")])
+
+        assert profiles[0] is None
+        assert profiles[1].tagline == "Tartine tagline"
+        stored = mock_supabase.table.return_value.upsert.call_args[0][0]
+        assert [r["profile"]["tagline"] for r in stored] == ["Tartine tagline"]
+        assert service.stats["failed"] == 1
+
+    @pytest.mark.unit
+    def test_sync_tag_uses_memo(self) -> None:
+        """tag() serves memoized profiles without calling the tagger."""
+        tagger = FakeVenueTagger()
+        cached_profile = FakeVenueTagger()._profile(_venue("Tartine")).model_dump()
+        mock_supabase = _memo_supabase(
+            [
+                {
+                    "content_hash": tagger.prompt_fingerprint(_venue("Tartine")),
+                    "profile": cached_profile,
+                },
+            ]
+        )
+
+        profile = VenueTaggingService(mock_supabase, tagger=tagger).tag(_venue("Tartine"))
+
+        assert profile.tagline == "Tartine tagline"
+        assert tagger.calls == []
+
+    @pytest.mark.unit
+    def test_fingerprint_covers_prompt_inputs_only(self) -> None:
+        """Review text past the prompt's truncation doesn't change the hash."""
+        tagger = FakeVenueTagger()
+        base = "x" * 300
+
+        assert tagger.prompt_fingerprint(_venue("A", base + "one")) == tagger.prompt_fingerprint(
+            _venue("A", base + "two")
+        )
+        assert tagger.prompt_fingerprint(_venue("A")) != tagger.prompt_fingerprint(_venue("B"))
+
+
+def _chain_row(name: str, primary_type: str | None = "cafe") -> dict:
+    return {
+        "chain_key": name,
+        "primary_type": primary_type,
+        "taste_cluster": "coffee",
+        "cuisine_type": None,
+        "energy": "lively",
+        "tagline": f"The usual {name}",
+        "best_for": ["quick_bite"],
+        "standout": [],
+    }
+
+
+def _chain_supabase(memo_rows: list[dict], chain_rows: list[dict]) -> MagicMock:
+    mock_supabase = _memo_supabase(memo_rows)
+    in_query = mock_supabase.table.return_value.select.return_value.in_.return_value
+    in_query.eq.return_value.execute.return_value.data = chain_rows
+    return mock_supabase
+
+
+class TestChainReuse:
+    """Tests for chain-level profile reuse."""
+
+    @pytest.mark.unit
+    async def test_known_chain_location_inherits_profile(self) -> None:
+        """A new Starbucks location reuses the chain's cluster, energy and occasions."""
+        tagger = FakeVenueTagger()
+        mock_supabase = _chain_supabase([], [_chain_row("starbucks")])
+        service = VenueTaggingService(mock_supabase, tagger=tagger)
+
+        profiles = await service.atag_many([_venue("STARBUCKS #1234"), _venue("Tartine")])
+
+        assert profiles[0].energy == "lively"
+        assert profiles[0].best_for == ["quick_bite"]
+        # Tagline describes this location, not the one the chain was tagged from
+        assert profiles[0].tagline == "Casual cafe"
+        assert profiles[1].tagline == "Tartine tagline"
+        assert tagger.calls == ["Tartine"]
+        assert service.stats["chain_hits"] == 1
+
+    @pytest.mark.unit
+    def test_unlisted_name_needs_multiple_locations(self) -> None:
+        """A single same-name venue isn't treated as a chain."""
+        tagger = FakeVenueTagger()
+        service = VenueTaggingService(
+            _chain_supabase([], [_chain_row("corner cafe")]), tagger=tagger
+        )
+
+        assert service.tag(_venue("Corner Cafe")).tagline == "Corner Cafe tagline"
+
+        service = VenueTaggingService(
+            _chain_supabase([], [_chain_row("corner cafe"), _chain_row("corner cafe")]),
+            tagger=tagger,
+        )
+
+        assert service.tag(_venue("Corner Cafe")).energy == "lively"
+        assert tagger.calls == ["Corner Cafe"]
+
+    @pytest.mark.unit
+    async def test_chain_requires_matching_primary_type(self) -> None:
+        """A chain's bar location doesn't inherit its cafe profile."""
+        tagger = FakeVenueTagger()
+        service = VenueTaggingService(
+            _chain_supabase([], [_chain_row("starbucks", primary_type="bar")]), tagger=tagger
+        )
+
+        profiles = await service.atag_many([_venue("Starbucks")])
+
+        assert profiles[0].tagline == "Starbucks tagline"
+        assert service.stats["chain_hits"] == 0
+
+    @pytest.mark.unit
+    async def test_new_known_chain_is_tagged_once_per_batch(self) -> None:
+        """Several untagged locations of a known chain share one tagging call."""
+        tagger = FakeVenueTagger()
+        service = VenueTaggingService(_chain_supabase([], []), tagger=tagger)
+
+        profiles = await service.atag_many(
+            [
+                _venue("Sweetgreen - Mission", "Fresh"),
+                _venue("Sweetgreen - SoMa", "Fast"),
+                _venue("Sweetgreen - Marina", "Busy"),
+            ]
+        )
+
+        assert len(tagger.calls) == 1
+        assert {p.best_for[0] for p in profiles} == {"solo_work"}
+        assert [p.tagline for p in profiles] == [
+            "Sweetgreen - Mission tagline",
+            "Casual cafe",
+            "Casual cafe",
+        ]
+
+    @pytest.mark.unit
+    async def test_missing_primary_type_matches_default_category(self) -> None:
+        """Chain rows stored without a primary type match untyped venues."""
+        tagger = FakeVenueTagger()
+        service = VenueTaggingService(
+            _chain_supabase([], [_chain_row("starbucks", primary_type=None)]), tagger=tagger
+        )
+
+        profiles = await service.atag_many([{**_venue("Starbucks"), "category": None}])
+
+        assert profiles[0].energy == "lively"
+        assert tagger.calls == []
+
+
+class TestUpgradeVenues:
+    """Tests for replacing rule-based tags with AI profiles."""
+
+    @pytest.mark.unit
+    async def test_upgrade_writes_ai_profile_and_skips_failures(self) -> None:
+        """Tagged venues get the AI profile; failed ones keep their rule tags."""
+        tagger = FakeVenueTagger(fail_on={"Broken"})
+        mock_supabase = _chain_supabase([], [])
+        service = VenueTaggingService(mock_supabase, tagger=tagger)
+
+        upgraded = await service.aupgrade_venues(
+            [
+                ("venue-1", _venue("Tartine")),
+                ("venue-2", _venue("Broken")),
+            ]
+        )
+
+        assert upgraded == 1
+        update = mock_supabase.table.return_value.update
+        update.assert_called_once()
+        assert update.call_args[0][0]["tagline"] == "Tartine tagline"
+        assert update.call_args[0][0]["tag_source"] == "ai"
+        update.return_value.eq.assert_called_once_with("id", "venue-1")
+
+    @pytest.mark.unit
+    def test_schedule_upgrade_runs_off_thread(self) -> None:
+        """Scheduled upgrades run in the background and report their count."""
+        service = VenueTaggingService(_chain_supabase([], []), tagger=FakeVenueTagger())
+
+        assert service.schedule_upgrade([]) is None
+        future = service.schedule_upgrade([("venue-1", _venue("Tartine"))])
+
+        assert future.result(timeout=5) == 1
+
+    @pytest.mark.unit
+    def test_sweep_pages_through_all_rule_tagged_venues(self) -> None:
+        """Every rules venue is retried, past ones whose details are missing."""
+        mock_supabase = _chain_supabase([], [])
+        rules = mock_supabase.table.return_value.select.return_value.eq.return_value
+        rules.order.return_value.limit.return_value.execute.return_value.data = [
+            {"id": "venue-1", "google_place_id": "place-1"},
+            {"id": "venue-2", "google_place_id": "place-2"},
+        ]
+        next_page = rules.gt.return_value.order.return_value.limit.return_value.execute
+        next_page.side_effect = [
+            MagicMock(data=[{"id": "venue-3", "google_place_id": "place-3"}]),
+            MagicMock(data=[]),
+        ]
+
+        def details(place_id: str) -> SimpleNamespace | None:
+            if place_id == "place-2":
+                return None  # Closed - skipped, sweep continues
+            return SimpleNamespace(
+                name=f"Cafe {place_id}",
+                primary_type="cafe",
+                types=["cafe"],
+                rating=4.5,
+                price_level=1,
+                reviews=[],
+            )
+
+        places_service = MagicMock()
+        places_service.get_place_details.side_effect = details
+        tagger = FakeVenueTagger()
+        service = VenueTaggingService(mock_supabase, tagger=tagger)
+
+        upgraded = service.upgrade_rule_tagged(places_service, batch_size=2)
+
+        assert upgraded == 2
+        rules.gt.assert_any_call("id", "venue-2")
+        rules.gt.assert_called_with("id", "venue-3")
+        upgraded_ids = [
+            c[0] for c in mock_supabase.table.return_value.update.return_value.eq.call_args_list
+        ]
+        assert upgraded_ids == [("id", "venue-1"), ("id", "venue-3")]
@@ -85,7 +85,8 @@ function groupVisitsByDay(visits: Visit[]): DayGroup[] {
 
 export default function PlaceDetailScreen() {
   const { id } = useLocalSearchParams<{ id: string }>();
-  const { selectedPlace, setSelectedPlace, updateReaction, addVisit } = useVaultStore();
+  const { selectedPlace, setSelectedPlace, fetchPlaceVisits, updateReaction, addVisit } =
+    useVaultStore();
   const { addVenueToSession, fetchSessions } = useSessionStore();
   const { user } = useAuthStore();
   const [showAddModal, setShowAddModal] = useState(false);
@@ -101,9 +102,12 @@ export default function PlaceDetailScreen() {
   useEffect(() => {
     if (id) {
       setSelectedPlace(id);
+      if (user?.id) {
+        fetchPlaceVisits(user.id, id);
+      }
     }
     return () => setSelectedPlace(null);
-  }, [id]);
+  }, [id, user?.id]);
 
   if (!selectedPlace) {
     return (
@@ -345,6 +345,7 @@ export interface VaultVisit {
 }
 
 export interface VaultPlace {
+  place_key: string;  // venue_id, or merchant name for unmatched places
   venue_id: string | null;
   venue_name: string;
   venue_type: string | null;
@@ -354,7 +355,7 @@ export interface VaultPlace {
   reaction: string | null;
   photo_url: string | null;
   google_place_id: string | null;  // For photo proxy
-  visits: VaultVisit[];
+  visits: VaultVisit[];  // Empty unless include_visits=true; see getPlaceVisits
 }
 
 export interface VaultStats {
@@ -368,6 +369,42 @@ export interface VaultResponse {
   stats: VaultStats;
 }
 
+export interface VaultPlaceSummary {
+  place_key: string;  // venue_id, or merchant name for unmatched places
+  venue_id: string | null;
+  venue_name: string;
+  venue_type: string | null;
+  visit_count: number;
+  last_visit: string;
+  total_spent: number;
+  reaction: string | null;
+  photo_url: string | null;
+  google_place_id: string | null;
+}
+
+export interface VaultPageResponse {
+  places: VaultPlaceSummary[];
+  stats: VaultStats | null;  // First page only
+  next_cursor: string | null;
+  has_more: boolean;
+}
+
+export interface PlaceVisitsPageResponse {
+  visits: VaultVisit[];
+  next_cursor: string | null;
+  has_more: boolean;
+}
+
+export interface VaultChangesResponse {
+  upserted: VaultVisit[];  // Inserted or updated visits
+  deleted: string[];       // Ids of deleted visits
+  stats: VaultStats;
+  next_token: string;      // Pass as `since` on the next call
+  resync: boolean;         // Full snapshot: replace the local copy
+  next_cursor: string | null;  // Snapshot only: pass as `cursor` for the next page
+  has_more: boolean;
+}
+
 export interface CreateVisitRequest {
   venue_id?: string;
   merchant_name: string;
@@ -399,6 +436,45 @@ export const vaultApi = {
     return api.get(`/api/vault/visits/${userId}?tz=${encodeURIComponent(tz)}`);
   },
 
+  getPlacesPage: (
+    userId: string,
+    cursor?: string | null,
+    limit = 20,
+    timezone?: string
+  ): Promise<VaultPageResponse> => {
+    const tz = timezone || getUserTimezone();
+    const cursorParam = cursor ? `&cursor=${encodeURIComponent(cursor)}` : '';
+    return api.get(
+      `/api/vault/places/${userId}?tz=${encodeURIComponent(tz)}&limit=${limit}${cursorParam}`
+    );
+  },
+
+  getPlaceVisits: (
+    userId: string,
+    placeKey: string,
+    cursor?: string | null,
+    limit = 50
+  ): Promise<PlaceVisitsPageResponse> => {
+    const cursorParam = cursor ? `&cursor=${encodeURIComponent(cursor)}` : '';
+    return api.get(
+      `/api/vault/places/${userId}/visits?place_key=${encodeURIComponent(placeKey)}&limit=${limit}${cursorParam}`
+    );
+  },
+
+  getChanges: (
+    userId: string,
+    since?: string | null,
+    cursor?: string | null,
+    timezone?: string
+  ): Promise<VaultChangesResponse> => {
+    const tz = timezone || getUserTimezone();
+    const sinceParam = since ? `&since=${encodeURIComponent(since)}` : '';
+    const cursorParam = cursor ? `&cursor=${encodeURIComponent(cursor)}` : '';
+    return api.get(
+      `/api/vault/changes/${userId}?tz=${encodeURIComponent(tz)}${sinceParam}${cursorParam}`
+    );
+  },
+
   createVisit: (userId: string, data: CreateVisitRequest): Promise<VaultVisit> =>
     api.post(`/api/vault/visits/${userId}`, data),
 
@@ -1,6 +1,7 @@
 import { act } from '@testing-library/react-native';
 import { useVaultStore } from './useVaultStore';
 import { PLACES, VISITS, VAULT_STATS } from '@/mocks/visits';
+import { vaultApi } from '@/services/api';
 
 describe('useVaultStore', () => {
   beforeEach(() => {
@@ -152,4 +153,38 @@ describe('useVaultStore', () => {
       expect(updatedVisit?.notes).toBe(newNote);
     });
   });
+
+  describe('fetchPlaceVisits', () => {
+    it('should load a place\'s visits on demand', async () => {
+      const place = { ...PLACES[0], placeKey: 'place-key-1', visits: [] };
+      useVaultStore.setState({ places: [place], selectedPlace: place });
+      const spy = jest.spyOn(vaultApi, 'getPlaceVisits').mockResolvedValue({
+        visits: [
+          {
+            id: 'visit-loaded',
+            venue_id: place.venueId,
+            venue_name: place.venueName,
+            venue_type: place.venueType,
+            visited_at: '2025-12-29T10:00:00Z',
+            amount: 5,
+            reaction: null,
+            notes: null,
+            source: 'transaction',
+          },
+        ],
+        next_cursor: null,
+        has_more: false,
+      });
+
+      await act(async () => {
+        await useVaultStore.getState().fetchPlaceVisits('user-1', place.venueName);
+      });
+
+      expect(spy).toHaveBeenCalledWith('user-1', 'place-key-1');
+      const state = useVaultStore.getState();
+      expect(state.selectedPlace?.visits.map((v) => v.id)).toEqual(['visit-loaded']);
+      expect(state.visits.some((v) => v.id === 'visit-loaded')).toBe(true);
+      spy.mockRestore();
+    });
+  });
 });
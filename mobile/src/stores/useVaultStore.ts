@@ -25,6 +25,7 @@ export interface Visit {
 }
 
 export interface Place {
+  placeKey?: string;  // Key for loading visits (venue_id or merchant name)
   venueId: string | null;
   venueName: string;
   venueType: string | null;
@@ -55,6 +56,7 @@ export interface AddVisitData {
 // Helper to convert API place to local format
 function mapApiPlace(apiPlace: VaultPlace): Place {
   return {
+    placeKey: apiPlace.place_key,
     venueId: apiPlace.venue_id,
     venueName: apiPlace.venue_name,
     venueType: apiPlace.venue_type,
@@ -112,6 +114,7 @@ interface VaultState {
 
   // Actions
   fetchVisits: (userId: string) => Promise<void>;
+  fetchPlaceVisits: (userId: string, placeId: string) => Promise<void>;
   setSelectedPlace: (placeId: string | null) => void;
   setFilter: (filter: StatusFilter) => void;
   updateReaction: (venueId: string, reaction: Reaction) => void;
@@ -166,6 +169,33 @@ export const useVaultStore = create<VaultState>((set, get) => ({
     }
   },
 
+  fetchPlaceVisits: async (userId: string, placeId: string) => {
+    const matchesPlace = (place: Place) =>
+      place.venueId === placeId || place.venueName === placeId;
+    const place = get().places.find(matchesPlace);
+    if (!place?.placeKey) return;
+
+    try {
+      // Vault open returns places only; a place's visits load on demand
+      const response = await vaultApi.getPlaceVisits(userId, place.placeKey);
+      const placeVisits = response.visits.map(mapApiVisit);
+      const loadedIds = new Set(placeVisits.map((v) => v.id));
+
+      set((state) => {
+        const withVisits = (p: Place) => (matchesPlace(p) ? { ...p, visits: placeVisits } : p);
+        const places = state.places.map(withVisits);
+        return {
+          places,
+          filteredPlaces: getPlacesByStatus(places, state.currentFilter),
+          visits: [...placeVisits, ...state.visits.filter((v) => !loadedIds.has(v.id))],
+          selectedPlace: state.selectedPlace ? withVisits(state.selectedPlace) : null,
+        };
+      });
+    } catch (error) {
+      console.error('[Vault] Failed to fetch place visits:', error);
+    }
+  },
+
   setSelectedPlace: (placeId) => {
     if (!placeId) {
       set({ selectedPlace: null });
@@ -291,7 +321,7 @@ export const useVaultStore = create<VaultState>((set, get) => ({
         stats: {
           ...state.stats,
           totalPlaces: updatedPlaces.length,
-          totalVisits: state.visits.length + 1,
+          totalVisits: state.stats.totalVisits + 1,
         },
       };
     });
@@ -0,0 +1,15 @@
+-- Per-user watermark for incremental place_visits creation.
+-- Stores the (created_at, id) of the last transaction processed into
+-- place_visits so the vault only scans transactions added after it.
+
+ALTER TABLE user_analysis
+  ADD COLUMN IF NOT EXISTS visits_watermark_at TIMESTAMPTZ,
+  ADD COLUMN IF NOT EXISTS visits_watermark_tx_id UUID;
+
+-- Keyset scan used by PlaidService._insert_new_place_visits
+CREATE INDEX IF NOT EXISTS idx_transactions_user_created
+  ON transactions (user_id, created_at, id);
+
+-- Batch existence check against already-created visits
+CREATE INDEX IF NOT EXISTS idx_place_visits_transaction
+  ON place_visits (transaction_id);
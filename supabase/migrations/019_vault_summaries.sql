@@ -0,0 +1,24 @@
+-- Materialized per-user vault summary.
+-- Refreshed after visits are synced, matched or edited so the vault read
+-- path serves one row instead of aggregating every place_visit.
+
+CREATE TABLE IF NOT EXISTS vault_summaries (
+  user_id UUID PRIMARY KEY REFERENCES profiles(id) ON DELETE CASCADE,
+  places JSONB NOT NULL DEFAULT '[]',        -- [{place_key, venue_id, venue_name, visit_count, total_spent, last_visit, reaction, ...}]
+  month_stats JSONB NOT NULL DEFAULT '{}',   -- {"2025-12": {total_places, total_visits, spent}}
+  tz TEXT NOT NULL DEFAULT 'UTC',            -- Timezone used for month buckets
+  refreshed_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+-- Enable Row Level Security
+ALTER TABLE vault_summaries ENABLE ROW LEVEL SECURITY;
+
+-- Users can read their own summary
+CREATE POLICY "Users can view own vault summary"
+  ON vault_summaries FOR SELECT
+  USING (auth.uid() = user_id);
+
+-- Service role maintains summaries (refreshed by the backend)
+CREATE POLICY "Service role can manage vault summaries"
+  ON vault_summaries FOR ALL
+  USING (auth.jwt() ->> 'role' = 'service_role');
@@ -0,0 +1,128 @@
+-- Server-side vault aggregation for the paged vault API.
+-- Places are keyed the same way as the API: venue_id when matched,
+-- otherwise the merchant name.
+
+-- One page of places, most recent first, keyset-paginated on
+-- (last_visit, place_key).
+CREATE OR REPLACE FUNCTION vault_places_page(
+  p_user_id UUID,
+  p_limit INT DEFAULT 20,
+  p_cursor_last_visit TIMESTAMPTZ DEFAULT NULL,
+  p_cursor_place_key TEXT DEFAULT NULL
+)
+RETURNS TABLE (
+  place_key TEXT,
+  venue_id UUID,
+  venue_name TEXT,
+  venue_type TEXT,
+  google_place_id TEXT,
+  photo_reference TEXT,
+  visit_count BIGINT,
+  total_spent NUMERIC,
+  last_visit TIMESTAMPTZ,
+  reaction TEXT
+)
+LANGUAGE sql STABLE
+AS $$
+  WITH places AS (
+    SELECT
+      COALESCE(pv.venue_id::TEXT, COALESCE(pv.merchant_name, 'Unknown')) AS place_key,
+      pv.venue_id,
+      COUNT(*) AS visit_count,
+      COALESCE(SUM(pv.amount), 0) AS total_spent,
+      MAX(pv.visited_at) AS last_visit,
+      (ARRAY_AGG(pv.reaction ORDER BY pv.visited_at DESC)
+        FILTER (WHERE pv.reaction IS NOT NULL))[1] AS reaction,
+      (ARRAY_AGG(COALESCE(pv.merchant_name, 'Unknown') ORDER BY pv.visited_at DESC))[1]
+        AS merchant_name
+    FROM place_visits pv
+    WHERE pv.user_id = p_user_id
+    GROUP BY 1, 2
+  )
+  SELECT
+    p.place_key,
+    p.venue_id,
+    COALESCE(v.name, p.merchant_name),
+    v.taste_cluster,
+    v.google_place_id,
+    v.photo_references->>0,
+    p.visit_count,
+    p.total_spent,
+    p.last_visit,
+    p.reaction
+  FROM places p
+  LEFT JOIN venues v ON v.id = p.venue_id
+  WHERE p_cursor_last_visit IS NULL
+     OR (p.last_visit, p.place_key) < (p_cursor_last_visit, p_cursor_place_key)
+  ORDER BY p.last_visit DESC, p.place_key DESC
+  LIMIT p_limit;
+$$;
+
+-- Current-month stats with the month boundary taken in the user's timezone.
+CREATE OR REPLACE FUNCTION vault_month_stats(
+  p_user_id UUID,
+  p_tz TEXT DEFAULT 'UTC'
+)
+RETURNS TABLE (
+  total_places BIGINT,
+  total_visits BIGINT,
+  spent NUMERIC
+)
+LANGUAGE sql STABLE
+AS $$
+  WITH bounds AS (
+    SELECT date_trunc('month', NOW() AT TIME ZONE p_tz) AS month_start
+  )
+  SELECT
+    COUNT(DISTINCT COALESCE(pv.venue_id::TEXT, COALESCE(pv.merchant_name, 'Unknown'))),
+    COUNT(*),
+    COALESCE(SUM(pv.amount), 0)
+  FROM place_visits pv, bounds b
+  WHERE pv.user_id = p_user_id
+    AND pv.visited_at >= (b.month_start AT TIME ZONE p_tz)
+    AND pv.visited_at < ((b.month_start + INTERVAL '1 month') AT TIME ZONE p_tz);
+$$;
+
+-- Visit history for a single place, most recent first, keyset-paginated on
+-- (visited_at, id).
+CREATE OR REPLACE FUNCTION vault_place_visits(
+  p_user_id UUID,
+  p_place_key TEXT,
+  p_limit INT DEFAULT 50,
+  p_cursor_visited_at TIMESTAMPTZ DEFAULT NULL,
+  p_cursor_id UUID DEFAULT NULL
+)
+RETURNS TABLE (
+  id UUID,
+  venue_id UUID,
+  venue_name TEXT,
+  venue_type TEXT,
+  visited_at TIMESTAMPTZ,
+  amount NUMERIC,
+  reaction TEXT,
+  notes TEXT,
+  source TEXT
+)
+LANGUAGE sql STABLE
+AS $$
+  SELECT
+    pv.id,
+    pv.venue_id,
+    COALESCE(v.name, pv.merchant_name, 'Unknown'),
+    v.taste_cluster,
+    pv.visited_at,
+    pv.amount,
+    pv.reaction,
+    pv.notes,
+    pv.source
+  FROM place_visits pv
+  LEFT JOIN venues v ON v.id = pv.venue_id
+  WHERE pv.user_id = p_user_id
+    AND COALESCE(pv.venue_id::TEXT, COALESCE(pv.merchant_name, 'Unknown')) = p_place_key
+    AND (
+      p_cursor_visited_at IS NULL
+      OR (pv.visited_at, pv.id) < (p_cursor_visited_at, p_cursor_id)
+    )
+  ORDER BY pv.visited_at DESC, pv.id DESC
+  LIMIT p_limit;
+$$;
@@ -0,0 +1,56 @@
+-- Change tracking for the vault delta sync endpoint.
+-- updated_at is maintained by 005's place_visits_updated_at trigger on
+-- every update (reaction, notes, venue match), and deletes leave a
+-- tombstone so clients can drop them. Tombstones are kept for 30 days
+-- (TOMBSTONE_RETENTION_DAYS in the vault router); older sync tokens get a
+-- full resync instead.
+
+CREATE INDEX IF NOT EXISTS idx_place_visits_user_updated
+  ON place_visits (user_id, updated_at);
+
+CREATE TABLE IF NOT EXISTS place_visit_tombstones (
+  visit_id UUID PRIMARY KEY,
+  user_id UUID NOT NULL,
+  deleted_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_place_visit_tombstones_user_deleted
+  ON place_visit_tombstones (user_id, deleted_at);
+
+-- Enable Row Level Security
+ALTER TABLE place_visit_tombstones ENABLE ROW LEVEL SECURITY;
+
+-- Users can read their own tombstones (delta sync)
+CREATE POLICY "Users can view own place visit tombstones"
+  ON place_visit_tombstones FOR SELECT
+  USING (auth.uid() = user_id);
+
+-- Service role manages tombstones (written by the delete trigger)
+CREATE POLICY "Service role can manage place visit tombstones"
+  ON place_visit_tombstones FOR ALL
+  USING (auth.jwt() ->> 'role' = 'service_role');
+
+-- SECURITY DEFINER: users deleting their own visits can't write tombstones directly
+CREATE OR REPLACE FUNCTION record_place_visit_tombstone()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+BEGIN
+  INSERT INTO place_visit_tombstones (visit_id, user_id)
+  VALUES (OLD.id, OLD.user_id)
+  ON CONFLICT (visit_id) DO UPDATE SET deleted_at = NOW();
+
+  -- Prune the user's tombstones past retention (no token can need them)
+  DELETE FROM place_visit_tombstones
+  WHERE user_id = OLD.user_id
+    AND deleted_at < NOW() - INTERVAL '30 days';
+  RETURN OLD;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS place_visits_record_tombstone ON place_visits;
+CREATE TRIGGER place_visits_record_tombstone
+  AFTER DELETE ON place_visits
+  FOR EACH ROW EXECUTE FUNCTION record_place_visit_tombstone();
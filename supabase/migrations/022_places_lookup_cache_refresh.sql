@@ -0,0 +1,14 @@
+-- Expiry for places_lookup_cache rows.
+-- refreshed_at is set on every upsert so no-match rows can expire after
+-- a short TTL and matches are re-checked after the refresh horizon.
+
+ALTER TABLE places_lookup_cache
+  ADD COLUMN IF NOT EXISTS refreshed_at TIMESTAMPTZ;
+
+-- Existing rows were last refreshed when they were created
+UPDATE places_lookup_cache
+  SET refreshed_at = created_at
+  WHERE refreshed_at IS NULL;
+
+ALTER TABLE places_lookup_cache
+  ALTER COLUMN refreshed_at SET DEFAULT NOW();
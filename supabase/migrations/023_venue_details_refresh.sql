@@ -0,0 +1,14 @@
+-- Track when a venue's Google details were last pulled so the refresher
+-- can re-fetch volatile fields (rating, review count, hours) for stale venues.
+
+ALTER TABLE venues
+  ADD COLUMN IF NOT EXISTS details_refreshed_at TIMESTAMPTZ;
+
+-- Existing venues were last refreshed when they were last written
+UPDATE venues
+  SET details_refreshed_at = updated_at
+  WHERE details_refreshed_at IS NULL;
+
+-- Oldest-first scan used by VenueDetailsRefresher
+CREATE INDEX IF NOT EXISTS idx_venues_details_refreshed
+  ON venues (details_refreshed_at);
@@ -0,0 +1,18 @@
+-- Memoized VenueTagger results keyed by a hash of the prompt inputs
+-- (model, system prompt, venue name/category/price/truncated reviews),
+-- so recreated or re-imported venues are not re-tagged.
+
+CREATE TABLE IF NOT EXISTS venue_tag_memo (
+  content_hash TEXT PRIMARY KEY,
+  profile JSONB NOT NULL,
+  model TEXT,
+  created_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+ALTER TABLE venue_tag_memo ENABLE ROW LEVEL SECURITY;
+
+-- Service role only (no user access needed)
+DROP POLICY IF EXISTS "Service role can manage venue tag memo" ON venue_tag_memo;
+CREATE POLICY "Service role can manage venue tag memo"
+  ON venue_tag_memo FOR ALL
+  USING (auth.jwt() ->> 'role' = 'service_role');
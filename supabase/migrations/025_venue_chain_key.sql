@@ -0,0 +1,20 @@
+-- Chain key (normalized venue name) so new locations of a chain can
+-- inherit the AI profile of an already-tagged location instead of being
+-- tagged again. New venues get the key from venue_matcher.normalize_merchant().
+
+ALTER TABLE venues
+  ADD COLUMN IF NOT EXISTS chain_key TEXT;
+
+-- Approximate backfill: lowercase, drop "- Location" suffixes and
+-- punctuation. Store numbers and noise words are only stripped for venues
+-- written by the app.
+UPDATE venues
+  SET chain_key = trim(regexp_replace(
+    replace(lower(split_part(name, ' - ', 1)), '''', ''),
+    '[^a-z0-9]+', ' ', 'g'
+  ))
+  WHERE chain_key IS NULL;
+
+-- Chain profile lookup used by VenueTaggingService
+CREATE INDEX IF NOT EXISTS idx_venues_chain_key
+  ON venues (chain_key, primary_type);
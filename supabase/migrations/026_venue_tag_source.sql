@@ -0,0 +1,17 @@
+-- Record which tagger produced a venue's profile. New venues are written
+-- with instant rule-based tags ('rules') and upgraded to the Claude
+-- profile ('ai') in the background.
+
+ALTER TABLE venues
+  ADD COLUMN IF NOT EXISTS tag_source TEXT
+  CHECK (tag_source IN ('rules', 'ai'));
+
+-- Existing taglines came from VenueTagger
+UPDATE venues
+  SET tag_source = 'ai'
+  WHERE tag_source IS NULL AND tagline IS NOT NULL;
+
+-- Finds venues still waiting on an AI profile
+CREATE INDEX IF NOT EXISTS idx_venues_tag_source_rules
+  ON venues (tag_source)
+  WHERE tag_source = 'rules';
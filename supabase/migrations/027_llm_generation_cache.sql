@@ -0,0 +1,23 @@
+-- Reusable insight / DNA / profile title generations keyed by
+-- generator, prompt version and a fingerprint of the generator input,
+-- so unchanged (or identical) user data doesn't trigger a new LLM call.
+-- outputs holds up to N variants that rotate by day.
+
+CREATE TABLE IF NOT EXISTS llm_generation_cache (
+  cache_key TEXT PRIMARY KEY,
+  generator TEXT NOT NULL,
+  outputs JSONB NOT NULL DEFAULT '[]',
+  expires_at TIMESTAMPTZ NOT NULL,
+  created_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_llm_generation_cache_expires
+  ON llm_generation_cache (expires_at);
+
+ALTER TABLE llm_generation_cache ENABLE ROW LEVEL SECURITY;
+
+-- Service role only (no user access needed)
+DROP POLICY IF EXISTS "Service role can manage LLM generation cache" ON llm_generation_cache;
+CREATE POLICY "Service role can manage LLM generation cache"
+  ON llm_generation_cache FOR ALL
+  USING (auth.jwt() ->> 'role' = 'service_role');
@@ -0,0 +1,12 @@
+-- Fused taste is computed when its inputs change (quiz submission,
+-- transaction aggregation) instead of on every GET. Store everything the
+-- endpoint returns, plus the input version it was built from (served as
+-- the ETag). Rows without input_version are rebuilt on first read.
+
+ALTER TABLE fused_taste
+  ADD COLUMN IF NOT EXISTS top_cuisines JSONB NOT NULL DEFAULT '[]',
+  ADD COLUMN IF NOT EXISTS quiz_weight FLOAT,
+  ADD COLUMN IF NOT EXISTS tx_weight FLOAT,
+  ADD COLUMN IF NOT EXISTS profile_title TEXT,
+  ADD COLUMN IF NOT EXISTS profile_tagline TEXT,
+  ADD COLUMN IF NOT EXISTS input_version TEXT;
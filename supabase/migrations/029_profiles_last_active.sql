@@ -0,0 +1,9 @@
+-- When each user last used the app, stamped by the taste endpoints.
+-- The nightly taste precompute only warms content for users active
+-- within TASTE_PRECOMPUTE_ACTIVE_DAYS, and can't use its own daily_*
+-- rows as the signal since it writes them itself.
+
+ALTER TABLE profiles ADD COLUMN IF NOT EXISTS last_active_at TIMESTAMPTZ;
+
+CREATE INDEX IF NOT EXISTS idx_profiles_last_active_at
+  ON profiles(last_active_at);
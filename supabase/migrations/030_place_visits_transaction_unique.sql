@@ -0,0 +1,25 @@
+-- One place visit per transaction per user.
+-- Overlapping syncs for the same user could both pass the existence
+-- check in PlaidService._insert_new_place_visits and insert the same
+-- transaction twice. The insert now upserts on (user_id, transaction_id)
+-- and skips duplicates, which needs this unique index. Manual visits have
+-- no transaction_id; NULLs never conflict.
+
+-- Remove existing duplicates, keeping the copy the user annotated (or the oldest)
+DELETE FROM place_visits
+WHERE id IN (
+  SELECT id FROM (
+    SELECT
+      id,
+      ROW_NUMBER() OVER (
+        PARTITION BY user_id, transaction_id
+        ORDER BY (reaction IS NOT NULL OR notes IS NOT NULL) DESC, created_at, id
+      ) AS copy
+    FROM place_visits
+    WHERE transaction_id IS NOT NULL
+  ) copies
+  WHERE copy > 1
+);
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_place_visits_user_transaction
+  ON place_visits (user_id, transaction_id);